@@ -2,5 +2,6 @@ import importlib.metadata
 
 __version__ = importlib.metadata.version("mem0ai")
 
+from mem0.client.batching import AsyncBatchingMemoryClient, BatchingMemoryClient  # noqa
 from mem0.client.main import AsyncMemoryClient, MemoryClient  # noqa
 from mem0.memory.main import AsyncMemory, Memory  # noqa
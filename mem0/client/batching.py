@@ -0,0 +1,434 @@
+import asyncio
+import atexit
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from mem0.client.main import AsyncMemoryClient, MemoryClient
+from mem0.client.utils import APIError, api_error_handler
+
+logger = logging.getLogger(__name__)
+
+# Seconds flush() and close() wait for outstanding adds by default
+DEFAULT_FLUSH_TIMEOUT = 30.0
+
+
+def _split_batch_response(data: Any, size: int) -> List[Any]:
+    """Return the per-item outcomes of a `POST /memories/batch` response, in request order.
+
+    Items the server reports as failed are returned as `APIError` instances.
+    """
+    items = data.get("results") if isinstance(data, dict) else None
+    if not isinstance(items, list) or len(items) != size:
+        raise APIError(f"Batch add returned {len(items) if isinstance(items, list) else 'no'} results for {size}")
+    outcomes: List[Any] = [None] * size
+    for position, item in enumerate(items):
+        index = item.get("index", position)
+        if not isinstance(index, int) or not 0 <= index < size:
+            raise APIError(f"Batch add returned a result for unknown item {index!r}")
+        if item.get("status") == "ok":
+            outcomes[index] = item.get("result")
+        else:
+            outcomes[index] = APIError(f"Batch add of item {index} failed: {item.get('error', 'unknown error')}")
+    return outcomes
+
+
+class BatchingMemoryClient:
+    """Micro-batching wrapper around `MemoryClient.add`.
+
+    `add` calls are buffered for up to `max_delay` seconds or `max_batch_size`
+    items and sent together. Each call returns a `concurrent.futures.Future`
+    that resolves with that caller's own result. At most `max_pending` adds are
+    buffered or in flight; further calls block until capacity frees up.
+
+    The Mem0 API has no batch add endpoint, so by default a batch is sent as
+    concurrent requests over the client's shared connection pool. Set
+    `batch_endpoint` to send each batch as a single `POST {"items": [...]}`
+    to a self-hosted server's `/memories/batch` endpoint, which reports a
+    result or an error for each item.
+
+    All other methods are forwarded to the wrapped `MemoryClient`.
+    """
+
+    def __init__(
+        self,
+        client: Optional[MemoryClient] = None,
+        max_batch_size: int = 50,
+        max_delay: float = 0.01,
+        max_pending: int = 1000,
+        max_workers: int = 8,
+        batch_endpoint: Optional[str] = None,
+        **client_kwargs,
+    ):
+        """Initialize the BatchingMemoryClient.
+
+        Args:
+            client: The MemoryClient to send requests with. Created from
+                    `client_kwargs` when not provided.
+            max_batch_size: Maximum number of adds sent in one batch.
+            max_delay: Seconds to wait for a batch to fill up.
+            max_pending: Maximum number of adds buffered or in flight.
+            max_workers: Concurrent requests used to send a batch when no
+                         `batch_endpoint` is configured.
+            batch_endpoint: Path of a batch add endpoint, e.g. "/memories/batch".
+        """
+        self.client = client or MemoryClient(**client_kwargs)
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.batch_endpoint = batch_endpoint
+
+        self._buffer = deque()
+        self._in_flight = set()
+        self._capacity = threading.BoundedSemaphore(max_pending)
+        self._changed = threading.Condition()
+        self._flush_requested = False
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mem0-batch-add")
+        self._worker = threading.Thread(target=self._run, name="mem0-batch-flusher", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    def __getattr__(self, name):
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def add(self, messages: List[Dict[str, str]], **kwargs) -> Future:
+        """Queue a memory to be added.
+
+        Args:
+            messages: A list of message dictionaries.
+            **kwargs: The same parameters as `MemoryClient.add`.
+
+        Returns:
+            A Future resolving to the API response for this call.
+
+        Raises:
+            RuntimeError: If the client has been closed.
+        """
+        if self._closed:
+            raise RuntimeError("BatchingMemoryClient is closed")
+        idempotency_key = kwargs.pop("idempotency_key", None) or str(uuid.uuid4())
+        payload = self.client._prepare_add_payload(messages, kwargs)
+
+        self._capacity.acquire()
+        future = Future()
+        future.add_done_callback(self._release)
+        with self._changed:
+            if self._closed:
+                self._capacity.release()
+                raise RuntimeError("BatchingMemoryClient is closed")
+            self._buffer.append((payload, idempotency_key, future))
+            self._in_flight.add(future)
+            self._changed.notify_all()
+        return future
+
+    def flush(self, timeout: Optional[float] = DEFAULT_FLUSH_TIMEOUT) -> bool:
+        """Send buffered adds now and wait for every outstanding add to finish.
+
+        Args:
+            timeout: Seconds to wait; None waits indefinitely.
+
+        Returns:
+            bool: True if all adds finished, False if `timeout` elapsed first.
+        """
+        with self._changed:
+            self._flush_requested = True
+            self._changed.notify_all()
+            outstanding = list(self._in_flight)
+        _, not_done = wait_futures(outstanding, timeout=timeout)
+        return not not_done
+
+    def close(self, timeout: Optional[float] = DEFAULT_FLUSH_TIMEOUT) -> None:
+        """Send buffered adds and stop the background flusher.
+
+        Buffered adds are sent from the calling thread, so closing also works
+        at interpreter exit, after Python has stopped accepting work in
+        thread pools.
+
+        Args:
+            timeout: Seconds to wait for adds already in flight.
+        """
+        if self._closed:
+            return
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+        self._drain()
+        self._worker.join(timeout)
+        if not self.flush(timeout):
+            logger.warning("BatchingMemoryClient closed with adds still in flight")
+        self._executor.shutdown(wait=False)
+        atexit.unregister(self.close)
+
+    def _drain(self) -> None:
+        while True:
+            with self._changed:
+                batch = [self._buffer.popleft() for _ in range(min(self.max_batch_size, len(self._buffer)))]
+            if not batch:
+                return
+            if self.batch_endpoint:
+                self._send_batch(batch)
+            else:
+                for item in batch:
+                    self._send_one(item)
+
+    def _release(self, future: Future) -> None:
+        with self._changed:
+            self._in_flight.discard(future)
+        self._capacity.release()
+
+    def _next_batch(self) -> List:
+        with self._changed:
+            while not self._buffer and not self._closed:
+                self._changed.wait()
+            deadline = time.monotonic() + self.max_delay
+            while len(self._buffer) < self.max_batch_size and not (self._flush_requested or self._closed):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+            batch = [self._buffer.popleft() for _ in range(min(self.max_batch_size, len(self._buffer)))]
+            if not self._buffer:
+                self._flush_requested = False
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            if self.batch_endpoint:
+                self._submit(self._send_batch, batch)
+            else:
+                for item in batch:
+                    self._submit(self._send_one, item)
+
+    def _submit(self, send, arg) -> None:
+        try:
+            self._executor.submit(send, arg)
+        except RuntimeError:
+            # The pool no longer accepts work (interpreter shutdown); send from this thread
+            send(arg)
+
+    def _send_one(self, item) -> None:
+        payload, idempotency_key, future = item
+        try:
+            future.set_result(self._post("/v1/memories/", payload, idempotency_key))
+        except Exception as e:
+            future.set_exception(e)
+
+    def _send_batch(self, batch) -> None:
+        try:
+            data = self._post(self.batch_endpoint, {"items": [item[0] for item in batch]}, str(uuid.uuid4()))
+            results = _split_batch_response(data, len(batch))
+        except Exception as e:
+            logger.error(f"Batch add of {len(batch)} memories failed: {e}")
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, _, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    @api_error_handler
+    def _post(self, path: str, payload: Dict[str, Any], idempotency_key: str) -> Any:
+        response = self.client.client.post(path, json=payload, headers={"Idempotency-Key": idempotency_key})
+        response.raise_for_status()
+        for params in payload.get("items", [payload]):
+            self.client._invalidate_cache(params)
+        return response.json()
+
+
+class AsyncBatchingMemoryClient:
+    """Micro-batching wrapper around `AsyncMemoryClient.add`.
+
+    Concurrent `add` calls are buffered for up to `max_delay` seconds or
+    `max_batch_size` items and sent together; each call returns its own
+    result. At most `max_pending` adds are buffered or in flight; further calls
+    wait until capacity frees up. See `BatchingMemoryClient` for how batches
+    are sent.
+
+    All other methods are forwarded to the wrapped `AsyncMemoryClient`.
+    """
+
+    def __init__(
+        self,
+        client: Optional[AsyncMemoryClient] = None,
+        max_batch_size: int = 50,
+        max_delay: float = 0.01,
+        max_pending: int = 1000,
+        batch_endpoint: Optional[str] = None,
+        **client_kwargs,
+    ):
+        """Initialize the AsyncBatchingMemoryClient.
+
+        Args:
+            client: The AsyncMemoryClient to send requests with. Created from
+                    `client_kwargs` when not provided.
+            max_batch_size: Maximum number of adds sent in one batch.
+            max_delay: Seconds to wait for a batch to fill up.
+            max_pending: Maximum number of adds buffered or in flight.
+            batch_endpoint: Path of a batch add endpoint, e.g. "/memories/batch".
+        """
+        self.client = client or AsyncMemoryClient(**client_kwargs)
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.batch_endpoint = batch_endpoint
+
+        self._buffer = deque()
+        self._in_flight = set()
+        self._tasks = set()
+        # Created on first use so they bind to the running event loop
+        self._capacity = None
+        self._changed = None
+        self._worker = None
+        self._flush_requested = False
+        self._closed = False
+        self._owns_client = client is None
+
+    def __getattr__(self, name):
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def add(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """Add a memory as part of the next batch.
+
+        Args:
+            messages: A list of message dictionaries.
+            **kwargs: The same parameters as `AsyncMemoryClient.add`.
+
+        Returns:
+            The API response for this call.
+
+        Raises:
+            RuntimeError: If the client has been closed.
+        """
+        if self._closed:
+            raise RuntimeError("AsyncBatchingMemoryClient is closed")
+        if self._worker is None:
+            self._capacity = asyncio.Semaphore(self.max_pending)
+            self._changed = asyncio.Event()
+            self._worker = asyncio.ensure_future(self._run())
+
+        idempotency_key = kwargs.pop("idempotency_key", None) or str(uuid.uuid4())
+        await self.client._ensure_validated()
+        payload = self.client._prepare_add_payload(messages, kwargs)
+
+        await self._capacity.acquire()
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(self._release)
+        self._buffer.append((payload, idempotency_key, future))
+        self._in_flight.add(future)
+        self._changed.set()
+        return await asyncio.shield(future)
+
+    async def flush(self) -> None:
+        """Send buffered adds now and wait for every outstanding add to finish."""
+        if not self._in_flight:
+            return
+        self._flush_requested = True
+        self._changed.set()
+        await asyncio.wait(list(self._in_flight))
+
+    async def aclose(self) -> None:
+        """Flush buffered adds and stop the background flusher, closing the client if it was created here."""
+        if self._closed:
+            return
+        await self.flush()
+        self._closed = True
+        if self._worker is not None:
+            self._changed.set()
+            await self._worker
+            if self._tasks:
+                await asyncio.wait(self._tasks)
+        if self._owns_client:
+            await self.client.__aexit__(None, None, None)
+
+    def _release(self, future: asyncio.Future) -> None:
+        self._in_flight.discard(future)
+        self._capacity.release()
+
+    async def _run(self) -> None:
+        while True:
+            while not self._buffer:
+                if self._closed:
+                    return
+                self._changed.clear()
+                await self._changed.wait()
+
+            deadline = time.monotonic() + self.max_delay
+            while len(self._buffer) < self.max_batch_size and not (self._flush_requested or self._closed):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._changed.clear()
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            batch = [self._buffer.popleft() for _ in range(min(self.max_batch_size, len(self._buffer)))]
+            if not self._buffer:
+                self._flush_requested = False
+            task = asyncio.ensure_future(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch) -> None:
+        if self.batch_endpoint:
+            try:
+                data = await self._post(self.batch_endpoint, {"items": [item[0] for item in batch]}, str(uuid.uuid4()))
+                results = _split_batch_response(data, len(batch))
+            except Exception as e:
+                logger.error(f"Batch add of {len(batch)} memories failed: {e}")
+                results = [e] * len(batch)
+        else:
+            results = await asyncio.gather(
+                *(self._post("/v1/memories/", payload, key) for payload, key, _ in batch), return_exceptions=True
+            )
+
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def _post(self, path: str, payload: Dict[str, Any], idempotency_key: str) -> Any:
+        try:
+            response = await self.client.async_client.post(
+                path, json=payload, headers={"Idempotency-Key": idempotency_key}
+            )
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise APIError(f"API request failed: {e.response.text}")
+        except httpx.RequestError as e:
+            raise APIError(f"Request failed: {str(e)}")
+        for params in payload.get("items", [payload]):
+            self.client._invalidate_cache(params)
+        return response.json()
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+SCOPE_FIELDS = ("user_id", "agent_id", "run_id", "app_id")
+
+
+class CacheBackend(ABC):
+    """Storage for cached responses and the write generation counters used to invalidate them."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the entry stored under `key`, or None."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, entry: Dict[str, Any], ttl: float) -> None:
+        """Store `entry` under `key` for `ttl` seconds."""
+        pass
+
+    @abstractmethod
+    def get_counters(self, keys: List[str]) -> List[int]:
+        """Return the current value of each counter, 0 for counters never incremented."""
+        pass
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        """Increment a counter and return its new value."""
+        pass
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Thread-safe, size-bounded LRU cache local to the process."""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            entry, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: Dict[str, Any], ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (entry, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_counters(self, keys: List[str]) -> List[int]:
+        with self._lock:
+            return [self._counters.get(key, 0) for key in keys]
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache shared between processes through Redis."""
+
+    def __init__(self, url: str = "redis://localhost:6379/0", client=None, prefix: str = "mem0:cache:"):
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise ImportError("The 'redis' library is required. Please install it using 'pip install redis'.")
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, entry: Dict[str, Any], ttl: float) -> None:
+        self.client.set(self.prefix + key, json.dumps(entry), px=max(1, int(ttl * 1000)))
+
+    def get_counters(self, keys: List[str]) -> List[int]:
+        values = self.client.mget([self.prefix + key for key in keys])
+        return [int(value) if value is not None else 0 for value in values]
+
+    def incr(self, key: str) -> int:
+        return self.client.incr(self.prefix + key)
+
+
+def get_scope(params: Optional[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """Collect the (field, value) entity pairs a request is scoped to, including those inside v2 `filters`."""
+    scope = set()
+
+    def collect(node):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key in SCOPE_FIELDS and isinstance(value, (str, int)):
+                    scope.add((key, str(value)))
+                else:
+                    collect(value)
+        elif isinstance(node, list):
+            for value in node:
+                collect(value)
+
+    collect(params or {})
+    return sorted(scope)
+
+
+class ResponseCache:
+    """
+    Read-through cache for client reads, keyed by endpoint and normalised request parameters.
+
+    Every key embeds the write generation of each entity (user/agent/run/app) the read is scoped to,
+    plus a global generation. A local write bumps the generations of the entities it touches, so
+    every cached read for those entities is invalidated at once without scanning the cache. Writes
+    that cannot be attributed to an entity (update or delete by memory ID, reset) bump the global
+    generation.
+
+    Reads that aren't scoped to an entity, such as `get` by memory ID, can't tell which
+    entity's writes affect them (an add may update or delete any memory of its user). They embed an
+    extra generation that every entity-scoped write bumps as well.
+
+    Entries are fresh for `ttl` seconds. Entries that came with an ETag are kept for
+    `revalidate_ttl` seconds and, once stale, revalidated with `If-None-Match`.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl: float = 60.0,
+        revalidate_ttl: Optional[float] = None,
+        max_size: int = 1024,
+    ):
+        self.backend = backend or InMemoryCacheBackend(max_size=max_size)
+        self.ttl = ttl
+        self.revalidate_ttl = revalidate_ttl if revalidate_ttl is not None else ttl * 10
+
+    def key(self, namespace: str, method: str, url: str, params: Optional[Dict[str, Any]]) -> str:
+        scope = get_scope(params)
+        counters = [f"gen:{namespace}:*"] + [f"gen:{namespace}:{field}:{value}" for field, value in scope]
+        if not scope:
+            counters.append(f"gen:{namespace}:unscoped")
+        generations = self.backend.get_counters(counters)
+        raw = json.dumps([method, url, params, generations], sort_keys=True, default=str)
+        return f"{namespace}:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+    def get(self, key: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Return the cached entry for `key` and whether it is still fresh."""
+        entry = self.backend.get(key)
+        if entry is None:
+            return None, False
+        return entry, entry["expires_at"] > time.time()
+
+    def store(self, key: str, value: Any, etag: Optional[str] = None) -> None:
+        entry = {"value": value, "etag": etag, "expires_at": time.time() + self.ttl}
+        self.backend.set(key, entry, self.revalidate_ttl if etag else self.ttl)
+
+    def invalidate(self, namespace: str, params: Optional[Dict[str, Any]] = None) -> None:
+        """Invalidate cached reads for the entities in `params`, or every cached read if there are none."""
+        scope = get_scope(params)
+        if not scope:
+            self.backend.incr(f"gen:{namespace}:*")
+            return
+        for field, value in scope:
+            self.backend.incr(f"gen:{namespace}:{field}:{value}")
+        self.backend.incr(f"gen:{namespace}:unscoped")
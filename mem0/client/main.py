@@ -1,13 +1,19 @@
+import copy
 import hashlib
 import logging
 import os
+import threading
+import uuid
 import warnings
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
 import httpx
-import requests
 
+from mem0.client.cache import ResponseCache
 from mem0.client.project import AsyncProject, Project
+from mem0.client.resilience import AsyncRetryTransport, RetryConfig, RetryTransport, get_rate_limiter
+from mem0.client.streaming import JsonItemParser
+from mem0.client.transport import TransportConfig, create_async_transport, get_shared_transport
 from mem0.client.utils import api_error_handler
 from mem0.memory.setup import get_user_id, setup_config
 from mem0.memory.telemetry import capture_client_event
@@ -19,6 +25,25 @@ warnings.filterwarnings("default", category=DeprecationWarning)
 # Setup user config
 setup_config()
 
+# Successful /v1/ping/ responses, keyed by (host, api_key, org_id, project_id) and shared by every
+# client in the process so that only the first client for a given key pays for the round trip.
+_validated_keys: Dict[Tuple[str, str, Optional[str], Optional[str]], Dict[str, Any]] = {}
+_validated_keys_lock = threading.Lock()
+
+
+def _parse_validation_error(response) -> ValueError:
+    try:
+        error_message = response.json().get("detail", response.text)
+    except Exception:
+        error_message = response.text
+    return ValueError(f"Error: {error_message}")
+
+
+def _install_validation_hook(client, hook) -> None:
+    """Add `hook` to the request hooks of `client`, replacing the one of an earlier Mem0 client that used it."""
+    hooks = client.event_hooks["request"]
+    hooks[:] = [h for h in hooks if getattr(h, "__func__", None) is not hook.__func__] + [hook]
+
 
 class MemoryClient:
     """Client for interacting with the Mem0 API.
@@ -42,9 +67,16 @@ class MemoryClient:
         org_id: Optional[str] = None,
         project_id: Optional[str] = None,
         client: Optional[httpx.Client] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+        transport_config: Optional[TransportConfig] = None,
+        retry_config: Optional[RetryConfig] = None,
+        cache: Optional[ResponseCache] = None,
     ):
         """Initialize the MemoryClient.
 
+        The API key is validated lazily, before the first request is sent,
+        and the result is cached for the rest of the process.
+
         Args:
             api_key: The API key for authenticating with the Mem0 API. If not
                      provided, it will attempt to use the MEM0_API_KEY
@@ -56,6 +88,15 @@ class MemoryClient:
             client: A custom httpx.Client instance. If provided, it will be
                     used instead of creating a new one. Note that base_url and
                     headers will be set/overridden as needed.
+            transport: A custom httpx transport. Defaults to a process-wide
+                       transport shared by all clients with the same
+                       `transport_config`.
+            transport_config: Connection pool, HTTP/2 and timeout settings.
+            retry_config: Retry, rate limiting and search hedging settings.
+                          Applied to requests sent through the client created
+                          here; ignored when `client` is provided.
+            cache: Optional read-through cache for `search` and `get`,
+                   invalidated by writes made through this client.
 
         Raises:
             ValueError: If no API key is provided or found in the environment.
@@ -65,9 +106,15 @@ class MemoryClient:
         self.org_id = org_id
         self.project_id = project_id
         self.user_id = get_user_id()
+        self.user_email = None
+        self.transport_config = transport_config or TransportConfig()
+        self.retry_config = retry_config or RetryConfig()
+        self.cache = cache
 
         if not self.api_key:
             raise ValueError("Mem0 API Key not provided. Please provide an API Key.")
+        if bool(self.org_id) != bool(self.project_id):
+            raise ValueError("Please provide both org_id and project_id")
 
         # Create MD5 hash of API key for user_id
         self.user_id = hashlib.md5(self.api_key.encode()).hexdigest()
@@ -89,42 +136,69 @@ class MemoryClient:
                     "Authorization": f"Token {self.api_key}",
                     "Mem0-User-ID": self.user_id,
                 },
-                timeout=300,
+                timeout=self.transport_config.timeout,
+                # Both the process-wide transport and one passed in by the caller may serve other clients
+                transport=RetryTransport(
+                    transport or get_shared_transport(self.transport_config),
+                    self.retry_config,
+                    get_rate_limiter((self.host, self.user_id), self.retry_config),
+                    owns_transport=False,
+                ),
             )
-        self.user_email = self._validate_api_key()
-
-        # Initialize project manager
-        self.project = Project(
-            client=self.client,
-            org_id=self.org_id,
-            project_id=self.project_id,
-            user_email=self.user_email,
-        )
+
+        self._validation_key = (self.host, self.api_key, self.org_id, self.project_id)
+        self._validation_lock = threading.Lock()
+        self._validated = False
+        self._project = None
+        _install_validation_hook(self.client, self._validate_before_request)
 
         capture_client_event("client.init", self, {"sync_type": "sync"})
 
-    def _validate_api_key(self):
+    @property
+    def project(self) -> Project:
+        """Project manager, created once the API key has been validated."""
+        if self._project is None:
+            self._ensure_validated()
+            self._project = Project(
+                client=self.client,
+                org_id=self.org_id,
+                project_id=self.project_id,
+                user_email=self.user_email,
+            )
+        return self._project
+
+    def _validate_before_request(self, request: httpx.Request) -> None:
+        if not request.url.path.endswith("/v1/ping/"):
+            self._ensure_validated()
+
+    def _ensure_validated(self) -> None:
+        """Validate the API key unless this client or another one in the process already has."""
+        if self._validated:
+            return
+        with self._validation_lock:
+            if self._validated:
+                return
+            data = _validated_keys.get(self._validation_key) or self._validate_api_key()
+            self._cache_validation(data)
+
+    def _cache_validation(self, data: Dict[str, Any]) -> None:
+        with _validated_keys_lock:
+            _validated_keys[self._validation_key] = data
+        if data.get("org_id") and data.get("project_id"):
+            self.org_id = data.get("org_id")
+            self.project_id = data.get("project_id")
+        self.user_email = data.get("user_email")
+        self._validated = True
+
+    def _ping_params(self) -> Dict[str, Any]:
+        return {"org_id": self.org_id, "project_id": self.project_id} if self.org_id else {}
+
+    def _validate_api_key(self) -> Dict[str, Any]:
         """Validate the API key by making a test request."""
-        try:
-            params = self._prepare_params()
-            response = self.client.get("/v1/ping/", params=params)
-            data = response.json()
-
-            response.raise_for_status()
-
-            if data.get("org_id") and data.get("project_id"):
-                self.org_id = data.get("org_id")
-                self.project_id = data.get("project_id")
-
-            return data.get("user_email")
-
-        except httpx.HTTPStatusError as e:
-            try:
-                error_data = e.response.json()
-                error_message = error_data.get("detail", str(e))
-            except Exception:
-                error_message = str(e)
-            raise ValueError(f"Error: {error_message}")
+        response = self.client.get("/v1/ping/", params=self._ping_params())
+        if response.is_error:
+            raise _parse_validation_error(response)
+        return response.json()
 
     @api_error_handler
     def add(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
@@ -133,7 +207,8 @@ class MemoryClient:
         Args:
             messages: A list of message dictionaries.
             **kwargs: Additional parameters such as user_id, agent_id, app_id,
-                      metadata, filters.
+                      metadata, filters. Pass `idempotency_key` to make
+                      retries of the same logical add safe across calls.
 
         Returns:
             A dictionary containing the API response.
@@ -141,25 +216,14 @@ class MemoryClient:
         Raises:
             APIError: If the API request fails.
         """
-        kwargs = self._prepare_params(kwargs)
-        if kwargs.get("output_format") != "v1.1":
-            kwargs["output_format"] = "v1.1"
-            warnings.warn(
-                (
-                    "output_format='v1.0' is deprecated therefore setting it to "
-                    "'v1.1' by default. Check out the docs for more information: "
-                    "https://docs.mem0.ai/platform/quickstart#4-1-create-memories"
-                ),
-                DeprecationWarning,
-                stacklevel=2,
-            )
-        kwargs["version"] = "v2"
-        payload = self._prepare_payload(messages, kwargs)
-        response = self.client.post("/v1/memories/", json=payload)
+        # Retries of this request reuse the key, so the server stores the memory only once
+        idempotency_key = kwargs.pop("idempotency_key", None) or str(uuid.uuid4())
+        payload = self._prepare_add_payload(messages, kwargs)
+        response = self.client.post("/v1/memories/", json=payload, headers={"Idempotency-Key": idempotency_key})
         response.raise_for_status()
-        if "metadata" in kwargs:
-            del kwargs["metadata"]
-        capture_client_event("client.add", self, {"keys": list(kwargs.keys()), "sync_type": "sync"})
+        self._invalidate_cache(payload)
+        keys = [key for key in payload if key not in ("messages", "metadata")]
+        capture_client_event("client.add", self, {"keys": keys, "sync_type": "sync"})
         return response.json()
 
     @api_error_handler
@@ -176,10 +240,9 @@ class MemoryClient:
             APIError: If the API request fails.
         """
         params = self._prepare_params()
-        response = self.client.get(f"/v1/memories/{memory_id}/", params=params)
-        response.raise_for_status()
+        result = self._cached_request("GET", f"/v1/memories/{memory_id}/", params=params)
         capture_client_event("client.get", self, {"memory_id": memory_id, "sync_type": "sync"})
-        return response.json()
+        return result
 
     @api_error_handler
     def get_all(self, version: str = "v1", **kwargs) -> List[Dict[str, Any]]:
@@ -241,8 +304,7 @@ class MemoryClient:
         payload = {"query": query}
         params = self._prepare_params(kwargs)
         payload.update(params)
-        response = self.client.post(f"/{version}/memories/search/", json=payload)
-        response.raise_for_status()
+        result = self._cached_request("POST", f"/{version}/memories/search/", json=payload)
         if "metadata" in kwargs:
             del kwargs["metadata"]
         capture_client_event(
@@ -254,7 +316,7 @@ class MemoryClient:
                 "sync_type": "sync",
             },
         )
-        return response.json()
+        return result
 
     @api_error_handler
     def update(
@@ -285,6 +347,7 @@ class MemoryClient:
         params = self._prepare_params()
         response = self.client.put(f"/v1/memories/{memory_id}/", json=payload, params=params)
         response.raise_for_status()
+        self._invalidate_cache()
         return response.json()
 
     @api_error_handler
@@ -303,6 +366,7 @@ class MemoryClient:
         params = self._prepare_params()
         response = self.client.delete(f"/v1/memories/{memory_id}/", params=params)
         response.raise_for_status()
+        self._invalidate_cache()
         capture_client_event("client.delete", self, {"memory_id": memory_id, "sync_type": "sync"})
         return response.json()
 
@@ -323,6 +387,7 @@ class MemoryClient:
         params = self._prepare_params(kwargs)
         response = self.client.delete("/v1/memories/", params=params)
         response.raise_for_status()
+        self._invalidate_cache(params)
         capture_client_event(
             "client.delete_all",
             self,
@@ -349,6 +414,90 @@ class MemoryClient:
         capture_client_event("client.history", self, {"memory_id": memory_id, "sync_type": "sync"})
         return response.json()
 
+    @api_error_handler
+    def iter_all(self, version: str = "v1", page_size: int = 100, **kwargs) -> Iterator[Dict[str, Any]]:
+        """Iterate over all memories, fetching pages lazily.
+
+        Each page is parsed incrementally as it arrives, so memory use stays
+        bounded regardless of how many memories match.
+
+        Args:
+            version: The API version to use for the get_all endpoint.
+            page_size: Number of memories requested per page.
+            **kwargs: Optional parameters for filtering (user_id, agent_id,
+                      app_id, filters).
+
+        Yields:
+            Memory dictionaries, one at a time.
+
+        Raises:
+            APIError: If the API request fails.
+        """
+        capture_client_event(
+            "client.iter_all",
+            self,
+            {"api_version": version, "keys": list(kwargs.keys()), "sync_type": "sync"},
+        )
+        page = 1
+        while True:
+            request = self._build_get_all_request(version, page, page_size, kwargs)
+            parser = JsonItemParser()
+            count = 0
+            for item in self._stream_items(request, parser):
+                count += 1
+                yield item
+            if not parser.paginated or count < page_size:
+                return
+            page += 1
+
+    @api_error_handler
+    def iter_search(self, query: str, version: str = "v1", **kwargs) -> Iterator[Dict[str, Any]]:
+        """Search memories, yielding results as the response is parsed.
+
+        Args:
+            query: The search query string.
+            version: The API version to use for the search endpoint.
+            **kwargs: Additional parameters such as user_id, agent_id, app_id,
+                      top_k, filters.
+
+        Yields:
+            Search result dictionaries, one at a time.
+
+        Raises:
+            APIError: If the API request fails.
+        """
+        payload = {"query": query, **self._prepare_params(kwargs)}
+        request = self.client.build_request("POST", f"/{version}/memories/search/", json=payload)
+        yield from self._stream_items(request, JsonItemParser())
+
+    @api_error_handler
+    def iter_history(self, memory_id: str) -> Iterator[Dict[str, Any]]:
+        """Iterate over the history of a specific memory as the response is parsed.
+
+        Args:
+            memory_id: The ID of the memory to retrieve history for.
+
+        Yields:
+            History entries, one at a time.
+
+        Raises:
+            APIError: If the API request fails.
+        """
+        request = self.client.build_request("GET", f"/v1/memories/{memory_id}/history/", params=self._prepare_params())
+        yield from self._stream_items(request, JsonItemParser())
+
+    def _stream_items(self, request: httpx.Request, parser: JsonItemParser) -> Iterator[Any]:
+        response = self.client.send(request, stream=True)
+        try:
+            if response.is_error:
+                response.read()
+                response.raise_for_status()
+            for chunk in response.iter_bytes():
+                yield from parser.feed(chunk)
+            yield from parser.close()
+        finally:
+            response.close()
+
     @api_error_handler
     def users(self) -> Dict[str, Any]:
         """Get all users, agents, and sessions for which memories exist."""
@@ -405,6 +554,7 @@ class MemoryClient:
             response = self.client.delete(f"/v2/entities/{entity['type']}/{entity['name']}/", params=params)
             response.raise_for_status()
 
+        self._invalidate_cache()
         capture_client_event(
             "client.delete_users",
             self,
@@ -460,6 +610,7 @@ class MemoryClient:
         """
         response = self.client.put("/v1/batch/", json={"memories": memories})
         response.raise_for_status()
+        self._invalidate_cache()
 
         capture_client_event("client.batch_update", self, {"sync_type": "sync"})
         return response.json()
@@ -481,6 +632,7 @@ class MemoryClient:
         """
         response = self.client.request("DELETE", "/v1/batch/", json={"memories": memories})
         response.raise_for_status()
+        self._invalidate_cache()
 
         capture_client_event("client.batch_delete", self, {"sync_type": "sync"})
         return response.json()
@@ -531,6 +683,31 @@ class MemoryClient:
         )
         return response.json()
 
+    @api_error_handler
+    def download_memory_export(self, path: str, **kwargs) -> str:
+        """Stream a memory export to a file without loading it into memory.
+
+        Args:
+            path: File to write the export to.
+            **kwargs: Filters like user_id to get specific export
+
+        Returns:
+            The path the export was written to.
+        """
+        with self.client.stream("POST", "/v1/exports/get/", json=self._prepare_params(kwargs)) as response:
+            if response.is_error:
+                response.read()
+                response.raise_for_status()
+            with open(path, "wb") as f:
+                for chunk in response.iter_bytes():
+                    f.write(chunk)
+        capture_client_event(
+            "client.download_memory_export",
+            self,
+            {"keys": list(kwargs.keys()), "sync_type": "sync"},
+        )
+        return path
+
     @api_error_handler
     def get_summary(self, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Get the summary of a memory export.
@@ -564,6 +741,7 @@ class MemoryClient:
         logger.warning(
             "get_project() method is going to be deprecated in version v1.0 of the package. Please use the client.project.get() method instead."
         )
+        self._ensure_validated()
         if not (self.org_id and self.project_id):
             raise ValueError("org_id and project_id must be set to access instructions or categories")
 
@@ -608,6 +786,7 @@ class MemoryClient:
         logger.warning(
             "update_project() method is going to be deprecated in version v1.0 of the package. Please use the client.project.update() method instead."
         )
+        self._ensure_validated()
         if not (self.org_id and self.project_id):
             raise ValueError("org_id and project_id must be set to update instructions or categories")
 
@@ -779,6 +958,88 @@ class MemoryClient:
         capture_client_event("client.feedback", self, data, {"sync_type": "sync"})
         return response.json()
 
+    def _cached_request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """Send a read request through the response cache, if one is configured."""
+        if self.cache is None:
+            response = self.client.request(method, url, params=params, json=json)
+            response.raise_for_status()
+            return response.json()
+
+        self._ensure_validated()
+        key = self._cache_key(method, url, params, json)
+        entry, fresh = self.cache.get(key)
+        if fresh:
+            return copy.deepcopy(entry["value"])
+
+        headers = {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else None
+        response = self.client.request(method, url, params=params, json=json, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            self.cache.store(key, entry["value"], entry["etag"])
+            return copy.deepcopy(entry["value"])
+        response.raise_for_status()
+        result = response.json()
+        self.cache.store(key, result, response.headers.get("etag"))
+        return copy.deepcopy(result)
+
+    def _cache_key(
+        self, method: str, url: str, params: Optional[Dict[str, Any]], json: Optional[Dict[str, Any]]
+    ) -> str:
+        # org_id/project_id may only be learned from the first request, so they are part of the
+        # namespace rather than of the request parameters.
+        request = {
+            name: {k: v for k, v in value.items() if k not in ("org_id", "project_id")}
+            for name, value in (("params", params), ("json", json))
+            if value
+        }
+        return self.cache.key(self._cache_namespace(), method, url, request)
+
+    def _cache_namespace(self) -> str:
+        return f"{self.user_id}:{self.org_id}:{self.project_id}"
+
+    def _invalidate_cache(self, params: Optional[Dict[str, Any]] = None) -> None:
+        """Invalidate cached reads for the entities in `params`, or all cached reads if there are none."""
+        if self.cache is not None:
+            self.cache.invalidate(self._cache_namespace(), params)
+
+    def _prepare_add_payload(self, messages: List[Dict[str, str]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Prepare the payload for an add request.
+
+        Args:
+            messages: The messages to add.
+            kwargs: Additional parameters such as user_id, agent_id, metadata.
+
+        Returns:
+            A dictionary containing the prepared payload.
+        """
+        kwargs = self._prepare_params(kwargs)
+        if kwargs.get("output_format") != "v1.1":
+            kwargs["output_format"] = "v1.1"
+            warnings.warn(
+                (
+                    "output_format='v1.0' is deprecated therefore setting it to "
+                    "'v1.1' by default. Check out the docs for more information: "
+                    "https://docs.mem0.ai/platform/quickstart#4-1-create-memories"
+                ),
+                DeprecationWarning,
+                stacklevel=3,
+            )
+        kwargs["version"] = "v2"
+        return self._prepare_payload(messages, kwargs)
+
+    def _build_get_all_request(self, version: str, page: int, page_size: int, kwargs: Dict[str, Any]) -> httpx.Request:
+        """Build the get_all request for one page of results."""
+        params = self._prepare_params(dict(kwargs))
+        page_params = {"page": page, "page_size": page_size}
+        if version == "v2":
+            return self.client.build_request("POST", "/v2/memories/", json=params, params=page_params)
+        return self.client.build_request("GET", f"/{version}/memories/", params={**params, **page_params})
+
     def _prepare_payload(self, messages: List[Dict[str, str]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare the payload for API requests.
 
@@ -807,7 +1068,8 @@ class MemoryClient:
         Raises:
             ValueError: If either org_id or project_id is provided but not both.
         """
-
+        # The org and project IDs may only be known once the API key has been validated
+        self._ensure_validated()
         if kwargs is None:
             kwargs = {}
 
@@ -821,6 +1083,25 @@ class MemoryClient:
         return {k: v for k, v in kwargs.items() if v is not None}
 
 
+class _PendingAsyncProject:
+    """Stands in for `AsyncMemoryClient.project` until the API key has been validated on the event loop."""
+
+    def __init__(self, memory_client: "AsyncMemoryClient"):
+        self._memory_client = memory_client
+
+    def __getattr__(self, name: str):
+        if name.startswith("_") or not callable(getattr(AsyncProject, name, None)):
+            raise AttributeError(
+                f"AsyncProject.{name} is available once the API key has been validated; await a client method first"
+            )
+
+        async def call(*args, **kwargs):
+            await self._memory_client._ensure_validated()
+            return await getattr(self._memory_client.project, name)(*args, **kwargs)
+
+        return call
+
+
 class AsyncMemoryClient:
     """Asynchronous client for interacting with the Mem0 API.
 
@@ -835,9 +1116,16 @@ class AsyncMemoryClient:
         org_id: Optional[str] = None,
         project_id: Optional[str] = None,
         client: Optional[httpx.AsyncClient] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        transport_config: Optional[TransportConfig] = None,
+        retry_config: Optional[RetryConfig] = None,
+        cache: Optional[ResponseCache] = None,
     ):
         """Initialize the AsyncMemoryClient.
 
+        The API key is validated lazily, before the first request is sent,
+        and the result is cached for the rest of the process.
+
         Args:
             api_key: The API key for authenticating with the Mem0 API. If not
                      provided, it will attempt to use the MEM0_API_KEY
@@ -849,6 +1137,14 @@ class AsyncMemoryClient:
             client: A custom httpx.AsyncClient instance. If provided, it will
                     be used instead of creating a new one. Note that base_url
                     and headers will be set/overridden as needed.
+            transport: A custom httpx async transport. Pass the same transport
+                       to several clients to share one connection pool.
+            transport_config: Connection pool, HTTP/2 and timeout settings.
+            retry_config: Retry, rate limiting and search hedging settings.
+                          Applied to requests sent through the client created
+                          here; ignored when `client` is provided.
+            cache: Optional read-through cache for `search` and `get`,
+                   invalidated by writes made through this client.
 
         Raises:
             ValueError: If no API key is provided or found in the environment.
@@ -858,9 +1154,15 @@ class AsyncMemoryClient:
         self.org_id = org_id
         self.project_id = project_id
         self.user_id = get_user_id()
+        self.user_email = None
+        self.transport_config = transport_config or TransportConfig()
+        self.retry_config = retry_config or RetryConfig()
+        self.cache = cache
 
         if not self.api_key:
             raise ValueError("Mem0 API Key not provided. Please provide an API Key.")
+        if bool(self.org_id) != bool(self.project_id):
+            raise ValueError("Please provide both org_id and project_id")
 
         # Create MD5 hash of API key for user_id
         self.user_id = hashlib.md5(self.api_key.encode()).hexdigest()
@@ -882,50 +1184,155 @@ class AsyncMemoryClient:
                     "Authorization": f"Token {self.api_key}",
                     "Mem0-User-ID": self.user_id,
                 },
-                timeout=300,
+                timeout=self.transport_config.timeout,
+                # A transport passed in by the caller may be shared with other clients
+                transport=AsyncRetryTransport(
+                    transport or create_async_transport(self.transport_config),
+                    self.retry_config,
+                    get_rate_limiter((self.host, self.user_id), self.retry_config),
+                    owns_transport=transport is None,
+                ),
             )
 
-        self.user_email = self._validate_api_key()
-
-        # Initialize project manager
-        self.project = AsyncProject(
-            client=self.async_client,
-            org_id=self.org_id,
-            project_id=self.project_id,
-            user_email=self.user_email,
-        )
+        self._validation_key = (self.host, self.api_key, self.org_id, self.project_id)
+        self._validated = False
+        self._project = None
+        _install_validation_hook(self.async_client, self._validate_before_request)
 
         capture_client_event("client.init", self, {"sync_type": "async"})
 
-    def _validate_api_key(self):
-        """Validate the API key by making a test request."""
-        try:
-            params = self._prepare_params()
-            response = requests.get(
-                f"{self.host}/v1/ping/",
-                headers={
-                    "Authorization": f"Token {self.api_key}",
-                    "Mem0-User-ID": self.user_id,
-                },
-                params=params,
+    @property
+    def project(self) -> AsyncProject:
+        """Project manager. Until the API key has been validated, its methods validate it first."""
+        if self._project is None:
+            if not self._validated:
+                data = _validated_keys.get(self._validation_key)
+                if data is None:
+                    # Validating needs a request, which can't be awaited from a property
+                    return _PendingAsyncProject(self)
+                self._cache_validation(data)
+            self._project = AsyncProject(
+                client=self.async_client,
+                org_id=self.org_id,
+                project_id=self.project_id,
+                user_email=self.user_email,
             )
-            data = response.json()
+        return self._project
+
+    async def _validate_before_request(self, request: httpx.Request) -> None:
+        if not request.url.path.endswith("/v1/ping/"):
+            await self._ensure_validated()
+
+    async def _ensure_validated(self) -> None:
+        """Validate the API key unless this client or another one in the process already has."""
+        if self._validated:
+            return
+        data = _validated_keys.get(self._validation_key)
+        if data is None:
+            # Concurrent first requests may each send a ping; the responses are identical.
+            data = await self._avalidate_api_key()
+        self._cache_validation(data)
+
+    def _cache_validation(self, data: Dict[str, Any]) -> None:
+        with _validated_keys_lock:
+            _validated_keys[self._validation_key] = data
+        if data.get("org_id") and data.get("project_id"):
+            self.org_id = data.get("org_id")
+            self.project_id = data.get("project_id")
+        self.user_email = data.get("user_email")
+        self._validated = True
+
+    def _ping_params(self) -> Dict[str, Any]:
+        return {"org_id": self.org_id, "project_id": self.project_id} if self.org_id else {}
+
+    async def _avalidate_api_key(self) -> Dict[str, Any]:
+        """Validate the API key by making a test request."""
+        response = await self.async_client.get("/v1/ping/", params=self._ping_params())
+        if response.is_error:
+            raise _parse_validation_error(response)
+        return response.json()
 
+    async def _cached_request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """Send a read request through the response cache, if one is configured."""
+        if self.cache is None:
+            response = await self.async_client.request(method, url, params=params, json=json)
             response.raise_for_status()
+            return response.json()
+
+        await self._ensure_validated()
+        key = self._cache_key(method, url, params, json)
+        entry, fresh = self.cache.get(key)
+        if fresh:
+            return copy.deepcopy(entry["value"])
+
+        headers = {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else None
+        response = await self.async_client.request(method, url, params=params, json=json, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            self.cache.store(key, entry["value"], entry["etag"])
+            return copy.deepcopy(entry["value"])
+        response.raise_for_status()
+        result = response.json()
+        self.cache.store(key, result, response.headers.get("etag"))
+        return copy.deepcopy(result)
+
+    def _cache_key(
+        self, method: str, url: str, params: Optional[Dict[str, Any]], json: Optional[Dict[str, Any]]
+    ) -> str:
+        # org_id/project_id may only be learned from the first request, so they are part of the
+        # namespace rather than of the request parameters.
+        request = {
+            name: {k: v for k, v in value.items() if k not in ("org_id", "project_id")}
+            for name, value in (("params", params), ("json", json))
+            if value
+        }
+        return self.cache.key(self._cache_namespace(), method, url, request)
 
-            if data.get("org_id") and data.get("project_id"):
-                self.org_id = data.get("org_id")
-                self.project_id = data.get("project_id")
+    def _cache_namespace(self) -> str:
+        return f"{self.user_id}:{self.org_id}:{self.project_id}"
 
-            return data.get("user_email")
+    def _invalidate_cache(self, params: Optional[Dict[str, Any]] = None) -> None:
+        """Invalidate cached reads for the entities in `params`, or all cached reads if there are none."""
+        if self.cache is not None:
+            self.cache.invalidate(self._cache_namespace(), params)
 
-        except requests.exceptions.HTTPError as e:
-            try:
-                error_data = e.response.json()
-                error_message = error_data.get("detail", str(e))
-            except Exception:
-                error_message = str(e)
-            raise ValueError(f"Error: {error_message}")
+    def _prepare_add_payload(self, messages: List[Dict[str, str]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Prepare the payload for an add request.
+
+        Args:
+            messages: The messages to add.
+            kwargs: Additional parameters such as user_id, agent_id, metadata.
+
+        Returns:
+            A dictionary containing the prepared payload.
+        """
+        kwargs = self._prepare_params(kwargs)
+        if kwargs.get("output_format") != "v1.1":
+            kwargs["output_format"] = "v1.1"
+            warnings.warn(
+                (
+                    "output_format='v1.0' is deprecated therefore setting it to "
+                    "'v1.1' by default. Check out the docs for more information: "
+                    "https://docs.mem0.ai/platform/quickstart#4-1-create-memories"
+                ),
+                DeprecationWarning,
+                stacklevel=3,
+            )
+        kwargs["version"] = "v2"
+        return self._prepare_payload(messages, kwargs)
+
+    def _build_get_all_request(self, version: str, page: int, page_size: int, kwargs: Dict[str, Any]) -> httpx.Request:
+        """Build the get_all request for one page of results."""
+        params = self._prepare_params(dict(kwargs))
+        page_params = {"page": page, "page_size": page_size}
+        if version == "v2":
+            return self.async_client.build_request("POST", "/v2/memories/", json=params, params=page_params)
+        return self.async_client.build_request("GET", f"/{version}/memories/", params={**params, **page_params})
 
     def _prepare_payload(self, messages: List[Dict[str, str]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare the payload for API requests.
@@ -976,37 +1383,30 @@ class AsyncMemoryClient:
 
     @api_error_handler
     async def add(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
-        kwargs = self._prepare_params(kwargs)
-        if kwargs.get("output_format") != "v1.1":
-            kwargs["output_format"] = "v1.1"
-            warnings.warn(
-                (
-                    "output_format='v1.0' is deprecated therefore setting it to "
-                    "'v1.1' by default. Check out the docs for more information: "
-                    "https://docs.mem0.ai/platform/quickstart#4-1-create-memories"
-                ),
-                DeprecationWarning,
-                stacklevel=2,
-            )
-        kwargs["version"] = "v2"
-        payload = self._prepare_payload(messages, kwargs)
-        response = await self.async_client.post("/v1/memories/", json=payload)
+        # Retries of this request reuse the key, so the server stores the memory only once
+        idempotency_key = kwargs.pop("idempotency_key", None) or str(uuid.uuid4())
+        await self._ensure_validated()
+        payload = self._prepare_add_payload(messages, kwargs)
+        response = await self.async_client.post(
+            "/v1/memories/", json=payload, headers={"Idempotency-Key": idempotency_key}
+        )
         response.raise_for_status()
-        if "metadata" in kwargs:
-            del kwargs["metadata"]
-        capture_client_event("client.add", self, {"keys": list(kwargs.keys()), "sync_type": "async"})
+        self._invalidate_cache(payload)
+        keys = [key for key in payload if key not in ("messages", "metadata")]
+        capture_client_event("client.add", self, {"keys": keys, "sync_type": "async"})
         return response.json()
 
     @api_error_handler
     async def get(self, memory_id: str) -> Dict[str, Any]:
+        await self._ensure_validated()
         params = self._prepare_params()
-        response = await self.async_client.get(f"/v1/memories/{memory_id}/", params=params)
-        response.raise_for_status()
+        result = await self._cached_request("GET", f"/v1/memories/{memory_id}/", params=params)
         capture_client_event("client.get", self, {"memory_id": memory_id, "sync_type": "async"})
-        return response.json()
+        return result
 
     @api_error_handler
     async def get_all(self, version: str = "v1", **kwargs) -> List[Dict[str, Any]]:
+        await self._ensure_validated()
         params = self._prepare_params(kwargs)
         if version == "v1":
             response = await self.async_client.get(f"/{version}/memories/", params=params)
@@ -1036,9 +1436,9 @@ class AsyncMemoryClient:
     @api_error_handler
     async def search(self, query: str, version: str = "v1", **kwargs) -> List[Dict[str, Any]]:
         payload = {"query": query}
+        await self._ensure_validated()
         payload.update(self._prepare_params(kwargs))
-        response = await self.async_client.post(f"/{version}/memories/search/", json=payload)
-        response.raise_for_status()
+        result = await self._cached_request("POST", f"/{version}/memories/search/", json=payload)
         if "metadata" in kwargs:
             del kwargs["metadata"]
         capture_client_event(
@@ -1050,7 +1450,7 @@ class AsyncMemoryClient:
                 "sync_type": "async",
             },
         )
-        return response.json()
+        return result
 
     @api_error_handler
     async def update(
@@ -1075,9 +1475,11 @@ class AsyncMemoryClient:
             payload["metadata"] = metadata
 
         capture_client_event("client.update", self, {"memory_id": memory_id, "sync_type": "async"})
+        await self._ensure_validated()
         params = self._prepare_params()
         response = await self.async_client.put(f"/v1/memories/{memory_id}/", json=payload, params=params)
         response.raise_for_status()
+        self._invalidate_cache()
         return response.json()
 
     @api_error_handler
@@ -1093,9 +1495,11 @@ class AsyncMemoryClient:
         Raises:
             APIError: If the API request fails.
         """
+        await self._ensure_validated()
         params = self._prepare_params()
         response = await self.async_client.delete(f"/v1/memories/{memory_id}/", params=params)
         response.raise_for_status()
+        self._invalidate_cache()
         capture_client_event("client.delete", self, {"memory_id": memory_id, "sync_type": "async"})
         return response.json()
 
@@ -1112,9 +1516,11 @@ class AsyncMemoryClient:
         Raises:
             APIError: If the API request fails.
         """
+        await self._ensure_validated()
         params = self._prepare_params(kwargs)
         response = await self.async_client.delete("/v1/memories/", params=params)
         response.raise_for_status()
+        self._invalidate_cache(params)
         capture_client_event("client.delete_all", self, {"keys": list(kwargs.keys()), "sync_type": "async"})
         return response.json()
 
@@ -1131,15 +1537,110 @@ class AsyncMemoryClient:
         Raises:
             APIError: If the API request fails.
         """
+        await self._ensure_validated()
         params = self._prepare_params()
         response = await self.async_client.get(f"/v1/memories/{memory_id}/history/", params=params)
         response.raise_for_status()
         capture_client_event("client.history", self, {"memory_id": memory_id, "sync_type": "async"})
         return response.json()
 
+    @api_error_handler
+    async def aiter_all(self, version: str = "v1", page_size: int = 100, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all memories, fetching pages lazily.
+
+        Each page is parsed incrementally as it arrives, so memory use stays
+        bounded regardless of how many memories match.
+
+        Args:
+            version: The API version to use for the get_all endpoint.
+            page_size: Number of memories requested per page.
+            **kwargs: Optional parameters for filtering (user_id, agent_id,
+                      app_id, filters).
+
+        Yields:
+            Memory dictionaries, one at a time.
+
+        Raises:
+            APIError: If the API request fails.
+        """
+        capture_client_event(
+            "client.iter_all",
+            self,
+            {"api_version": version, "keys": list(kwargs.keys()), "sync_type": "async"},
+        )
+        page = 1
+        await self._ensure_validated()
+        while True:
+            request = self._build_get_all_request(version, page, page_size, kwargs)
+            parser = JsonItemParser()
+            count = 0
+            async for item in self._stream_items(request, parser):
+                count += 1
+                yield item
+            if not parser.paginated or count < page_size:
+                return
+            page += 1
+
+    @api_error_handler
+    async def aiter_search(self, query: str, version: str = "v1", **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """Search memories, yielding results as the response is parsed.
+
+        Args:
+            query: The search query string.
+            version: The API version to use for the search endpoint.
+            **kwargs: Additional parameters such as user_id, agent_id, app_id,
+                      top_k, filters.
+
+        Yields:
+            Search result dictionaries, one at a time.
+
+        Raises:
+            APIError: If the API request fails.
+        """
+        await self._ensure_validated()
+        payload = {"query": query, **self._prepare_params(kwargs)}
+        request = self.async_client.build_request("POST", f"/{version}/memories/search/", json=payload)
+        async for item in self._stream_items(request, JsonItemParser()):
+            yield item
+
+    @api_error_handler
+    async def aiter_history(self, memory_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over the history of a specific memory as the response is parsed.
+
+        Args:
+            memory_id: The ID of the memory to retrieve history for.
+
+        Yields:
+            History entries, one at a time.
+
+        Raises:
+            APIError: If the API request fails.
+        """
+        await self._ensure_validated()
+        request = self.async_client.build_request(
+            "GET", f"/v1/memories/{memory_id}/history/", params=self._prepare_params()
+        )
+        async for item in self._stream_items(request, JsonItemParser()):
+            yield item
+
+    async def _stream_items(self, request: httpx.Request, parser: JsonItemParser) -> AsyncIterator[Any]:
+        response = await self.async_client.send(request, stream=True)
+        try:
+            if response.is_error:
+                await response.aread()
+                response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                for item in parser.feed(chunk):
+                    yield item
+            for item in parser.close():
+                yield item
+        finally:
+            await response.aclose()
+
     @api_error_handler
     async def users(self) -> Dict[str, Any]:
         """Get all users, agents, and sessions for which memories exist."""
+        await self._ensure_validated()
         params = self._prepare_params()
         response = await self.async_client.get("/v1/entities/", params=params)
         response.raise_for_status()
@@ -1183,6 +1684,7 @@ class AsyncMemoryClient:
             # Filter entities based on provided IDs using list comprehension
             to_delete = [{"type": entity["type"], "name": entity["name"]} for entity in entities["results"]]
 
+        await self._ensure_validated()
         params = self._prepare_params()
 
         if not to_delete:
@@ -1193,6 +1695,7 @@ class AsyncMemoryClient:
             response = await self.async_client.delete(f"/v2/entities/{entity['type']}/{entity['name']}/", params=params)
             response.raise_for_status()
 
+        self._invalidate_cache()
         capture_client_event(
             "client.delete_users",
             self,
@@ -1245,6 +1748,7 @@ class AsyncMemoryClient:
         """
         response = await self.async_client.put("/v1/batch/", json={"memories": memories})
         response.raise_for_status()
+        self._invalidate_cache()
 
         capture_client_event("client.batch_update", self, {"sync_type": "async"})
         return response.json()
@@ -1266,6 +1770,7 @@ class AsyncMemoryClient:
         """
         response = await self.async_client.request("DELETE", "/v1/batch/", json={"memories": memories})
         response.raise_for_status()
+        self._invalidate_cache()
 
         capture_client_event("client.batch_delete", self, {"sync_type": "async"})
         return response.json()
@@ -1281,6 +1786,7 @@ class AsyncMemoryClient:
         Returns:
             Dict containing export request ID and status message
         """
+        await self._ensure_validated()
         response = await self.async_client.post("/v1/exports/", json={"schema": schema, **self._prepare_params(kwargs)})
         response.raise_for_status()
         capture_client_event(
@@ -1298,11 +1804,38 @@ class AsyncMemoryClient:
         Returns:
             Dict containing the exported data
         """
+        await self._ensure_validated()
         response = await self.async_client.post("/v1/exports/get/", json=self._prepare_params(kwargs))
         response.raise_for_status()
         capture_client_event("client.get_memory_export", self, {"keys": list(kwargs.keys()), "sync_type": "async"})
         return response.json()
 
+    @api_error_handler
+    async def download_memory_export(self, path: str, **kwargs) -> str:
+        """Stream a memory export to a file without loading it into memory.
+
+        Args:
+            path: File to write the export to.
+            **kwargs: Filters like user_id to get specific export
+
+        Returns:
+            The path the export was written to.
+        """
+        await self._ensure_validated()
+        async with self.async_client.stream("POST", "/v1/exports/get/", json=self._prepare_params(kwargs)) as response:
+            if response.is_error:
+                await response.aread()
+                response.raise_for_status()
+            with open(path, "wb") as f:
+                async for chunk in response.aiter_bytes():
+                    f.write(chunk)
+        capture_client_event(
+            "client.download_memory_export",
+            self,
+            {"keys": list(kwargs.keys()), "sync_type": "async"},
+        )
+        return path
+
     @api_error_handler
     async def get_summary(self, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Get the summary of a memory export.
@@ -1314,6 +1847,7 @@ class AsyncMemoryClient:
             Dict containing the export status and summary data
         """
 
+        await self._ensure_validated()
         response = await self.async_client.post("/v1/summary/", json=self._prepare_params({"filters": filters}))
         response.raise_for_status()
         capture_client_event("client.get_summary", self, {"sync_type": "async"})
@@ -1336,6 +1870,7 @@ class AsyncMemoryClient:
         logger.warning(
             "get_project() method is going to be deprecated in version v1.0 of the package. Please use the client.project.get() method instead."
         )
+        await self._ensure_validated()
         if not (self.org_id and self.project_id):
             raise ValueError("org_id and project_id must be set to access instructions or categories")
 
@@ -1376,6 +1911,7 @@ class AsyncMemoryClient:
         logger.warning(
             "update_project() method is going to be deprecated in version v1.0 of the package. Please use the client.project.update() method instead."
         )
+        await self._ensure_validated()
         if not (self.org_id and self.project_id):
             raise ValueError("org_id and project_id must be set to update instructions or categories")
 
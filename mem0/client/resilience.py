@@ -0,0 +1,373 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+import httpx
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# POST endpoints that only read data and are therefore safe to retry and hedge
+READ_ONLY_POST_PATHS = frozenset({"/v1/memories/search/", "/v2/memories/search/", "/v2/memories/", "/v1/exports/get/"})
+SEARCH_PATHS = frozenset({"/v1/memories/search/", "/v2/memories/search/"})
+
+# Errors raised before the request reached the server; any request can be retried after these
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class RetryConfig(BaseModel):
+    """
+    Retry, rate limiting and hedging settings for requests made by the Mem0 clients.
+    """
+
+    max_retries: int = Field(default=3, ge=0, description="Maximum number of retries per request")
+    backoff_factor: float = Field(default=0.5, description="Base delay in seconds for exponential backoff")
+    max_backoff: float = Field(default=30.0, description="Maximum backoff delay in seconds")
+    max_retry_after: float = Field(default=60.0, description="Maximum Retry-After delay honoured, in seconds")
+    retry_statuses: Tuple[int, ...] = Field(
+        default=(429, 500, 502, 503, 504), description="HTTP status codes that trigger a retry"
+    )
+    requests_per_second: Optional[float] = Field(
+        default=None, description="Upper bound for the client-side rate limiter. None disables rate limiting"
+    )
+    min_requests_per_second: float = Field(default=1.0, description="Lower bound the rate limiter backs off to")
+    hedge_search: bool = Field(
+        default=False, description="Send a second search request when the first exceeds the observed p95 latency"
+    )
+    hedge_quantile: float = Field(default=0.95, description="Latency quantile after which a search is hedged")
+    hedge_min_samples: int = Field(default=20, description="Search latencies observed before hedging starts")
+
+    class Config:
+        frozen = True
+        extra = "forbid"
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket whose rate adapts to the server's rate-limit signals.
+
+    The rate is halved on 429 responses, capped by `X-RateLimit-Remaining / X-RateLimit-Reset`
+    when the server reports them, and recovers additively on success. `Retry-After` pauses the
+    bucket entirely. `reserve` never sleeps, so the same bucket serves sync and async clients.
+    """
+
+    def __init__(self, max_rate: float, min_rate: float = 1.0):
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.rate = max_rate
+        self.capacity = max(1.0, max_rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must wait before sending."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait_for = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            return max(wait_for, self.paused_until - now)
+
+    def update(self, response: httpx.Response, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+            if response.status_code == 429:
+                self.rate = max(self.min_rate, self.rate / 2)
+                return
+
+            remaining = _header_float(response.headers, "x-ratelimit-remaining", "ratelimit-remaining")
+            reset = _header_float(response.headers, "x-ratelimit-reset", "ratelimit-reset")
+            if remaining is not None and reset is not None and reset > 0:
+                self.rate = min(self.max_rate, max(self.min_rate, remaining / reset))
+            else:
+                self.rate = min(self.max_rate, self.rate + 1)
+
+
+_rate_limiters: Dict[Tuple[str, ...], TokenBucket] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(key: Tuple[str, ...], config: RetryConfig) -> Optional[TokenBucket]:
+    """Return the process-wide rate limiter for `key` (typically host and API key hash)."""
+    if config.requests_per_second is None:
+        return None
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(key)
+        if limiter is None:
+            limiter = TokenBucket(config.requests_per_second, config.min_requests_per_second)
+            _rate_limiters[key] = limiter
+        return limiter
+
+
+def _header_float(headers: httpx.Headers, *names: str) -> Optional[float]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
+
+
+def parse_retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds to wait according to the `Retry-After` header, accepting delta-seconds or an HTTP date."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _RetryPolicy:
+    """Retry, rate limiting and hedging decisions shared by the sync and async transports."""
+
+    def __init__(self, config: RetryConfig, limiter: Optional[TokenBucket]):
+        self.config = config
+        self.limiter = limiter
+        self._latencies = deque(maxlen=200)
+        self._latencies_lock = threading.Lock()
+
+    def is_retryable(self, request: httpx.Request) -> bool:
+        return (
+            request.method in IDEMPOTENT_METHODS
+            or "idempotency-key" in request.headers
+            or request.url.path in READ_ONLY_POST_PATHS
+        )
+
+    def should_retry_error(self, request: httpx.Request, error: httpx.TransportError, attempt: int) -> bool:
+        if attempt >= self.config.max_retries:
+            return False
+        return isinstance(error, CONNECT_ERRORS) or self.is_retryable(request)
+
+    def should_retry_response(self, request: httpx.Request, response: httpx.Response, attempt: int) -> bool:
+        if attempt >= self.config.max_retries or response.status_code not in self.config.retry_statuses:
+            return False
+        # A 429 means the request was rejected without being processed
+        return response.status_code == 429 or self.is_retryable(request)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.config.max_retry_after)
+        # Full jitter: spreads retries from concurrent clients across the backoff window
+        return random.uniform(0, min(self.config.max_backoff, self.config.backoff_factor * 2**attempt))
+
+    def throttle_delay(self) -> float:
+        return self.limiter.reserve() if self.limiter else 0.0
+
+    def observe(self, response: httpx.Response, retry_after: Optional[float]) -> None:
+        if self.limiter:
+            self.limiter.update(response, retry_after)
+
+    def hedge_delay(self, request: httpx.Request) -> Optional[float]:
+        """Seconds after which a second copy of `request` should be sent, or None to not hedge."""
+        if not self.config.hedge_search or request.url.path not in SEARCH_PATHS:
+            return None
+        with self._latencies_lock:
+            if len(self._latencies) < self.config.hedge_min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.config.hedge_quantile))]
+
+    def record_latency(self, request: httpx.Request, latency: float) -> None:
+        if request.url.path in SEARCH_PATHS:
+            with self._latencies_lock:
+                self._latencies.append(latency)
+
+    def log_retry(self, request: httpx.Request, attempt: int, delay: float, reason) -> None:
+        logger.debug(
+            f"Retrying {request.method} {request.url.path} in {delay:.2f}s "
+            f"(attempt {attempt + 1}/{self.config.max_retries}): {reason}"
+        )
+
+
+class RetryTransport(httpx.BaseTransport):
+    """
+    Sync transport wrapper adding jittered retries, `Retry-After` handling, adaptive client-side
+    rate limiting and optional hedged search requests.
+
+    Pass `owns_transport=False` for a transport shared with other clients; closing this wrapper then
+    leaves it open.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        config: RetryConfig,
+        limiter: Optional[TokenBucket] = None,
+        owns_transport: bool = True,
+    ):
+        self.transport = transport
+        self.policy = _RetryPolicy(config, limiter)
+        self.owns_transport = owns_transport
+        self._hedge_executor = None
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            delay = self.policy.throttle_delay()
+            if delay > 0:
+                time.sleep(delay)
+
+            try:
+                response = self._send(request)
+            except httpx.TransportError as e:
+                if not self.policy.should_retry_error(request, e, attempt):
+                    raise
+                delay = self.policy.backoff(attempt)
+                self.policy.log_retry(request, attempt, delay, e)
+            else:
+                retry_after = parse_retry_after(response)
+                self.policy.observe(response, retry_after)
+                if not self.policy.should_retry_response(request, response, attempt):
+                    return response
+                response.close()
+                delay = self.policy.backoff(attempt, retry_after)
+                self.policy.log_retry(request, attempt, delay, f"HTTP {response.status_code}")
+
+            time.sleep(delay)
+            attempt += 1
+
+    def _send_once(self, request: httpx.Request, buffer: bool = False) -> httpx.Response:
+        started = time.monotonic()
+        response = self.transport.handle_request(request)
+        self.policy.record_latency(request, time.monotonic() - started)
+        if buffer:
+            response.read()
+        return response
+
+    def _send(self, request: httpx.Request) -> httpx.Response:
+        hedge_after = self.policy.hedge_delay(request)
+        if hedge_after is None:
+            return self._send_once(request)
+
+        if self._hedge_executor is None:
+            self._hedge_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mem0-hedge")
+        primary = self._hedge_executor.submit(self._send_once, request, True)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        futures = [primary, self._hedge_executor.submit(self._send_once, request, True)]
+        while futures:
+            done, pending = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.add_done_callback(_close_response)
+                    return future.result()
+            futures = list(pending)
+        return primary.result()
+
+    def close(self) -> None:
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        if self.owns_transport:
+            self.transport.close()
+
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+    """
+    Async transport wrapper adding jittered retries, `Retry-After` handling, adaptive client-side
+    rate limiting and optional hedged search requests.
+
+    Pass `owns_transport=False` for a transport shared with other clients; closing this wrapper then
+    leaves it open.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        config: RetryConfig,
+        limiter: Optional[TokenBucket] = None,
+        owns_transport: bool = True,
+    ):
+        self.transport = transport
+        self.policy = _RetryPolicy(config, limiter)
+        self.owns_transport = owns_transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            delay = self.policy.throttle_delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            try:
+                response = await self._send(request)
+            except httpx.TransportError as e:
+                if not self.policy.should_retry_error(request, e, attempt):
+                    raise
+                delay = self.policy.backoff(attempt)
+                self.policy.log_retry(request, attempt, delay, e)
+            else:
+                retry_after = parse_retry_after(response)
+                self.policy.observe(response, retry_after)
+                if not self.policy.should_retry_response(request, response, attempt):
+                    return response
+                await response.aclose()
+                delay = self.policy.backoff(attempt, retry_after)
+                self.policy.log_retry(request, attempt, delay, f"HTTP {response.status_code}")
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _send_once(self, request: httpx.Request, buffer: bool = False) -> httpx.Response:
+        started = time.monotonic()
+        response = await self.transport.handle_async_request(request)
+        self.policy.record_latency(request, time.monotonic() - started)
+        if buffer:
+            await response.aread()
+        return response
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        hedge_after = self.policy.hedge_delay(request)
+        if hedge_after is None:
+            return await self._send_once(request)
+
+        primary = asyncio.ensure_future(self._send_once(request, True))
+        done, _ = await asyncio.wait([primary], timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        tasks = {primary, asyncio.ensure_future(self._send_once(request, True))}
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    for loser in tasks:
+                        loser.cancel()
+                    return task.result()
+        return primary.result()
+
+    async def aclose(self) -> None:
+        if self.owns_transport:
+            await self.transport.aclose()
+
+
+def _close_response(future) -> None:
+    if future.exception() is None:
+        future.result().close()
@@ -0,0 +1,55 @@
+import json
+from typing import Any, List
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+class JsonItemParser:
+    """
+    Incrementally parse the items of a JSON response body.
+
+    Accepts either a top-level array or a paginated object whose items are under "results".
+    Feed raw response chunks to `feed`, which returns the items completed so far, then call `close`
+    for the rest. When `ijson` is installed items are decoded as they arrive, so memory stays
+    bounded by the largest single item. Without it the body is buffered and decoded on `close`.
+    """
+
+    def __init__(self):
+        self.paginated = None
+        self._items = ijson.sendable_list() if ijson else []
+        self._coro = None
+        self._buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        if self.paginated is None:
+            stripped = chunk.lstrip()
+            if not stripped:
+                return []
+            self.paginated = stripped[:1] == b"{"
+            if ijson:
+                prefix = "results.item" if self.paginated else "item"
+                self._coro = ijson.items_coro(self._items, prefix, use_float=True)
+
+        if self._coro is None:
+            self._buffer.extend(chunk)
+            return []
+        self._coro.send(chunk)
+        return self._drain()
+
+    def close(self) -> List[Any]:
+        if self._coro is not None:
+            self._coro.close()
+            return self._drain()
+        if not self._buffer:
+            return []
+        data = json.loads(bytes(self._buffer))
+        self._buffer.clear()
+        return data.get("results", []) if isinstance(data, dict) else data
+
+    def _drain(self) -> List[Any]:
+        items = list(self._items)
+        del self._items[:]
+        return items
@@ -0,0 +1,85 @@
+import threading
+from typing import Dict
+
+import httpx
+from pydantic import BaseModel, Field
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class TransportConfig(BaseModel):
+    """
+    Connection pool, protocol and timeout settings for the HTTP transport used by the Mem0 clients.
+    """
+
+    max_connections: int = Field(default=100, description="Maximum number of concurrent connections")
+    max_keepalive_connections: int = Field(default=20, description="Maximum number of idle keep-alive connections")
+    keepalive_expiry: float = Field(default=30.0, description="Seconds an idle keep-alive connection is kept open")
+    http2: bool = Field(default=HTTP2_AVAILABLE, description="Enable HTTP/2 (requires the `h2` package)")
+    connect_timeout: float = Field(default=10.0, description="Seconds to wait for a connection to be established")
+    read_timeout: float = Field(default=300.0, description="Seconds to wait for a response chunk")
+    write_timeout: float = Field(default=60.0, description="Seconds to wait for a request chunk to be sent")
+    pool_timeout: float = Field(default=10.0, description="Seconds to wait for a connection from the pool")
+
+    class Config:
+        frozen = True
+        extra = "forbid"
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    @property
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+
+_shared_transports: Dict[TransportConfig, httpx.HTTPTransport] = {}
+_shared_transports_lock = threading.Lock()
+
+
+def _check_http2(config: TransportConfig) -> None:
+    if config.http2 and not HTTP2_AVAILABLE:
+        raise ImportError("HTTP/2 support requires the 'h2' package. Install it using 'pip install httpx[http2]'")
+
+
+def get_shared_transport(config: TransportConfig) -> httpx.HTTPTransport:
+    """
+    Return the process-wide sync transport for `config`, creating it on first use.
+
+    Every `MemoryClient` built with the same transport settings reuses the same connection pool,
+    so short-lived clients do not pay for new TCP/TLS handshakes.
+    """
+    with _shared_transports_lock:
+        transport = _shared_transports.get(config)
+        if transport is None:
+            _check_http2(config)
+            transport = httpx.HTTPTransport(limits=config.limits, http2=config.http2)
+            _shared_transports[config] = transport
+        return transport
+
+
+def create_async_transport(config: TransportConfig) -> httpx.AsyncHTTPTransport:
+    """
+    Create an async transport for `config`.
+
+    Async connections are bound to the event loop they were opened on, so async transports are
+    not shared implicitly. Pass the same transport to several `AsyncMemoryClient` instances to
+    share a pool within one event loop.
+    """
+    _check_http2(config)
+    return httpx.AsyncHTTPTransport(limits=config.limits, http2=config.http2)
@@ -13,8 +13,40 @@ class APIError(Exception):
 
 def api_error_handler(func):
     """Decorator to handle API errors consistently."""
+    import inspect
     from functools import wraps
 
+    if inspect.isgeneratorfunction(func):
+
+        @wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            try:
+                yield from func(*args, **kwargs)
+            except httpx.HTTPStatusError as e:
+                logger.error(f"HTTP error occurred: {e}")
+                raise APIError(f"API request failed: {e.response.text}")
+            except httpx.RequestError as e:
+                logger.error(f"Request error occurred: {e}")
+                raise APIError(f"Request failed: {str(e)}")
+
+        return generator_wrapper
+
+    if inspect.isasyncgenfunction(func):
+
+        @wraps(func)
+        async def async_generator_wrapper(*args, **kwargs):
+            try:
+                async for item in func(*args, **kwargs):
+                    yield item
+            except httpx.HTTPStatusError as e:
+                logger.error(f"HTTP error occurred: {e}")
+                raise APIError(f"API request failed: {e.response.text}")
+            except httpx.RequestError as e:
+                logger.error(f"Request error occurred: {e}")
+                raise APIError(f"Request failed: {str(e)}")
+
+        return async_generator_wrapper
+
     @wraps(func)
     def wrapper(*args, **kwargs):
         try:
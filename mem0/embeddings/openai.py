@@ -1,6 +1,6 @@
 import os
 import warnings
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from openai import OpenAI
 
@@ -47,3 +47,22 @@ class OpenAIEmbedding(EmbeddingBase):
             .data[0]
             .embedding
         )
+
+    def embed_batch(self, texts: List[str], memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for several texts with a single OpenAI request.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: One embedding vector per text, in order.
+        """
+        if not texts:
+            return []
+        response = self.client.embeddings.create(
+            input=[text.replace("\n", " ") for text in texts],
+            model=self.config.model,
+            dimensions=self.config.embedding_dims,
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
@@ -70,18 +70,64 @@ class NeptuneConfig(BaseModel):
             )
 
 
+class LocalGraphConfig(BaseModel):
+    path: Optional[str] = Field(
+        None, description="Directory for the embedded graph database. Defaults to a `graph` folder under mem0_dir"
+    )
+
+
 class GraphStoreConfig(BaseModel):
     provider: str = Field(
-        description="Provider of the data store (e.g., 'neo4j', 'memgraph', 'neptune')",
+        description="Provider of the data store (e.g., 'neo4j', 'memgraph', 'neptune', 'local')",
         default="neo4j",
     )
-    config: Union[Neo4jConfig, MemgraphConfig, NeptuneConfig] = Field(
+    config: Union[Neo4jConfig, MemgraphConfig, NeptuneConfig, LocalGraphConfig] = Field(
         description="Configuration for the specific data store", default=None
     )
     llm: Optional[LlmConfig] = Field(description="LLM configuration for querying the graph store", default=None)
     custom_prompt: Optional[str] = Field(
         description="Custom prompt to fetch entities from the given text", default=None
     )
+    extraction_mode: str = Field(
+        description="How entities and relations are extracted on add: 'sequential' (one LLM call each) or 'fused' (a single LLM call)",
+        default="sequential",
+    )
+    search_mode: str = Field(
+        description="How search queries are resolved to entities: 'llm' (LLM entity extraction) or 'fast' (local name and embedding matching, no LLM call)",
+        default="llm",
+    )
+    rerank_top_n: int = Field(
+        description="Number of relations returned by graph search after reranking", default=5, gt=0
+    )
+    write_mode: str = Field(
+        description="How graph writes are applied on add: 'sync' (add waits for the graph) or 'async' (durable write-behind queue)",
+        default="sync",
+    )
+
+    @model_validator(mode="before")
+    def set_local_default_config(cls, values):
+        # The embedded store needs no connection details, so `config` may be omitted entirely
+        if isinstance(values, dict) and values.get("provider") == "local" and values.get("config") is None:
+            values["config"] = {}
+        return values
+
+    @field_validator("extraction_mode")
+    def validate_extraction_mode(cls, v):
+        if v not in ("sequential", "fused"):
+            raise ValueError(f"Unsupported graph extraction mode: {v}. Use 'sequential' or 'fused'.")
+        return v
+
+    @field_validator("search_mode")
+    def validate_search_mode(cls, v):
+        if v not in ("llm", "fast"):
+            raise ValueError(f"Unsupported graph search mode: {v}. Use 'llm' or 'fast'.")
+        return v
+
+    @field_validator("write_mode")
+    def validate_write_mode(cls, v):
+        if v not in ("sync", "async"):
+            raise ValueError(f"Unsupported graph write mode: {v}. Use 'sync' or 'async'.")
+        return v
 
     @field_validator("config")
     def validate_config(cls, v, values):
@@ -92,5 +138,7 @@ class GraphStoreConfig(BaseModel):
             return MemgraphConfig(**v.model_dump())
         elif provider == "neptune":
             return NeptuneConfig(**v.model_dump())
+        elif provider == "local":
+            return LocalGraphConfig(**v.model_dump())
         else:
             raise ValueError(f"Unsupported graph store provider: {provider}")
@@ -1,22 +1,25 @@
 import logging
 from abc import ABC, abstractmethod
 
-from mem0.memory.utils import format_entities
-
-try:
-    from rank_bm25 import BM25Okapi
-except ImportError:
-    raise ImportError("rank_bm25 is not installed. Please install it using pip install rank-bm25")
-
+from mem0.graphs.rerank import rerank_relations
 from mem0.graphs.tools import (
     DELETE_MEMORY_STRUCT_TOOL_GRAPH,
     DELETE_MEMORY_TOOL_GRAPH,
+    EXTRACT_ENTITIES_RELATIONS_STRUCT_TOOL,
+    EXTRACT_ENTITIES_RELATIONS_TOOL,
     EXTRACT_ENTITIES_STRUCT_TOOL,
     EXTRACT_ENTITIES_TOOL,
     RELATIONS_STRUCT_TOOL,
     RELATIONS_TOOL,
 )
-from mem0.graphs.utils import EXTRACT_RELATIONS_PROMPT, get_delete_messages
+from mem0.graphs.utils import (
+    EXTRACT_RELATIONS_PROMPT,
+    get_delete_messages,
+    get_extract_entities_relations_messages,
+    match_entity_names,
+    parse_entities_relations_response,
+)
+from mem0.memory.utils import format_entities
 from mem0.utils.factory import EmbedderFactory, LlmFactory
 
 logger = logging.getLogger(__name__)
@@ -54,13 +57,17 @@ class NeptuneBase(ABC):
             data (str): The data to add to the graph.
             filters (dict): A dictionary containing filters to be applied during the addition.
         """
-        entity_type_map = self._retrieve_nodes_from_data(data, filters)
-        to_be_added = self._establish_nodes_relations_from_data(data, filters, entity_type_map)
+        if self.config.graph_store.extraction_mode == "fused":
+            entity_type_map, to_be_added = self._retrieve_nodes_relations_from_data(data, filters)
+        else:
+            entity_type_map = self._retrieve_nodes_from_data(data, filters)
+            to_be_added = self._establish_nodes_relations_from_data(data, filters, entity_type_map)
         search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
         to_be_deleted = self._get_delete_entities_from_search_output(search_output, data, filters)
 
         deleted_entities = self._delete_entities(to_be_deleted, filters["user_id"])
         added_entities = self._add_entities(to_be_added, filters["user_id"], entity_type_map)
+        self.entity_name_cache.invalidate(filters["user_id"])
 
         return {"deleted_entities": deleted_entities, "added_entities": added_entities}
 
@@ -141,6 +148,57 @@ class NeptuneBase(ABC):
         logger.debug(f"Extracted entities: {entities}")
         return entities
 
+    def _retrieve_nodes_from_query(self, query, filters):
+        """
+        Match the query against the stored entity names and embeddings without an LLM call.
+        """
+        entity_names = self.entity_name_cache.get(filters, self._get_entity_names)
+        if not entity_names:
+            return []
+
+        node_list = match_entity_names(query, entity_names, user_id=filters["user_id"])
+        # The query embedding is matched against the entity embeddings alongside any matched names
+        return node_list + [query]
+
+    def _get_entity_names(self, filters):
+        """
+        Return the names of all entities stored for the user.
+        """
+        cypher, params = self._get_entity_names_cypher(filters)
+        return [result["name"] for result in self.graph.query(cypher, params=params)]
+
+    @abstractmethod
+    def _get_entity_names_cypher(self, filters):
+        """
+        Returns the OpenCypher query and parameters to get the names of all entities in the memory store
+        """
+        pass
+
+    def _retrieve_nodes_relations_from_data(self, data, filters):
+        """
+        Extract entities and the relations among them with a single LLM call.
+        """
+        system_prompt, user_prompt = get_extract_entities_relations_messages(
+            data, filters["user_id"], self.config.graph_store.custom_prompt
+        )
+
+        _tools = [EXTRACT_ENTITIES_RELATIONS_TOOL]
+        if self.llm_provider in ["azure_openai_structured", "openai_structured"]:
+            _tools = [EXTRACT_ENTITIES_RELATIONS_STRUCT_TOOL]
+
+        extracted = self.llm.generate_response(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            tools=_tools,
+        )
+
+        entity_type_map, relations = parse_entities_relations_response(extracted)
+        relations = self._remove_spaces_from_entities(relations)
+        logger.debug(f"Entity type map: {entity_type_map}\n Extracted relations: {relations}")
+        return entity_type_map, relations
+
     def _remove_spaces_from_entities(self, entity_list):
         for item in entity_list:
             item["source"] = item["source"].lower().replace(" ", "_")
@@ -152,6 +210,9 @@ class NeptuneBase(ABC):
         """
         Get the entities to be deleted from the search output.
         """
+        if not search_output:
+            # Nothing in the neighbourhood can conflict with the new data
+            return []
 
         search_output_string = format_entities(search_output)
         system_prompt, user_prompt = get_delete_messages(search_output_string, data, filters["user_id"])
@@ -278,23 +339,16 @@ class NeptuneBase(ABC):
                 - "entities": List of related graph data based on the query.
         """
 
-        entity_type_map = self._retrieve_nodes_from_data(query, filters)
-        search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
+        if self.config.graph_store.search_mode == "fast":
+            node_list = self._retrieve_nodes_from_query(query, filters)
+        else:
+            node_list = list(self._retrieve_nodes_from_data(query, filters).keys())
+        search_output = self._search_graph_db(node_list=node_list, filters=filters)
 
         if not search_output:
             return []
 
-        search_outputs_sequence = [
-            [item["source"], item["relationship"], item["destination"]] for item in search_output
-        ]
-        bm25 = BM25Okapi(search_outputs_sequence)
-
-        tokenized_query = query.split(" ")
-        reranked_results = bm25.get_top_n(tokenized_query, search_outputs_sequence, n=5)
-
-        search_results = []
-        for item in reranked_results:
-            search_results.append({"source": item[0], "relationship": item[1], "destination": item[2]})
+        search_results = rerank_relations(query, search_output, top_n=self.config.graph_store.rerank_top_n)
 
         return search_results
 
@@ -325,6 +379,7 @@ class NeptuneBase(ABC):
     def delete_all(self, filters):
         cypher, params = self._delete_all_cypher(filters)
         self.graph.query(cypher, params=params)
+        self.entity_name_cache.invalidate(filters["user_id"])
 
     @abstractmethod
     def _delete_all_cypher(self, filters):
@@ -408,3 +463,4 @@ class NeptuneBase(ABC):
         )
         waiter = self.graph.client.get_waiter("graph_available")
         waiter.wait(graphIdentifier=graph_id, WaiterConfig={"Delay": 10, "MaxAttempts": 60})
+        self.entity_name_cache.invalidate()
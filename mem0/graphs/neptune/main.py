@@ -1,4 +1,7 @@
 import logging
+
+from mem0.graphs.utils import EntityNameCache
+
 from .base import NeptuneBase
 
 try:
@@ -35,6 +38,7 @@ class MemoryGraph(NeptuneBase):
         self.llm = NeptuneBase._create_llm(self.config, self.llm_provider)
         self.user_id = None
         self.threshold = 0.7
+        self.entity_name_cache = EntityNameCache()
 
     def _delete_entities_cypher(self, source, destination, relationship, user_id):
         """
@@ -309,6 +313,21 @@ class MemoryGraph(NeptuneBase):
         logger.debug(f"delete_all query={cypher}")
         return cypher, params
 
+    def _get_entity_names_cypher(self, filters):
+        """
+        Returns the OpenCypher query and parameters to get the names of all entities in the memory store
+
+        :param filters: search filters
+        :return: str, dict
+        """
+
+        cypher = f"""
+        MATCH (n {self.node_label} {{user_id: $user_id}})
+        RETURN DISTINCT n.name AS name
+        """
+        params = {"user_id": filters["user_id"]}
+        return cypher, params
+
     def _get_all_cypher(self, filters, limit):
         """
         Returns the OpenCypher query and parameters to get all edges/nodes in the memory store
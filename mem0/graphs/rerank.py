@@ -0,0 +1,85 @@
+import numpy as np
+
+from mem0.memory.utils import tokenize
+
+
+def bm25_scores(query_tokens, documents, k1=1.5, b=0.75):
+    """
+    Score pre-tokenized `documents` against `query_tokens` with Okapi BM25.
+
+    Only the query terms contribute to the score, so the term-frequency matrix is built over the
+    (deduplicated) query vocabulary and scored in a single vectorized pass.
+
+    Returns:
+        np.ndarray: One score per document.
+    """
+    terms = list(dict.fromkeys(query_tokens))
+    if not documents or not terms:
+        return np.zeros(len(documents))
+
+    term_index = {term: i for i, term in enumerate(terms)}
+    tf = np.zeros((len(documents), len(terms)))
+    for row, tokens in enumerate(documents):
+        for token in tokens:
+            column = term_index.get(token)
+            if column is not None:
+                tf[row, column] += 1
+
+    doc_len = np.fromiter((len(tokens) for tokens in documents), dtype=float, count=len(documents))
+    avg_doc_len = doc_len.mean() or 1.0
+    doc_freq = np.count_nonzero(tf, axis=0)
+    # Non-negative IDF variant, so terms present in most triples still score above zero
+    idf = np.log1p((len(documents) - doc_freq + 0.5) / (doc_freq + 0.5))
+
+    norm = k1 * (1 - b + b * doc_len / avg_doc_len)
+    return (tf * (k1 + 1) / (tf + norm[:, None])) @ idf
+
+
+def _ranks(scores):
+    """1-based rank of each score, highest first; ties keep input order."""
+    order = np.argsort(-scores, kind="stable")
+    ranks = np.empty(len(scores), dtype=float)
+    ranks[order] = np.arange(1, len(scores) + 1)
+    return ranks
+
+
+def rerank_relations(query, relations, top_n=5, rrf_k=60):
+    """
+    Rerank graph search results for `query`.
+
+    Relations are deduplicated on (source, relationship, destination), keeping the highest
+    similarity. BM25 over the triples is fused with the graph similarity score using reciprocal
+    rank fusion; results without a similarity score are ranked on BM25 alone.
+
+    Args:
+        query (str): The search query.
+        relations (list): Dicts with "source", "relationship", "destination" and optionally "similarity".
+        top_n (int): Number of relations to return. Defaults to 5.
+        rrf_k (int): Reciprocal rank fusion constant. Defaults to 60.
+
+    Returns:
+        list: Up to `top_n` dicts with "source", "relationship" and "destination".
+    """
+    triples = {}
+    for item in relations:
+        key = (item["source"], item["relationship"], item["destination"])
+        similarity = item.get("similarity")
+        best = triples.get(key)
+        if key not in triples or (similarity is not None and (best is None or similarity > best)):
+            triples[key] = similarity
+
+    if not triples:
+        return []
+
+    keys = list(triples)
+    documents = [
+        tokenize(source) + tokenize(relationship) + tokenize(destination) for source, relationship, destination in keys
+    ]
+    scores = 1.0 / (rrf_k + _ranks(bm25_scores(tokenize(query), documents)))
+
+    similarities = [triples[key] for key in keys]
+    if all(similarity is not None for similarity in similarities):
+        scores += 1.0 / (rrf_k + _ranks(np.asarray(similarities, dtype=float)))
+
+    top = np.argsort(-scores, kind="stable")[:top_n]
+    return [{"source": keys[i][0], "relationship": keys[i][1], "destination": keys[i][2]} for i in top]
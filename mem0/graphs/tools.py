@@ -369,3 +369,100 @@ DELETE_MEMORY_TOOL_GRAPH = {
         },
     },
 }
+
+EXTRACT_ENTITIES_RELATIONS_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "extract_entities_and_relations",
+        "description": "Extract entities with their types and the relationships among them from the text.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "entities": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "entity": {"type": "string", "description": "The name or identifier of the entity."},
+                            "entity_type": {"type": "string", "description": "The type or category of the entity."},
+                        },
+                        "required": ["entity", "entity_type"],
+                        "additionalProperties": False,
+                    },
+                    "description": "An array of entities with their types.",
+                },
+                "relations": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "source": {"type": "string", "description": "The source entity of the relationship."},
+                            "relationship": {
+                                "type": "string",
+                                "description": "The relationship between the source and destination entities.",
+                            },
+                            "destination": {
+                                "type": "string",
+                                "description": "The destination entity of the relationship.",
+                            },
+                        },
+                        "required": ["source", "relationship", "destination"],
+                        "additionalProperties": False,
+                    },
+                    "description": "An array of relationships among the extracted entities.",
+                },
+            },
+            "required": ["entities", "relations"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+EXTRACT_ENTITIES_RELATIONS_STRUCT_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "extract_entities_and_relations",
+        "description": "Extract entities with their types and the relationships among them from the text.",
+        "strict": True,
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "entities": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "entity": {"type": "string", "description": "The name or identifier of the entity."},
+                            "entity_type": {"type": "string", "description": "The type or category of the entity."},
+                        },
+                        "required": ["entity", "entity_type"],
+                        "additionalProperties": False,
+                    },
+                    "description": "An array of entities with their types.",
+                },
+                "relations": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "source": {"type": "string", "description": "The source entity of the relationship."},
+                            "relationship": {
+                                "type": "string",
+                                "description": "The relationship between the source and destination entities.",
+                            },
+                            "destination": {
+                                "type": "string",
+                                "description": "The destination entity of the relationship.",
+                            },
+                        },
+                        "required": ["source", "relationship", "destination"],
+                        "additionalProperties": False,
+                    },
+                    "description": "An array of relationships among the extracted entities.",
+                },
+            },
+            "required": ["entities", "relations"],
+            "additionalProperties": False,
+        },
+    },
+}
@@ -1,3 +1,9 @@
+import difflib
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
 UPDATE_GRAPH_PROMPT = """
 You are an AI expert specializing in graph memory management and optimization. Your task is to analyze existing graph memories alongside new information, and update the relationships in the memory list to ensure the most accurate, current, and coherent representation of knowledge.
 
@@ -91,7 +97,182 @@ Provide a list of deletion instructions, each specifying the relationship to be
 """
 
 
+EXTRACT_ENTITIES_RELATIONS_PROMPT = """
+You are an advanced algorithm designed to extract structured information from text to construct knowledge graphs. In a single pass, identify the entities mentioned in the text together with their types, and the relationships among them. Follow these key principles:
+
+1. Extract only explicitly stated information from the text.
+2. Every entity used as the source or destination of a relationship must also be listed as an entity.
+3. Use "USER_ID" as the source entity for any self-references (e.g., "I," "me," "my," etc.) in user messages.
+4. ***DO NOT*** answer the question itself if the given text is a question; only extract the entities it mentions.
+CUSTOM_PROMPT
+
+Relationships:
+    - Use consistent, general, and timeless relationship types.
+    - Example: Prefer "professor" over "became_professor."
+    - Relationships should only be established among the entities explicitly mentioned in the user message.
+
+Entity Consistency:
+    - Ensure that relationships are coherent and logically align with the context of the message.
+    - Maintain consistent naming for entities across the extracted data.
+
+Adhere strictly to these guidelines to ensure high-quality knowledge graph extraction."""
+
+
+def get_extract_entities_relations_messages(data, user_identity, custom_prompt=None):
+    custom_prompt_line = f"5. {custom_prompt}" if custom_prompt else ""
+    system_prompt = EXTRACT_ENTITIES_RELATIONS_PROMPT.replace("USER_ID", user_identity).replace(
+        "CUSTOM_PROMPT", custom_prompt_line
+    )
+    return system_prompt, f"Text: {data}"
+
+
+def parse_entities_relations_response(response):
+    """
+    Parse the `extract_entities_and_relations` tool call into an entity type map and a list of relations.
+
+    Entity names and types are lower-cased with spaces replaced by underscores, matching the
+    normalisation applied to the output of the sequential extraction calls.
+    """
+    entity_type_map = {}
+    relations = []
+    for tool_call in response.get("tool_calls") or []:
+        if tool_call.get("name") != "extract_entities_and_relations":
+            continue
+        arguments = tool_call.get("arguments", {})
+        for item in arguments.get("entities", []):
+            entity_type_map[item["entity"]] = item["entity_type"]
+        relations.extend(arguments.get("relations", []))
+
+    entity_type_map = {k.lower().replace(" ", "_"): v.lower().replace(" ", "_") for k, v in entity_type_map.items()}
+    return entity_type_map, relations
+
+
 def get_delete_messages(existing_memories_string, data, user_id):
     return DELETE_RELATIONS_SYSTEM_PROMPT.replace(
         "USER_ID", user_id
     ), f"Here are the existing memories: {existing_memories_string} \n\n New Information: {data}"
+
+
+SELF_REFERENCES = {"i", "me", "my", "mine", "myself", "i'm", "i've", "i'd", "i'll"}
+
+
+def get_query_ngrams(query, max_n=3):
+    """Return the word n-grams of `query`, normalised the same way entity names are stored."""
+    tokens = re.findall(r"[\w']+", query.lower())
+    ngrams = []
+    for n in range(1, max_n + 1):
+        for i in range(len(tokens) - n + 1):
+            ngrams.append("_".join(tokens[i : i + n]))
+    return ngrams
+
+
+def _trigrams(text):
+    # Padded like pg_trgm, so short names and word boundaries still produce trigrams
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class EntityNameIndex:
+    """
+    A set of entity names with a trigram index over them.
+
+    Fuzzy matching only compares a query n-gram with the names that share a trigram with it and
+    whose length allows a close enough match, instead of with every name.
+    """
+
+    def __init__(self, names):
+        self.names = set(names)
+        self._by_trigram = defaultdict(set)
+        for name in self.names:
+            for trigram in _trigrams(name):
+                self._by_trigram[trigram].add(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def candidates(self, ngram, cutoff):
+        """Return the names `ngram` could match with a difflib ratio of at least `cutoff`."""
+        found = set()
+        for trigram in _trigrams(ngram):
+            found.update(self._by_trigram.get(trigram, ()))
+        # difflib's ratio is at most 2 * min(len(a), len(b)) / (len(a) + len(b))
+        return sorted(name for name in found if 2 * min(len(ngram), len(name)) >= cutoff * (len(ngram) + len(name)))
+
+
+class EntityNameCache:
+    """
+    Entity name indexes per user/agent scope, for fast-mode graph search.
+
+    Graph stores invalidate a user's entries whenever they add or delete entities for that user.
+    Entries also expire after `ttl` seconds, so writes made by other processes are picked up.
+    """
+
+    def __init__(self, ttl=60.0, max_size=1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, filters, load):
+        """Return the index for the scope of `filters`, calling `load(filters)` for the names if it isn't cached."""
+        key = (filters["user_id"], filters.get("agent_id"))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                return entry[0]
+            generation = self._generation
+
+        index = EntityNameIndex(load(filters))
+        with self._lock:
+            # Don't cache names read before a concurrent write invalidated them
+            if generation == self._generation:
+                self._entries[key] = (index, time.monotonic() + self.ttl)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return index
+
+    def invalidate(self, user_id=None):
+        """Drop the cached names of `user_id`, across all of their agents, or of every user."""
+        with self._lock:
+            self._generation += 1
+            if user_id is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+
+def match_entity_names(query, entity_names, user_id=None, cutoff=0.85):
+    """
+    Match a search query against known entity names without an LLM call.
+
+    Query n-grams are matched exactly and then fuzzily against `entity_names`, which may be an
+    `EntityNameIndex` or any iterable of names. Self-references such as "I" or "my" resolve to
+    `user_id`, mirroring the entity extraction prompt.
+
+    Returns:
+        list: Matched entity names, in query order and without duplicates.
+    """
+    index = entity_names if isinstance(entity_names, EntityNameIndex) else EntityNameIndex(entity_names)
+    names = index.names
+    if not names:
+        return []
+
+    ngrams = get_query_ngrams(query)
+    matches = {}
+    if user_id and any(ngram in SELF_REFERENCES for ngram in ngrams):
+        user_node = user_id.lower().replace(" ", "_")
+        if user_node in names:
+            matches[user_node] = None
+
+    for ngram in ngrams:
+        if ngram in names:
+            matches[ngram] = None
+        elif len(ngram) >= 4:
+            candidates = index.candidates(ngram, cutoff)
+            for name in difflib.get_close_matches(ngram, candidates, n=1, cutoff=cutoff):
+                matches[name] = None
+    return list(matches)
@@ -0,0 +1,335 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytz
+
+logger = logging.getLogger(__name__)
+
+# How often waits re-check the database for work claimed by other processes
+POLL_INTERVAL = 0.1
+
+
+def graph_config_key(graph_store_config) -> str:
+    """Identify the graph a queued operation belongs to, from the graph store provider and connection config."""
+    connection_config = graph_store_config.config.model_dump() if graph_store_config.config else {}
+    payload = json.dumps(
+        {"provider": graph_store_config.provider, "config": connection_config}, sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class GraphWriteQueue:
+    """
+    Durable write-behind queue for graph ingestion.
+
+    Operations are persisted to SQLite before `enqueue` returns and drained by a worker pool.
+    Operations sharing the same filters (user/agent/run scope) are applied one batch at a time in
+    insertion order, and everything pending for a scope when a worker picks it up is coalesced into
+    a single `graph.add` call.
+
+    Several queues, in one or more processes, may share a database file. Each operation records the
+    graph it was queued for (`graph_key`) and is only applied by queues for that graph. A queue claims
+    a batch under its own owner id with a lease; batches whose lease expired because the process
+    applying them died are re-queued, while batches other live queues are applying are left alone.
+
+    A batch that fails is retried after `retry_delay` seconds, doubling with each attempt; later
+    operations for its scope wait behind it. After `max_attempts` failures its operations are kept
+    with status `failed`; see `failed` and `retry_failed`.
+    """
+
+    def __init__(
+        self,
+        graph,
+        db_path: str = ":memory:",
+        max_workers: int = 4,
+        max_batch_size: int = 20,
+        max_attempts: int = 3,
+        graph_key: str = "",
+        lease_seconds: float = 300.0,
+        retry_delay: float = 1.0,
+    ):
+        self.graph = graph
+        self.db_path = db_path
+        self.max_batch_size = max_batch_size
+        self.max_attempts = max_attempts
+        self.graph_key = graph_key
+        self.lease_seconds = lease_seconds
+        self.retry_delay = retry_delay
+        self.owner = uuid.uuid4().hex
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._active_scopes = set()
+        self._closed = False
+        self._retry_timers = set()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mem0-graph-writer")
+        self._create_table()
+
+        with self._lock:
+            self._dispatch()
+
+    def _create_table(self) -> None:
+        with self._lock:
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS graph_ops (
+                    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                    scope       TEXT NOT NULL,
+                    user_id     TEXT,
+                    agent_id    TEXT,
+                    run_id      TEXT,
+                    graph_key   TEXT,
+                    data        TEXT NOT NULL,
+                    filters     TEXT NOT NULL,
+                    status      TEXT NOT NULL DEFAULT 'pending',
+                    attempts    INTEGER NOT NULL DEFAULT 0,
+                    owner       TEXT,
+                    claimed_at  REAL,
+                    not_before  REAL,
+                    created_at  DATETIME
+                )
+                """
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_graph_ops_scope ON graph_ops (scope, status)")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_graph_ops_graph ON graph_ops (graph_key, status, scope)"
+            )
+            self.connection.commit()
+
+    def enqueue(self, data: str, filters: Dict[str, Any]) -> int:
+        """Persist a graph add operation and schedule it. Returns the operation id."""
+        scope = json.dumps(filters, sort_keys=True)
+        with self._lock:
+            cursor = self.connection.execute(
+                """
+                INSERT INTO graph_ops (scope, user_id, agent_id, run_id, graph_key, data, filters, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    scope,
+                    filters.get("user_id"),
+                    filters.get("agent_id"),
+                    filters.get("run_id"),
+                    self.graph_key,
+                    data,
+                    json.dumps(filters),
+                    datetime.now(pytz.UTC).isoformat(),
+                ),
+            )
+            self.connection.commit()
+            self._dispatch()
+            return cursor.lastrowid
+
+    def discard(
+        self,
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        timeout: Optional[float] = 60.0,
+    ) -> int:
+        """
+        Drop queued operations for a user/agent/run scope and wait for those already being applied.
+
+        Call this before deleting the scope from the graph, so that no queued operation re-populates it.
+
+        Returns:
+            int: The number of operations dropped.
+        """
+        conditions, params = ["graph_key = ?"], [self.graph_key]
+        for column, value in (("user_id", user_id), ("agent_id", agent_id), ("run_id", run_id)):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        where = " AND ".join(conditions)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        dropped = 0
+        with self._changed:
+            while self.connection is not None:
+                # Failed batches go back to pending while we wait, so drop pending operations each time
+                dropped += self.connection.execute(
+                    f"DELETE FROM graph_ops WHERE status IN ('pending', 'failed') AND {where}", params
+                ).rowcount
+                self.connection.commit()
+                running = self.connection.execute(
+                    f"SELECT COUNT(*) FROM graph_ops WHERE status = 'running' AND {where}", params
+                ).fetchone()[0]
+                if not running:
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    logger.warning(f"Timed out waiting for {running} in-flight graph operation(s) to finish")
+                    break
+                self._changed.wait(POLL_INTERVAL if remaining is None else min(POLL_INTERVAL, remaining))
+            self._changed.notify_all()
+        return dropped
+
+    def pending(self) -> int:
+        """Number of operations not yet applied to the graph, including those in progress or awaiting a retry."""
+        with self._lock:
+            return self._count()
+
+    def failed(self) -> int:
+        """Number of operations that were given up on after `max_attempts` failed attempts."""
+        with self._lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM graph_ops WHERE graph_key = ? AND status = 'failed'", (self.graph_key,)
+            ).fetchone()[0]
+
+    def retry_failed(self) -> int:
+        """Re-queue the operations that were given up on. Returns the number of operations re-queued."""
+        with self._lock:
+            requeued = self.connection.execute(
+                """
+                UPDATE graph_ops SET status = 'pending', attempts = 0, not_before = NULL
+                WHERE graph_key = ? AND status = 'failed'
+                """,
+                (self.graph_key,),
+            ).rowcount
+            self.connection.commit()
+            self._dispatch()
+            return requeued
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every queued operation has been applied.
+
+        Returns:
+            bool: True if the queue drained, False if `timeout` elapsed first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._changed:
+            while self._count():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._changed.wait(POLL_INTERVAL if remaining is None else min(POLL_INTERVAL, remaining))
+                # Pick up work left by other processes, or whose lease expired
+                self._dispatch()
+            return True
+
+    def close(self) -> None:
+        """Stop scheduling new work and wait for in-flight operations. Pending operations stay on disk."""
+        with self._lock:
+            self._closed = True
+            for timer in self._retry_timers:
+                timer.cancel()
+            self._retry_timers.clear()
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            if self.connection:
+                self.connection.close()
+                self.connection = None
+
+    def _count(self) -> int:
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM graph_ops WHERE graph_key = ? AND status != 'failed'", (self.graph_key,)
+        ).fetchone()[0]
+
+    def _dispatch(self) -> None:
+        """Claim and hand every idle scope with due pending operations to a worker. Call with `self._lock` held."""
+        if self._closed or self.connection is None:
+            return
+        claimed: List[Tuple[str, list]] = []
+        # IMMEDIATE takes the write lock up front, so queues in other processes can't claim the same operations
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            self.connection.execute(
+                """
+                UPDATE graph_ops SET status = 'pending', owner = NULL, claimed_at = NULL
+                WHERE graph_key = ? AND status = 'running' AND (claimed_at IS NULL OR claimed_at < ?)
+                """,
+                (self.graph_key, time.time() - self.lease_seconds),
+            )
+            # A scope whose oldest batch is waiting out a retry delay holds back its later operations too
+            scopes = self.connection.execute(
+                """
+                SELECT scope FROM graph_ops
+                WHERE graph_key = ? AND status = 'pending'
+                  AND scope NOT IN (SELECT scope FROM graph_ops WHERE graph_key = ? AND status = 'running')
+                GROUP BY scope HAVING COALESCE(MAX(not_before), 0) <= ? ORDER BY MIN(id)
+                """,
+                (self.graph_key, self.graph_key, time.time()),
+            ).fetchall()
+            for (scope,) in scopes:
+                if scope in self._active_scopes:
+                    continue
+                ops = self.connection.execute(
+                    """
+                    SELECT id, data, filters, attempts FROM graph_ops
+                    WHERE graph_key = ? AND scope = ? AND status = 'pending' ORDER BY id LIMIT ?
+                    """,
+                    (self.graph_key, scope, self.max_batch_size),
+                ).fetchall()
+                claimed_at = time.time()
+                self.connection.executemany(
+                    "UPDATE graph_ops SET status = 'running', owner = ?, claimed_at = ? WHERE id = ?",
+                    [(self.owner, claimed_at, op[0]) for op in ops],
+                )
+                claimed.append((scope, ops))
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+
+        for scope, ops in claimed:
+            self._active_scopes.add(scope)
+            self._executor.submit(self._apply, scope, ops)
+
+    def _apply(self, scope, ops) -> None:
+        op_ids = [(op[0], self.owner) for op in ops]
+        data = "\n".join(op[1] for op in ops)
+        filters = json.loads(ops[-1][2])
+
+        try:
+            self.graph.add(data, filters)
+            succeeded = True
+        except Exception as e:
+            logger.error(f"Error applying {len(ops)} queued graph operation(s): {e}")
+            succeeded = False
+
+        with self._lock:
+            if self.connection is None:
+                return
+            if succeeded:
+                self.connection.executemany("DELETE FROM graph_ops WHERE id = ? AND owner = ?", op_ids)
+            else:
+                attempts = 1 + max(op[3] for op in ops)
+                delay = self.retry_delay * 2 ** (attempts - 1)
+                status = "failed" if attempts >= self.max_attempts else "pending"
+                self.connection.executemany(
+                    """
+                    UPDATE graph_ops SET status = ?, owner = NULL, claimed_at = NULL, attempts = ?, not_before = ?
+                    WHERE id = ? AND owner = ?
+                    """,
+                    [(status, attempts, time.time() + delay, op_id, owner) for op_id, owner in op_ids],
+                )
+                if status == "failed":
+                    logger.error(f"Gave up on {len(ops)} graph operation(s) after {self.max_attempts} failed attempts")
+                else:
+                    self._schedule_retry(delay)
+            self.connection.commit()
+            self._active_scopes.discard(scope)
+            self._dispatch()
+            self._changed.notify_all()
+
+    def _schedule_retry(self, delay: float) -> None:
+        """Dispatch again once a failed batch's retry delay has passed. Call with `self._lock` held."""
+
+        def retry():
+            with self._lock:
+                self._retry_timers.discard(timer)
+                self._dispatch()
+
+        timer = threading.Timer(delay, retry)
+        timer.daemon = True
+        self._retry_timers.add(timer)
+        timer.start()
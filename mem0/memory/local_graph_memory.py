@@ -0,0 +1,620 @@
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import pytz
+
+from mem0.memory.setup import mem0_dir
+from mem0.memory.utils import format_entities
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("numpy is not installed. Please install it using pip install numpy")
+
+from mem0.graphs.rerank import rerank_relations
+from mem0.graphs.tools import (
+    DELETE_MEMORY_STRUCT_TOOL_GRAPH,
+    DELETE_MEMORY_TOOL_GRAPH,
+    EXTRACT_ENTITIES_RELATIONS_STRUCT_TOOL,
+    EXTRACT_ENTITIES_RELATIONS_TOOL,
+    EXTRACT_ENTITIES_STRUCT_TOOL,
+    EXTRACT_ENTITIES_TOOL,
+    RELATIONS_STRUCT_TOOL,
+    RELATIONS_TOOL,
+)
+from mem0.graphs.utils import (
+    EXTRACT_RELATIONS_PROMPT,
+    get_delete_messages,
+    get_extract_entities_relations_messages,
+    match_entity_names,
+    parse_entities_relations_response,
+)
+from mem0.utils.factory import EmbedderFactory, LlmFactory
+
+logger = logging.getLogger(__name__)
+
+
+class EntityIndex:
+    """
+    In-memory embedding matrix for the entities of a single user.
+
+    Rows are L2-normalised on insert so that cosine similarity against a query
+    is a single matrix-vector product.
+    """
+
+    def __init__(self, ids=None, agent_ids=None, names=None, embeddings=None):
+        self.ids = list(ids or [])
+        self.agent_ids = list(agent_ids or [])
+        self.names = list(names or [])
+        self.matrix = np.vstack(embeddings).astype(np.float32) if embeddings else None
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def normalize(embedding):
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def add(self, entity_id, agent_id, name, embedding):
+        row = embedding.reshape(1, -1)
+        self.matrix = row if self.matrix is None else np.vstack([self.matrix, row])
+        self.ids.append(entity_id)
+        self.agent_ids.append(agent_id)
+        self.names.append(name)
+
+    def search(self, embedding, threshold, agent_id=None, limit=None):
+        """Return `(entity_id, name, similarity)` tuples above `threshold`, most similar first."""
+        if self.matrix is None:
+            return []
+
+        scores = self.matrix @ self.normalize(embedding)
+        mask = scores >= threshold
+        if agent_id:
+            mask &= np.asarray(self.agent_ids) == agent_id
+
+        candidates = np.flatnonzero(mask)
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        if limit is not None:
+            candidates = candidates[:limit]
+
+        return [(self.ids[i], self.names[i], round(float(scores[i]), 4)) for i in candidates]
+
+
+class MemoryGraph:
+    """
+    Embedded graph store backed by SQLite adjacency tables.
+
+    Entity embeddings are persisted alongside the entities and loaded lazily into a
+    per-user `EntityIndex`, so node lookups do not leave the process.
+    """
+
+    def __init__(self, config):
+        self.config = config
+
+        graph_dir = self.config.graph_store.config.path or os.path.join(mem0_dir, "graph")
+        os.makedirs(graph_dir, exist_ok=True)
+        self.db_path = os.path.join(graph_dir, "graph.db")
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self._lock = threading.RLock()
+        self._indexes = {}
+        self._create_tables()
+
+        self.embedding_model = EmbedderFactory.create(
+            self.config.embedder.provider, self.config.embedder.config, self.config.vector_store.config
+        )
+
+        self.llm_provider = "openai_structured"
+        if self.config.llm.provider:
+            self.llm_provider = self.config.llm.provider
+        if self.config.graph_store.llm:
+            self.llm_provider = self.config.graph_store.llm.provider
+
+        self.llm = LlmFactory.create(self.llm_provider, self.config.llm.config)
+        self.user_id = None
+        self.threshold = 0.7
+
+    def _create_tables(self):
+        with self._lock:
+            self.connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS entities (
+                    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id     TEXT NOT NULL,
+                    agent_id    TEXT NOT NULL DEFAULT '',
+                    name        TEXT NOT NULL,
+                    entity_type TEXT,
+                    embedding   BLOB,
+                    mentions    INTEGER NOT NULL DEFAULT 1,
+                    created_at  DATETIME,
+                    UNIQUE (user_id, agent_id, name)
+                );
+
+                CREATE TABLE IF NOT EXISTS relations (
+                    id             INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id        TEXT NOT NULL,
+                    source_id      INTEGER NOT NULL REFERENCES entities(id) ON DELETE CASCADE,
+                    relationship   TEXT NOT NULL,
+                    destination_id INTEGER NOT NULL REFERENCES entities(id) ON DELETE CASCADE,
+                    mentions       INTEGER NOT NULL DEFAULT 1,
+                    created_at     DATETIME,
+                    UNIQUE (source_id, relationship, destination_id)
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_relations_source ON relations (source_id);
+                CREATE INDEX IF NOT EXISTS idx_relations_destination ON relations (destination_id);
+                CREATE INDEX IF NOT EXISTS idx_relations_user ON relations (user_id);
+                """
+            )
+            self.connection.commit()
+
+    def _get_index(self, user_id):
+        """Return the entity index for `user_id`, loading it from SQLite on first use."""
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is None:
+                rows = self.connection.execute(
+                    "SELECT id, agent_id, name, embedding FROM entities WHERE user_id = ? AND embedding IS NOT NULL",
+                    (user_id,),
+                ).fetchall()
+                index = EntityIndex(
+                    ids=[row[0] for row in rows],
+                    agent_ids=[row[1] for row in rows],
+                    names=[row[2] for row in rows],
+                    embeddings=[np.frombuffer(row[3], dtype=np.float32) for row in rows],
+                )
+                self._indexes[user_id] = index
+            return index
+
+    def add(self, data, filters):
+        """
+        Adds data to the graph.
+
+        Args:
+            data (str): The data to add to the graph.
+            filters (dict): A dictionary containing filters to be applied during the addition.
+        """
+        if self.config.graph_store.extraction_mode == "fused":
+            entity_type_map, to_be_added = self._retrieve_nodes_relations_from_data(data, filters)
+        else:
+            entity_type_map = self._retrieve_nodes_from_data(data, filters)
+            to_be_added = self._establish_nodes_relations_from_data(data, filters, entity_type_map)
+        search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
+        to_be_deleted = self._get_delete_entities_from_search_output(search_output, data, filters)
+
+        deleted_entities = self._delete_entities(to_be_deleted, filters)
+        added_entities = self._add_entities(to_be_added, filters, entity_type_map)
+
+        return {"deleted_entities": deleted_entities, "added_entities": added_entities}
+
+    def search(self, query, filters, limit=100):
+        """
+        Search for memories and related graph data.
+
+        Args:
+            query (str): Query to search for.
+            filters (dict): A dictionary containing filters to be applied during the search.
+            limit (int): The maximum number of nodes and relationships to retrieve. Defaults to 100.
+
+        Returns:
+            dict: A dictionary containing:
+                - "contexts": List of search results from the base data store.
+                - "entities": List of related graph data based on the query.
+        """
+        if self.config.graph_store.search_mode == "fast":
+            node_list = self._retrieve_nodes_from_query(query, filters)
+        else:
+            node_list = list(self._retrieve_nodes_from_data(query, filters).keys())
+        search_output = self._search_graph_db(node_list=node_list, filters=filters)
+
+        if not search_output:
+            return []
+
+        search_results = rerank_relations(query, search_output, top_n=self.config.graph_store.rerank_top_n)
+
+        logger.info(f"Returned {len(search_results)} search results")
+
+        return search_results
+
+    def delete_all(self, filters):
+        """Delete all nodes and relationships for a user or specific agent."""
+        with self._lock:
+            if filters.get("agent_id"):
+                self.connection.execute(
+                    "DELETE FROM entities WHERE user_id = ? AND agent_id = ?",
+                    (filters["user_id"], filters["agent_id"]),
+                )
+            else:
+                self.connection.execute("DELETE FROM entities WHERE user_id = ?", (filters["user_id"],))
+            self.connection.commit()
+            self._indexes.pop(filters["user_id"], None)
+
+    def get_all(self, filters, limit=100):
+        """
+        Retrieves all nodes and relationships from the graph database based on optional filtering criteria.
+         Args:
+            filters (dict): A dictionary containing filters to be applied during the retrieval.
+            limit (int): The maximum number of nodes and relationships to retrieve. Defaults to 100.
+        Returns:
+            list: A list of dictionaries, each containing:
+                - 'contexts': The base data store response for each memory.
+                - 'entities': A list of strings representing the nodes and relationships
+        """
+        agent_filter = ""
+        params = [filters["user_id"]]
+        if filters.get("agent_id"):
+            agent_filter = "AND n.agent_id = ? AND m.agent_id = ?"
+            params.extend([filters["agent_id"], filters["agent_id"]])
+        params.append(limit)
+
+        query = f"""
+            SELECT n.name, r.relationship, m.name
+            FROM relations r
+            JOIN entities n ON n.id = r.source_id
+            JOIN entities m ON m.id = r.destination_id
+            WHERE r.user_id = ? {agent_filter}
+            ORDER BY r.id
+            LIMIT ?
+        """
+        with self._lock:
+            results = self.connection.execute(query, params).fetchall()
+
+        final_results = []
+        for source, relationship, target in results:
+            final_results.append(
+                {
+                    "source": source,
+                    "relationship": relationship,
+                    "target": target,
+                }
+            )
+
+        logger.info(f"Retrieved {len(final_results)} relationships")
+
+        return final_results
+
+    def _retrieve_nodes_from_data(self, data, filters):
+        """Extracts all the entities mentioned in the query."""
+        _tools = [EXTRACT_ENTITIES_TOOL]
+        if self.llm_provider in ["azure_openai_structured", "openai_structured"]:
+            _tools = [EXTRACT_ENTITIES_STRUCT_TOOL]
+        search_results = self.llm.generate_response(
+            messages=[
+                {
+                    "role": "system",
+                    "content": f"You are a smart assistant who understands entities and their types in a given text. If user message contains self reference such as 'I', 'me', 'my' etc. then use {filters['user_id']} as the source entity. Extract all the entities from the text. ***DO NOT*** answer the question itself if the given text is a question.",
+                },
+                {"role": "user", "content": data},
+            ],
+            tools=_tools,
+        )
+
+        entity_type_map = {}
+
+        try:
+            for tool_call in search_results["tool_calls"]:
+                if tool_call["name"] != "extract_entities":
+                    continue
+                for item in tool_call["arguments"]["entities"]:
+                    entity_type_map[item["entity"]] = item["entity_type"]
+        except Exception as e:
+            logger.exception(
+                f"Error in search tool: {e}, llm_provider={self.llm_provider}, search_results={search_results}"
+            )
+
+        entity_type_map = {k.lower().replace(" ", "_"): v.lower().replace(" ", "_") for k, v in entity_type_map.items()}
+        logger.debug(f"Entity type map: {entity_type_map}\n search_results={search_results}")
+        return entity_type_map
+
+    def _establish_nodes_relations_from_data(self, data, filters, entity_type_map):
+        """Establish relations among the extracted nodes."""
+
+        # Compose user identification string for prompt
+        user_identity = f"user_id: {filters['user_id']}"
+        if filters.get("agent_id"):
+            user_identity += f", agent_id: {filters['agent_id']}"
+
+        if self.config.graph_store.custom_prompt:
+            system_content = EXTRACT_RELATIONS_PROMPT.replace("USER_ID", user_identity)
+            # Add the custom prompt line if configured
+            system_content = system_content.replace("CUSTOM_PROMPT", f"4. {self.config.graph_store.custom_prompt}")
+            messages = [
+                {"role": "system", "content": system_content},
+                {"role": "user", "content": data},
+            ]
+        else:
+            system_content = EXTRACT_RELATIONS_PROMPT.replace("USER_ID", user_identity)
+            messages = [
+                {"role": "system", "content": system_content},
+                {"role": "user", "content": f"List of entities: {list(entity_type_map.keys())}. \n\nText: {data}"},
+            ]
+
+        _tools = [RELATIONS_TOOL]
+        if self.llm_provider in ["azure_openai_structured", "openai_structured"]:
+            _tools = [RELATIONS_STRUCT_TOOL]
+
+        extracted_entities = self.llm.generate_response(
+            messages=messages,
+            tools=_tools,
+        )
+
+        entities = []
+        if extracted_entities.get("tool_calls"):
+            entities = extracted_entities["tool_calls"][0].get("arguments", {}).get("entities", [])
+
+        entities = self._remove_spaces_from_entities(entities)
+        logger.debug(f"Extracted entities: {entities}")
+        return entities
+
+    def _retrieve_nodes_from_query(self, query, filters):
+        """Match the query against the stored entity names and embeddings without an LLM call."""
+        entity_names = self._get_entity_names(filters)
+        if not entity_names:
+            return []
+
+        node_list = match_entity_names(query, entity_names, user_id=filters["user_id"])
+        # The query embedding is matched against the entity embeddings alongside any matched names
+        return node_list + [query]
+
+    def _get_entity_names(self, filters):
+        """Return the names of all entities stored for the user (and agent, if given)."""
+        index = self._get_index(filters["user_id"])
+        agent_id = filters.get("agent_id")
+        with self._lock:
+            return [
+                name
+                for name, entity_agent_id in zip(index.names, index.agent_ids)
+                if not agent_id or entity_agent_id == agent_id
+            ]
+
+    def _retrieve_nodes_relations_from_data(self, data, filters):
+        """Extract entities and the relations among them with a single LLM call."""
+
+        # Compose user identification string for prompt
+        user_identity = f"user_id: {filters['user_id']}"
+        if filters.get("agent_id"):
+            user_identity += f", agent_id: {filters['agent_id']}"
+
+        system_prompt, user_prompt = get_extract_entities_relations_messages(
+            data, user_identity, self.config.graph_store.custom_prompt
+        )
+
+        _tools = [EXTRACT_ENTITIES_RELATIONS_TOOL]
+        if self.llm_provider in ["azure_openai_structured", "openai_structured"]:
+            _tools = [EXTRACT_ENTITIES_RELATIONS_STRUCT_TOOL]
+
+        extracted = self.llm.generate_response(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            tools=_tools,
+        )
+
+        entity_type_map, relations = parse_entities_relations_response(extracted)
+        relations = self._remove_spaces_from_entities(relations)
+        logger.debug(f"Entity type map: {entity_type_map}\n Extracted relations: {relations}")
+        return entity_type_map, relations
+
+    def _search_graph_db(self, node_list, filters, limit=100):
+        """Search similar nodes among and their respective incoming and outgoing relations."""
+        result_relations = []
+        index = self._get_index(filters["user_id"])
+        agent_id = filters.get("agent_id")
+
+        agent_filter = ""
+        if agent_id:
+            agent_filter = "AND n.agent_id = ? AND m.agent_id = ?"
+
+        for node in node_list:
+            n_embedding = self.embedding_model.embed(node)
+            with self._lock:
+                matches = index.search(n_embedding, self.threshold, agent_id=agent_id)
+            if not matches:
+                continue
+
+            similarity = {entity_id: score for entity_id, _, score in matches}
+            placeholders = ", ".join("?" for _ in similarity)
+            params = list(similarity) + list(similarity) + [filters["user_id"]]
+            if agent_id:
+                params.extend([agent_id, agent_id])
+
+            query = f"""
+                SELECT n.name, n.id, r.relationship, r.id, m.name, m.id
+                FROM relations r
+                JOIN entities n ON n.id = r.source_id
+                JOIN entities m ON m.id = r.destination_id
+                WHERE (r.source_id IN ({placeholders}) OR r.destination_id IN ({placeholders}))
+                AND r.user_id = ? {agent_filter}
+            """
+            with self._lock:
+                rows = self.connection.execute(query, params).fetchall()
+
+            relations = []
+            for source, source_id, relationship, relation_id, destination, destination_id in rows:
+                relations.append(
+                    {
+                        "source": source,
+                        "source_id": source_id,
+                        "relationship": relationship,
+                        "relation_id": relation_id,
+                        "destination": destination,
+                        "destination_id": destination_id,
+                        "similarity": max(similarity.get(source_id, -1.0), similarity.get(destination_id, -1.0)),
+                    }
+                )
+            relations.sort(key=lambda item: item["similarity"], reverse=True)
+            result_relations.extend(relations[:limit])
+
+        return result_relations
+
+    def _get_delete_entities_from_search_output(self, search_output, data, filters):
+        """Get the entities to be deleted from the search output."""
+        if not search_output:
+            # Nothing in the neighbourhood can conflict with the new data
+            return []
+
+        search_output_string = format_entities(search_output)
+
+        # Compose user identification string for prompt
+        user_identity = f"user_id: {filters['user_id']}"
+        if filters.get("agent_id"):
+            user_identity += f", agent_id: {filters['agent_id']}"
+
+        system_prompt, user_prompt = get_delete_messages(search_output_string, data, user_identity)
+
+        _tools = [DELETE_MEMORY_TOOL_GRAPH]
+        if self.llm_provider in ["azure_openai_structured", "openai_structured"]:
+            _tools = [
+                DELETE_MEMORY_STRUCT_TOOL_GRAPH,
+            ]
+
+        memory_updates = self.llm.generate_response(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            tools=_tools,
+        )
+
+        to_be_deleted = []
+        for item in memory_updates.get("tool_calls", []):
+            if item.get("name") == "delete_graph_memory":
+                to_be_deleted.append(item.get("arguments"))
+        # Clean entities formatting
+        to_be_deleted = self._remove_spaces_from_entities(to_be_deleted)
+        logger.debug(f"Deleted relationships: {to_be_deleted}")
+        return to_be_deleted
+
+    def _delete_entities(self, to_be_deleted, filters):
+        """Delete the entities from the graph."""
+        user_id = filters["user_id"]
+        agent_id = filters.get("agent_id", None)
+        results = []
+
+        for item in to_be_deleted:
+            agent_filter = ""
+            params = [item["source"], user_id, item["destination"], user_id, item["relationship"]]
+            if agent_id:
+                agent_filter = "AND n.agent_id = ? AND m.agent_id = ?"
+                params.extend([agent_id, agent_id])
+
+            with self._lock:
+                rows = self.connection.execute(
+                    f"""
+                    SELECT r.id, n.name, m.name, r.relationship
+                    FROM relations r
+                    JOIN entities n ON n.id = r.source_id
+                    JOIN entities m ON m.id = r.destination_id
+                    WHERE n.name = ? AND n.user_id = ? AND m.name = ? AND m.user_id = ?
+                    AND r.relationship = ? {agent_filter}
+                    """,
+                    params,
+                ).fetchall()
+                self.connection.executemany("DELETE FROM relations WHERE id = ?", [(row[0],) for row in rows])
+                self.connection.commit()
+
+            results.append([{"source": row[1], "target": row[2], "relationship": row[3]} for row in rows])
+
+        return results
+
+    def _add_entities(self, to_be_added, filters, entity_type_map):
+        """Add the new entities to the graph. Merge the nodes if they already exist."""
+        user_id = filters["user_id"]
+        results = []
+        for item in to_be_added:
+            # entities
+            source = item["source"]
+            destination = item["destination"]
+            relationship = item["relationship"]
+
+            # embeddings
+            source_embedding = self.embedding_model.embed(source)
+            dest_embedding = self.embedding_model.embed(destination)
+
+            with self._lock:
+                # reuse the nodes with the closest embeddings, otherwise merge by name
+                source_id, source_name = self._merge_node(
+                    source, entity_type_map.get(source, "__User__"), source_embedding, filters
+                )
+                destination_id, destination_name = self._merge_node(
+                    destination, entity_type_map.get(destination, "__User__"), dest_embedding, filters
+                )
+                self.connection.execute(
+                    """
+                    INSERT INTO relations (user_id, source_id, relationship, destination_id, mentions, created_at)
+                    VALUES (?, ?, ?, ?, 1, ?)
+                    ON CONFLICT (source_id, relationship, destination_id) DO UPDATE SET mentions = mentions + 1
+                    """,
+                    (user_id, source_id, relationship, destination_id, datetime.now(pytz.UTC).isoformat()),
+                )
+                self.connection.commit()
+
+            results.append([{"source": source_name, "relationship": relationship, "target": destination_name}])
+        return results
+
+    def _merge_node(self, name, entity_type, embedding, filters, threshold=0.9):
+        """
+        Return `(entity_id, name)` of the node to attach a relation to, creating it if needed.
+
+        Must be called with `self._lock` held.
+        """
+        user_id = filters["user_id"]
+        agent_id = filters.get("agent_id") or ""
+        index = self._get_index(user_id)
+
+        matches = index.search(embedding, threshold, agent_id=filters.get("agent_id"), limit=1)
+        if matches:
+            entity_id, entity_name, _ = matches[0]
+            self.connection.execute("UPDATE entities SET mentions = mentions + 1 WHERE id = ?", (entity_id,))
+            return entity_id, entity_name
+
+        row = self.connection.execute(
+            "SELECT id, embedding FROM entities WHERE user_id = ? AND agent_id = ? AND name = ?",
+            (user_id, agent_id, name),
+        ).fetchone()
+        vector = EntityIndex.normalize(embedding)
+        if row:
+            self.connection.execute("UPDATE entities SET mentions = mentions + 1 WHERE id = ?", (row[0],))
+            return row[0], name
+
+        cursor = self.connection.execute(
+            """
+            INSERT INTO entities (user_id, agent_id, name, entity_type, embedding, mentions, created_at)
+            VALUES (?, ?, ?, ?, ?, 1, ?)
+            """,
+            (user_id, agent_id, name, entity_type, vector.tobytes(), datetime.now(pytz.UTC).isoformat()),
+        )
+        index.add(cursor.lastrowid, agent_id, name, vector)
+        return cursor.lastrowid, name
+
+    def _remove_spaces_from_entities(self, entity_list):
+        for item in entity_list:
+            item["source"] = item["source"].lower().replace(" ", "_")
+            item["relationship"] = item["relationship"].lower().replace(" ", "_")
+            item["destination"] = item["destination"].lower().replace(" ", "_")
+        return entity_list
+
+    # Reset is not defined in base.py
+    def reset(self):
+        """Reset the graph by clearing all nodes and relationships."""
+        logger.warning("Clearing graph...")
+        with self._lock:
+            self.connection.execute("DELETE FROM relations")
+            self.connection.execute("DELETE FROM entities")
+            self.connection.commit()
+            self._indexes.clear()
+
+    def close(self) -> None:
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+    def __del__(self):
+        self.close()
@@ -9,7 +9,7 @@ import uuid
 import warnings
 from copy import deepcopy
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import pytz
 from pydantic import ValidationError
@@ -21,6 +21,7 @@ from mem0.configs.prompts import (
     get_update_memory_messages,
 )
 from mem0.memory.base import MemoryBase
+from mem0.memory.graph_queue import GraphWriteQueue, graph_config_key
 from mem0.memory.setup import mem0_dir, setup_config
 from mem0.memory.storage import SQLiteManager
 from mem0.memory.telemetry import capture_event
@@ -110,6 +111,59 @@ def _build_filters_and_metadata(
     return base_metadata_template, effective_query_filters
 
 
+def _format_search_results(memories, threshold: Optional[float] = None):
+    """Convert vector store search results to memory dicts, dropping those scoring below `threshold`."""
+    promoted_payload_keys = [
+        "user_id",
+        "agent_id",
+        "run_id",
+        "actor_id",
+        "role",
+    ]
+
+    core_and_promoted_keys = {"data", "hash", "created_at", "updated_at", "id", *promoted_payload_keys}
+
+    original_memories = []
+    for mem in memories:
+        memory_item_dict = MemoryItem(
+            id=mem.id,
+            memory=mem.payload["data"],
+            hash=mem.payload.get("hash"),
+            created_at=mem.payload.get("created_at"),
+            updated_at=mem.payload.get("updated_at"),
+            score=mem.score,
+        ).model_dump()
+
+        for key in promoted_payload_keys:
+            if key in mem.payload:
+                memory_item_dict[key] = mem.payload[key]
+
+        additional_metadata = {k: v for k, v in mem.payload.items() if k not in core_and_promoted_keys}
+        if additional_metadata:
+            memory_item_dict["metadata"] = additional_metadata
+
+        if threshold is None or mem.score >= threshold:
+            original_memories.append(memory_item_dict)
+
+    return original_memories
+
+
+def _prepare_search_batch(queries):
+    """Resolve the query text, effective filters and limit of each request passed to `search_batch`."""
+    texts, all_filters, limits = [], [], []
+    for request in queries:
+        _, effective_filters = _build_filters_and_metadata(
+            user_id=request.get("user_id"),
+            agent_id=request.get("agent_id"),
+            run_id=request.get("run_id"),
+            input_filters=request.get("filters"),
+        )
+        texts.append(request["query"])
+        all_filters.append(effective_filters)
+        limits.append(request.get("limit", 100))
+    return texts, all_filters, limits
+
+
 setup_config()
 logger = logging.getLogger(__name__)
 
@@ -140,6 +194,8 @@ class Memory(MemoryBase):
                 from mem0.memory.memgraph_memory import MemoryGraph
             elif self.config.graph_store.provider == "neptune":
                 from mem0.graphs.neptune.main import MemoryGraph
+            elif self.config.graph_store.provider == "local":
+                from mem0.memory.local_graph_memory import MemoryGraph
             else:
                 from mem0.memory.graph_memory import MemoryGraph
 
@@ -147,6 +203,14 @@ class Memory(MemoryBase):
             self.enable_graph = True
         else:
             self.graph = None
+
+        self.graph_queue = None
+        if self.enable_graph and self.config.graph_store.write_mode == "async":
+            self.graph_queue = GraphWriteQueue(
+                self.graph,
+                os.path.join(mem0_dir, "graph_queue.db"),
+                graph_key=graph_config_key(self.config.graph_store),
+            )
         self.config.vector_store.config.collection_name = "mem0migrations"
         if self.config.vector_store.provider in ["faiss", "qdrant"]:
             provider_path = f"migrations_{self.config.vector_store.provider}"
@@ -457,7 +521,10 @@ class Memory(MemoryBase):
                 filters["user_id"] = "user"
 
             data = "\n".join([msg["content"] for msg in messages if "content" in msg and msg["role"] != "system"])
-            added_entities = self.graph.add(data, filters)
+            if self.graph_queue:
+                self.graph_queue.enqueue(data, filters)
+            else:
+                added_entities = self.graph.add(data, filters)
 
         return added_entities
 
@@ -687,43 +754,50 @@ class Memory(MemoryBase):
         else:
             return {"results": original_memories}
 
-    def _search_vector_store(self, query, filters, limit, threshold: Optional[float] = None):
-        embeddings = self.embedding_model.embed(query, "search")
-        memories = self.vector_store.search(query=query, vectors=embeddings, limit=limit, filters=filters)
-
-        promoted_payload_keys = [
-            "user_id",
-            "agent_id",
-            "run_id",
-            "actor_id",
-            "role",
-        ]
+    def search_batch(self, queries: List[Dict[str, Any]]):
+        """
+        Searches for memories for several queries at once.
 
-        core_and_promoted_keys = {"data", "hash", "created_at", "updated_at", "id", *promoted_payload_keys}
+        All queries are embedded in one batch and looked up with a single multi-query vector store
+        search, which saves a round trip per query compared to calling `search` in a loop.
 
-        original_memories = []
-        for mem in memories:
-            memory_item_dict = MemoryItem(
-                id=mem.id,
-                memory=mem.payload["data"],
-                hash=mem.payload.get("hash"),
-                created_at=mem.payload.get("created_at"),
-                updated_at=mem.payload.get("updated_at"),
-                score=mem.score,
-            ).model_dump()
+        Args:
+            queries (list): Search requests, each a dict with a "query" and optionally the other
+                arguments of `search` (user_id, agent_id, run_id, limit, filters, threshold). Each
+                request must be scoped to at least one of user_id, agent_id or run_id.
 
-            for key in promoted_payload_keys:
-                if key in mem.payload:
-                    memory_item_dict[key] = mem.payload[key]
+        Returns:
+            list: One result per request, in order, in the same format as `search`.
+        """
+        if not queries:
+            return []
+        texts, all_filters, limits = _prepare_search_batch(queries)
+        capture_event(
+            "mem0.search_batch",
+            self,
+            {"count": len(queries), "version": self.api_version, "sync_type": "sync"},
+        )
 
-            additional_metadata = {k: v for k, v in mem.payload.items() if k not in core_and_promoted_keys}
-            if additional_metadata:
-                memory_item_dict["metadata"] = additional_metadata
+        embeddings = self.embedding_model.embed_batch(texts, "search")
+        all_memories = self.vector_store.search_batch(
+            queries=texts, vectors=embeddings, limit=max(limits), filters=all_filters
+        )
+        results = [
+            {"results": _format_search_results(memories[:limit], request.get("threshold"))}
+            for request, memories, limit in zip(queries, all_memories, limits)
+        ]
 
-            if threshold is None or mem.score >= threshold:
-                original_memories.append(memory_item_dict)
+        if self.enable_graph:
+            with concurrent.futures.ThreadPoolExecutor() as executor:
+                relations = list(executor.map(self.graph.search, texts, all_filters, limits))
+            for result, graph_entities in zip(results, relations):
+                result["relations"] = graph_entities
+        return results
 
-        return original_memories
+    def _search_vector_store(self, query, filters, limit, threshold: Optional[float] = None):
+        embeddings = self.embedding_model.embed(query, "search")
+        memories = self.vector_store.search(query=query, vectors=embeddings, limit=limit, filters=filters)
+        return _format_search_results(memories, threshold)
 
     def update(self, memory_id, data):
         """
@@ -785,6 +859,8 @@ class Memory(MemoryBase):
         logger.info(f"Deleted {len(memories)} memories")
 
         if self.enable_graph:
+            if self.graph_queue:
+                self.graph_queue.discard(filters.get("user_id"), filters.get("agent_id"), filters.get("run_id"))
             self.graph.delete_all(filters)
 
         return {"message": "Memories deleted successfully!"}
@@ -965,6 +1041,42 @@ class Memory(MemoryBase):
             )
         capture_event("mem0.reset", self, {"sync_type": "sync"})
 
+    def pending_graph_ops(self):
+        """
+        Count graph operations queued but not yet applied, and those given up on after repeated failures.
+
+        Only non-zero when `graph_store.write_mode` is "async".
+
+        Returns:
+            dict: `pending` (queued, in progress or awaiting a retry) and `failed` operation counts.
+        """
+        if not self.graph_queue:
+            return {"pending": 0, "failed": 0}
+        return {"pending": self.graph_queue.pending(), "failed": self.graph_queue.failed()}
+
+    def flush(self, timeout: Optional[float] = None):
+        """
+        Wait until all queued graph operations have been applied.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait. Defaults to None (wait indefinitely).
+
+        Returns:
+            bool: True if the queue drained, False if the timeout elapsed first.
+        """
+        return self.graph_queue.flush(timeout=timeout) if self.graph_queue else True
+
+    def close(self):
+        """
+        Stop the graph write queue and close the history database.
+
+        Graph operations already being applied are waited for; those still queued stay on disk and
+        are applied by the next Memory using the same graph store.
+        """
+        if self.graph_queue:
+            self.graph_queue.close()
+        self.db.close()
+
     def chat(self, query):
         raise NotImplementedError("Chat function not implemented yet.")
 
@@ -989,13 +1101,28 @@ class AsyncMemory(MemoryBase):
         self.enable_graph = False
 
         if self.config.graph_store.config:
-            from mem0.memory.graph_memory import MemoryGraph
+            if self.config.graph_store.provider == "memgraph":
+                from mem0.memory.memgraph_memory import MemoryGraph
+            elif self.config.graph_store.provider == "neptune":
+                from mem0.graphs.neptune.main import MemoryGraph
+            elif self.config.graph_store.provider == "local":
+                from mem0.memory.local_graph_memory import MemoryGraph
+            else:
+                from mem0.memory.graph_memory import MemoryGraph
 
             self.graph = MemoryGraph(self.config)
             self.enable_graph = True
         else:
             self.graph = None
 
+        self.graph_queue = None
+        if self.enable_graph and self.config.graph_store.write_mode == "async":
+            self.graph_queue = GraphWriteQueue(
+                self.graph,
+                os.path.join(mem0_dir, "graph_queue.db"),
+                graph_key=graph_config_key(self.config.graph_store),
+            )
+
         capture_event("mem0.init", self, {"sync_type": "async"})
 
     @classmethod
@@ -1296,7 +1423,10 @@ class AsyncMemory(MemoryBase):
                 filters["user_id"] = "user"
 
             data = "\n".join([msg["content"] for msg in messages if "content" in msg and msg["role"] != "system"])
-            added_entities = await asyncio.to_thread(self.graph.add, data, filters)
+            if self.graph_queue:
+                await asyncio.to_thread(self.graph_queue.enqueue, data, filters)
+            else:
+                added_entities = await asyncio.to_thread(self.graph.add, data, filters)
 
         return added_entities
 
@@ -1532,45 +1662,58 @@ class AsyncMemory(MemoryBase):
         else:
             return {"results": original_memories}
 
-    async def _search_vector_store(self, query, filters, limit, threshold: Optional[float] = None):
-        embeddings = await asyncio.to_thread(self.embedding_model.embed, query, "search")
-        memories = await asyncio.to_thread(
-            self.vector_store.search, query=query, vectors=embeddings, limit=limit, filters=filters
-        )
-
-        promoted_payload_keys = [
-            "user_id",
-            "agent_id",
-            "run_id",
-            "actor_id",
-            "role",
-        ]
+    async def search_batch(self, queries: List[Dict[str, Any]]):
+        """
+        Searches for memories for several queries at once.
 
-        core_and_promoted_keys = {"data", "hash", "created_at", "updated_at", "id", *promoted_payload_keys}
+        All queries are embedded in one batch and looked up with a single multi-query vector store
+        search, which saves a round trip per query compared to calling `search` in a loop.
 
-        original_memories = []
-        for mem in memories:
-            memory_item_dict = MemoryItem(
-                id=mem.id,
-                memory=mem.payload["data"],
-                hash=mem.payload.get("hash"),
-                created_at=mem.payload.get("created_at"),
-                updated_at=mem.payload.get("updated_at"),
-                score=mem.score,
-            ).model_dump()
+        Args:
+            queries (list): Search requests, each a dict with a "query" and optionally the other
+                arguments of `search` (user_id, agent_id, run_id, limit, filters, threshold). Each
+                request must be scoped to at least one of user_id, agent_id or run_id.
 
-            for key in promoted_payload_keys:
-                if key in mem.payload:
-                    memory_item_dict[key] = mem.payload[key]
+        Returns:
+            list: One result per request, in order, in the same format as `search`.
+        """
+        if not queries:
+            return []
+        texts, all_filters, limits = _prepare_search_batch(queries)
+        capture_event(
+            "mem0.search_batch",
+            self,
+            {"count": len(queries), "version": self.api_version, "sync_type": "async"},
+        )
 
-            additional_metadata = {k: v for k, v in mem.payload.items() if k not in core_and_promoted_keys}
-            if additional_metadata:
-                memory_item_dict["metadata"] = additional_metadata
+        embeddings = await asyncio.to_thread(self.embedding_model.embed_batch, texts, "search")
+        all_memories = await asyncio.to_thread(
+            self.vector_store.search_batch, queries=texts, vectors=embeddings, limit=max(limits), filters=all_filters
+        )
+        results = [
+            {"results": _format_search_results(memories[:limit], request.get("threshold"))}
+            for request, memories, limit in zip(queries, all_memories, limits)
+        ]
 
-            if threshold is None or mem.score >= threshold:
-                original_memories.append(memory_item_dict)
+        if self.enable_graph:
+            relations = await asyncio.gather(
+                *(
+                    self.graph.search(text, filters, limit)
+                    if asyncio.iscoroutinefunction(self.graph.search)
+                    else asyncio.to_thread(self.graph.search, text, filters, limit)
+                    for text, filters, limit in zip(texts, all_filters, limits)
+                )
+            )
+            for result, graph_entities in zip(results, relations):
+                result["relations"] = graph_entities
+        return results
 
-        return original_memories
+    async def _search_vector_store(self, query, filters, limit, threshold: Optional[float] = None):
+        embeddings = await asyncio.to_thread(self.embedding_model.embed, query, "search")
+        memories = await asyncio.to_thread(
+            self.vector_store.search, query=query, vectors=embeddings, limit=limit, filters=filters
+        )
+        return _format_search_results(memories, threshold)
 
     async def update(self, memory_id, data):
         """
@@ -1637,6 +1780,10 @@ class AsyncMemory(MemoryBase):
         logger.info(f"Deleted {len(memories[0])} memories")
 
         if self.enable_graph:
+            if self.graph_queue:
+                await asyncio.to_thread(
+                    self.graph_queue.discard, filters.get("user_id"), filters.get("agent_id"), filters.get("run_id")
+                )
             await asyncio.to_thread(self.graph.delete_all, filters)
 
         return {"message": "Memories deleted successfully!"}
@@ -1842,5 +1989,43 @@ class AsyncMemory(MemoryBase):
         )
         capture_event("mem0.reset", self, {"sync_type": "async"})
 
+    def pending_graph_ops(self):
+        """
+        Count graph operations queued but not yet applied, and those given up on after repeated failures.
+
+        Only non-zero when `graph_store.write_mode` is "async".
+
+        Returns:
+            dict: `pending` (queued, in progress or awaiting a retry) and `failed` operation counts.
+        """
+        if not self.graph_queue:
+            return {"pending": 0, "failed": 0}
+        return {"pending": self.graph_queue.pending(), "failed": self.graph_queue.failed()}
+
+    async def flush(self, timeout: Optional[float] = None):
+        """
+        Wait until all queued graph operations have been applied.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait. Defaults to None (wait indefinitely).
+
+        Returns:
+            bool: True if the queue drained, False if the timeout elapsed first.
+        """
+        if not self.graph_queue:
+            return True
+        return await asyncio.to_thread(self.graph_queue.flush, timeout)
+
+    async def close(self):
+        """
+        Stop the graph write queue and close the history database.
+
+        Graph operations already being applied are waited for; those still queued stay on disk and
+        are applied by the next Memory using the same graph store.
+        """
+        if self.graph_queue:
+            await asyncio.to_thread(self.graph_queue.close)
+        await asyncio.to_thread(self.db.close)
+
     async def chat(self, query):
         raise NotImplementedError("Chat function not implemented yet.")
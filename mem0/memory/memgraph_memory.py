@@ -7,20 +7,25 @@ try:
 except ImportError:
     raise ImportError("langchain_memgraph is not installed. Please install it using pip install langchain-memgraph")
 
-try:
-    from rank_bm25 import BM25Okapi
-except ImportError:
-    raise ImportError("rank_bm25 is not installed. Please install it using pip install rank-bm25")
-
+from mem0.graphs.rerank import rerank_relations
 from mem0.graphs.tools import (
     DELETE_MEMORY_STRUCT_TOOL_GRAPH,
     DELETE_MEMORY_TOOL_GRAPH,
+    EXTRACT_ENTITIES_RELATIONS_STRUCT_TOOL,
+    EXTRACT_ENTITIES_RELATIONS_TOOL,
     EXTRACT_ENTITIES_STRUCT_TOOL,
     EXTRACT_ENTITIES_TOOL,
     RELATIONS_STRUCT_TOOL,
     RELATIONS_TOOL,
 )
-from mem0.graphs.utils import EXTRACT_RELATIONS_PROMPT, get_delete_messages
+from mem0.graphs.utils import (
+    EXTRACT_RELATIONS_PROMPT,
+    EntityNameCache,
+    get_delete_messages,
+    get_extract_entities_relations_messages,
+    match_entity_names,
+    parse_entities_relations_response,
+)
 from mem0.utils.factory import EmbedderFactory, LlmFactory
 
 logger = logging.getLogger(__name__)
@@ -49,6 +54,7 @@ class MemoryGraph:
         self.llm = LlmFactory.create(self.llm_provider, self.config.llm.config)
         self.user_id = None
         self.threshold = 0.7
+        self.entity_name_cache = EntityNameCache()
 
         # Setup Memgraph:
         # 1. Create vector index (created Entity label on all nodes)
@@ -81,8 +87,11 @@ class MemoryGraph:
             data (str): The data to add to the graph.
             filters (dict): A dictionary containing filters to be applied during the addition.
         """
-        entity_type_map = self._retrieve_nodes_from_data(data, filters)
-        to_be_added = self._establish_nodes_relations_from_data(data, filters, entity_type_map)
+        if self.config.graph_store.extraction_mode == "fused":
+            entity_type_map, to_be_added = self._retrieve_nodes_relations_from_data(data, filters)
+        else:
+            entity_type_map = self._retrieve_nodes_from_data(data, filters)
+            to_be_added = self._establish_nodes_relations_from_data(data, filters, entity_type_map)
         search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
         to_be_deleted = self._get_delete_entities_from_search_output(search_output, data, filters)
 
@@ -90,6 +99,7 @@ class MemoryGraph:
         # TODO: Add more filter support
         deleted_entities = self._delete_entities(to_be_deleted, filters)
         added_entities = self._add_entities(to_be_added, filters, entity_type_map)
+        self.entity_name_cache.invalidate(filters["user_id"])
 
         return {"deleted_entities": deleted_entities, "added_entities": added_entities}
 
@@ -107,23 +117,16 @@ class MemoryGraph:
                 - "contexts": List of search results from the base data store.
                 - "entities": List of related graph data based on the query.
         """
-        entity_type_map = self._retrieve_nodes_from_data(query, filters)
-        search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
+        if self.config.graph_store.search_mode == "fast":
+            node_list = self._retrieve_nodes_from_query(query, filters)
+        else:
+            node_list = list(self._retrieve_nodes_from_data(query, filters).keys())
+        search_output = self._search_graph_db(node_list=node_list, filters=filters)
 
         if not search_output:
             return []
 
-        search_outputs_sequence = [
-            [item["source"], item["relationship"], item["destination"]] for item in search_output
-        ]
-        bm25 = BM25Okapi(search_outputs_sequence)
-
-        tokenized_query = query.split(" ")
-        reranked_results = bm25.get_top_n(tokenized_query, search_outputs_sequence, n=5)
-
-        search_results = []
-        for item in reranked_results:
-            search_results.append({"source": item[0], "relationship": item[1], "destination": item[2]})
+        search_results = rerank_relations(query, search_output, top_n=self.config.graph_store.rerank_top_n)
 
         logger.info(f"Returned {len(search_results)} search results")
 
@@ -144,6 +147,7 @@ class MemoryGraph:
             """
             params = {"user_id": filters["user_id"]}
         self.graph.query(cypher, params=params)
+        self.entity_name_cache.invalidate(filters["user_id"])
 
     def get_all(self, filters, limit=100):
         """
@@ -265,6 +269,60 @@ class MemoryGraph:
         logger.debug(f"Extracted entities: {entities}")
         return entities
 
+    def _retrieve_nodes_from_query(self, query, filters):
+        """Match the query against the stored entity names and embeddings without an LLM call."""
+        entity_names = self.entity_name_cache.get(filters, self._get_entity_names)
+        if not entity_names:
+            return []
+
+        node_list = match_entity_names(query, entity_names, user_id=filters["user_id"])
+        # The query embedding is matched against the entity embeddings alongside any matched names
+        return node_list + [query]
+
+    def _get_entity_names(self, filters):
+        """Return the names of all entities stored for the user (and agent, if given)."""
+        agent_filter = ""
+        params = {"user_id": filters["user_id"]}
+        if filters.get("agent_id"):
+            agent_filter = "AND n.agent_id = $agent_id"
+            params["agent_id"] = filters["agent_id"]
+
+        cypher = f"""
+        MATCH (n:Entity)
+        WHERE n.user_id = $user_id {agent_filter}
+        RETURN DISTINCT n.name AS name
+        """
+        return [result["name"] for result in self.graph.query(cypher, params=params)]
+
+    def _retrieve_nodes_relations_from_data(self, data, filters):
+        """Extract entities and the relations among them with a single LLM call."""
+
+        # Compose user identification string for prompt
+        user_identity = f"user_id: {filters['user_id']}"
+        if filters.get("agent_id"):
+            user_identity += f", agent_id: {filters['agent_id']}"
+
+        system_prompt, user_prompt = get_extract_entities_relations_messages(
+            data, user_identity, self.config.graph_store.custom_prompt
+        )
+
+        _tools = [EXTRACT_ENTITIES_RELATIONS_TOOL]
+        if self.llm_provider in ["azure_openai_structured", "openai_structured"]:
+            _tools = [EXTRACT_ENTITIES_RELATIONS_STRUCT_TOOL]
+
+        extracted = self.llm.generate_response(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            tools=_tools,
+        )
+
+        entity_type_map, relations = parse_entities_relations_response(extracted)
+        relations = self._remove_spaces_from_entities(relations)
+        logger.debug(f"Entity type map: {entity_type_map}\n Extracted relations: {relations}")
+        return entity_type_map, relations
+
     def _search_graph_db(self, node_list, filters, limit=100):
         """Search similar nodes among and their respective incoming and outgoing relations."""
         result_relations = []
@@ -338,6 +396,10 @@ class MemoryGraph:
 
     def _get_delete_entities_from_search_output(self, search_output, data, filters):
         """Get the entities to be deleted from the search output."""
+        if not search_output:
+            # Nothing in the neighbourhood can conflict with the new data
+            return []
+
         search_output_string = format_entities(search_output)
         system_prompt, user_prompt = get_delete_messages(search_output_string, data, filters["user_id"])
 
@@ -1,8 +1,12 @@
 import hashlib
 import re
+from functools import lru_cache
 
 from mem0.configs.prompts import FACT_RETRIEVAL_PROMPT
 
+# Letters and digits in any script; underscores and punctuation separate tokens
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
 
 def get_fact_retrieval_messages(message):
     return FACT_RETRIEVAL_PROMPT, f"Input:\n{message}"
@@ -20,6 +24,18 @@ def parse_messages(messages):
     return response
 
 
+@lru_cache(maxsize=65536)
+def tokenize(text):
+    """
+    Lower-case `text` and split it into alphanumeric tokens.
+
+    Underscores separate tokens, so stored entity and relationship names such as `works_at`
+    tokenize the same way as natural-language text. Results are cached because the same
+    names and queries recur across searches.
+    """
+    return tuple(TOKEN_PATTERN.findall(str(text).lower()))
+
+
 def format_entities(entities):
     if not entities:
         return ""
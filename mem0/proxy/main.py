@@ -1,7 +1,8 @@
+import asyncio
+import json
 import logging
 import subprocess
 import sys
-import threading
 from typing import List, Optional, Union
 
 import httpx
@@ -26,6 +27,8 @@ except ImportError:
 from mem0 import Memory, MemoryClient
 from mem0.configs.prompts import MEMORY_ANSWER_PROMPT
 from mem0.memory.telemetry import capture_client_event, capture_event
+from mem0.proxy.retrieval_cache import RetrievalCache
+from mem0.proxy.write_queue import MemoryWriteQueue, conversation_id
 
 logger = logging.getLogger(__name__)
 
@@ -36,23 +39,43 @@ class Mem0:
         config: Optional[dict] = None,
         api_key: Optional[str] = None,
         host: Optional[str] = None,
+        write_queue_size: int = 1000,
+        write_workers: int = 4,
+        retrieval_cache: Optional[RetrievalCache] = None,
     ):
         if api_key:
             self.mem0_client = MemoryClient(api_key, host)
         else:
             self.mem0_client = Memory.from_config(config) if config else Memory()
 
-        self.chat = Chat(self.mem0_client)
+        self.write_queue = MemoryWriteQueue(self.mem0_client, max_size=write_queue_size, num_workers=write_workers)
+        self.chat = Chat(self.mem0_client, self.write_queue, retrieval_cache)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Flush pending memory writes and stop the background writers."""
+        return self.write_queue.close(timeout)
 
 
 class Chat:
-    def __init__(self, mem0_client):
-        self.completions = Completions(mem0_client)
+    def __init__(
+        self,
+        mem0_client,
+        write_queue: Optional[MemoryWriteQueue] = None,
+        retrieval_cache: Optional[RetrievalCache] = None,
+    ):
+        self.completions = Completions(mem0_client, write_queue, retrieval_cache)
 
 
 class Completions:
-    def __init__(self, mem0_client):
+    def __init__(
+        self,
+        mem0_client,
+        write_queue: Optional[MemoryWriteQueue] = None,
+        retrieval_cache: Optional[RetrievalCache] = None,
+    ):
         self.mem0_client = mem0_client
+        self.write_queue = write_queue or MemoryWriteQueue(mem0_client)
+        self.retrieval_cache = retrieval_cache or RetrievalCache()
 
     def create(
         self,
@@ -110,7 +133,10 @@ class Completions:
             self._async_add_to_memory(messages, user_id, agent_id, run_id, metadata, filters)
             relevant_memories = self._fetch_relevant_memories(messages, user_id, agent_id, run_id, filters, limit)
             logger.debug(f"Retrieved {len(relevant_memories)} relevant memories")
-            prepared_messages[-1]["content"] = self._format_query_with_memories(messages, relevant_memories)
+            prepared_messages[-1] = {
+                **prepared_messages[-1],
+                "content": self._format_query_with_memories(messages, relevant_memories),
+            }
 
         response = litellm.completion(
             model=model,
@@ -149,26 +175,151 @@ class Completions:
             capture_client_event("mem0.chat.create", self.mem0_client)
         return response
 
+    async def acreate(
+        self,
+        model: str,
+        messages: List = [],
+        # Mem0 arguments
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        metadata: Optional[dict] = None,
+        filters: Optional[dict] = None,
+        limit: Optional[int] = 10,
+        # LLM arguments
+        timeout: Optional[Union[float, str, httpx.Timeout]] = None,
+        temperature: Optional[float] = None,
+        top_p: Optional[float] = None,
+        n: Optional[int] = None,
+        stream: Optional[bool] = None,
+        stream_options: Optional[dict] = None,
+        stop=None,
+        max_tokens: Optional[int] = None,
+        presence_penalty: Optional[float] = None,
+        frequency_penalty: Optional[float] = None,
+        logit_bias: Optional[dict] = None,
+        user: Optional[str] = None,
+        # openai v1.0+ new params
+        response_format: Optional[dict] = None,
+        seed: Optional[int] = None,
+        tools: Optional[List] = None,
+        tool_choice: Optional[Union[str, dict]] = None,
+        logprobs: Optional[bool] = None,
+        top_logprobs: Optional[int] = None,
+        parallel_tool_calls: Optional[bool] = None,
+        deployment_id=None,
+        extra_headers: Optional[dict] = None,
+        # soon to be deprecated params by OpenAI
+        functions: Optional[List] = None,
+        function_call: Optional[str] = None,
+        # set api_base, api_version, api_key
+        base_url: Optional[str] = None,
+        api_version: Optional[str] = None,
+        api_key: Optional[str] = None,
+        model_list: Optional[list] = None,  # pass in a list of api_base,keys, etc.
+    ):
+        """Async version of `create`.
+
+        Memory retrieval runs in a worker thread concurrently with queueing the
+        memory write, and is skipped when the conversation's last retrieval can
+        be reused. With `stream=True` the model's stream is returned as soon
+        as the request is sent, so tokens reach the caller as they are generated.
+        """
+        if not any([user_id, agent_id, run_id]):
+            raise ValueError("One of user_id, agent_id, run_id must be provided")
+
+        if not litellm.supports_function_calling(model):
+            raise ValueError(
+                f"Model '{model}' does not support function calling. Please use a model that supports function calling."
+            )
+
+        prepared_messages = self._prepare_messages(messages)
+        if prepared_messages[-1]["role"] == "user":
+            _, relevant_memories = await asyncio.gather(
+                asyncio.to_thread(self._async_add_to_memory, messages, user_id, agent_id, run_id, metadata, filters),
+                self._afetch_relevant_memories(messages, user_id, agent_id, run_id, filters, limit),
+            )
+            logger.debug(f"Retrieved {len(relevant_memories)} relevant memories")
+            prepared_messages[-1] = {
+                **prepared_messages[-1],
+                "content": self._format_query_with_memories(messages, relevant_memories),
+            }
+
+        response = await litellm.acompletion(
+            model=model,
+            messages=prepared_messages,
+            temperature=temperature,
+            top_p=top_p,
+            n=n,
+            timeout=timeout,
+            stream=stream,
+            stream_options=stream_options,
+            stop=stop,
+            max_tokens=max_tokens,
+            presence_penalty=presence_penalty,
+            frequency_penalty=frequency_penalty,
+            logit_bias=logit_bias,
+            user=user,
+            response_format=response_format,
+            seed=seed,
+            tools=tools,
+            tool_choice=tool_choice,
+            logprobs=logprobs,
+            top_logprobs=top_logprobs,
+            parallel_tool_calls=parallel_tool_calls,
+            deployment_id=deployment_id,
+            extra_headers=extra_headers,
+            functions=functions,
+            function_call=function_call,
+            base_url=base_url,
+            api_version=api_version,
+            api_key=api_key,
+            model_list=model_list,
+        )
+        if isinstance(self.mem0_client, Memory):
+            capture_event("mem0.chat.create", self.mem0_client, {"sync_type": "async"})
+        else:
+            capture_client_event("mem0.chat.create", self.mem0_client, {"sync_type": "async"})
+        return response
+
     def _prepare_messages(self, messages: List[dict]) -> List[dict]:
         if not messages or messages[0]["role"] != "system":
             return [{"role": "system", "content": MEMORY_ANSWER_PROMPT}] + messages
-        return messages
+        return list(messages)
 
     def _async_add_to_memory(self, messages, user_id, agent_id, run_id, metadata, filters):
-        def add_task():
-            logger.debug("Adding to memory asynchronously")
-            self.mem0_client.add(
-                messages=messages,
-                user_id=user_id,
-                agent_id=agent_id,
-                run_id=run_id,
-                metadata=metadata,
-                filters=filters,
+        logger.debug("Queueing memory add")
+        self.write_queue.submit(
+            messages,
+            user_id=user_id,
+            agent_id=agent_id,
+            run_id=run_id,
+            metadata=metadata,
+            filters=filters,
+        )
+
+    def _fetch_relevant_memories(self, messages, user_id, agent_id, run_id, filters, limit):
+        key = self._retrieval_key(messages, user_id, agent_id, run_id, filters, limit)
+        relevant_memories = self.retrieval_cache.get(key, messages[-1]["content"])
+        if relevant_memories is None:
+            relevant_memories = self._search_memories(messages, user_id, agent_id, run_id, filters, limit)
+            self.retrieval_cache.set(key, messages[-1]["content"], relevant_memories)
+        return relevant_memories
+
+    async def _afetch_relevant_memories(self, messages, user_id, agent_id, run_id, filters, limit):
+        key = self._retrieval_key(messages, user_id, agent_id, run_id, filters, limit)
+        relevant_memories = self.retrieval_cache.get(key, messages[-1]["content"])
+        if relevant_memories is None:
+            relevant_memories = await asyncio.to_thread(
+                self._search_memories, messages, user_id, agent_id, run_id, filters, limit
             )
+            self.retrieval_cache.set(key, messages[-1]["content"], relevant_memories)
+        return relevant_memories
 
-        threading.Thread(target=add_task, daemon=True).start()
+    def _retrieval_key(self, messages, user_id, agent_id, run_id, filters, limit):
+        return (conversation_id(messages), user_id, agent_id, run_id, json.dumps(filters, sort_keys=True), limit)
 
-    def _fetch_relevant_memories(self, messages, user_id, agent_id, run_id, filters, limit):
+    def _search_memories(self, messages, user_id, agent_id, run_id, filters, limit):
         # Currently, only pass the last 6 messages to the search API to prevent long query
         message_input = [f"{message['role']}: {message['content']}" for message in messages][-6:]
         # TODO: Make it better by summarizing the past conversation
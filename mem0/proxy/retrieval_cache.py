@@ -0,0 +1,56 @@
+import math
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Hashable, Optional
+
+from mem0.memory.utils import tokenize
+
+
+def _similarity(a: Counter, b: Counter) -> float:
+    """Cosine similarity of two term-frequency vectors."""
+    dot = sum(count * b[token] for token, count in a.items() if token in b)
+    if not dot:
+        return 0.0
+    norm = math.sqrt(sum(v * v for v in a.values())) * math.sqrt(sum(v * v for v in b.values()))
+    return dot / norm
+
+
+class RetrievalCache:
+    """Last memory retrieval per conversation, reused while the user's question barely changes.
+
+    Queries are compared by the cosine similarity of their term-frequency
+    vectors, which costs no model call. A cached retrieval is reused when the
+    new query is at least `threshold` similar to the one it was made for and
+    it is younger than `ttl` seconds. At most `max_size` conversations are
+    kept, least recently used first out.
+    """
+
+    def __init__(self, threshold: float = 0.9, ttl: float = 60.0, max_size: int = 1024):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, query: str) -> Optional[Any]:
+        """Return the memories cached for `key` if they were retrieved for a similar query."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            vector, memories, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        if _similarity(Counter(tokenize(query)), vector) < self.threshold:
+            return None
+        return memories
+
+    def set(self, key: Hashable, query: str, memories: Any) -> None:
+        with self._lock:
+            self._entries[key] = (Counter(tokenize(query)), memories, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
@@ -0,0 +1,220 @@
+import atexit
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def conversation_id(messages: List[Dict[str, Any]]) -> str:
+    """Identify the conversation `messages` belong to.
+
+    Chat completion requests resend the whole conversation, so its messages up
+    to and including the first user message are the same on every turn.
+    """
+    end = next((i + 1 for i, message in enumerate(messages) if message.get("role") == "user"), len(messages))
+    opening = json.dumps(messages[:end], sort_keys=True, default=str)
+    return hashlib.sha256(opening.encode()).hexdigest()
+
+
+def _merge_messages(pending: List[Dict[str, Any]], messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge a new turn into the messages already queued for a conversation.
+
+    Chat completion requests usually resend the whole conversation, so when the
+    new messages start with the queued ones only the new messages are kept.
+    Otherwise the new messages are appended.
+    """
+    if messages[: len(pending)] == pending:
+        return list(messages)
+    return pending + list(messages)
+
+
+class MemoryWriteQueue:
+    """Bounded background writer for the proxy's memory adds.
+
+    Writes are queued per conversation (its `conversation_id` together with
+    user_id, agent_id, run_id, metadata and filters) and sent by a fixed pool of worker threads.
+    Turns of a conversation that arrive while an earlier write is still queued
+    or in flight are coalesced into a single `add()`, and writes of the same
+    conversation are never sent concurrently.
+
+    At most `max_size` conversations can be waiting. When the queue is full,
+    `submit` blocks for up to `put_timeout` seconds and then drops the write.
+    Outstanding writes are flushed when the queue is closed, including at
+    interpreter exit.
+    """
+
+    def __init__(self, client, max_size: int = 1000, num_workers: int = 4, put_timeout: float = 0.1):
+        """Initialize the MemoryWriteQueue.
+
+        Args:
+            client: The Memory or MemoryClient used to add memories.
+            max_size: Maximum number of conversations waiting to be written.
+            num_workers: Number of worker threads sending writes.
+            put_timeout: Seconds `submit` waits for room before dropping a write.
+        """
+        self.client = client
+        self.max_size = max_size
+        self.num_workers = num_workers
+        self.put_timeout = put_timeout
+
+        self._queue = deque()
+        self._pending = {}
+        self._in_flight = set()
+        self._changed = threading.Condition()
+        self._workers = []
+        self._closed = False
+        self._stats = {
+            "submitted": 0,
+            "coalesced": 0,
+            "dropped": 0,
+            "added": 0,
+            "failed": 0,
+            "add_latency_total": 0.0,
+            "add_latency_max": 0.0,
+        }
+
+    def submit(
+        self,
+        messages: List[Dict[str, Any]],
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        metadata: Optional[dict] = None,
+        filters: Optional[dict] = None,
+    ) -> bool:
+        """Queue messages to be added to memory.
+
+        Returns:
+            bool: False if the write was dropped because the queue stayed full
+            or the queue is closed.
+        """
+        key = (
+            conversation_id(messages),
+            user_id,
+            agent_id,
+            run_id,
+            json.dumps(metadata, sort_keys=True),
+            json.dumps(filters, sort_keys=True),
+        )
+        with self._changed:
+            if self._closed:
+                self._stats["dropped"] += 1
+                return False
+            self._stats["submitted"] += 1
+            if key in self._pending:
+                self._pending[key]["messages"] = _merge_messages(self._pending[key]["messages"], messages)
+                self._stats["coalesced"] += 1
+                return True
+
+            deadline = time.monotonic() + self.put_timeout
+            while len(self._pending) >= self.max_size and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["dropped"] += 1
+                    logger.warning("Memory write queue is full, dropping write")
+                    return False
+                self._changed.wait(remaining)
+
+            self._pending[key] = {
+                "messages": list(messages),
+                "user_id": user_id,
+                "agent_id": agent_id,
+                "run_id": run_id,
+                "metadata": metadata,
+                "filters": filters,
+            }
+            if key not in self._in_flight:
+                self._queue.append(key)
+            self._ensure_workers()
+            self._changed.notify_all()
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, in-flight writes, counters and add latency in seconds."""
+        with self._changed:
+            stats = dict(self._stats)
+            stats["queue_depth"] = len(self._pending)
+            stats["in_flight"] = len(self._in_flight)
+        total = stats.pop("add_latency_total")
+        completed = stats["added"] + stats["failed"]
+        stats["add_latency_avg"] = total / completed if completed else 0.0
+        return stats
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued write has been sent.
+
+        Returns:
+            bool: True if the queue drained, False if `timeout` elapsed first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._changed:
+            while self._pending or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._changed.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Flush outstanding writes and stop the workers.
+
+        Returns:
+            bool: True if every write was sent before `timeout` elapsed.
+        """
+        flushed = self.flush(timeout)
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+            workers = list(self._workers)
+        for worker in workers:
+            worker.join(timeout)
+        atexit.unregister(self.close)
+        return flushed
+
+    def _ensure_workers(self) -> None:
+        if self._workers:
+            return
+        for i in range(self.num_workers):
+            worker = threading.Thread(target=self._run, name=f"mem0-proxy-writer-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        atexit.register(self.close)
+
+    def _next_write(self):
+        with self._changed:
+            while not self._queue and not self._closed:
+                self._changed.wait()
+            if not self._queue:
+                return None, None
+            key = self._queue.popleft()
+            self._in_flight.add(key)
+            write = self._pending.pop(key)
+            self._changed.notify_all()
+            return key, write
+
+    def _run(self) -> None:
+        while True:
+            key, write = self._next_write()
+            if key is None:
+                return
+            start = time.monotonic()
+            try:
+                self.client.add(**write)
+                outcome = "added"
+            except Exception as e:
+                logger.error(f"Failed to add memory: {e}")
+                outcome = "failed"
+            elapsed = time.monotonic() - start
+            with self._changed:
+                self._stats[outcome] += 1
+                self._stats["add_latency_total"] += elapsed
+                self._stats["add_latency_max"] = max(self._stats["add_latency_max"], elapsed)
+                self._in_flight.discard(key)
+                if key in self._pending:
+                    self._queue.append(key)
+                self._changed.notify_all()
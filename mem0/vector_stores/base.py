@@ -17,6 +17,28 @@ class VectorStoreBase(ABC):
         """Search for similar vectors."""
         pass
 
+    def search_batch(self, queries, vectors, limit=5, filters=None):
+        """
+        Search for several query vectors at once.
+
+        Stores that can run several similarity searches in one round trip override this; the
+        default runs the searches one by one.
+
+        Args:
+            queries (List[str]): Queries.
+            vectors (List[List[float]]): One query vector per query.
+            limit (int, optional): Number of results per query. Defaults to 5.
+            filters (List[Dict], optional): One filter dict per query. Defaults to None.
+
+        Returns:
+            List[list]: Search results for each query, in order.
+        """
+        filters = filters or [None] * len(queries)
+        return [
+            self.search(query=query, vectors=vector, limit=limit, filters=query_filters)
+            for query, vector, query_filters in zip(queries, vectors, filters)
+        ]
+
     @abstractmethod
     def delete(self, vector_id):
         """Delete a vector by ID."""
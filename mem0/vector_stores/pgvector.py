@@ -159,6 +159,48 @@ class PGVector(VectorStoreBase):
         results = self.cur.fetchall()
         return [OutputData(id=str(r[0]), score=float(r[1]), payload=r[2]) for r in results]
 
+    def search_batch(self, queries, vectors, limit=5, filters=None):
+        """
+        Search for several query vectors in a single statement.
+
+        Args:
+            queries (List[str]): Queries.
+            vectors (List[List[float]]): One query vector per query.
+            limit (int, optional): Number of results per query. Defaults to 5.
+            filters (List[Dict], optional): One filter dict per query. Defaults to None.
+
+        Returns:
+            List[list]: Search results for each query, in order.
+        """
+        if not vectors:
+            return []
+        filters = filters or [None] * len(vectors)
+        # Each query's filters are matched the same way as in `search`: payload->>key = str(value).
+        query_filters = [json.dumps({k: str(v) for k, v in (f or {}).items()}) for f in filters]
+
+        self.cur.execute(
+            f"""
+            SELECT q.idx, m.id, m.distance, m.payload
+            FROM unnest(%s::int[], %s::text[], %s::jsonb[]) AS q(idx, vec, filters)
+            CROSS JOIN LATERAL (
+                SELECT id, vector <=> q.vec::vector AS distance, payload
+                FROM {self.collection_name}
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM jsonb_each_text(q.filters) f WHERE payload->>f.key IS DISTINCT FROM f.value
+                )
+                ORDER BY distance
+                LIMIT %s
+            ) m
+            ORDER BY q.idx, m.distance
+        """,
+            (list(range(len(vectors))), [json.dumps(list(v)) for v in vectors], query_filters, limit),
+        )
+
+        results = [[] for _ in vectors]
+        for idx, vector_id, distance, payload in self.cur.fetchall():
+            results[idx].append(OutputData(id=str(vector_id), score=float(distance), payload=payload))
+        return results
+
     def delete(self, vector_id):
         """
         Delete a vector by ID.
@@ -0,0 +1,55 @@
+"""add_categorization_queue
+
+Revision ID: add_categorization_queue
+Revises: afd00efbd06b
+Create Date: 2025-06-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_categorization_queue'
+down_revision: Union[str, None] = 'afd00efbd06b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'categorization_queue',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('memory_id', sa.UUID(), nullable=False),
+        sa.Column('content_hash', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('claim_token', sa.String(), nullable=True),
+        sa.Column('claimed_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['memory_id'], ['memories.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_categorization_queue_memory_id'), 'categorization_queue', ['memory_id'], unique=True)
+    op.create_index(op.f('ix_categorization_queue_content_hash'), 'categorization_queue', ['content_hash'], unique=False)
+    op.create_index(op.f('ix_categorization_queue_status'), 'categorization_queue', ['status'], unique=False)
+    op.create_index(op.f('ix_categorization_queue_claim_token'), 'categorization_queue', ['claim_token'], unique=False)
+    op.create_index(op.f('ix_categorization_queue_created_at'), 'categorization_queue', ['created_at'], unique=False)
+    op.create_index('idx_categorization_status_updated', 'categorization_queue', ['status', 'updated_at'], unique=False)
+    op.create_index('idx_categorization_hash_status', 'categorization_queue', ['content_hash', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_categorization_hash_status', table_name='categorization_queue')
+    op.drop_index('idx_categorization_status_updated', table_name='categorization_queue')
+    op.drop_index(op.f('ix_categorization_queue_created_at'), table_name='categorization_queue')
+    op.drop_index(op.f('ix_categorization_queue_claim_token'), table_name='categorization_queue')
+    op.drop_index(op.f('ix_categorization_queue_status'), table_name='categorization_queue')
+    op.drop_index(op.f('ix_categorization_queue_content_hash'), table_name='categorization_queue')
+    op.drop_index(op.f('ix_categorization_queue_memory_id'), table_name='categorization_queue')
+    op.drop_table('categorization_queue')
@@ -0,0 +1,26 @@
+"""add_memory_keyset_index
+
+Revision ID: add_memory_keyset_index
+Revises: add_categorization_queue
+Create Date: 2025-06-24 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_memory_keyset_index'
+down_revision: Union[str, None] = 'add_categorization_queue'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_memory_user_created', 'memories', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_memory_user_created', table_name='memories')
@@ -0,0 +1,78 @@
+"""add_memory_text_search
+
+Revision ID: add_memory_text_search
+Revises: add_memory_keyset_index
+Create Date: 2025-06-25 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_memory_text_search'
+down_revision: Union[str, None] = 'add_memory_keyset_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        # FTS5 rows need an integer key, and the implicit rowid of memories may be renumbered by
+        # VACUUM, so each memory gets a stable key in memories_fts_keys. The index reads content
+        # through a view instead of storing it twice. The trigram tokenizer keeps ILIKE's
+        # case-insensitive substring matching (SQLite >= 3.34).
+        op.execute(
+            "CREATE TABLE IF NOT EXISTS memories_fts_keys (id INTEGER PRIMARY KEY, memory_id CHAR(32) NOT NULL UNIQUE)"
+        )
+        op.execute("""
+            CREATE VIEW IF NOT EXISTS memories_fts_content AS
+            SELECT k.id AS id, m.content AS content FROM memories_fts_keys k JOIN memories m ON m.id = k.memory_id
+        """)
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5("
+            "content, content='memories_fts_content', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS memories_fts_insert AFTER INSERT ON memories BEGIN
+                INSERT INTO memories_fts_keys(memory_id) VALUES (NEW.id);
+                INSERT INTO memories_fts(rowid, content)
+                    SELECT id, NEW.content FROM memories_fts_keys WHERE memory_id = NEW.id;
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS memories_fts_update AFTER UPDATE OF content ON memories BEGIN
+                INSERT INTO memories_fts(memories_fts, rowid, content)
+                    SELECT 'delete', id, OLD.content FROM memories_fts_keys WHERE memory_id = OLD.id;
+                INSERT INTO memories_fts(rowid, content)
+                    SELECT id, NEW.content FROM memories_fts_keys WHERE memory_id = NEW.id;
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS memories_fts_delete AFTER DELETE ON memories BEGIN
+                INSERT INTO memories_fts(memories_fts, rowid, content)
+                    SELECT 'delete', id, OLD.content FROM memories_fts_keys WHERE memory_id = OLD.id;
+                DELETE FROM memories_fts_keys WHERE memory_id = OLD.id;
+            END
+        """)
+        op.execute("INSERT INTO memories_fts_keys(memory_id) SELECT id FROM memories")
+        op.execute("INSERT INTO memories_fts(memories_fts) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE INDEX IF NOT EXISTS idx_memory_content_trgm ON memories USING gin (content gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS memories_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS memories_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS memories_fts_insert")
+        op.execute("DROP TABLE IF EXISTS memories_fts")
+        op.execute("DROP VIEW IF EXISTS memories_fts_content")
+        op.execute("DROP TABLE IF EXISTS memories_fts_keys")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS idx_memory_content_trgm")
@@ -28,3 +28,35 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_async_database_url(url: str) -> str:
+    """Map a sync database URL to its async driver (aiosqlite / asyncpg), unless it names one already."""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    for prefix in ("postgresql+psycopg2:", "postgresql:", "postgres:"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg:" + url[len(prefix):]
+    return url
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or get_async_database_url(DATABASE_URL)
+
+# Async engine & session, used by endpoints that never leave the event loop
+try:
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    async_engine = create_async_engine(ASYNC_DATABASE_URL)
+    AsyncSessionLocal = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+except ImportError:
+    # The async driver or greenlet isn't installed; endpoints using get_async_db report it when called
+    async_engine = None
+    AsyncSessionLocal = None
+
+
+# Async dependency for FastAPI
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError(f"No async driver is installed for {ASYNC_DATABASE_URL}; install sqlalchemy[asyncio] and aiosqlite or asyncpg")
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -23,12 +23,19 @@ import uuid
 
 from app.database import SessionLocal
 from app.models import Memory, MemoryAccessLog, MemoryState, MemoryStatusHistory
+from app.utils.access_log import access_log_writer
 from app.utils.client_detection import get_enhanced_client_info, is_client_approved
+from app.utils.concurrency import run_blocking, write_executor
 from app.utils.unknown_client_handler import UnknownClientHandler
 from app.utils.db import get_user_and_app
 from app.utils.memory import get_memory_client
-from app.utils.permissions import check_memory_access_permissions
+from app.utils.permissions import (
+    build_vector_search_filter,
+    filter_accessible_memory_ids,
+    get_accessible_memories,
+)
 from app.utils.validation import (
+    prefetch_memories,
     validate_memory_operations, 
     should_use_raw_storage, 
     log_memory_operation_metrics
@@ -38,7 +45,6 @@ from fastapi import FastAPI, Request
 from fastapi.routing import APIRouter
 from mcp.server.fastmcp import FastMCP
 from mcp.server.sse import SseServerTransport
-from qdrant_client import models as qdrant_models
 
 # Load environment variables
 load_dotenv()
@@ -161,6 +167,11 @@ async def add_memories(text: str, infer: bool = True, async_mode: bool = False)
     if not client_name:
         return "Error: client_name not provided"
 
+    # The memory client and the database session block, so run them off the event loop
+    return await run_blocking(_add_memories, uid, client_name, client_info, text, infer, async_mode, executor=write_executor)
+
+
+def _add_memories(uid: str, client_name: str, client_info: dict, text: str, infer: bool = True, async_mode: bool = False) -> str:
     # Get memory client safely
     memory_client = get_memory_client_safe()
     if not memory_client:
@@ -179,17 +190,7 @@ async def add_memories(text: str, infer: bool = True, async_mode: bool = False)
 
             # Check if content should use raw storage (minimal content auto-fallback)
             effective_infer = infer
-            metadata = {
-                "source_app": "openmemory",
-                "mcp_client": client_name,  # Display name
-                "client_identifier": client_info.get('client_identifier', client_name),
-                "client_type": client_info.get('client_type', 'unknown'),
-                "model_name": client_info.get('model_name'),
-                "client_version": client_info.get('client_version'),
-                "endpoint_source": client_info.get('endpoint_source', 'unknown'),
-                "confidence_score": client_info.get('confidence_score', 0),
-                "registry_status": client_info.get('registry_status', 'unknown'),
-            }
+            metadata = _client_metadata(client_name, client_info)
             
             if should_use_raw_storage(text, infer):
                 effective_infer = False
@@ -208,80 +209,11 @@ async def add_memories(text: str, infer: bool = True, async_mode: bool = False)
 
             # Process the response and update database with validation
             if isinstance(response, dict) and 'results' in response:
-                # Apply validation to prevent phantom operations
-                validated_results = validate_memory_operations(response['results'], db, uid)
-                
-                for result in validated_results:
-                    memory_id = uuid.UUID(result['id'])
-                    memory = db.query(Memory).filter(Memory.id == memory_id).first()
-
-                    if result['event'] == 'ADD':
-                        if not memory:
-                            # Include enhanced client information and parameters in metadata
-                            memory_metadata = {
-                                'source_app': 'openmemory',
-                                'mcp_client': client_name,  # Display name
-                                'client_identifier': client_info.get('client_identifier', client_name),
-                                'client_type': client_info.get('client_type', 'unknown'),
-                                'model_name': client_info.get('model_name'),
-                                'client_version': client_info.get('client_version'),
-                                'endpoint_source': client_info.get('endpoint_source', 'unknown'),
-                                'confidence_score': client_info.get('confidence_score', 0),
-                                'registry_status': client_info.get('registry_status', 'unknown'),
-                                'infer': infer,
-                                'async_mode': async_mode
-                            }
-                            memory = Memory(
-                                id=memory_id,
-                                user_id=user.id,
-                                app_id=app.id,
-                                content=result['memory'],
-                                metadata_=memory_metadata,
-                                state=MemoryState.active
-                            )
-                            db.add(memory)
-                        else:
-                            memory.state = MemoryState.active
-                            memory.content = result['memory']
-                            # Update metadata to include enhanced client information and parameters
-                            existing_metadata = memory.metadata_ or {}
-                            existing_metadata.update({
-                                'source_app': 'openmemory',
-                                'mcp_client': client_name,  # Display name
-                                'client_identifier': client_info.get('client_identifier', client_name),
-                                'client_type': client_info.get('client_type', 'unknown'),
-                                'model_name': client_info.get('model_name'),
-                                'client_version': client_info.get('client_version'),
-                                'endpoint_source': client_info.get('endpoint_source', 'unknown'),
-                                'confidence_score': client_info.get('confidence_score', 0),
-                                'registry_status': client_info.get('registry_status', 'unknown'),
-                                'infer': infer,
-                                'async_mode': async_mode
-                            })
-                            memory.metadata_ = existing_metadata
-
-                        # Create history entry
-                        history = MemoryStatusHistory(
-                            memory_id=memory_id,
-                            changed_by=user.id,
-                            old_state=MemoryState.deleted if memory else None,
-                            new_state=MemoryState.active
-                        )
-                        db.add(history)
-
-                    elif result['event'] == 'DELETE':
-                        if memory:
-                            memory.state = MemoryState.deleted
-                            memory.deleted_at = datetime.datetime.now(datetime.UTC)
-                            # Create history entry
-                            history = MemoryStatusHistory(
-                                memory_id=memory_id,
-                                changed_by=user.id,
-                                old_state=MemoryState.active,
-                                new_state=MemoryState.deleted
-                            )
-                            db.add(history)
-
+                _persist_add_results(db, uid, user, app, response['results'], {
+                    **_client_metadata(client_name, client_info),
+                    'infer': infer,
+                    'async_mode': async_mode
+                })
                 db.commit()
 
             return str(response)
@@ -292,6 +224,156 @@ async def add_memories(text: str, infer: bool = True, async_mode: bool = False)
         return f"Error adding to memory: {e}"
 
 
+@mcp.tool(description="Add several memories at once. Use this instead of calling add_memories repeatedly when the user shares multiple separate facts. Pass 'infer=False' when the texts are already summarized facts that don't need LLM inference.")
+async def add_memories_batch(texts: list[str], infer: bool = True, async_mode: bool = False) -> str:
+    uid = user_id_var.get(None)
+    client_name = client_name_var.get(None)
+    client_info = client_info_var.get({})
+
+    if not uid:
+        return "Error: user_id not provided"
+    if not client_name:
+        return "Error: client_name not provided"
+
+    return await run_blocking(_add_memories_batch, uid, client_name, client_info, texts, infer, async_mode, executor=write_executor)
+
+
+def _add_memories_batch(uid: str, client_name: str, client_info: dict, texts: list, infer: bool = True, async_mode: bool = False) -> str:
+    texts = [text for text in texts if text and text.strip()]
+    if not texts:
+        return "Error: no texts provided"
+
+    # Get memory client safely
+    memory_client = get_memory_client_safe()
+    if not memory_client:
+        return "Error: Memory system is currently unavailable. Please try again later."
+
+    try:
+        db = SessionLocal()
+        try:
+            app_id = client_info.get('client_identifier', client_name)
+            user, app = get_user_and_app(db, user_id=uid, app_id=app_id)
+
+            if not app.is_active:
+                return f"Error: App {app.name} is currently paused on OpenMemory. Cannot create new memories."
+
+            # Minimal texts are stored raw, the rest go through one inference call together
+            raw_texts = [text for text in texts if should_use_raw_storage(text, infer)]
+            inferred_texts = [text for text in texts if not should_use_raw_storage(text, infer)]
+
+            results = []
+            if raw_texts:
+                metadata = _client_metadata(client_name, client_info)
+                if infer:
+                    metadata["auto_fallback"] = "true"
+                    metadata["fallback_reason"] = "minimal_content"
+                response = memory_client.add([{"role": "user", "content": text} for text in raw_texts],
+                                             user_id=uid,
+                                             infer=False,
+                                             metadata=metadata)
+                if isinstance(response, dict):
+                    results.extend(response.get('results', []))
+            if inferred_texts:
+                response = memory_client.add([{"role": "user", "content": text} for text in inferred_texts],
+                                             user_id=uid,
+                                             infer=True,
+                                             metadata=_client_metadata(client_name, client_info))
+                if isinstance(response, dict):
+                    results.extend(response.get('results', []))
+
+            _persist_add_results(db, uid, user, app, results, {
+                **_client_metadata(client_name, client_info),
+                'infer': infer,
+                'async_mode': async_mode
+            })
+            db.commit()
+
+            return str({"results": results})
+        finally:
+            db.close()
+    except Exception as e:
+        logging.exception(f"Error adding memories in batch: {e}")
+        return f"Error adding memories in batch: {e}"
+
+
+def _client_metadata(client_name: str, client_info: dict) -> dict:
+    return {
+        "source_app": "openmemory",
+        "mcp_client": client_name,  # Display name
+        "client_identifier": client_info.get('client_identifier', client_name),
+        "client_type": client_info.get('client_type', 'unknown'),
+        "model_name": client_info.get('model_name'),
+        "client_version": client_info.get('client_version'),
+        "endpoint_source": client_info.get('endpoint_source', 'unknown'),
+        "confidence_score": client_info.get('confidence_score', 0),
+        "registry_status": client_info.get('registry_status', 'unknown'),
+    }
+
+
+def _persist_add_results(db, uid: str, user, app, results: list, memory_metadata: dict) -> None:
+    """
+    Mirror mem0 add results into the database without committing.
+
+    Referenced memories are loaded with one IN query and operations are validated against them.
+    History rows are written with a single bulk insert, and the caller commits everything at once.
+    """
+    memories = prefetch_memories(db, results)
+    validated_results = validate_memory_operations(results, db, uid, memories)
+
+    history_rows = []
+    now = datetime.datetime.now(datetime.UTC)
+    for result in validated_results:
+        if result['event'] not in ('ADD', 'DELETE'):
+            continue
+
+        memory_id = uuid.UUID(result['id'])
+        memory = memories.get(memory_id)
+
+        if result['event'] == 'ADD':
+            if not memory:
+                # New memories are recorded as coming back from deleted, as before
+                old_state = MemoryState.deleted
+                memory = Memory(
+                    id=memory_id,
+                    user_id=user.id,
+                    app_id=app.id,
+                    content=result['memory'],
+                    metadata_=dict(memory_metadata),
+                    state=MemoryState.active
+                )
+                db.add(memory)
+                memories[memory_id] = memory
+            else:
+                old_state = memory.state
+                memory.state = MemoryState.active
+                memory.content = result['memory']
+                # Update metadata to include enhanced client information and parameters
+                memory.metadata_ = {**(memory.metadata_ or {}), **memory_metadata}
+            new_state = MemoryState.active
+
+        else:
+            if not memory:
+                continue
+            old_state = memory.state
+            memory.state = MemoryState.deleted
+            memory.deleted_at = now
+            new_state = MemoryState.deleted
+
+        history_rows.append({
+            "id": uuid.uuid4(),
+            "memory_id": memory_id,
+            "changed_by": user.id,
+            "old_state": old_state,
+            "new_state": new_state,
+            "changed_at": now,
+        })
+
+    # Memories must exist before their history rows reference them
+    db.flush()
+    if history_rows:
+        db.execute(MemoryStatusHistory.__table__.insert(), history_rows)
+
+
 @mcp.tool(description="Search through stored memories. This method is called EVERYTIME the user asks anything.")
 async def search_memory(query: str) -> str:
     uid = user_id_var.get(None)
@@ -302,6 +384,10 @@ async def search_memory(query: str) -> str:
     if not client_name:
         return "Error: client_name not provided"
 
+    return await run_blocking(_search_memory, uid, client_name, client_info, query)
+
+
+def _search_memory(uid: str, client_name: str, client_info: dict, query: str) -> str:
     # Get memory client safely
     memory_client = get_memory_client_safe()
     if not memory_client:
@@ -314,20 +400,13 @@ async def search_memory(query: str) -> str:
             app_id = client_info.get('client_identifier', client_name)
             user, app = get_user_and_app(db, user_id=uid, app_id=app_id)
 
-            # Get accessible memory IDs based on ACL
-            user_memories = db.query(Memory).filter(Memory.user_id == user.id).all()
-            accessible_memory_ids = [memory.id for memory in user_memories if check_memory_access_permissions(db, memory, app.id)]
-            
-            conditions = [qdrant_models.FieldCondition(key="user_id", match=qdrant_models.MatchValue(value=uid))]
-            
-            if accessible_memory_ids:
-                # Convert UUIDs to strings for Qdrant
-                accessible_memory_ids_str = [str(memory_id) for memory_id in accessible_memory_ids]
-                conditions.append(qdrant_models.HasIdCondition(has_id=accessible_memory_ids_str))
+            # Push the app's ACL into the Qdrant filter instead of listing every accessible memory ID
+            filters = build_vector_search_filter(db, user.id, uid, app.id)
+            if filters is None:
+                return json.dumps([], indent=2)
 
-            filters = qdrant_models.Filter(must=conditions)
             embeddings = memory_client.embedding_model.embed(query, "search")
-            
+
             hits = memory_client.vector_store.client.query_points(
                 collection_name=memory_client.vector_store.collection_name,
                 query=embeddings,
@@ -335,8 +414,11 @@ async def search_memory(query: str) -> str:
                 limit=10,
             )
 
-            # Process search results
-            memories = hits.points
+            # Drop hits whose memory was deleted (or changed state) since it was indexed
+            accessible_memory_ids = filter_accessible_memory_ids(
+                db, [uuid.UUID(str(point.id)) for point in hits.points], app.id
+            )
+            memories = [point for point in hits.points if uuid.UUID(str(point.id)) in accessible_memory_ids]
             memories = [
                 {
                     "id": memory.id,
@@ -350,40 +432,17 @@ async def search_memory(query: str) -> str:
             ]
 
             # Log memory access for each memory found
-            if isinstance(memories, dict) and 'results' in memories:
-                print(f"Memories: {memories}")
-                for memory_data in memories['results']:
-                    if 'id' in memory_data:
-                        memory_id = uuid.UUID(memory_data['id'])
-                        # Create access log entry
-                        access_log = MemoryAccessLog(
-                            memory_id=memory_id,
-                            app_id=app.id,
-                            access_type="search",
-                            metadata_={
-                                "query": query,
-                                "score": memory_data.get('score'),
-                                "hash": memory_data.get('hash')
-                            }
-                        )
-                        db.add(access_log)
-                db.commit()
-            else:
-                for memory in memories:
-                    memory_id = uuid.UUID(memory['id'])
-                    # Create access log entry
-                    access_log = MemoryAccessLog(
-                        memory_id=memory_id,
-                        app_id=app.id,
-                        access_type="search",
-                        metadata_={
-                            "query": query,
-                            "score": memory.get('score'),
-                            "hash": memory.get('hash')
-                        }
-                    )
-                    db.add(access_log)
-                db.commit()
+            for memory in memories:
+                access_log_writer.record(
+                    memory_id=uuid.UUID(str(memory['id'])),
+                    app_id=app.id,
+                    access_type="search",
+                    metadata={
+                        "query": query,
+                        "score": memory.get('score'),
+                        "hash": memory.get('hash')
+                    }
+                )
             return json.dumps(memories, indent=2)
         finally:
             db.close()
@@ -402,6 +461,10 @@ async def list_memories() -> str:
     if not client_name:
         return "Error: client_name not provided"
 
+    return await run_blocking(_list_memories, uid, client_name, client_info)
+
+
+def _list_memories(uid: str, client_name: str, client_info: dict) -> str:
     # Get memory client safely
     memory_client = get_memory_client_safe()
     if not memory_client:
@@ -419,42 +482,36 @@ async def list_memories() -> str:
             filtered_memories = []
 
             # Filter memories based on permissions
-            user_memories = db.query(Memory).filter(Memory.user_id == user.id).all()
-            accessible_memory_ids = [memory.id for memory in user_memories if check_memory_access_permissions(db, memory, app.id)]
+            accessible_memory_ids = {memory.id for memory in get_accessible_memories(db, user.id, app.id)}
             if isinstance(memories, dict) and 'results' in memories:
                 for memory_data in memories['results']:
                     if 'id' in memory_data:
                         memory_id = uuid.UUID(memory_data['id'])
                         if memory_id in accessible_memory_ids:
                             # Create access log entry
-                            access_log = MemoryAccessLog(
+                            access_log_writer.record(
                                 memory_id=memory_id,
                                 app_id=app.id,
                                 access_type="list",
-                                metadata_={
+                                metadata={
                                     "hash": memory_data.get('hash')
                                 }
                             )
-                            db.add(access_log)
                             filtered_memories.append(memory_data)
-                db.commit()
             else:
                 for memory in memories:
                     memory_id = uuid.UUID(memory['id'])
-                    memory_obj = db.query(Memory).filter(Memory.id == memory_id).first()
-                    if memory_obj and check_memory_access_permissions(db, memory_obj, app.id):
+                    if memory_id in accessible_memory_ids:
                         # Create access log entry
-                        access_log = MemoryAccessLog(
+                        access_log_writer.record(
                             memory_id=memory_id,
                             app_id=app.id,
                             access_type="list",
-                            metadata_={
+                            metadata={
                                 "hash": memory.get('hash')
                             }
                         )
-                        db.add(access_log)
                         filtered_memories.append(memory)
-                db.commit()
             return json.dumps(filtered_memories, indent=2)
         finally:
             db.close()
@@ -473,6 +530,10 @@ async def delete_all_memories() -> str:
     if not client_name:
         return "Error: client_name not provided"
 
+    return await run_blocking(_delete_all_memories, uid, client_name, client_info, executor=write_executor)
+
+
+def _delete_all_memories(uid: str, client_name: str, client_info: dict) -> str:
     # Get memory client safely
     memory_client = get_memory_client_safe()
     if not memory_client:
@@ -485,20 +546,19 @@ async def delete_all_memories() -> str:
             app_id = client_info.get('client_identifier', client_name)
             user, app = get_user_and_app(db, user_id=uid, app_id=app_id)
 
-            user_memories = db.query(Memory).filter(Memory.user_id == user.id).all()
-            accessible_memory_ids = [memory.id for memory in user_memories if check_memory_access_permissions(db, memory, app.id)]
+            accessible_memories = get_accessible_memories(db, user.id, app.id)
 
             # delete the accessible memories only
-            for memory_id in accessible_memory_ids:
+            for memory in accessible_memories:
                 try:
-                    memory_client.delete(memory_id)
+                    memory_client.delete(memory.id)
                 except Exception as delete_error:
-                    logging.warning(f"Failed to delete memory {memory_id} from vector store: {delete_error}")
+                    logging.warning(f"Failed to delete memory {memory.id} from vector store: {delete_error}")
 
             # Update each memory's state and create history entries
             now = datetime.datetime.now(datetime.UTC)
-            for memory_id in accessible_memory_ids:
-                memory = db.query(Memory).filter(Memory.id == memory_id).first()
+            for memory in accessible_memories:
+                memory_id = memory.id
                 # Update memory state
                 memory.state = MemoryState.deleted
                 memory.deleted_at = now
@@ -530,24 +590,8 @@ async def delete_all_memories() -> str:
         return f"Error deleting memories: {e}"
 
 
-# Enhanced endpoint routing for different client types
-@mcp_router.get("/claude-code/sse/{user_id}")
-@mcp_router.get("/claude-desktop/sse/{user_id}")
-@mcp_router.get("/ollama/sse/{user_id}")
-@mcp_router.get("/vscode-claude/sse/{user_id}")
-@mcp_router.get("/vscode-gpt/sse/{user_id}")
-@mcp_router.get("/vscode-{model}/sse/{user_id}")
-@mcp_router.get("/unknown/sse/{user_id}")
-@mcp_router.get("/{client_name}/sse/{user_id}")
-async def handle_sse(request: Request):
-    """Handle SSE connections for a specific user and client with enhanced detection"""
-    # Extract user_id and client_name from path parameters
-    uid = request.path_params.get("user_id")
-    user_token = user_id_var.set(uid or "")
-    base_client_name = request.path_params.get("client_name")
-    
-    # Get enhanced client information
-    endpoint_path = str(request.url.path)
+def _identify_client(request: Request, endpoint_path: str) -> dict:
+    """Detect the connecting client and quarantine it if it is unknown or unapproved."""
     client_info = get_enhanced_client_info(request, endpoint_path)
     
     # Handle unknown/unapproved clients
@@ -566,6 +610,29 @@ async def handle_sse(request: Request):
         except Exception as e:
             logging.error(f"Error handling unknown client: {e}")
             # For now, continue with limited access
+
+    return client_info
+
+
+# Enhanced endpoint routing for different client types
+@mcp_router.get("/claude-code/sse/{user_id}")
+@mcp_router.get("/claude-desktop/sse/{user_id}")
+@mcp_router.get("/ollama/sse/{user_id}")
+@mcp_router.get("/vscode-claude/sse/{user_id}")
+@mcp_router.get("/vscode-gpt/sse/{user_id}")
+@mcp_router.get("/vscode-{model}/sse/{user_id}")
+@mcp_router.get("/unknown/sse/{user_id}")
+@mcp_router.get("/{client_name}/sse/{user_id}")
+async def handle_sse(request: Request):
+    """Handle SSE connections for a specific user and client with enhanced detection"""
+    # Extract user_id and client_name from path parameters
+    uid = request.path_params.get("user_id")
+    user_token = user_id_var.set(uid or "")
+    base_client_name = request.path_params.get("client_name")
+    
+    # Get enhanced client information (registry lookups block, so run them off the event loop)
+    endpoint_path = str(request.url.path)
+    client_info = await run_blocking(_identify_client, request, endpoint_path)
     
     # Set context variables
     enhanced_client_name = f"{client_info['client_type']}"
@@ -1,10 +1,10 @@
 import datetime
 import enum
+import hashlib
 import uuid
 
 import sqlalchemy as sa
 from app.database import Base
-from app.utils.categorization import get_categories_for_memory
 from sqlalchemy import (
     JSON,
     UUID,
@@ -17,9 +17,10 @@ from sqlalchemy import (
     Integer,
     String,
     Table,
+    Text,
     event,
 )
-from sqlalchemy.orm import Session, relationship
+from sqlalchemy.orm import relationship
 
 
 def get_current_utc_time():
@@ -106,6 +107,7 @@ class Memory(Base):
         Index('idx_memory_user_state', 'user_id', 'state'),
         Index('idx_memory_app_state', 'app_id', 'state'),
         Index('idx_memory_user_app', 'user_id', 'app_id'),
+        Index('idx_memory_user_created', 'user_id', 'created_at', 'id'),
     )
 
 
@@ -240,74 +242,68 @@ class ClientSession(Base):
         Index('idx_session_activity', 'last_activity_at'),
     )
 
-def categorize_memory(memory: Memory, db: Session) -> None:
-    """Categorize a memory using OpenAI and store the categories in the database."""
-    try:
-        # Extract infer parameter from memory metadata (defaults to True if not present)
-        infer = True
-        if memory.metadata_ and isinstance(memory.metadata_, dict):
-            infer = memory.metadata_.get('infer', True)
-        
-        # Get categories from OpenAI with processing status
-        categories = get_categories_for_memory(memory.content, infer=infer)
-
-        # Get or create categories in the database
-        for category_name in categories:
-            category = db.query(Category).filter(Category.name == category_name).first()
-            if not category:
-                category = Category(
-                    name=category_name,
-                    description=f"Automatically created category for {category_name}"
-                )
-                db.add(category)
-                db.flush()  # Flush to get the category ID
-
-            # Check if the memory-category association already exists
-            existing = db.execute(
-                memory_categories.select().where(
-                    (memory_categories.c.memory_id == memory.id) &
-                    (memory_categories.c.category_id == category.id)
-                )
-            ).first()
-
-            if not existing:
-                # Create the association
-                db.execute(
-                    memory_categories.insert().values(
-                        memory_id=memory.id,
-                        category_id=category.id
-                    )
-                )
-
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        print(f"Error categorizing memory: {e}")
+class CategorizationTask(Base):
+    """A memory waiting to be categorized. There is one row per memory, reset to pending when its content changes."""
+    __tablename__ = "categorization_queue"
+    id = Column(UUID, primary_key=True, default=lambda: uuid.uuid4())
+    memory_id = Column(UUID, ForeignKey("memories.id"), nullable=False, unique=True, index=True)
+    content_hash = Column(String, nullable=False, index=True)
+    status = Column(String, nullable=False, default="pending", index=True)  # pending, running, done, fallback, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    claim_token = Column(String, nullable=True, index=True)
+    claimed_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=get_current_utc_time, index=True)
+    updated_at = Column(DateTime, default=get_current_utc_time, onupdate=get_current_utc_time)
+
+    __table_args__ = (
+        Index('idx_categorization_status_updated', 'status', 'updated_at'),
+        Index('idx_categorization_hash_status', 'content_hash', 'status'),
+    )
+
+
+def get_content_hash(content: str) -> str:
+    return hashlib.sha256((content or "").encode("utf-8")).hexdigest()
+
+
+def enqueue_categorization(connection, memory_id: uuid.UUID, content: str) -> None:
+    """
+    Queue a memory for categorization on the given connection, inside the caller's transaction.
+
+    The memory's queue row is reset to pending, so a memory is never queued twice.
+    The LLM call happens later in the categorization workers.
+    """
+    table = CategorizationTask.__table__
+    now = get_current_utc_time()
+    values = {
+        "content_hash": get_content_hash(content),
+        "status": "pending",
+        "attempts": 0,
+        "claim_token": None,
+        "claimed_at": None,
+        "last_error": None,
+        "updated_at": now,
+    }
+    updated = connection.execute(table.update().where(table.c.memory_id == memory_id).values(**values)).rowcount
+    if not updated:
+        connection.execute(table.insert().values(id=uuid.uuid4(), memory_id=memory_id, created_at=now, **values))
 
 
 @event.listens_for(Memory, 'after_insert')
 def after_memory_insert(mapper, connection, target):
-    """Trigger categorization after a memory is inserted, unless async_mode is enabled."""
-    # Check if async_mode is enabled in metadata
-    metadata = target.metadata_ or {}
-    if metadata.get('async_mode', False):
-        # Skip immediate categorization for async mode
-        return
-    
-    db = Session(bind=connection)
-    categorize_memory(target, db)
-    db.close()
+    """Queue a new memory for background categorization."""
+    enqueue_categorization(connection, target.id, target.content)
 
 
 @event.listens_for(Memory, 'after_update')
 def after_memory_update(mapper, connection, target):
-    """Trigger categorization after a memory is updated, unless async_mode is enabled."""
-    # Check if async_mode is enabled in metadata
-    metadata = target.metadata_ or {}
-    if metadata.get('async_mode', False):
-        # Skip immediate categorization for async mode
-        return
-        
-    db = Session(bind=connection)
-    categorize_memory(target, db)
-    db.close()
+    """Queue a memory for background categorization again when its content changed."""
+    if sa.inspect(target).attrs.content.history.has_changes():
+        enqueue_categorization(connection, target.id, target.content)
+
+
+@event.listens_for(Memory, 'before_delete')
+def before_memory_delete(mapper, connection, target):
+    """Drop a memory's queue row before the memory itself is deleted."""
+    table = CategorizationTask.__table__
+    connection.execute(table.delete().where(table.c.memory_id == target.id))
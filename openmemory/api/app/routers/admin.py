@@ -79,7 +79,7 @@ class CreateClientRegistryRequest(BaseModel):
 
 # List all client registries
 @router.get("/clients", response_model=Page[ClientRegistryResponse])
-async def list_client_registries(
+def list_client_registries(
     status: Optional[ClientRegistryStatus] = None,
     client_type: Optional[str] = None,
     model_name: Optional[str] = None,
@@ -103,7 +103,7 @@ async def list_client_registries(
 
 # Get specific client registry
 @router.get("/clients/{client_id}", response_model=ClientRegistryResponse)
-async def get_client_registry(
+def get_client_registry(
     client_id: UUID,
     db: Session = Depends(get_db)
 ):
@@ -116,7 +116,7 @@ async def get_client_registry(
 
 # Update client registry
 @router.put("/clients/{client_id}", response_model=ClientRegistryResponse)
-async def update_client_registry(
+def update_client_registry(
     client_id: UUID,
     request: UpdateClientRegistryRequest,
     db: Session = Depends(get_db)
@@ -140,7 +140,7 @@ async def update_client_registry(
 
 # Create new client registry
 @router.post("/clients", response_model=ClientRegistryResponse)
-async def create_client_registry(
+def create_client_registry(
     request: CreateClientRegistryRequest,
     db: Session = Depends(get_db)
 ):
@@ -180,7 +180,7 @@ async def create_client_registry(
 
 # Delete client registry
 @router.delete("/clients/{client_id}")
-async def delete_client_registry(
+def delete_client_registry(
     client_id: UUID,
     db: Session = Depends(get_db)
 ):
@@ -199,7 +199,7 @@ async def delete_client_registry(
 
 # Approve pending clients
 @router.post("/clients/{client_id}/approve")
-async def approve_client(
+def approve_client(
     client_id: UUID,
     db: Session = Depends(get_db)
 ):
@@ -218,7 +218,7 @@ async def approve_client(
 
 # Block client
 @router.post("/clients/{client_id}/block")
-async def block_client(
+def block_client(
     client_id: UUID,
     db: Session = Depends(get_db)
 ):
@@ -237,7 +237,7 @@ async def block_client(
 
 # List client sessions
 @router.get("/sessions", response_model=Page[ClientSessionResponse])
-async def list_client_sessions(
+def list_client_sessions(
     client_registry_id: Optional[UUID] = None,
     user_id: Optional[UUID] = None,
     active_only: bool = Query(False, description="Show only active sessions"),
@@ -261,7 +261,7 @@ async def list_client_sessions(
 
 # Get client activity statistics
 @router.get("/stats/client-activity")
-async def get_client_activity_stats(
+def get_client_activity_stats(
     days: int = Query(30, description="Number of days to analyze"),
     db: Session = Depends(get_db)
 ):
@@ -324,7 +324,7 @@ async def get_client_activity_stats(
 
 # Bulk approve/block clients
 @router.post("/clients/bulk-action")
-async def bulk_client_action(
+def bulk_client_action(
     client_ids: List[UUID],
     action: str = Query(..., regex="^(approve|block)$"),
     db: Session = Depends(get_db)
@@ -352,7 +352,7 @@ async def bulk_client_action(
 
 # Quarantine management endpoints
 @router.get("/quarantine")
-async def list_quarantined_clients():
+def list_quarantined_clients():
     """List all quarantined clients requiring approval."""
     return get_quarantined_clients()
 
@@ -363,7 +363,7 @@ class ApproveQuarantinedClientRequest(BaseModel):
 
 
 @router.post("/quarantine/{client_id}/approve")
-async def approve_quarantined_client_endpoint(
+def approve_quarantined_client_endpoint(
     client_id: UUID,
     request: ApproveQuarantinedClientRequest
 ):
@@ -384,7 +384,7 @@ class BlockQuarantinedClientRequest(BaseModel):
 
 
 @router.post("/quarantine/{client_id}/block")
-async def block_quarantined_client_endpoint(
+def block_quarantined_client_endpoint(
     client_id: UUID,
     request: BlockQuarantinedClientRequest
 ):
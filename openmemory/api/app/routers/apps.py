@@ -3,6 +3,7 @@ from uuid import UUID
 
 from app.database import get_db
 from app.models import App, Memory, MemoryAccessLog, MemoryState
+from app.utils.access_log import access_log_writer
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import desc, func
 from sqlalchemy.orm import Session, joinedload
@@ -18,7 +19,7 @@ def get_app_or_404(db: Session, app_id: UUID) -> App:
 
 # List all apps with filtering
 @router.get("/")
-async def list_apps(
+def list_apps(
     name: Optional[str] = None,
     is_active: Optional[bool] = None,
     sort_by: str = 'name',
@@ -99,13 +100,14 @@ async def list_apps(
 
 # Get app details
 @router.get("/{app_id}")
-async def get_app_details(
+def get_app_details(
     app_id: UUID,
     db: Session = Depends(get_db)
 ):
     app = get_app_or_404(db, app_id)
 
-    # Get memory access statistics
+    # Get memory access statistics, including accesses still buffered in this process
+    access_log_writer.flush()
     access_stats = db.query(
         func.count(MemoryAccessLog.id).label("total_memories_accessed"),
         func.min(MemoryAccessLog.accessed_at).label("first_accessed"),
@@ -124,7 +126,7 @@ async def get_app_details(
 
 # List memories created by app
 @router.get("/{app_id}/memories")
-async def list_app_memories(
+def list_app_memories(
     app_id: UUID,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
@@ -160,13 +162,14 @@ async def list_app_memories(
 
 # List memories accessed by app
 @router.get("/{app_id}/accessed")
-async def list_app_accessed_memories(
+def list_app_accessed_memories(
     app_id: UUID,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     db: Session = Depends(get_db)
 ):
-    
+    access_log_writer.flush()
+
     # Get memories with access counts
     query = db.query(
         Memory,
@@ -212,7 +215,7 @@ async def list_app_accessed_memories(
 
 
 @router.put("/{app_id}")
-async def update_app_details(
+def update_app_details(
     app_id: UUID,
     is_active: bool,
     db: Session = Depends(get_db)
@@ -224,7 +227,7 @@ async def update_app_details(
 
 
 @router.delete("/{app_id}")
-async def delete_app(
+def delete_app(
     app_id: UUID,
     force: bool = False,
     db: Session = Depends(get_db)
@@ -254,6 +257,9 @@ async def delete_app(
                    "Use force=true to delete anyway, or these memories will be permanently lost."
         )
     
+    # Write buffered access logs, so they are counted below and not written after the app is gone
+    access_log_writer.flush()
+
     # Check if app has any access logs (only check if not forcing)
     if not force:
         access_log_count = db.query(MemoryAccessLog).filter(MemoryAccessLog.app_id == app_id).count()
@@ -1,11 +1,14 @@
+import base64
+import json
 import logging
+import math
+import os
 from datetime import UTC, datetime
-from typing import List, Optional, Set
+from typing import List, Optional, Set, Tuple
 from uuid import UUID
 
 from app.database import get_db
 from app.models import (
-    AccessControl,
     App,
     Category,
     Memory,
@@ -13,21 +16,26 @@ from app.models import (
     MemoryState,
     MemoryStatusHistory,
     User,
+    memory_categories,
 )
-from app.schemas import MemoryResponse
+from app.schemas import MemoryCursorPage, MemoryPage, MemoryResponse
+from app.utils.access_log import access_log_writer
 from app.utils.memory import get_memory_client
-from app.utils.background_tasks import schedule_background_categorization
-from app.utils.permissions import check_memory_access_permissions
+from app.utils.permissions import accessible_memory_condition, get_app_access_policy
+from app.utils.text_search import apply_memory_search
 from app.utils.client_detection import get_enhanced_client_info
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi_pagination import Page, Params
 from fastapi_pagination.ext.sqlalchemy import paginate as sqlalchemy_paginate
-from pydantic import BaseModel
-from sqlalchemy import func
-from sqlalchemy.orm import Session, joinedload
+from pydantic import BaseModel, Field
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 router = APIRouter(prefix="/api/v1/memories", tags=["memories"])
 
+# Above this many matching memories, cursor pages report a capped total instead of counting them all
+APPROXIMATE_COUNT_LIMIT = int(os.getenv("APPROXIMATE_COUNT_LIMIT", "10000"))
+
 
 def get_memory_or_404(db: Session, memory_id: UUID) -> Memory:
     memory = db.query(Memory).filter(Memory.id == memory_id).first()
@@ -77,46 +85,157 @@ def update_memory_state(db: Session, memory_id: UUID, new_state: MemoryState, us
 def get_accessible_memory_ids(db: Session, app_id: UUID) -> Set[UUID]:
     """
     Get the set of memory IDs that the app has access to based on app-level ACL rules.
-    Returns all memory IDs if no specific restrictions are found.
+    Returns None if no specific restrictions are found.
+    """
+    return get_app_access_policy(db, app_id).allowed_ids
+
+
+def to_memory_response(memory: Memory) -> MemoryResponse:
+    return MemoryResponse(
+        id=memory.id,
+        content=memory.content,
+        created_at=memory.created_at,
+        state=memory.state.value,
+        app_id=memory.app_id,
+        app_name=memory.app.name if memory.app else "Unknown",
+        categories=[category.name for category in memory.categories],
+        metadata_=memory.metadata_
+    )
+
+
+def build_memory_query(
+    db: Session,
+    user: User,
+    acl_app_id: Optional[UUID] = None,
+    app_ids: Optional[List[UUID]] = None,
+    search_query: Optional[str] = None,
+    category_names: Optional[List[str]] = None,
+    category_ids: Optional[List[UUID]] = None,
+    from_date: Optional[int] = None,
+    to_date: Optional[int] = None,
+    show_archived: bool = False,
+    rank_search: bool = False,
+):
     """
-    # Get app-level access controls
-    app_access = db.query(AccessControl).filter(
-        AccessControl.subject_type == "app",
-        AccessControl.subject_id == app_id,
-        AccessControl.object_type == "memory"
-    ).all()
-
-    # If no app-level rules exist, return None to indicate all memories are accessible
-    if not app_access:
-        return None
-
-    # Initialize sets for allowed and denied memory IDs
-    allowed_memory_ids = set()
-    denied_memory_ids = set()
-
-    # Process app-level rules
-    for rule in app_access:
-        if rule.effect == "allow":
-            if rule.object_id:  # Specific memory access
-                allowed_memory_ids.add(rule.object_id)
-            else:  # All memories access
-                return None  # All memories allowed
-        elif rule.effect == "deny":
-            if rule.object_id:  # Specific memory denied
-                denied_memory_ids.add(rule.object_id)
-            else:  # All memories denied
-                return set()  # No memories accessible
-
-    # Remove denied memories from allowed set
-    if allowed_memory_ids:
-        allowed_memory_ids -= denied_memory_ids
-
-    return allowed_memory_ids
+    Build the query behind the memory list endpoints, with every filter expressed in SQL.
+
+    Category filters use EXISTS instead of a join, so each memory appears once and pages are
+    always full. Categories and apps are loaded with one extra query per page.
+    When `acl_app_id` is given, only memories that app may access are returned.
+    With `rank_search`, the best `search_query` matches come first.
+    """
+    query = db.query(Memory).filter(
+        Memory.user_id == user.id,
+        Memory.state != MemoryState.deleted,
+    )
+
+    # Filter archived memories based on show_archived parameter
+    if not show_archived:
+        query = query.filter(Memory.state != MemoryState.archived)
+
+    if acl_app_id:
+        query = query.filter(accessible_memory_condition(db, acl_app_id))
+
+    if search_query:
+        query = apply_memory_search(db, query, search_query, ranked=rank_search)
+
+    if app_ids:
+        query = query.filter(Memory.app_id.in_(app_ids))
+
+    if category_names:
+        query = query.filter(Memory.categories.any(Category.name.in_(category_names)))
+
+    if category_ids:
+        query = query.filter(Memory.categories.any(Category.id.in_(category_ids)))
+
+    if from_date:
+        query = query.filter(Memory.created_at >= datetime.fromtimestamp(from_date, tz=UTC))
+
+    if to_date:
+        query = query.filter(Memory.created_at <= datetime.fromtimestamp(to_date, tz=UTC))
+
+    return query.options(selectinload(Memory.categories), selectinload(Memory.app))
+
+
+def encode_cursor(memory: Memory) -> str:
+    payload = json.dumps({"created_at": memory.created_at.isoformat(), "id": str(memory.id)})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(payload["created_at"]), UUID(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def approximate_count(query) -> Tuple[int, bool]:
+    """Count the query's rows, stopping at APPROXIMATE_COUNT_LIMIT. Returns (count, capped)."""
+    capped = query.with_entities(Memory.id).order_by(None).limit(APPROXIMATE_COUNT_LIMIT + 1).subquery()
+    count = query.session.query(func.count()).select_from(capped).scalar()
+    if count > APPROXIMATE_COUNT_LIMIT:
+        return APPROXIMATE_COUNT_LIMIT, True
+    return count, False
+
+
+def paginate_memories(
+    query,
+    size: int,
+    page: Optional[int] = None,
+    cursor: Optional[str] = None,
+    keyset_direction: Optional[str] = None,
+) -> MemoryPage:
+    """
+    Get one page of a memory query, by `page` number or after a `cursor`.
+
+    `keyset_direction` ("asc" or "desc") orders the query by (created_at, id) and makes pages
+    return a `next_cursor`; without it the query must already be ordered and cursors are refused.
+    After a cursor each page costs the same however deep it is, unlike page numbers. `total` is
+    exact up to APPROXIMATE_COUNT_LIMIT memories and capped above that, with `total_is_approximate` set.
+    """
+    if cursor and not keyset_direction:
+        raise HTTPException(status_code=400, detail="Cursors require sorting by created_at")
+    total, total_is_approximate = approximate_count(query)
+
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        if keyset_direction == 'desc':
+            query = query.filter(or_(
+                Memory.created_at < created_at,
+                and_(Memory.created_at == created_at, Memory.id < last_id)
+            ))
+        else:
+            query = query.filter(or_(
+                Memory.created_at > created_at,
+                and_(Memory.created_at == created_at, Memory.id > last_id)
+            ))
+    if keyset_direction == 'desc':
+        query = query.order_by(Memory.created_at.desc(), Memory.id.desc())
+    elif keyset_direction:
+        query = query.order_by(Memory.created_at.asc(), Memory.id.asc())
+    if page and not cursor:
+        query = query.offset((page - 1) * size)
+
+    # Fetch one extra row to know whether there is a next page
+    memories = query.limit(size + 1).all()
+    has_more = len(memories) > size
+    memories = memories[:size]
+
+    return MemoryPage(
+        items=[to_memory_response(memory) for memory in memories],
+        next_cursor=encode_cursor(memories[-1]) if has_more and keyset_direction else None,
+        total=total,
+        total_is_approximate=total_is_approximate,
+        size=size,
+        page=None if cursor else page,
+        pages=None if cursor else math.ceil(total / size),
+    )
 
 
 # List all memories with filtering
-@router.get("/", response_model=Page[MemoryResponse])
-async def list_memories(
+@router.get("/", response_model=MemoryPage)
+def list_memories(
     user_id: str,
     app_id: Optional[UUID] = None,
     from_date: Optional[int] = Query(
@@ -134,72 +253,47 @@ async def list_memories(
     search_query: Optional[str] = None,
     sort_column: Optional[str] = Query(None, description="Column to sort by (memory, categories, app_name, created_at)"),
     sort_direction: Optional[str] = Query(None, description="Sort direction (asc or desc)"),
+    cursor: Optional[str] = Query(None, description="The next_cursor of the previous page, instead of a page number"),
     db: Session = Depends(get_db)
 ):
     user = db.query(User).filter(User.user_id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    # Build base query
-    query = db.query(Memory).filter(
-        Memory.user_id == user.id,
-        Memory.state != MemoryState.deleted,
-        Memory.state != MemoryState.archived,
-        Memory.content.ilike(f"%{search_query}%") if search_query else True
+    query = build_memory_query(
+        db,
+        user,
+        acl_app_id=app_id,
+        app_ids=[app_id] if app_id else None,
+        search_query=search_query,
+        category_names=[c.strip() for c in categories.split(",")] if categories else None,
+        from_date=from_date,
+        to_date=to_date,
+        # Best matches first when searching without an explicit sort, unless paging by cursor
+        rank_search=not sort_column and not cursor,
     )
 
-    # Apply filters
-    if app_id:
-        query = query.filter(Memory.app_id == app_id)
-
-    if from_date:
-        from_datetime = datetime.fromtimestamp(from_date, tz=UTC)
-        query = query.filter(Memory.created_at >= from_datetime)
-
-    if to_date:
-        to_datetime = datetime.fromtimestamp(to_date, tz=UTC)
-        query = query.filter(Memory.created_at <= to_datetime)
-
-    # Add joins for app and categories after filtering
-    query = query.outerjoin(App, Memory.app_id == App.id)
-    query = query.outerjoin(Memory.categories)
-
-    # Apply category filter if provided
-    if categories:
-        category_list = [c.strip() for c in categories.split(",")]
-        query = query.filter(Category.name.in_(category_list))
-
-    # Apply sorting if specified
-    if sort_column:
+    # Newest first by default; this and sorting by created_at page by keyset and return cursors
+    keyset_direction = None if search_query and not sort_column and not cursor else 'desc'
+    if sort_column == 'created_at':
+        keyset_direction = 'desc' if sort_direction == 'desc' else 'asc'
+    elif sort_column:
+        keyset_direction = None
         sort_field = getattr(Memory, sort_column, None)
         if sort_field:
             query = query.order_by(sort_field.desc()) if sort_direction == "desc" else query.order_by(sort_field.asc())
+    if keyset_direction is None:
+        # Tie-breaker so pages are stable
+        query = query.order_by(Memory.created_at.desc(), Memory.id.desc())
 
-
-    # Get paginated results with proper transformation
-    return sqlalchemy_paginate(
-        query,
-        params,
-        transformer=lambda items: [
-            MemoryResponse(
-                id=memory.id,
-                content=memory.content,
-                created_at=int(memory.created_at.timestamp()),
-                state=memory.state.value,
-                app_id=memory.app_id,
-                app_name=memory.app.name if memory.app else "Unknown",
-                categories=[category.name for category in memory.categories],
-                metadata_=memory.metadata_
-            )
-            for memory in items
-            if check_memory_access_permissions(db, memory, app_id)
-        ]
+    return paginate_memories(
+        query, params.size, page=params.page, cursor=cursor, keyset_direction=keyset_direction
     )
 
 
 # Get all categories
 @router.get("/categories")
-async def get_categories(
+def get_categories(
     user_id: str,
     db: Session = Depends(get_db)
 ):
@@ -207,17 +301,35 @@ async def get_categories(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    # Get unique categories associated with the user's memories
-    # Get all memories
-    memories = db.query(Memory).filter(Memory.user_id == user.id, Memory.state != MemoryState.deleted, Memory.state != MemoryState.archived).all()
-    # Get all categories from memories and convert to strings
-    categories = [category.name for memory in memories for category in memory.categories]
-    # Get unique categories
-    unique_categories = list(set(categories))
+    # Count the user's active memories per category in one grouped query
+    memory_count = func.count(memory_categories.c.memory_id).label("memory_count")
+    rows = (
+        db.query(Category, memory_count)
+        .join(memory_categories, memory_categories.c.category_id == Category.id)
+        .join(Memory, Memory.id == memory_categories.c.memory_id)
+        .filter(
+            Memory.user_id == user.id,
+            Memory.state != MemoryState.deleted,
+            Memory.state != MemoryState.archived
+        )
+        .group_by(Category.id)
+        .order_by(memory_count.desc(), Category.name)
+        .all()
+    )
 
     return {
-        "categories": unique_categories,
-        "total": len(unique_categories)
+        "categories": [
+            {
+                "id": category.id,
+                "name": category.name,
+                "description": category.description,
+                "created_at": category.created_at,
+                "updated_at": category.updated_at,
+                "memory_count": count
+            }
+            for category, count in rows
+        ],
+        "total": len(rows)
     }
 
 
@@ -232,7 +344,7 @@ class CreateMemoryRequest(BaseModel):
 
 # Create new memory
 @router.post("/")
-async def create_memory(
+def create_memory(
     memory_request: CreateMemoryRequest,
     request: Request,
     db: Session = Depends(get_db)  
@@ -352,10 +464,6 @@ async def create_memory(
                     db.commit()
                     db.refresh(memory)
                     
-                    # Schedule background categorization if async_mode is enabled
-                    if memory_request.async_mode:
-                        schedule_background_categorization(memory_id)
-                    
                     return memory
     except Exception as qdrant_error:
         logging.warning(f"Qdrant operation failed: {qdrant_error}.")
@@ -369,7 +477,7 @@ async def create_memory(
 
 # Get memory by ID
 @router.get("/{memory_id}")
-async def get_memory(
+def get_memory(
     memory_id: UUID,
     db: Session = Depends(get_db)
 ):
@@ -392,7 +500,7 @@ class DeleteMemoriesRequest(BaseModel):
 
 # Delete multiple memories
 @router.delete("/")
-async def delete_memories(
+def delete_memories(
     request: DeleteMemoriesRequest,
     db: Session = Depends(get_db)
 ):
@@ -407,7 +515,7 @@ async def delete_memories(
 
 # Archive memories
 @router.post("/actions/archive")
-async def archive_memories(
+def archive_memories(
     memory_ids: List[UUID],
     user_id: UUID,
     db: Session = Depends(get_db)
@@ -428,7 +536,7 @@ class PauseMemoriesRequest(BaseModel):
 
 # Pause access to memories
 @router.post("/actions/pause")
-async def pause_memories(
+def pause_memories(
     request: PauseMemoriesRequest,
     db: Session = Depends(get_db)
 ):
@@ -501,12 +609,14 @@ async def pause_memories(
 
 # Get memory access logs
 @router.get("/{memory_id}/access-log")
-async def get_memory_access_log(
+def get_memory_access_log(
     memory_id: UUID,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     db: Session = Depends(get_db)
 ):
+    # Write buffered access logs first so the page and the total agree with each other
+    access_log_writer.flush()
     query = db.query(MemoryAccessLog).filter(MemoryAccessLog.memory_id == memory_id)
     total = query.count()
     logs = query.order_by(MemoryAccessLog.accessed_at.desc()).offset((page - 1) * page_size).limit(page_size).all()
@@ -530,7 +640,7 @@ class UpdateMemoryRequest(BaseModel):
 
 # Update a memory
 @router.put("/{memory_id}")
-async def update_memory(
+def update_memory(
     memory_id: UUID,
     request: UpdateMemoryRequest,
     db: Session = Depends(get_db)
@@ -546,8 +656,9 @@ async def update_memory(
 
 class FilterMemoriesRequest(BaseModel):
     user_id: str
-    page: int = 1
-    size: int = 10
+    page: int = Field(1, ge=1)
+    size: int = Field(10, ge=1, le=100)
+    cursor: Optional[str] = None
     search_query: Optional[str] = None
     app_ids: Optional[List[UUID]] = None
     category_ids: Optional[List[UUID]] = None
@@ -557,8 +668,8 @@ class FilterMemoriesRequest(BaseModel):
     to_date: Optional[int] = None
     show_archived: Optional[bool] = False
 
-@router.post("/filter", response_model=Page[MemoryResponse])
-async def filter_memories(
+@router.post("/filter", response_model=MemoryPage)
+def filter_memories(
     request: FilterMemoriesRequest,
     db: Session = Depends(get_db)
 ):
@@ -566,41 +677,23 @@ async def filter_memories(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    # Build base query
-    query = db.query(Memory).filter(
-        Memory.user_id == user.id,
-        Memory.state != MemoryState.deleted,
+    query = build_memory_query(
+        db,
+        user,
+        app_ids=request.app_ids,
+        search_query=request.search_query,
+        category_ids=request.category_ids,
+        from_date=request.from_date,
+        to_date=request.to_date,
+        show_archived=request.show_archived,
+        # Best matches first when searching without an explicit sort, unless paging by cursor
+        rank_search=not (request.sort_column and request.sort_direction) and not request.cursor,
     )
 
-    # Filter archived memories based on show_archived parameter
-    if not request.show_archived:
-        query = query.filter(Memory.state != MemoryState.archived)
-
-    # Apply search filter
-    if request.search_query:
-        query = query.filter(Memory.content.ilike(f"%{request.search_query}%"))
-
-    # Apply app filter
-    if request.app_ids:
-        query = query.filter(Memory.app_id.in_(request.app_ids))
-
-    # Add joins for app and categories
-    query = query.outerjoin(App, Memory.app_id == App.id)
-
-    # Apply category filter
-    if request.category_ids:
-        query = query.join(Memory.categories).filter(Category.id.in_(request.category_ids))
-    else:
-        query = query.outerjoin(Memory.categories)
-
-    # Apply date filters
-    if request.from_date:
-        from_datetime = datetime.fromtimestamp(request.from_date, tz=UTC)
-        query = query.filter(Memory.created_at >= from_datetime)
-
-    if request.to_date:
-        to_datetime = datetime.fromtimestamp(request.to_date, tz=UTC)
-        query = query.filter(Memory.created_at <= to_datetime)
+    # Newest first by default; this and sorting by created_at page by keyset and return cursors
+    keyset_direction = 'desc'
+    if request.search_query and not (request.sort_column and request.sort_direction) and not request.cursor:
+        keyset_direction = None
 
     # Apply sorting
     if request.sort_column and request.sort_direction:
@@ -618,41 +711,71 @@ async def filter_memories(
             raise HTTPException(status_code=400, detail="Invalid sort column")
 
         sort_field = sort_mapping[request.sort_column]
-        if sort_direction == 'desc':
-            query = query.order_by(sort_field.desc())
+        if request.sort_column == 'created_at':
+            keyset_direction = sort_direction
         else:
-            query = query.order_by(sort_field.asc())
-    else:
-        # Default sorting
-        query = query.order_by(Memory.created_at.desc())
+            keyset_direction = None
+            if request.sort_column == 'app_name':
+                query = query.outerjoin(App, Memory.app_id == App.id)
+            if sort_direction == 'desc':
+                query = query.order_by(sort_field.desc())
+            else:
+                query = query.order_by(sort_field.asc())
+    if keyset_direction is None:
+        # Tie-breaker so pages are stable
+        query = query.order_by(Memory.created_at.desc(), Memory.id.desc())
 
-    # Add eager loading for categories and make the query distinct
-    query = query.options(
-        joinedload(Memory.categories)
-    ).distinct(Memory.id)
+    return paginate_memories(
+        query, request.size, page=request.page, cursor=request.cursor, keyset_direction=keyset_direction
+    )
 
-    # Use fastapi-pagination's paginate function
-    return sqlalchemy_paginate(
-        query,
-        Params(page=request.page, size=request.size),
-        transformer=lambda items: [
-            MemoryResponse(
-                id=memory.id,
-                content=memory.content,
-                created_at=memory.created_at,
-                state=memory.state.value,
-                app_id=memory.app_id,
-                app_name=memory.app.name if memory.app else None,
-                categories=[category.name for category in memory.categories],
-                metadata_=memory.metadata_
-            )
-            for memory in items
-        ]
+
+class FilterMemoriesCursorRequest(BaseModel):
+    user_id: str
+    cursor: Optional[str] = None
+    size: int = Field(50, ge=1, le=200)
+    search_query: Optional[str] = None
+    app_ids: Optional[List[UUID]] = None
+    category_ids: Optional[List[UUID]] = None
+    sort_direction: str = "desc"
+    from_date: Optional[int] = None
+    to_date: Optional[int] = None
+    show_archived: Optional[bool] = False
+
+
+@router.post("/filter/cursor", response_model=MemoryCursorPage)
+def filter_memories_cursor(
+    request: FilterMemoriesCursorRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Filter memories with keyset pagination on (created_at, id).
+
+    Pass the returned `next_cursor` to get the following page; see `paginate_memories`.
+    """
+    user = db.query(User).filter(User.user_id == request.user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    sort_direction = request.sort_direction.lower()
+    if sort_direction not in ['asc', 'desc']:
+        raise HTTPException(status_code=400, detail="Invalid sort direction")
+
+    query = build_memory_query(
+        db,
+        user,
+        app_ids=request.app_ids,
+        search_query=request.search_query,
+        category_ids=request.category_ids,
+        from_date=request.from_date,
+        to_date=request.to_date,
+        show_archived=request.show_archived,
     )
+    return paginate_memories(query, request.size, cursor=request.cursor, keyset_direction=sort_direction)
 
 
 @router.get("/{memory_id}/related", response_model=Page[MemoryResponse])
-async def get_related_memories(
+def get_related_memories(
     memory_id: UUID,
     user_id: str,
     params: Params = Depends(),
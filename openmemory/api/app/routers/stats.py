@@ -1,29 +1,46 @@
-from app.database import get_db
+from app.database import get_async_db
 from app.models import App, Memory, MemoryState, User
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix="/api/v1/stats", tags=["stats"])
 
 @router.get("/")
 async def get_profile(
     user_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.user_id == user_id).first()
+    user = (await db.execute(select(User).filter(User.user_id == user_id))).scalars().first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    
+
     # Get total number of memories
-    total_memories = db.query(Memory).filter(Memory.user_id == user.id, Memory.state != MemoryState.deleted).count()
+    total_memories = await db.scalar(
+        select(func.count(Memory.id)).filter(Memory.user_id == user.id, Memory.state != MemoryState.deleted)
+    )
 
-    # Get total number of apps
-    apps = db.query(App).filter(App.owner == user)
-    total_apps = apps.count()
+    # Get apps with their memory counts in one grouped query
+    memory_count = func.count(Memory.id).label("memory_count")
+    rows = (await db.execute(
+        select(App.id, App.name, App.is_active, App.created_at, memory_count)
+        .outerjoin(Memory, (Memory.app_id == App.id) & (Memory.state != MemoryState.deleted))
+        .filter(App.owner_id == user.id)
+        .group_by(App.id, App.name, App.is_active, App.created_at)
+        .order_by(memory_count.desc(), App.name)
+    )).all()
 
     return {
         "total_memories": total_memories,
-        "total_apps": total_apps,
-        "apps": apps.all()
+        "total_apps": len(rows),
+        "apps": [
+            {
+                "id": row.id,
+                "name": row.name,
+                "is_active": row.is_active,
+                "created_at": row.created_at,
+                "memory_count": row.memory_count
+            }
+            for row in rows
+        ]
     }
-
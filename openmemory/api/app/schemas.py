@@ -64,3 +64,17 @@ class PaginatedMemoryResponse(BaseModel):
     page: int
     size: int
     pages: int
+
+
+class MemoryCursorPage(BaseModel):
+    items: List[MemoryResponse]
+    next_cursor: Optional[str] = None
+    total: int
+    total_is_approximate: bool = False
+    size: int
+
+
+class MemoryPage(MemoryCursorPage):
+    """A page of memories, by number (`page` and `pages` set) or after a cursor."""
+    page: Optional[int] = None
+    pages: Optional[int] = None
@@ -0,0 +1,137 @@
+"""
+Buffered writer for memory access logs.
+
+Searches and listings log one access per returned memory. Writing those rows in the request
+transaction turned every read into a write burst, so they are buffered here and written with bulk
+inserts, either every `flush_interval` seconds or as soon as `flush_size` entries are waiting.
+Readers of the access log call `flush` first, so they see every access recorded by this process.
+"""
+import logging
+import os
+import random
+import threading
+import uuid
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from app.database import SessionLocal
+from app.models import MemoryAccessLog, get_current_utc_time
+
+ACCESS_LOG_BUFFER_SIZE = int(os.getenv("ACCESS_LOG_BUFFER_SIZE", "10000"))
+ACCESS_LOG_FLUSH_SIZE = int(os.getenv("ACCESS_LOG_FLUSH_SIZE", "500"))
+ACCESS_LOG_FLUSH_INTERVAL = float(os.getenv("ACCESS_LOG_FLUSH_INTERVAL", "2.0"))
+# Fraction of read accesses (search, list) that are logged; other access types are always logged.
+ACCESS_LOG_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "1.0"))
+
+SAMPLED_ACCESS_TYPES = {"search", "list"}
+
+
+class AccessLogWriter:
+    """
+    Buffers MemoryAccessLog rows and writes them in bulk.
+
+    At most `max_buffer` entries are held in memory. Entries recorded while the buffer is full,
+    or lost in a failed flush, are dropped and counted in `stats()`.
+    """
+
+    def __init__(
+        self,
+        max_buffer: int = ACCESS_LOG_BUFFER_SIZE,
+        flush_size: int = ACCESS_LOG_FLUSH_SIZE,
+        flush_interval: float = ACCESS_LOG_FLUSH_INTERVAL,
+        sample_rate: float = ACCESS_LOG_SAMPLE_RATE,
+    ):
+        self.max_buffer = max_buffer
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.sample_rate = sample_rate
+        self._buffer: List[Dict] = []
+        self._lock = threading.Lock()
+        # Serializes flushes so a reader's flush waits for one already in progress.
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._written = 0
+        self._dropped = 0
+        self._sampled_out = 0
+
+    def record(self, memory_id: UUID, app_id: UUID, access_type: str, metadata: Optional[Dict] = None) -> bool:
+        """Queue an access log entry. Returns False if it was sampled out or dropped."""
+        if access_type in SAMPLED_ACCESS_TYPES and self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            with self._lock:
+                self._sampled_out += 1
+            return False
+
+        entry = {
+            "id": uuid.uuid4(),
+            "memory_id": memory_id,
+            "app_id": app_id,
+            "accessed_at": get_current_utc_time(),
+            "access_type": access_type,
+            "metadata": metadata or {},
+        }
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer:
+                self._dropped += 1
+                return False
+            self._buffer.append(entry)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="access-log-writer", daemon=True)
+                self._thread.start()
+            if len(self._buffer) >= self.flush_size:
+                self._wakeup.set()
+        return True
+
+    def flush(self) -> int:
+        """Write all buffered entries. Returns the number of rows written."""
+        with self._flush_lock:
+            with self._lock:
+                entries, self._buffer = self._buffer, []
+            if not entries:
+                return 0
+
+            db = SessionLocal()
+            try:
+                db.execute(MemoryAccessLog.__table__.insert(), entries)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logging.error(f"Failed to write {len(entries)} memory access log entries: {e}")
+                with self._lock:
+                    self._dropped += len(entries)
+                return 0
+            finally:
+                db.close()
+
+            with self._lock:
+                self._written += len(entries)
+            return len(entries)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "buffered": len(self._buffer),
+                "written": self._written,
+                "dropped": self._dropped,
+                "sampled_out": self._sampled_out,
+            }
+
+    def close(self) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logging.exception(f"Error in access log writer: {e}")
+
+
+access_log_writer = AccessLogWriter()
@@ -1,8 +1,8 @@
 import logging
 import os
-from typing import List
+from typing import List, Optional
 
-from app.utils.prompts import MEMORY_CATEGORIZATION_PROMPT
+from app.utils.prompts import BATCH_MEMORY_CATEGORIZATION_PROMPT, MEMORY_CATEGORIZATION_PROMPT
 from dotenv import load_dotenv
 from openai import OpenAI
 from pydantic import BaseModel
@@ -22,6 +22,15 @@ class MemoryCategories(BaseModel):
     categories: List[str]
 
 
+class IndexedMemoryCategories(BaseModel):
+    index: int
+    categories: List[str]
+
+
+class BatchMemoryCategories(BaseModel):
+    memories: List[IndexedMemoryCategories]
+
+
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=15))
 def get_categories_for_memory(memory: str, infer: bool = True) -> List[str]:
     """
@@ -73,6 +82,52 @@ def get_categories_for_memory(memory: str, infer: bool = True) -> List[str]:
         return _fallback_categorization(memory)
 
 
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=15))
+def _parse_categories_batch(memories: List[str]) -> BatchMemoryCategories:
+    numbered = "\n".join(f"[{index}] {memory}" for index, memory in enumerate(memories))
+    completion = openai_client.beta.chat.completions.parse(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": BATCH_MEMORY_CATEGORIZATION_PROMPT},
+            {"role": "user", "content": numbered}
+        ],
+        response_format=BatchMemoryCategories,
+        temperature=0
+    )
+    return completion.choices[0].message.parsed
+
+
+def uses_llm() -> bool:
+    """Whether memories are categorized by the LLM, rather than by keywords for lack of an OpenAI API key."""
+    return openai_client is not None
+
+
+def get_categories_for_memories(memories: List[str]) -> List[Optional[List[str]]]:
+    """
+    Get categories for several memories with a single LLM call.
+
+    Unlike `get_categories_for_memory`, a failed LLM call raises instead of falling back to keyword
+    categories, so callers can retry rather than store a guess as the memory's categories.
+
+    Args:
+        memories: The memory contents to categorize
+
+    Returns:
+        One list of category names per memory, in the same order, or None for memories the model
+        skipped. Without an OpenAI API key every memory gets the keyword-based categories.
+    """
+    if not memories:
+        return []
+    if not openai_client:
+        return [_fallback_categorization(memory) for memory in memories]
+
+    results: List[Optional[List[str]]] = [None] * len(memories)
+    for item in _parse_categories_batch(memories).memories:
+        if 0 <= item.index < len(memories):
+            results[item.index] = [cat.strip().lower() for cat in item.categories]
+    return results
+
+
 def _fallback_categorization(memory: str) -> List[str]:
     """
     Simple keyword-based categorization when OpenAI is not available.
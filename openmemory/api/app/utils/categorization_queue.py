@@ -0,0 +1,295 @@
+"""
+Background categorization of memories.
+
+Memory writes only add a row to the `categorization_queue` table (see `app.models.enqueue_categorization`).
+Workers claim pending rows in batches, categorize the memories with a single LLM call per batch and
+link the categories. Rows are claimed with a lease, so several API processes can share one database,
+and work left behind by a crashed process is picked up again. A failed LLM call, or a memory the model
+skipped, puts the rows back to pending until they have been attempted `max_attempts` times.
+
+Categories are reused for memories with the same content, but only those the LLM produced. Without an
+OpenAI API key memories are categorized by keywords and their rows end up `fallback` instead of `done`.
+"""
+import datetime
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set
+from uuid import UUID
+
+from app.database import SessionLocal
+from app.models import (
+    CategorizationTask,
+    Category,
+    Memory,
+    get_current_utc_time,
+    memory_categories,
+)
+from app.utils.categorization import get_categories_for_memories, uses_llm
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+CATEGORIZATION_WORKERS = int(os.getenv("CATEGORIZATION_WORKERS", "1"))
+CATEGORIZATION_BATCH_SIZE = int(os.getenv("CATEGORIZATION_BATCH_SIZE", "20"))
+CATEGORIZATION_MAX_ATTEMPTS = int(os.getenv("CATEGORIZATION_MAX_ATTEMPTS", "3"))
+CATEGORIZATION_LEASE_SECONDS = int(os.getenv("CATEGORIZATION_LEASE_SECONDS", "300"))
+CATEGORIZATION_POLL_INTERVAL = float(os.getenv("CATEGORIZATION_POLL_INTERVAL", "1.0"))
+
+
+class CategorizationWorker:
+    """Drains the categorization queue with `num_workers` threads."""
+
+    def __init__(
+        self,
+        num_workers: int = CATEGORIZATION_WORKERS,
+        batch_size: int = CATEGORIZATION_BATCH_SIZE,
+        max_attempts: int = CATEGORIZATION_MAX_ATTEMPTS,
+        lease_seconds: int = CATEGORIZATION_LEASE_SECONDS,
+        poll_interval: float = CATEGORIZATION_POLL_INTERVAL,
+        max_cached_hashes: int = 10000,
+    ):
+        self.num_workers = num_workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_cached_hashes = max_cached_hashes
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        # Category names never change once created, so their IDs are cached for the process lifetime.
+        self._category_ids: Dict[str, UUID] = {}
+        self._categories_by_hash: "OrderedDict[str, List[str]]" = OrderedDict()
+
+    def start(self) -> None:
+        self._stop.clear()
+        for index in range(self.num_workers):
+            thread = threading.Thread(target=self._work, name=f"categorization-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the workers after their current batch. Unfinished rows stay queued for the next start."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            try:
+                processed = self.run_once()
+            except Exception as e:
+                logging.exception(f"Error in categorization worker: {e}")
+                processed = 0
+            if not processed:
+                self._stop.wait(self.poll_interval)
+
+    def run_once(self) -> int:
+        """Claim and categorize one batch. Returns the number of queue rows processed."""
+        db = SessionLocal()
+        try:
+            token, tasks = self._claim(db)
+            if not tasks:
+                return 0
+            try:
+                status = "done" if uses_llm() else "fallback"
+                skipped = self._process(db, tasks, remember=status == "done")
+                self._finish(db, token, [task.id for task in tasks if task.id not in skipped], status)
+                if skipped:
+                    self._fail(db, token, [task for task in tasks if task.id in skipped], "No categories returned")
+            except Exception as e:
+                db.rollback()
+                logging.error(f"Failed to categorize {len(tasks)} memories: {e}")
+                self._fail(db, token, tasks, str(e))
+            return len(tasks)
+        finally:
+            db.close()
+
+    def _claim(self, db: Session):
+        now = get_current_utc_time()
+        token = uuid.uuid4().hex
+        claimable = or_(
+            CategorizationTask.status == "pending",
+            and_(
+                CategorizationTask.status == "running",
+                CategorizationTask.claimed_at < now - datetime.timedelta(seconds=self.lease_seconds),
+            ),
+        )
+        ids = [
+            row[0]
+            for row in db.query(CategorizationTask.id)
+            .filter(claimable)
+            .order_by(CategorizationTask.updated_at)
+            .limit(self.batch_size)
+            .all()
+        ]
+        if not ids:
+            return token, []
+        # Another process may select the same rows; the UPDATE only claims rows that are still claimable.
+        db.query(CategorizationTask).filter(CategorizationTask.id.in_(ids), claimable).update(
+            {
+                CategorizationTask.status: "running",
+                CategorizationTask.claim_token: token,
+                CategorizationTask.claimed_at: now,
+                CategorizationTask.attempts: CategorizationTask.attempts + 1,
+            },
+            synchronize_session=False,
+        )
+        db.commit()
+        return token, db.query(CategorizationTask).filter(CategorizationTask.claim_token == token).all()
+
+    def _process(self, db: Session, tasks: List[CategorizationTask], remember: bool = True) -> Set[UUID]:
+        """Link the categories of the tasks' memories. Returns the IDs of the tasks the model skipped."""
+        memories = {
+            memory.id: memory
+            for memory in db.query(Memory).filter(Memory.id.in_([task.memory_id for task in tasks])).all()
+        }
+
+        # Memories with the same content get the same categories, so each distinct content is sent once
+        # and content categorized before (by this process or, through the queue table, by any other) is reused.
+        contents: Dict[str, str] = {}
+        for task in tasks:
+            memory = memories.get(task.memory_id)
+            if memory is not None:
+                contents.setdefault(task.content_hash, memory.content)
+        categories_by_hash = self._known_categories(db, contents.keys())
+        missing = [content_hash for content_hash in contents if content_hash not in categories_by_hash]
+        if missing:
+            results = get_categories_for_memories([contents[content_hash] for content_hash in missing])
+            for content_hash, names in zip(missing, results):
+                if names is None:
+                    continue
+                categories_by_hash[content_hash] = names
+                if remember:
+                    self._remember(content_hash, names)
+        skipped = {
+            task.id for task in tasks if task.memory_id in memories and task.content_hash not in categories_by_hash
+        }
+
+        category_ids = self._get_category_ids(db, {name for names in categories_by_hash.values() for name in names})
+        existing = {
+            (row.memory_id, row.category_id)
+            for row in db.execute(
+                memory_categories.select().where(memory_categories.c.memory_id.in_(list(memories)))
+            )
+        }
+        links = []
+        for task in tasks:
+            memory = memories.get(task.memory_id)
+            if memory is None or task.id in skipped:
+                continue
+            for name in categories_by_hash[task.content_hash]:
+                link = (memory.id, category_ids[name])
+                if link not in existing:
+                    existing.add(link)
+                    links.append({"memory_id": link[0], "category_id": link[1]})
+
+            metadata = dict(memory.metadata_ or {})
+            metadata["processing_status"] = "processed" if metadata.get("infer", True) else "unprocessed"
+            memory.metadata_ = metadata
+
+        if links:
+            db.execute(memory_categories.insert(), links)
+        db.commit()
+        return skipped
+
+    def _known_categories(self, db: Session, content_hashes: Iterable[str]) -> Dict[str, List[str]]:
+        known: Dict[str, List[str]] = {}
+        unknown: Set[str] = set()
+        with self._lock:
+            for content_hash in content_hashes:
+                if content_hash in self._categories_by_hash:
+                    self._categories_by_hash.move_to_end(content_hash)
+                    known[content_hash] = self._categories_by_hash[content_hash]
+                else:
+                    unknown.add(content_hash)
+        if not unknown:
+            return known
+
+        done = (
+            db.query(CategorizationTask.content_hash, CategorizationTask.memory_id)
+            .filter(CategorizationTask.content_hash.in_(unknown), CategorizationTask.status == "done")
+            .all()
+        )
+        memory_hashes = {}
+        for content_hash, memory_id in done:
+            memory_hashes.setdefault(content_hash, memory_id)
+        if not memory_hashes:
+            return known
+
+        rows = (
+            db.query(memory_categories.c.memory_id, Category.name)
+            .join(Category, Category.id == memory_categories.c.category_id)
+            .filter(memory_categories.c.memory_id.in_(list(memory_hashes.values())))
+            .all()
+        )
+        names_by_memory: Dict[UUID, List[str]] = {}
+        for memory_id, name in rows:
+            names_by_memory.setdefault(memory_id, []).append(name)
+        for content_hash, memory_id in memory_hashes.items():
+            if memory_id in names_by_memory:
+                known[content_hash] = names_by_memory[memory_id]
+                self._remember(content_hash, names_by_memory[memory_id])
+        return known
+
+    def _remember(self, content_hash: str, names: List[str]) -> None:
+        with self._lock:
+            self._categories_by_hash[content_hash] = names
+            self._categories_by_hash.move_to_end(content_hash)
+            while len(self._categories_by_hash) > self.max_cached_hashes:
+                self._categories_by_hash.popitem(last=False)
+
+    def _get_category_ids(self, db: Session, names: Set[str]) -> Dict[str, UUID]:
+        with self._lock:
+            ids = {name: self._category_ids[name] for name in names if name in self._category_ids}
+        missing = names - ids.keys()
+        if missing:
+            for category in db.query(Category).filter(Category.name.in_(missing)).all():
+                ids[category.name] = category.id
+            for name in missing - ids.keys():
+                try:
+                    with db.begin_nested():
+                        category = Category(name=name, description=f"Automatically created category for {name}")
+                        db.add(category)
+                    ids[name] = category.id
+                except IntegrityError:
+                    # Created concurrently by another worker
+                    ids[name] = db.query(Category.id).filter(Category.name == name).scalar()
+            with self._lock:
+                self._category_ids.update(ids)
+        return ids
+
+    def _finish(self, db: Session, token: str, task_ids: List[UUID], status: str = "done") -> None:
+        # Rows re-queued by a content change while this batch ran lost their claim token and stay pending.
+        db.query(CategorizationTask).filter(
+            CategorizationTask.id.in_(task_ids), CategorizationTask.claim_token == token
+        ).update(
+            {
+                CategorizationTask.status: status,
+                CategorizationTask.claim_token: None,
+                CategorizationTask.last_error: None,
+            },
+            synchronize_session=False,
+        )
+        db.commit()
+
+    def _fail(self, db: Session, token: str, tasks: List[CategorizationTask], error: str) -> None:
+        for task_id, attempts in [(task.id, task.attempts) for task in tasks]:
+            db.query(CategorizationTask).filter(
+                CategorizationTask.id == task_id, CategorizationTask.claim_token == token
+            ).update(
+                {
+                    CategorizationTask.status: "pending" if attempts < self.max_attempts else "failed",
+                    CategorizationTask.claim_token: None,
+                    CategorizationTask.last_error: error,
+                },
+                synchronize_session=False,
+            )
+        db.commit()
+
+
+categorization_worker = CategorizationWorker()
@@ -6,10 +6,15 @@ including support for various clients (Claude Code, Claude Desktop, OLLAMA, VS C
 with model-specific differentiation and unknown client isolation.
 """
 
+import atexit
 import hashlib
 import json
 import logging
+import os
 import re
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple
 from uuid import UUID
@@ -17,8 +22,18 @@ from uuid import UUID
 from app.database import SessionLocal
 from app.models import ClientRegistry, ClientRegistryStatus, ClientSession, User
 from fastapi import Request
+from sqlalchemy import bindparam, event
 from sqlalchemy.orm import Session
 
+# How long a client's registry status is trusted before it is read again. Changes made through the
+# ORM in this process (e.g. admin approve/block) invalidate it immediately.
+CLIENT_REGISTRY_TTL = float(os.getenv("CLIENT_REGISTRY_TTL", "30"))
+# How often buffered last-seen timestamps are written to the registry.
+CLIENT_ACTIVITY_FLUSH_INTERVAL = float(os.getenv("CLIENT_ACTIVITY_FLUSH_INTERVAL", "30"))
+
+# Only these headers affect detection; the rest of the request only ends up in the metadata.
+DETECTION_HEADERS = ('x-client-id', 'x-mcp-client', 'x-model-name', 'x-client-version')
+
 
 class ClientDetectionResult:
     """Result of client detection with all relevant metadata."""
@@ -49,7 +64,10 @@ class ClientDetectionResult:
 class EnhancedClientDetector:
     """Enhanced client detection with registry-based tracking."""
     
-    def __init__(self):
+    def __init__(self, max_cached_detections: int = 1024):
+        self.max_cached_detections = max_cached_detections
+        self._detection_cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         self.detection_patterns = {
             # Claude Code specific patterns
             'claude-code': {
@@ -124,6 +142,9 @@ class EnhancedClientDetector:
         """
         Detect client type from HTTP request with enhanced accuracy.
         
+        The classification is memoized per endpoint path, user agent and detection headers,
+        so repeated connections from the same client skip the pattern matching.
+        
         Args:
             request: FastAPI Request object
             endpoint_path: The endpoint path used (for endpoint-based detection)
@@ -133,38 +154,76 @@ class EnhancedClientDetector:
         """
         headers = dict(request.headers)
         user_agent = headers.get("user-agent", "").lower()
+        web_ui = 'localhost:3000' in headers.get('referer', '') or 'localhost:3000' in headers.get('origin', '')
+        key = (endpoint_path, user_agent.strip(), web_ui, tuple(headers.get(name, '') for name in DETECTION_HEADERS))
+        
+        with self._cache_lock:
+            cached = self._detection_cache.get(key)
+            if cached is not None:
+                self._detection_cache.move_to_end(key)
+        if cached is None:
+            cached = self._classify(headers, user_agent, endpoint_path)
+            with self._cache_lock:
+                self._detection_cache[key] = cached
+                while len(self._detection_cache) > self.max_cached_detections:
+                    self._detection_cache.popitem(last=False)
         
+        result = ClientDetectionResult(**cached)
+        # Metadata describes this request, so it is never taken from the cache
+        if result.endpoint_source == "endpoint":
+            self._enhance_with_headers(result, headers)
+        elif result.client_type == "unknown" and result.endpoint_source == "unknown":
+            result.metadata = self._create_unknown_client_result(request).metadata
+            # Log unknown client access attempt
+            logging.warning(f"Unknown client access attempt: {result.client_identifier} "
+                           f"from {headers.get('user-agent', 'unknown')} at {endpoint_path}")
+        return result
+    
+    def _classify(self, headers: Dict[str, str], user_agent: str, endpoint_path: str) -> Dict:
+        """Run the detection strategies and return the result's fields, without request metadata."""
         # First, try endpoint-based detection (highest confidence)
-        endpoint_result = self._detect_from_endpoint(endpoint_path)
-        if endpoint_result:
-            endpoint_result.endpoint_source = "endpoint"
-            endpoint_result.confidence_score = 95
+        result = self._detect_from_endpoint(endpoint_path)
+        if result:
+            result.endpoint_source = "endpoint"
+            result.confidence_score = 95
             # Enhance with header information
-            self._enhance_with_headers(endpoint_result, headers)
-            return endpoint_result
+            if not result.model_name:
+                result.model_name = headers.get('x-model-name')
+            if not result.client_version:
+                result.client_version = headers.get('x-client-version')
         
         # Then try header-based detection
-        header_result = self._detect_from_headers(headers)
-        if header_result:
-            header_result.endpoint_source = "headers"
-            header_result.confidence_score = 85
-            return header_result
+        if not result:
+            result = self._detect_from_headers(headers)
+            if result:
+                result.endpoint_source = "headers"
+                result.confidence_score = 85
         
         # Finally, try user-agent based detection
-        ua_result = self._detect_from_user_agent(user_agent)
-        if ua_result:
-            ua_result.endpoint_source = "user_agent"
-            ua_result.confidence_score = 70
-            return ua_result
+        if not result:
+            result = self._detect_from_user_agent(user_agent)
+            if result:
+                result.endpoint_source = "user_agent"
+                result.confidence_score = 70
         
         # Unknown client - check if it should be blocked
-        unknown_result = self._create_unknown_client_result(request)
-        
-        # Log unknown client access attempt
-        logging.warning(f"Unknown client access attempt: {unknown_result.client_identifier} "
-                       f"from {headers.get('user-agent', 'unknown')} at {endpoint_path}")
+        if not result:
+            client_hash = hashlib.md5(headers.get('user-agent', 'unknown').encode()).hexdigest()[:8]
+            result = ClientDetectionResult(
+                client_identifier=f"unknown-{client_hash}",
+                client_type="unknown",
+                confidence_score=0,
+                endpoint_source="unknown"
+            )
         
-        return unknown_result
+        return {
+            'client_identifier': result.client_identifier,
+            'client_type': result.client_type,
+            'model_name': result.model_name,
+            'client_version': result.client_version,
+            'confidence_score': result.confidence_score,
+            'endpoint_source': result.endpoint_source,
+        }
     
     def _detect_from_endpoint(self, endpoint_path: str) -> Optional[ClientDetectionResult]:
         """Detect client from endpoint path pattern."""
@@ -322,6 +381,116 @@ class EnhancedClientDetector:
         )
 
 
+class ClientActivityBuffer:
+    """
+    Buffers client last-seen timestamps and writes them to the registry in one batched UPDATE
+    every `flush_interval` seconds, instead of committing on every connection.
+    """
+    
+    def __init__(self, flush_interval: float = CLIENT_ACTIVITY_FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def touch(self, client_identifier: str):
+        """Record that a client was just seen."""
+        with self._lock:
+            self._pending[client_identifier] = datetime.now(timezone.utc)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="client-activity-flusher", daemon=True)
+                self._thread.start()
+    
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+    
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        
+        table = ClientRegistry.__table__
+        statement = table.update().where(
+            table.c.client_identifier == bindparam("identifier")
+        ).values(last_seen_at=bindparam("seen_at"))
+        db = SessionLocal()
+        try:
+            db.execute(statement, [{"identifier": identifier, "seen_at": seen_at} for identifier, seen_at in pending.items()])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logging.warning(f"Failed to record activity for {len(pending)} clients: {e}")
+        finally:
+            db.close()
+    
+    def close(self):
+        self._stop.set()
+        self.flush()
+
+
+client_activity = ClientActivityBuffer()
+atexit.register(client_activity.close)
+
+_registry_cache: Dict[str, Tuple[float, Optional[Tuple[ClientRegistryStatus, UUID]]]] = {}
+_registry_lock = threading.Lock()
+
+
+def _cache_client_registry(client_identifier: str, entry: Optional[Tuple[ClientRegistryStatus, UUID]]):
+    with _registry_lock:
+        _registry_cache[client_identifier] = (time.monotonic() + CLIENT_REGISTRY_TTL, entry)
+
+
+def invalidate_client_registry_cache(client_identifier: Optional[str] = None):
+    """Drop a client's cached registry status, or every cached status when no client is given."""
+    with _registry_lock:
+        if client_identifier is None:
+            _registry_cache.clear()
+        else:
+            _registry_cache.pop(client_identifier, None)
+
+
+def get_client_registry_status(client_identifier: str) -> Optional[Tuple[ClientRegistryStatus, UUID]]:
+    """
+    Get a client's registry status and registry ID, or None if the client isn't registered.
+    
+    Results are cached for CLIENT_REGISTRY_TTL seconds.
+    """
+    with _registry_lock:
+        cached = _registry_cache.get(client_identifier)
+    if cached and time.monotonic() < cached[0]:
+        return cached[1]
+    
+    db = SessionLocal()
+    try:
+        row = db.query(ClientRegistry.status, ClientRegistry.id).filter(
+            ClientRegistry.client_identifier == client_identifier
+        ).first()
+    finally:
+        db.close()
+    
+    entry = (row[0], row[1]) if row else None
+    _cache_client_registry(client_identifier, entry)
+    return entry
+
+
+@event.listens_for(ClientRegistry, 'after_insert')
+@event.listens_for(ClientRegistry, 'after_update')
+@event.listens_for(ClientRegistry, 'after_delete')
+def _after_client_registry_change(mapper, connection, target):
+    # Any identifier may have changed, so drop everything; the next lookup reloads it
+    invalidate_client_registry_cache()
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_session_commit(session):
+    # A lookup made between the flush and the commit above may have cached the old status again
+    if any(isinstance(obj, ClientRegistry) for obj in session.identity_map.values()):
+        invalidate_client_registry_cache()
+
+
 def get_or_create_client_registry(
     db: Session, 
     detection_result: ClientDetectionResult
@@ -339,8 +508,7 @@ def get_or_create_client_registry(
     
     if existing:
         # Update last seen time
-        existing.last_seen_at = datetime.now(timezone.utc)
-        db.commit()
+        client_activity.touch(existing.client_identifier)
         return existing, False
     
     # Create new registry entry
@@ -403,43 +571,41 @@ def get_enhanced_client_info(request: Request, endpoint_path: str) -> Dict:
     
     Returns comprehensive client information for memory metadata.
     """
-    detector = EnhancedClientDetector()
-    detection_result = detector.detect_client_from_request(request, endpoint_path)
+    detection_result = _detector.detect_client_from_request(request, endpoint_path)
     
-    db = SessionLocal()
-    try:
-        # Get or create registry entry
-        registry, created = get_or_create_client_registry(db, detection_result)
-        
-        client_info = {
-            'client_identifier': detection_result.client_identifier,
-            'client_type': detection_result.client_type,
-            'model_name': detection_result.model_name,
-            'client_version': detection_result.client_version,
-            'endpoint_source': detection_result.endpoint_source,
-            'confidence_score': detection_result.confidence_score,
-            'is_registered': not created,
-            'registry_status': registry.status.value,
-            'registry_id': str(registry.id),
-            'detection_metadata': detection_result.metadata
-        }
-        
-        return client_info
-        
-    finally:
-        db.close()
+    registry = get_client_registry_status(detection_result.client_identifier)
+    created = False
+    if registry is None:
+        db = SessionLocal()
+        try:
+            # Get or create registry entry
+            registry_entry, created = get_or_create_client_registry(db, detection_result)
+            registry = (registry_entry.status, registry_entry.id)
+        finally:
+            db.close()
+        _cache_client_registry(detection_result.client_identifier, registry)
+    else:
+        client_activity.touch(detection_result.client_identifier)
+    
+    status, registry_id = registry
+    return {
+        'client_identifier': detection_result.client_identifier,
+        'client_type': detection_result.client_type,
+        'model_name': detection_result.model_name,
+        'client_version': detection_result.client_version,
+        'endpoint_source': detection_result.endpoint_source,
+        'confidence_score': detection_result.confidence_score,
+        'is_registered': not created,
+        'registry_status': status.value,
+        'registry_id': str(registry_id),
+        'detection_metadata': detection_result.metadata
+    }
 
 
 def is_client_approved(client_identifier: str) -> bool:
     """Check if a client is approved for memory operations."""
-    db = SessionLocal()
-    try:
-        registry = db.query(ClientRegistry).filter(
-            ClientRegistry.client_identifier == client_identifier,
-            ClientRegistry.status == ClientRegistryStatus.approved
-        ).first()
-        
-        return registry is not None
-        
-    finally:
-        db.close()
\ No newline at end of file
+    registry = get_client_registry_status(client_identifier)
+    return registry is not None and registry[0] == ClientRegistryStatus.approved
+
+
+_detector = EnhancedClientDetector()
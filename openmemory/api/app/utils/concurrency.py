@@ -0,0 +1,34 @@
+"""
+Bounded executors for blocking work called from async code.
+
+The MCP tools and SSE handlers run on the event loop, but the memory client and the sync database
+session block. Running that work here keeps the loop free for other connections. Writes get their
+own pool so a few long adds can't starve searches and listings.
+"""
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+READ_WORKERS = int(os.getenv("OPENMEMORY_READ_WORKERS", "16"))
+WRITE_WORKERS = int(os.getenv("OPENMEMORY_WRITE_WORKERS", "4"))
+
+read_executor = ThreadPoolExecutor(max_workers=READ_WORKERS, thread_name_prefix="openmemory-read")
+write_executor = ThreadPoolExecutor(max_workers=WRITE_WORKERS, thread_name_prefix="openmemory-write")
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, executor: Optional[ThreadPoolExecutor] = None, **kwargs: Any) -> T:
+    """Run `func` in a bounded executor (the read pool by default) without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(executor or read_executor, call)
+
+
+def shutdown_executors() -> None:
+    read_executor.shutdown(wait=False)
+    write_executor.shutdown(wait=True)
@@ -1,6 +1,7 @@
 from typing import Tuple
 
 from app.models import App, User
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 
@@ -10,7 +11,12 @@ def get_or_create_user(db: Session, user_id: str) -> User:
     if not user:
         user = User(user_id=user_id)
         db.add(user)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent request created the user first
+            db.rollback()
+            return db.query(User).filter(User.user_id == user_id).one()
         db.refresh(user)
     return user
 
@@ -21,7 +27,12 @@ def get_or_create_app(db: Session, user: User, app_id: str) -> App:
     if not app:
         app = App(owner_id=user.id, name=app_id)
         db.add(app)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent request created the app first
+            db.rollback()
+            return db.query(App).filter(App.owner_id == user.id, App.name == app_id).one()
         db.refresh(app)
     return app
 
@@ -27,10 +27,13 @@ Example configuration that will be automatically adjusted:
 }
 """
 
+import functools
 import hashlib
 import json
 import os
 import socket
+import threading
+import time
 from typing import Optional
 
 from app.database import SessionLocal
@@ -41,6 +44,15 @@ from mem0 import Memory
 _memory_client = None
 _config_hash = None
 
+# Bumped whenever the configuration is written (see reset_memory_client). The client is rebuilt only
+# when the version or the custom instructions change, or when the TTL expires, which picks up
+# configuration written by other processes.
+CONFIG_CHECK_TTL = float(os.getenv("MEMORY_CLIENT_CONFIG_TTL", "60"))
+_config_version = 0
+_client_key = None
+_client_checked_at = 0.0
+_client_lock = threading.Lock()
+
 
 def _get_config_hash(config_dict):
     """Generate a hash of the config to detect changes."""
@@ -48,6 +60,7 @@ def _get_config_hash(config_dict):
     return hashlib.md5(config_str.encode()).hexdigest()
 
 
+@functools.lru_cache(maxsize=None)
 def _get_docker_host_url():
     """
     Determine the appropriate host URL to reach host machine from inside Docker container.
@@ -128,10 +141,10 @@ def _fix_ollama_urls(config_section):
 
 
 def reset_memory_client():
-    """Reset the global memory client to force reinitialization with new config."""
-    global _memory_client, _config_hash
-    _memory_client = None
-    _config_hash = None
+    """Mark the configuration as changed so the next get_memory_client call rebuilds the client if needed."""
+    global _config_version
+    with _client_lock:
+        _config_version += 1
 
 
 def get_default_memory_config():
@@ -196,10 +209,74 @@ def _parse_environment_variables(config_dict):
     return config_dict
 
 
+def _build_memory_config(custom_instructions: Optional[str] = None):
+    """Build the Mem0 configuration from the defaults, the database and the environment."""
+    # Start with default configuration
+    config = get_default_memory_config()
+
+    # Variable to track custom instructions
+    db_custom_instructions = None
+    
+    # Load configuration from database
+    try:
+        db = SessionLocal()
+        db_config = db.query(ConfigModel).filter(ConfigModel.key == "main").first()
+        
+        if db_config:
+            json_config = db_config.value
+            
+            # Extract custom instructions from openmemory settings
+            if "openmemory" in json_config and "custom_instructions" in json_config["openmemory"]:
+                db_custom_instructions = json_config["openmemory"]["custom_instructions"]
+            
+            # Override defaults with configurations from the database
+            if "mem0" in json_config:
+                mem0_config = json_config["mem0"]
+                
+                # Update LLM configuration if available
+                if "llm" in mem0_config and mem0_config["llm"] is not None:
+                    config["llm"] = mem0_config["llm"]
+                    
+                    # Fix Ollama URLs for Docker if needed
+                    if config["llm"].get("provider") == "ollama":
+                        config["llm"] = _fix_ollama_urls(config["llm"])
+                
+                # Update Embedder configuration if available
+                if "embedder" in mem0_config and mem0_config["embedder"] is not None:
+                    config["embedder"] = mem0_config["embedder"]
+                    
+                    # Fix Ollama URLs for Docker if needed
+                    if config["embedder"].get("provider") == "ollama":
+                        config["embedder"] = _fix_ollama_urls(config["embedder"])
+        else:
+            print("No configuration found in database, using defaults")
+                
+        db.close()
+                        
+    except Exception as e:
+        print(f"Warning: Error loading configuration from database: {e}")
+        print("Using default configuration")
+        # Continue with default configuration if database config can't be loaded
+
+    # Use custom_instructions parameter first, then fall back to database value
+    instructions_to_use = custom_instructions or db_custom_instructions
+    if instructions_to_use:
+        config["custom_fact_extraction_prompt"] = instructions_to_use
+
+    # ALWAYS parse environment variables in the final config
+    # This ensures that even default config values like "env:OPENAI_API_KEY" get parsed
+    print("Parsing environment variables in final config...")
+    config = _parse_environment_variables(config)
+
+    return config
+
+
 def get_memory_client(custom_instructions: Optional[str] = None):
     """
     Get or initialize the Mem0 client.
 
+    The client is cached and only rebuilt when the configuration changes.
+
     Args:
         custom_instructions: Optional instructions for the memory project.
 
@@ -209,89 +286,47 @@ def get_memory_client(custom_instructions: Optional[str] = None):
     Raises:
         Exception: If required API keys are not set or critical configuration is missing.
     """
-    global _memory_client, _config_hash
+    global _memory_client, _config_hash, _client_key, _client_checked_at
+
+    key = (_config_version, custom_instructions)
+    if _memory_client is not None and _client_key == key and time.monotonic() - _client_checked_at < CONFIG_CHECK_TTL:
+        return _memory_client
+
+    with _client_lock:
+        # Another thread may have rebuilt the client while this one waited for the lock
+        key = (_config_version, custom_instructions)
+        if _memory_client is not None and _client_key == key and time.monotonic() - _client_checked_at < CONFIG_CHECK_TTL:
+            return _memory_client
 
-    try:
-        # Start with default configuration
-        config = get_default_memory_config()
-        
-        # Variable to track custom instructions
-        db_custom_instructions = None
-        
-        # Load configuration from database
         try:
-            db = SessionLocal()
-            db_config = db.query(ConfigModel).filter(ConfigModel.key == "main").first()
-            
-            if db_config:
-                json_config = db_config.value
-                
-                # Extract custom instructions from openmemory settings
-                if "openmemory" in json_config and "custom_instructions" in json_config["openmemory"]:
-                    db_custom_instructions = json_config["openmemory"]["custom_instructions"]
-                
-                # Override defaults with configurations from the database
-                if "mem0" in json_config:
-                    mem0_config = json_config["mem0"]
-                    
-                    # Update LLM configuration if available
-                    if "llm" in mem0_config and mem0_config["llm"] is not None:
-                        config["llm"] = mem0_config["llm"]
-                        
-                        # Fix Ollama URLs for Docker if needed
-                        if config["llm"].get("provider") == "ollama":
-                            config["llm"] = _fix_ollama_urls(config["llm"])
-                    
-                    # Update Embedder configuration if available
-                    if "embedder" in mem0_config and mem0_config["embedder"] is not None:
-                        config["embedder"] = mem0_config["embedder"]
-                        
-                        # Fix Ollama URLs for Docker if needed
-                        if config["embedder"].get("provider") == "ollama":
-                            config["embedder"] = _fix_ollama_urls(config["embedder"])
-            else:
-                print("No configuration found in database, using defaults")
-                    
-            db.close()
-                            
+            config = _build_memory_config(custom_instructions)
+
+            # Check if config has changed by comparing hashes
+            current_config_hash = _get_config_hash(config)
+
+            # Only reinitialize if config changed or client doesn't exist
+            if _memory_client is None or _config_hash != current_config_hash:
+                print(f"Initializing memory client with config hash: {current_config_hash}")
+                try:
+                    _memory_client = Memory.from_config(config_dict=config)
+                    _config_hash = current_config_hash
+                    print("Memory client initialized successfully")
+                except Exception as init_error:
+                    print(f"Warning: Failed to initialize memory client: {init_error}")
+                    print("Server will continue running with limited memory functionality")
+                    _memory_client = None
+                    _config_hash = None
+                    _client_key = None
+                    return None
+
+            _client_key = key
+            _client_checked_at = time.monotonic()
+            return _memory_client
+
         except Exception as e:
-            print(f"Warning: Error loading configuration from database: {e}")
-            print("Using default configuration")
-            # Continue with default configuration if database config can't be loaded
-
-        # Use custom_instructions parameter first, then fall back to database value
-        instructions_to_use = custom_instructions or db_custom_instructions
-        if instructions_to_use:
-            config["custom_fact_extraction_prompt"] = instructions_to_use
-
-        # ALWAYS parse environment variables in the final config
-        # This ensures that even default config values like "env:OPENAI_API_KEY" get parsed
-        print("Parsing environment variables in final config...")
-        config = _parse_environment_variables(config)
-
-        # Check if config has changed by comparing hashes
-        current_config_hash = _get_config_hash(config)
-        
-        # Only reinitialize if config changed or client doesn't exist
-        if _memory_client is None or _config_hash != current_config_hash:
-            print(f"Initializing memory client with config hash: {current_config_hash}")
-            try:
-                _memory_client = Memory.from_config(config_dict=config)
-                _config_hash = current_config_hash
-                print("Memory client initialized successfully")
-            except Exception as init_error:
-                print(f"Warning: Failed to initialize memory client: {init_error}")
-                print("Server will continue running with limited memory functionality")
-                _memory_client = None
-                _config_hash = None
-                return None
-        
-        return _memory_client
-        
-    except Exception as e:
-        print(f"Warning: Exception occurred while initializing memory client: {e}")
-        print("Server will continue running with limited memory functionality")
-        return None
+            print(f"Warning: Exception occurred while initializing memory client: {e}")
+            print("Server will continue running with limited memory functionality")
+            return None
 
 
 def get_default_user_id():
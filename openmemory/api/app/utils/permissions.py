@@ -1,9 +1,227 @@
-from typing import Optional
+import threading
+import time
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 from uuid import UUID
 
-from app.models import App, Memory, MemoryState
+from app.models import AccessControl, App, Memory, MemoryState
+from qdrant_client import models as qdrant_models
+from sqlalchemy import and_, event, false, inspect, not_
 from sqlalchemy.orm import Session
 
+# Compiled app policies are dropped whenever an App or AccessControl row changes in this process.
+# The TTL bounds how long a change made by another process can go unnoticed.
+POLICY_TTL_SECONDS = 30
+
+_policy_cache: Dict[UUID, Tuple[float, int, "AppAccessPolicy"]] = {}
+_policy_generation = 0
+_policy_lock = threading.Lock()
+
+# Paused and archived memory IDs per user, dropped whenever one of the user's memories changes state
+# in this process. The TTL bounds how long a state change made by another process can go unnoticed.
+INACTIVE_IDS_TTL_SECONDS = 30
+
+_inactive_cache: Dict[UUID, Tuple[float, FrozenSet[str]]] = {}
+_inactive_generations: Dict[UUID, int] = {}
+_inactive_lock = threading.Lock()
+
+
+class AppAccessPolicy:
+    """
+    An app's compiled access to memories.
+
+    `allowed_ids` is None when the app's ACL rules don't restrict it to specific memories,
+    otherwise it is the set of memory IDs the app may access. `denied_ids` are the memories
+    an unrestricted app is still denied.
+    """
+
+    def __init__(self, is_active: bool, allowed_ids: Optional[Set[UUID]], denied_ids: Optional[Set[UUID]] = None):
+        self.is_active = is_active
+        self.allowed_ids = allowed_ids
+        self.denied_ids = denied_ids or set()
+
+    def allows(self, memory_id: UUID) -> bool:
+        if not self.is_active or memory_id in self.denied_ids:
+            return False
+        return self.allowed_ids is None or memory_id in self.allowed_ids
+
+
+def compile_app_access_rules(db: Session, app_id: UUID) -> Tuple[Optional[Set[UUID]], Set[UUID]]:
+    """
+    Get the memory IDs the app may access and those it is denied, based on app-level ACL rules.
+
+    The allowed IDs are None if the rules don't restrict the app to specific memories; the app
+    may then access every memory except the denied ones. Otherwise the denied IDs are already
+    removed from the allowed ones and returned empty.
+
+    Rules that only deny specific memories therefore leave the app every other memory. (They used
+    to leave it no memory at all; add an `allow` rule per memory to restrict an app instead.) A
+    deny rule without a memory ID denies everything.
+    """
+    app_access = db.query(AccessControl).filter(
+        AccessControl.subject_type == "app",
+        AccessControl.subject_id == app_id,
+        AccessControl.object_type == "memory"
+    ).all()
+
+    # If no app-level rules exist, return None to indicate all memories are accessible
+    if not app_access:
+        return None, set()
+
+    allowed_memory_ids = set()
+    denied_memory_ids = set()
+    allow_all = False
+
+    for rule in app_access:
+        if rule.effect == "allow":
+            if rule.object_id:  # Specific memory access
+                allowed_memory_ids.add(rule.object_id)
+            else:  # All memories access
+                allow_all = True
+        elif rule.effect == "deny":
+            if rule.object_id:  # Specific memory denied
+                denied_memory_ids.add(rule.object_id)
+            else:  # All memories denied
+                return set(), set()
+
+    if allow_all or not allowed_memory_ids:
+        return None, denied_memory_ids
+    return allowed_memory_ids - denied_memory_ids, set()
+
+
+def get_app_access_policy(db: Session, app_id: UUID) -> AppAccessPolicy:
+    """Get the app's compiled access policy, loading the App row and ACL rules at most once per TTL."""
+    now = time.monotonic()
+    with _policy_lock:
+        cached = _policy_cache.get(app_id)
+        generation = _policy_generation
+    if cached and cached[1] == generation and now - cached[0] < POLICY_TTL_SECONDS:
+        return cached[2]
+
+    app = db.query(App.is_active).filter(App.id == app_id).first()
+    if app is None:
+        policy = AppAccessPolicy(False, set())
+    else:
+        policy = AppAccessPolicy(bool(app.is_active), *compile_app_access_rules(db, app_id))
+
+    with _policy_lock:
+        if generation == _policy_generation:
+            _policy_cache[app_id] = (now, generation, policy)
+    return policy
+
+
+def _invalidate_policies(mapper, connection, target):
+    global _policy_generation
+    with _policy_lock:
+        _policy_generation += 1
+        _policy_cache.clear()
+
+
+for _model in (App, AccessControl):
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, _invalidate_policies)
+
+
+def accessible_memory_condition(db: Session, app_id: Optional[UUID] = None):
+    """
+    SQL condition selecting the memories an app may access.
+
+    Memories must be active. When an app is given it must be active too, and its ACL rules
+    must allow the memory. Use it to filter a query instead of checking memories one by one.
+    """
+    condition = Memory.state == MemoryState.active
+    if not app_id:
+        return condition
+
+    policy = get_app_access_policy(db, app_id)
+    if not policy.is_active:
+        return false()
+    if policy.allowed_ids is None:
+        return and_(condition, not_(Memory.id.in_(policy.denied_ids))) if policy.denied_ids else condition
+    if not policy.allowed_ids:
+        return false()
+    return and_(condition, Memory.id.in_(policy.allowed_ids))
+
+
+def get_accessible_memories(db: Session, user_id: UUID, app_id: Optional[UUID] = None) -> List[Memory]:
+    """Load all of a user's memories the app may access with a single query."""
+    return db.query(Memory).filter(Memory.user_id == user_id, accessible_memory_condition(db, app_id)).all()
+
+
+def filter_accessible_memory_ids(db: Session, memory_ids: List[UUID], app_id: Optional[UUID] = None) -> Set[UUID]:
+    """Return the subset of `memory_ids` the app may access, with a single query."""
+    if not memory_ids:
+        return set()
+    rows = db.query(Memory.id).filter(Memory.id.in_(memory_ids), accessible_memory_condition(db, app_id)).all()
+    return {row[0] for row in rows}
+
+
+def get_inactive_memory_ids(db: Session, user_id: UUID) -> FrozenSet[str]:
+    """Get the IDs of the user's paused and archived memories, loading them at most once per TTL."""
+    now = time.monotonic()
+    with _inactive_lock:
+        cached = _inactive_cache.get(user_id)
+        generation = _inactive_generations.get(user_id, 0)
+    if cached and now - cached[0] < INACTIVE_IDS_TTL_SECONDS:
+        return cached[1]
+
+    rows = db.query(Memory.id).filter(
+        Memory.user_id == user_id,
+        Memory.state.in_([MemoryState.paused, MemoryState.archived]),
+    ).all()
+    inactive = frozenset(str(row[0]) for row in rows)
+
+    with _inactive_lock:
+        # Don't cache IDs loaded while one of the user's memories changed state
+        if generation == _inactive_generations.get(user_id, 0):
+            _inactive_cache[user_id] = (now, inactive)
+    return inactive
+
+
+def _invalidate_inactive_ids(mapper, connection, target):
+    with _inactive_lock:
+        _inactive_generations[target.user_id] = _inactive_generations.get(target.user_id, 0) + 1
+        _inactive_cache.pop(target.user_id, None)
+
+
+def _invalidate_inactive_ids_on_state_change(mapper, connection, target):
+    if inspect(target).attrs.state.history.has_changes():
+        _invalidate_inactive_ids(mapper, connection, target)
+
+
+event.listen(Memory, "after_insert", _invalidate_inactive_ids)
+event.listen(Memory, "after_delete", _invalidate_inactive_ids)
+event.listen(Memory, "after_update", _invalidate_inactive_ids_on_state_change)
+
+
+def build_vector_search_filter(db: Session, user_id: UUID, uid: str, app_id: UUID) -> Optional[qdrant_models.Filter]:
+    """
+    Build the Qdrant filter for an app's search over a user's memories.
+
+    The user's memories are selected by their `user_id` payload. Paused and archived memories
+    are still stored in Qdrant, so they are excluded by ID (cached per user, see
+    `get_inactive_memory_ids`) along with the memories the app's ACL denies. When the ACL
+    restricts the app to specific memories, those are listed instead. Deleted memories are
+    removed from Qdrant, and callers should still check hits with `filter_accessible_memory_ids`.
+
+    Returns None when the app may not access any memory.
+    """
+    policy = get_app_access_policy(db, app_id)
+    if not policy.is_active or policy.allowed_ids == set():
+        return None
+
+    conditions = [qdrant_models.FieldCondition(key="user_id", match=qdrant_models.MatchValue(value=uid))]
+    if policy.allowed_ids is not None:
+        allowed = filter_accessible_memory_ids(db, list(policy.allowed_ids), app_id)
+        if not allowed:
+            return None
+        return qdrant_models.Filter(
+            must=conditions + [qdrant_models.HasIdCondition(has_id=[str(memory_id) for memory_id in allowed])]
+        )
+
+    excluded = get_inactive_memory_ids(db, user_id) | {str(memory_id) for memory_id in policy.denied_ids}
+    must_not = [qdrant_models.HasIdCondition(has_id=sorted(excluded))] if excluded else None
+    return qdrant_models.Filter(must=conditions, must_not=must_not)
+
 
 def check_memory_access_permissions(
     db: Session,
@@ -32,22 +250,4 @@ def check_memory_access_permissions(
     if not app_id:
         return True
 
-    # Check if app exists and is active
-    app = db.query(App).filter(App.id == app_id).first()
-    if not app:
-        return False
-
-    # Check if app is paused/inactive
-    if not app.is_active:
-        return False
-
-    # Check app-specific access controls
-    from app.routers.memories import get_accessible_memory_ids
-    accessible_memory_ids = get_accessible_memory_ids(db, app_id)
-
-    # If accessible_memory_ids is None, all memories are accessible
-    if accessible_memory_ids is None:
-        return True
-
-    # Check if memory is in the accessible set
-    return memory.id in accessible_memory_ids
+    return get_app_access_policy(db, app_id).allows(memory.id)
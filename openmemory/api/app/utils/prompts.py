@@ -27,3 +27,9 @@ Guidelines:
 - Don't limit yourself to the categories listed above only. Feel free to create new categories based on the memory. Make sure that it is a single phrase.
 - The system will automatically add processing status tags ('processed' or 'unprocessed') based on how the memory was created, so do not include these in your response.
 """
+
+BATCH_MEMORY_CATEGORIZATION_PROMPT = MEMORY_CATEGORIZATION_PROMPT + """
+You will receive several memories at once, each prefixed with its index in square brackets.
+- Categorize every memory independently, following the guidelines above.
+- Return one entry per memory under the 'memories' key, each with the memory's 'index' and its 'categories'.
+"""
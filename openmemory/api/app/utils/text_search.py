@@ -0,0 +1,151 @@
+"""
+Indexed substring search over memory content.
+
+`search_query` used to be a bare `ILIKE '%…%'`, which scans every memory of the user. On SQLite
+memories are indexed by an FTS5 table with the trigram tokenizer, kept in sync by triggers; on
+Postgres a pg_trgm GIN index serves the ILIKE directly. Both keep the old case-insensitive
+substring semantics and add a relevance rank. Other databases, queries shorter than a trigram, and
+SQLite builds without FTS5 trigram support fall back to the plain ILIKE.
+"""
+import logging
+from typing import Optional
+
+from app.models import Memory
+from sqlalchemy import column, func, literal_column, select, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+MIN_INDEXED_QUERY_LENGTH = 3
+
+SQLITE_FTS_TABLE = "memories_fts"
+SQLITE_FTS_KEYS_TABLE = "memories_fts_keys"
+SQLITE_FTS_CONTENT_VIEW = "memories_fts_content"
+
+# FTS5 rows need an integer key, and the implicit rowid of memories (keyed by a UUID) may be
+# renumbered by VACUUM. Each memory gets a stable INTEGER PRIMARY KEY in the keys table instead,
+# and the index reads content through a view joining the keys to memories, so it isn't stored twice.
+SQLITE_SEARCH_DDL = [
+    f"CREATE TABLE IF NOT EXISTS {SQLITE_FTS_KEYS_TABLE} ("
+    f"id INTEGER PRIMARY KEY, memory_id CHAR(32) NOT NULL UNIQUE)",
+    f"""CREATE VIEW IF NOT EXISTS {SQLITE_FTS_CONTENT_VIEW} AS
+        SELECT k.id AS id, m.content AS content FROM {SQLITE_FTS_KEYS_TABLE} k JOIN memories m ON m.id = k.memory_id""",
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5("
+    f"content, content='{SQLITE_FTS_CONTENT_VIEW}', content_rowid='id', tokenize='trigram')",
+    f"""CREATE TRIGGER IF NOT EXISTS memories_fts_insert AFTER INSERT ON memories BEGIN
+        INSERT INTO {SQLITE_FTS_KEYS_TABLE}(memory_id) VALUES (NEW.id);
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, content)
+            SELECT id, NEW.content FROM {SQLITE_FTS_KEYS_TABLE} WHERE memory_id = NEW.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS memories_fts_update AFTER UPDATE OF content ON memories BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, content)
+            SELECT 'delete', id, OLD.content FROM {SQLITE_FTS_KEYS_TABLE} WHERE memory_id = OLD.id;
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, content)
+            SELECT id, NEW.content FROM {SQLITE_FTS_KEYS_TABLE} WHERE memory_id = NEW.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS memories_fts_delete AFTER DELETE ON memories BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, content)
+            SELECT 'delete', id, OLD.content FROM {SQLITE_FTS_KEYS_TABLE} WHERE memory_id = OLD.id;
+        DELETE FROM {SQLITE_FTS_KEYS_TABLE} WHERE memory_id = OLD.id;
+    END""",
+]
+
+SQLITE_SEARCH_REBUILD = [
+    f"DELETE FROM {SQLITE_FTS_KEYS_TABLE} WHERE memory_id NOT IN (SELECT id FROM memories)",
+    f"INSERT INTO {SQLITE_FTS_KEYS_TABLE}(memory_id) "
+    f"SELECT id FROM memories WHERE id NOT IN (SELECT memory_id FROM {SQLITE_FTS_KEYS_TABLE})",
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_SEARCH_DROP = [
+    "DROP TRIGGER IF EXISTS memories_fts_delete",
+    "DROP TRIGGER IF EXISTS memories_fts_update",
+    "DROP TRIGGER IF EXISTS memories_fts_insert",
+    f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}",
+    f"DROP VIEW IF EXISTS {SQLITE_FTS_CONTENT_VIEW}",
+    f"DROP TABLE IF EXISTS {SQLITE_FTS_KEYS_TABLE}",
+]
+
+POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS idx_memory_content_trgm ON memories USING gin (content gin_trgm_ops)",
+]
+
+# Set by ensure_search_index; None until it has run for this process
+_index_available: Optional[bool] = None
+# Whether SQLite supports MATERIALIZED CTEs (3.35+); the trigram tokenizer only needs 3.34
+_materialize_matches = False
+
+
+def ensure_search_index(engine: Engine) -> bool:
+    """Create the search index and its triggers if they're missing. Returns whether it's usable."""
+    global _index_available, _materialize_matches
+    try:
+        with engine.begin() as connection:
+            if engine.dialect.name == "sqlite":
+                version = connection.execute(text("SELECT sqlite_version()")).scalar()
+                _materialize_matches = tuple(int(part) for part in version.split(".")[:2]) >= (3, 35)
+                existing = connection.execute(
+                    text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {"name": SQLITE_FTS_TABLE},
+                ).scalar()
+                # Earlier layouts were keyed by the memories rowid, or by a memory_id column in the index
+                if existing and SQLITE_FTS_CONTENT_VIEW not in existing:
+                    for statement in SQLITE_SEARCH_DROP:
+                        connection.execute(text(statement))
+                    existing = None
+                for statement in SQLITE_SEARCH_DDL:
+                    connection.execute(text(statement))
+                if not existing:
+                    for statement in SQLITE_SEARCH_REBUILD:
+                        connection.execute(text(statement))
+            elif engine.dialect.name == "postgresql":
+                for statement in POSTGRES_SEARCH_DDL:
+                    connection.execute(text(statement))
+            else:
+                _index_available = False
+                return False
+        _index_available = True
+    except Exception as e:
+        logging.warning(f"Memory text search index unavailable, falling back to ILIKE: {e}")
+        _index_available = False
+    return _index_available
+
+
+def _uses_fts(db: Session, search_query: str) -> bool:
+    return (
+        _index_available is True
+        and db.get_bind().dialect.name == "sqlite"
+        and len(search_query) >= MIN_INDEXED_QUERY_LENGTH
+    )
+
+
+def _fts_phrase(search_query: str) -> str:
+    # Quote the query as one FTS5 phrase so user input is never parsed as query syntax
+    return '"' + search_query.replace('"', '""') + '"'
+
+
+def apply_memory_search(db: Session, query, search_query: str, ranked: bool = False):
+    """
+    Filter a Memory query to memories whose content contains `search_query`, case-insensitively.
+
+    With `ranked`, the best matches are ordered first; later `order_by` calls break ties.
+    """
+    if _uses_fts(db, search_query):
+        keys = table(SQLITE_FTS_KEYS_TABLE, column("id"), column("memory_id"))
+        matches = (
+            select(keys.c.memory_id, literal_column(f"{SQLITE_FTS_TABLE}.rank").label("rank"))
+            .select_from(table(SQLITE_FTS_TABLE).join(keys, keys.c.id == literal_column(f"{SQLITE_FTS_TABLE}.rowid")))
+            .where(text(f"{SQLITE_FTS_TABLE} MATCH :search_phrase").bindparams(search_phrase=_fts_phrase(search_query)))
+            .cte("memory_search_matches")
+        )
+        if _materialize_matches:
+            # So the MATCH runs once, instead of once per candidate memory
+            matches = matches.prefix_with("MATERIALIZED")
+        query = query.join(matches, matches.c.memory_id == Memory.id)
+        # FTS5's rank is bm25, which is lower for better matches
+        return query.order_by(matches.c.rank) if ranked else query
+
+    query = query.filter(Memory.content.ilike(f"%{search_query}%"))
+    if ranked and db.get_bind().dialect.name == "postgresql" and _index_available:
+        query = query.order_by(func.word_similarity(search_query, Memory.content).desc())
+    return query
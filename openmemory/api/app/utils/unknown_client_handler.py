@@ -11,7 +11,11 @@ from typing import Dict, Optional
 
 from app.database import SessionLocal
 from app.models import ClientRegistry, ClientRegistryStatus
-from app.utils.client_detection import ClientDetectionResult
+from app.utils.client_detection import (
+    ClientDetectionResult,
+    client_activity,
+    get_client_registry_status,
+)
 from fastapi import HTTPException, Request
 
 
@@ -36,36 +40,33 @@ class UnknownClientHandler:
         Returns:
             Response dictionary with action taken
         """
+        # Check if this unknown client has been seen before
+        existing = get_client_registry_status(detection_result.client_identifier)
+        
+        if existing:
+            status = existing[0]
+            if status == ClientRegistryStatus.blocked:
+                # Client is blocked - deny access
+                logging.warning(f"Blocked client attempted access: {detection_result.client_identifier}")
+                raise HTTPException(
+                    status_code=403, 
+                    detail=f"Client '{detection_result.client_identifier}' is blocked"
+                )
+            elif status == ClientRegistryStatus.approved:
+                # Client was approved - allow access
+                return {"action": "allowed", "reason": "previously_approved"}
+            else:
+                # Client is pending - update last seen
+                client_activity.touch(detection_result.client_identifier)
+                return self._quarantine_client(detection_result, "pending_approval")
+        
+        # New unknown client - create registry entry and quarantine
         db = SessionLocal()
         try:
-            # Check if this unknown client has been seen before
-            existing = db.query(ClientRegistry).filter(
-                ClientRegistry.client_identifier == detection_result.client_identifier
-            ).first()
-            
-            if existing:
-                if existing.status == ClientRegistryStatus.blocked:
-                    # Client is blocked - deny access
-                    logging.warning(f"Blocked client attempted access: {detection_result.client_identifier}")
-                    raise HTTPException(
-                        status_code=403, 
-                        detail=f"Client '{detection_result.client_identifier}' is blocked"
-                    )
-                elif existing.status == ClientRegistryStatus.approved:
-                    # Client was approved - allow access
-                    return {"action": "allowed", "reason": "previously_approved"}
-                else:
-                    # Client is pending - update last seen
-                    existing.last_seen_at = datetime.now(timezone.utc)
-                    db.commit()
-                    return self._quarantine_client(detection_result, "pending_approval")
-            else:
-                # New unknown client - create registry entry and quarantine
-                new_client = self._create_unknown_client_registry(detection_result, request, db)
-                return self._quarantine_client(detection_result, "new_unknown_client")
-                
+            self._create_unknown_client_registry(detection_result, request, db)
         finally:
             db.close()
+        return self._quarantine_client(detection_result, "new_unknown_client")
     
     def _create_unknown_client_registry(
         self, 
@@ -151,17 +152,8 @@ class UnknownClientHandler:
 
 def is_client_quarantined(client_identifier: str) -> bool:
     """Check if a client is currently quarantined."""
-    db = SessionLocal()
-    try:
-        client = db.query(ClientRegistry).filter(
-            ClientRegistry.client_identifier == client_identifier,
-            ClientRegistry.status.in_([ClientRegistryStatus.unknown, ClientRegistryStatus.pending])
-        ).first()
-        
-        return client is not None
-        
-    finally:
-        db.close()
+    registry = get_client_registry_status(client_identifier)
+    return registry is not None and registry[0] in (ClientRegistryStatus.unknown, ClientRegistryStatus.pending)
 
 
 def get_quarantined_clients() -> Dict:
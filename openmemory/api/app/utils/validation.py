@@ -47,7 +47,33 @@ def validate_memory_exists(db: Session, memory_id: str, user_id: str) -> bool:
         return False
 
 
-def validate_memory_operations(operations: List[Dict[str, Any]], db: Session, user_id: str) -> List[Dict[str, Any]]:
+def prefetch_memories(db: Session, operations: List[Dict[str, Any]]) -> Dict[uuid.UUID, Memory]:
+    """
+    Load every memory referenced by a list of mem0 operations with a single IN query.
+    
+    Args:
+        operations: List of memory operations from mem0
+        db: Database session
+        
+    Returns:
+        Mapping of memory ID to Memory for the referenced memories that exist
+    """
+    memory_ids = set()
+    for operation in operations:
+        try:
+            memory_ids.add(uuid.UUID(operation.get('id')))
+        except (ValueError, TypeError, AttributeError):
+            continue
+    
+    if not memory_ids:
+        return {}
+    
+    memories = db.query(Memory).filter(Memory.id.in_(memory_ids)).all()
+    return {memory.id: memory for memory in memories}
+
+
+def validate_memory_operations(operations: List[Dict[str, Any]], db: Session, user_id: str,
+                               memories: Optional[Dict[uuid.UUID, Memory]] = None) -> List[Dict[str, Any]]:
     """
     Validate memory operations to prevent phantom operations and inappropriate relationships.
     
@@ -55,10 +81,14 @@ def validate_memory_operations(operations: List[Dict[str, Any]], db: Session, us
         operations: List of memory operations from mem0
         db: Database session
         user_id: User identifier
+        memories: Memories from prefetch_memories; fetched here when not given
         
     Returns:
         Filtered list of validated operations
     """
+    if memories is None:
+        memories = prefetch_memories(db, operations)
+    
     validated_operations = []
     
     for operation in operations:
@@ -75,7 +105,7 @@ def validate_memory_operations(operations: List[Dict[str, Any]], db: Session, us
         
         # For UPDATE and DELETE operations, validate memory exists
         if operation_type in ['UPDATE', 'DELETE'] and memory_id:
-            if validate_memory_exists(db, memory_id, user_id):
+            if _is_live_memory(memories, memory_id):
                 validated_operations.append(operation)
                 logger.info(f"Validated {operation_type} operation on existing memory {memory_id}")
             else:
@@ -95,6 +125,15 @@ def validate_memory_operations(operations: List[Dict[str, Any]], db: Session, us
     return validated_operations
 
 
+def _is_live_memory(memories: Dict[uuid.UUID, Memory], memory_id: str) -> bool:
+    try:
+        memory = memories.get(uuid.UUID(memory_id))
+    except (ValueError, TypeError, AttributeError):
+        logger.warning(f"Invalid memory ID format: {memory_id}")
+        return False
+    return memory is not None and memory.state not in (MemoryState.deleted, MemoryState.archived)
+
+
 def is_minimal_content(text: str) -> bool:
     """
     Determine if content is too minimal for LLM processing.
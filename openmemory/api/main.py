@@ -6,7 +6,12 @@ from app.database import Base, SessionLocal, engine
 from app.mcp_server import setup_mcp_server
 from app.models import App, User
 from app.routers import admin_router, apps_router, config_router, memories_router, stats_router
+from app.utils.access_log import access_log_writer
+from app.utils.categorization_queue import categorization_worker
+from app.utils.client_detection import client_activity
 from app.utils.client_seeding import seed_default_clients
+from app.utils.concurrency import shutdown_executors
+from app.utils.text_search import ensure_search_index
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi_pagination import add_pagination
@@ -23,6 +28,7 @@ app.add_middleware(
 
 # Create all tables
 Base.metadata.create_all(bind=engine)
+ensure_search_index(engine)
 
 # Check for USER_ID and create default user if needed
 def create_default_user():
@@ -95,3 +101,17 @@ app.include_router(admin_router)
 
 # Add pagination support
 add_pagination(app)
+
+
+# Categorize memories in the background, off the request path
+@app.on_event("startup")
+def start_categorization_worker():
+    categorization_worker.start()
+
+
+@app.on_event("shutdown")
+def stop_categorization_worker():
+    categorization_worker.stop(timeout=30)
+    shutdown_executors()
+    client_activity.close()
+    access_log_writer.close()
@@ -0,0 +1,18 @@
+import os
+import tempfile
+
+# Point the app at a throwaway database before anything imports app.database
+_database_dir = tempfile.mkdtemp(prefix="openmemory-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_database_dir, 'openmemory.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+import pytest  # noqa: E402
+
+from app.database import Base, engine  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    engine.dispose()
@@ -0,0 +1,174 @@
+import datetime
+import uuid
+
+import pytest
+
+from app.database import SessionLocal
+from app.models import CategorizationTask, Memory, get_current_utc_time
+from app.utils import categorization, categorization_queue
+from app.utils.categorization_queue import CategorizationWorker
+from app.utils.db import get_user_and_app
+
+
+class FakeCategorizer:
+    """Stands in for the batched LLM call, answering with one category per memory."""
+
+    def __init__(self):
+        self.calls = []
+        self.fail = False
+        self.skip = set()
+
+    def __call__(self, contents):
+        self.calls.append(list(contents))
+        if self.fail:
+            raise RuntimeError("LLM unavailable")
+        return [None if content in self.skip else [content.split()[-1]] for content in contents]
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    # Queue rows left by other tests would be claimed along with this test's
+    session.query(CategorizationTask).delete()
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def categorizer(monkeypatch):
+    fake = FakeCategorizer()
+    monkeypatch.setattr(categorization_queue, "get_categories_for_memories", fake)
+    monkeypatch.setattr(categorization_queue, "uses_llm", lambda: True)
+    return fake
+
+
+@pytest.fixture
+def add_memories(db):
+    user, app = get_user_and_app(db, user_id=f"user-{uuid.uuid4()}", app_id=f"app-{uuid.uuid4()}")
+
+    def add(*contents):
+        memories = [Memory(user_id=user.id, app_id=app.id, content=content) for content in contents]
+        db.add_all(memories)
+        db.commit()
+        return memories
+
+    return add
+
+
+def _statuses(db, memories):
+    db.expire_all()
+    rows = db.query(CategorizationTask).filter(CategorizationTask.memory_id.in_([m.id for m in memories])).all()
+    by_memory = {row.memory_id: (row.status, row.attempts) for row in rows}
+    return [by_memory[memory.id] for memory in memories]
+
+
+def _categories(db, memory):
+    db.refresh(memory)
+    return sorted(category.name for category in memory.categories)
+
+
+def test_batch_is_categorized_once_per_distinct_content(db, categorizer, add_memories):
+    memories = add_memories("likes tea", "likes tea", "plays chess")
+
+    assert CategorizationWorker().run_once() == 3
+
+    assert categorizer.calls == [["likes tea", "plays chess"]]
+    assert [_categories(db, memory) for memory in memories] == [["tea"], ["tea"], ["chess"]]
+    assert _statuses(db, memories) == [("done", 1)] * 3
+
+
+def test_categories_of_done_rows_are_reused(db, categorizer, add_memories):
+    worker = CategorizationWorker()
+    add_memories("likes coffee")
+    worker.run_once()
+
+    again = add_memories("likes coffee")
+    worker.run_once()
+    # A fresh worker has no cached categories and reuses those of the done row instead
+    later = add_memories("likes coffee")
+    CategorizationWorker().run_once()
+
+    assert categorizer.calls == [["likes coffee"]]
+    assert _categories(db, again[0]) == _categories(db, later[0]) == ["coffee"]
+
+
+def test_claimed_rows_wait_for_their_lease_to_expire(db, categorizer, add_memories):
+    memories = add_memories("reads poetry")
+    crashed = CategorizationWorker(lease_seconds=60)
+    _, claimed = crashed._claim(db)
+    assert [task.memory_id for task in claimed] == [memories[0].id]
+
+    worker = CategorizationWorker(lease_seconds=60)
+    assert worker.run_once() == 0
+
+    db.query(CategorizationTask).update(
+        {CategorizationTask.claimed_at: get_current_utc_time() - datetime.timedelta(seconds=61)}
+    )
+    db.commit()
+    assert worker.run_once() == 1
+    assert _statuses(db, memories) == [("done", 2)]
+    assert _categories(db, memories[0]) == ["poetry"]
+
+
+def test_failed_llm_calls_are_retried_and_not_cached(db, categorizer, add_memories):
+    memories = add_memories("collects stamps")
+    worker = CategorizationWorker(max_attempts=2)
+    categorizer.fail = True
+
+    assert worker.run_once() == 1
+    assert _statuses(db, memories) == [("pending", 1)]
+    assert _categories(db, memories[0]) == []
+
+    categorizer.fail = False
+    assert worker.run_once() == 1
+    assert _statuses(db, memories) == [("done", 2)]
+    assert _categories(db, memories[0]) == ["stamps"]
+
+    categorizer.fail = True
+    failing = add_memories("grows tomatoes")
+    worker.run_once()
+    worker.run_once()
+    assert _statuses(db, failing) == [("failed", 2)]
+    assert worker.run_once() == 0
+
+
+def test_memories_the_model_skipped_are_retried(db, categorizer, add_memories):
+    memories = add_memories("speaks french", "speaks greek")
+    categorizer.skip = {"speaks greek"}
+    worker = CategorizationWorker()
+
+    worker.run_once()
+    assert _statuses(db, memories) == [("done", 1), ("pending", 1)]
+    assert _categories(db, memories[1]) == []
+
+    categorizer.skip = set()
+    worker.run_once()
+    assert _statuses(db, memories) == [("done", 1), ("done", 2)]
+    assert _categories(db, memories[1]) == ["greek"]
+
+
+def test_keyword_categories_are_not_reused(db, categorizer, add_memories, monkeypatch):
+    monkeypatch.setattr(categorization_queue, "uses_llm", lambda: False)
+    first = add_memories("plays guitar")
+    worker = CategorizationWorker()
+    worker.run_once()
+    assert _statuses(db, first) == [("fallback", 1)]
+
+    monkeypatch.setattr(categorization_queue, "uses_llm", lambda: True)
+    second = add_memories("plays guitar")
+    worker.run_once()
+
+    assert categorizer.calls == [["plays guitar"], ["plays guitar"]]
+    assert _statuses(db, second) == [("done", 1)]
+
+
+def test_batched_llm_failures_raise_instead_of_guessing(monkeypatch):
+    def unavailable(memories):
+        raise RuntimeError("LLM unavailable")
+
+    monkeypatch.setattr(categorization, "openai_client", object())
+    monkeypatch.setattr(categorization, "_parse_categories_batch", unavailable)
+
+    with pytest.raises(RuntimeError):
+        categorization.get_categories_for_memories(["works at the office"])
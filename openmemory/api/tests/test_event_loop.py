@@ -0,0 +1,93 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app import mcp_server
+
+# Time the fake memory client blocks per call, and the longest stall the event loop may see
+BLOCKING_SECONDS = 0.3
+MAX_LOOP_LAG_SECONDS = 0.1
+TICK_SECONDS = 0.01
+
+
+class BlockingMemoryClient:
+    """Memory client whose calls block the calling thread, like a real LLM or vector store call."""
+
+    def __init__(self):
+        self.calls = []
+        self.embedding_model = SimpleNamespace(embed=self._embed)
+        self.vector_store = SimpleNamespace(
+            collection_name="memories",
+            client=SimpleNamespace(query_points=lambda **kwargs: SimpleNamespace(points=[])),
+        )
+
+    def add(self, messages, **kwargs):
+        self.calls.append("add")
+        time.sleep(BLOCKING_SECONDS)
+        return {"results": []}
+
+    def _embed(self, text, memory_action=None):
+        self.calls.append("embed")
+        time.sleep(BLOCKING_SECONDS)
+        return [0.0]
+
+
+@pytest.fixture
+def memory_client(monkeypatch):
+    client = BlockingMemoryClient()
+    monkeypatch.setattr(mcp_server, "get_memory_client_safe", lambda: client)
+    return client
+
+
+async def _max_loop_lag(*coroutines):
+    """Run the coroutines and return their results and the longest the event loop went without running."""
+    loop = asyncio.get_running_loop()
+    max_lag = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal max_lag
+        while not done:
+            started = loop.time()
+            await asyncio.sleep(TICK_SECONDS)
+            max_lag = max(max_lag, loop.time() - started - TICK_SECONDS)
+
+    ticking = asyncio.ensure_future(ticker())
+    # Let the ticker start before the tools run
+    await asyncio.sleep(0)
+    try:
+        results = await asyncio.gather(*coroutines)
+    finally:
+        done = True
+        await ticking
+    return results, max_lag
+
+
+def _run_tools(*tool_calls):
+    async def run():
+        mcp_server.user_id_var.set("loop-test-user")
+        mcp_server.client_name_var.set("loop-test-client")
+        mcp_server.client_info_var.set({"client_identifier": "loop-test-client"})
+        return await _max_loop_lag(*(tool() for tool in tool_calls))
+
+    return asyncio.run(run())
+
+
+def test_add_memories_does_not_block_event_loop(memory_client):
+    results, max_lag = _run_tools(
+        *[lambda: mcp_server.add_memories("I prefer window seats on long flights", infer=False)] * 3
+    )
+
+    assert memory_client.calls == ["add"] * 3
+    assert all(not result.startswith("Error") for result in results), results
+    assert max_lag < MAX_LOOP_LAG_SECONDS
+
+
+def test_search_memory_does_not_block_event_loop(memory_client):
+    results, max_lag = _run_tools(lambda: mcp_server.search_memory("seats"))
+
+    assert memory_client.calls == ["embed"]
+    assert results == ["[]"]
+    assert max_lag < MAX_LOOP_LAG_SECONDS
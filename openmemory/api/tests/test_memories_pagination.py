@@ -0,0 +1,148 @@
+import datetime
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from fastapi_pagination import Params
+
+from app.database import SessionLocal, engine
+from app.models import Category, Memory
+from app.routers.memories import (
+    FilterMemoriesCursorRequest,
+    FilterMemoriesRequest,
+    filter_memories,
+    filter_memories_cursor,
+    list_memories,
+)
+from app.utils.db import get_user_and_app
+from app.utils.text_search import ensure_search_index
+
+START = datetime.datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def db():
+    ensure_search_index(engine)
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def user_memories(db):
+    user, app = get_user_and_app(db, user_id=f"user-{uuid.uuid4()}", app_id=f"app-{uuid.uuid4()}")
+
+    def add(*memories):
+        """Add (content, minutes after START) pairs, oldest first."""
+        rows = [
+            Memory(user_id=user.id, app_id=app.id, content=content, created_at=START + datetime.timedelta(minutes=n))
+            for content, n in memories
+        ]
+        db.add_all(rows)
+        db.commit()
+        return rows
+
+    return user, add
+
+
+def _all_pages(fetch):
+    """Follow next_cursor from the first page to the last, returning the contents and the pages."""
+    pages = [fetch(None)]
+    while pages[-1].next_cursor:
+        pages.append(fetch(pages[-1].next_cursor))
+    return [item.content for page in pages for item in page.items], pages
+
+
+def _filter(db, user, **fields):
+    return filter_memories(FilterMemoriesRequest(user_id=user.user_id, **fields), db=db)
+
+
+def _list(db, user, cursor=None, size=2, **params):
+    defaults = dict(app_id=None, from_date=None, to_date=None, categories=None, search_query=None,
+                    sort_column=None, sort_direction=None)
+    return list_memories(user.user_id, params=Params(page=1, size=size), cursor=cursor, db=db, **{**defaults, **params})
+
+
+def test_cursor_round_trip_in_both_directions(db, user_memories):
+    user, add = user_memories
+    add(*[(f"memory {i}", i) for i in range(5)])
+
+    newest_first, pages = _all_pages(lambda cursor: _filter(db, user, size=2, cursor=cursor))
+    assert newest_first == [f"memory {i}" for i in reversed(range(5))]
+    assert [len(page.items) for page in pages] == [2, 2, 1]
+    assert [page.total for page in pages] == [5, 5, 5]
+
+    oldest_first, _ = _all_pages(lambda cursor: _filter(
+        db, user, size=2, cursor=cursor, sort_column="created_at", sort_direction="asc"
+    ))
+    assert oldest_first == [f"memory {i}" for i in range(5)]
+
+    listed, _ = _all_pages(lambda cursor: _list(db, user, cursor=cursor))
+    assert listed == newest_first
+
+
+def test_cursor_pages_split_equal_timestamps_without_gaps(db, user_memories):
+    user, add = user_memories
+    add(*[(f"tied {i}", 0) for i in range(5)], ("later", 1))
+
+    contents, pages = _all_pages(lambda cursor: _filter(db, user, size=2, cursor=cursor))
+    assert contents[0] == "later"
+    assert sorted(contents) == sorted(["later"] + [f"tied {i}" for i in range(5)])
+    assert len(pages) == 3
+
+    ascending, _ = _all_pages(lambda cursor: filter_memories_cursor(
+        FilterMemoriesCursorRequest(user_id=user.user_id, size=2, cursor=cursor, sort_direction="asc"), db=db
+    ))
+    assert ascending == list(reversed(contents))
+
+
+def test_cursor_pages_keep_category_and_search_filters(db, user_memories):
+    user, add = user_memories
+    memories = add(("likes tea", 0), ("likes coffee", 1), ("plays chess", 2), ("likes juice", 3), ("likes soda", 4))
+    drinks = Category(name=f"drinks-{uuid.uuid4()}")
+    for memory in memories:
+        if memory.content != "likes juice":
+            memory.categories.append(drinks)
+    db.commit()
+
+    by_category, _ = _all_pages(lambda cursor: _filter(db, user, size=1, cursor=cursor, category_ids=[drinks.id]))
+    assert by_category == ["likes soda", "plays chess", "likes coffee", "likes tea"]
+
+    # Ranked search pages are numbered, so they return no cursor
+    ranked = _list(db, user, size=1, search_query="likes")
+    assert (ranked.total, ranked.pages, ranked.next_cursor) == (4, 4, None)
+
+    by_search, _ = _all_pages(lambda cursor: _list(
+        db, user, cursor=cursor, size=1, search_query="likes", sort_column="created_at", sort_direction="desc"
+    ))
+    assert by_search == ["likes soda", "likes juice", "likes coffee", "likes tea"]
+
+    first = _filter(db, user, size=2, search_query="likes", sort_column="created_at", sort_direction="desc")
+    rest, _ = _all_pages(lambda cursor: _filter(
+        db, user, size=2, search_query="likes", cursor=cursor or first.next_cursor
+    ))
+    assert [item.content for item in first.items] + rest == ["likes soda", "likes juice", "likes coffee", "likes tea"]
+
+
+def test_page_numbers_still_work_and_report_totals(db, user_memories):
+    user, add = user_memories
+    add(*[(f"memory {i}", i) for i in range(5)])
+
+    page = _filter(db, user, page=3, size=2)
+    assert [item.content for item in page.items] == ["memory 0"]
+    assert (page.total, page.page, page.pages, page.total_is_approximate) == (5, 3, 3, False)
+    assert page.next_cursor is None
+
+    sorted_page = _filter(db, user, page=1, size=2, sort_column="memory", sort_direction="asc")
+    assert [item.content for item in sorted_page.items] == ["memory 0", "memory 1"]
+    assert sorted_page.next_cursor is None
+
+
+def test_cursor_with_other_sort_columns_is_refused(db, user_memories):
+    user, add = user_memories
+    add(("memory", 0), ("other", 1))
+    cursor = _filter(db, user, size=1).next_cursor
+
+    with pytest.raises(HTTPException) as error:
+        _filter(db, user, size=1, cursor=cursor, sort_column="memory", sort_direction="asc")
+    assert error.value.status_code == 400
@@ -0,0 +1,109 @@
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from app.database import SessionLocal, engine
+from app.models import AccessControl, Memory, MemoryState
+from app.utils.db import get_user_and_app
+from app.utils.permissions import build_vector_search_filter, filter_accessible_memory_ids, get_accessible_memories
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def memories(db):
+    user, app = get_user_and_app(db, user_id=f"user-{uuid.uuid4()}", app_id=f"app-{uuid.uuid4()}")
+    created = {}
+    for name, state in (("kept", MemoryState.active), ("denied", MemoryState.active), ("paused", MemoryState.paused)):
+        memory = Memory(user_id=user.id, app_id=app.id, content=name, state=state)
+        db.add(memory)
+        created[name] = memory
+    db.commit()
+    return user, app, created
+
+
+def _acl(db, app, effect, memory=None):
+    object_id = memory.id if memory else None
+    db.add(
+        AccessControl(subject_type="app", subject_id=app.id, object_type="memory", object_id=object_id, effect=effect)
+    )
+    db.commit()
+
+
+def _excluded_ids(search_filter):
+    return {point_id for condition in search_filter.must_not or [] for point_id in condition.has_id}
+
+
+@pytest.mark.parametrize("allow_all", [False, True])
+def test_denied_memories_are_excluded_from_vector_search(db, memories, allow_all):
+    user, app, created = memories
+    if allow_all:
+        _acl(db, app, "allow")
+    _acl(db, app, "deny", created["denied"])
+
+    search_filter = build_vector_search_filter(db, user.id, user.user_id, app.id)
+
+    assert _excluded_ids(search_filter) == {str(created["denied"].id), str(created["paused"].id)}
+    ids = [memory.id for memory in created.values()]
+    assert filter_accessible_memory_ids(db, ids, app.id) == {created["kept"].id}
+
+
+def test_deny_all_blocks_vector_search(db, memories):
+    user, app, _ = memories
+    _acl(db, app, "deny")
+
+    assert build_vector_search_filter(db, user.id, user.user_id, app.id) is None
+
+
+def test_deny_only_rules_leave_every_other_memory_accessible(db, memories):
+    user, app, created = memories
+    _acl(db, app, "deny", created["denied"])
+
+    assert [memory.id for memory in get_accessible_memories(db, user.id, app.id)] == [created["kept"].id]
+
+
+def test_allow_rules_restrict_the_app_to_the_allowed_memories(db, memories):
+    user, app, created = memories
+    extra = Memory(user_id=user.id, app_id=app.id, content="unlisted", state=MemoryState.active)
+    db.add(extra)
+    db.commit()
+    _acl(db, app, "allow", created["kept"])
+    _acl(db, app, "allow", created["denied"])
+    _acl(db, app, "deny", created["denied"])
+
+    assert [memory.id for memory in get_accessible_memories(db, user.id, app.id)] == [created["kept"].id]
+
+
+def test_inactive_ids_are_cached_until_a_memory_changes_state(db, memories):
+    user, app, created = memories
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "memories" in statement and "state IN" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        build_vector_search_filter(db, user.id, user.user_id, app.id)
+        search_filter = build_vector_search_filter(db, user.id, user.user_id, app.id)
+        assert _excluded_ids(search_filter) == {str(created["paused"].id)}
+        assert len(statements) == 1
+
+        created["kept"].state = MemoryState.archived
+        db.commit()
+        search_filter = build_vector_search_filter(db, user.id, user.user_id, app.id)
+        assert _excluded_ids(search_filter) == {str(created["paused"].id), str(created["kept"].id)}
+        assert len(statements) == 2
+
+        created["denied"].content = "renamed"
+        db.commit()
+        build_vector_search_filter(db, user.id, user.user_id, app.id)
+        assert len(statements) == 2
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
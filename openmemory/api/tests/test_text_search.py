@@ -0,0 +1,93 @@
+import uuid
+
+import pytest
+
+from app.database import SessionLocal, engine
+from app.models import Memory
+from app.utils import text_search
+from app.utils.db import get_user_and_app
+from app.utils.text_search import SQLITE_SEARCH_DROP, apply_memory_search, ensure_search_index
+
+
+@pytest.fixture
+def db():
+    assert ensure_search_index(engine)
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def user_memories(db):
+    user, app = get_user_and_app(db, user_id=f"user-{uuid.uuid4()}", app_id=f"app-{uuid.uuid4()}")
+
+    def add(*contents):
+        memories = [Memory(user_id=user.id, app_id=app.id, content=content) for content in contents]
+        db.add_all(memories)
+        db.commit()
+        return memories
+
+    return user, add
+
+
+def _search(db, user, search_query):
+    query = apply_memory_search(db, db.query(Memory).filter(Memory.user_id == user.id), search_query, ranked=True)
+    return [memory.content for memory in query.all()]
+
+
+def test_search_matches_substrings_case_insensitively(db, user_memories):
+    user, add = user_memories
+    add("Loves Hiking in the Alps", "Allergic to peanuts", "Hikes every weekend")
+
+    assert sorted(_search(db, user, "hik")) == ["Hikes every weekend", "Loves Hiking in the Alps"]
+    assert _search(db, user, "PEANUT") == ["Allergic to peanuts"]
+
+
+def test_search_follows_updates_and_deletes(db, user_memories):
+    user, add = user_memories
+    renamed, deleted = add("Drinks green tea", "Drinks black tea")
+
+    renamed.content = "Drinks espresso"
+    db.delete(deleted)
+    db.commit()
+
+    assert _search(db, user, "tea") == []
+    assert _search(db, user, "espresso") == ["Drinks espresso"]
+
+
+def test_search_survives_rowid_renumbering(db, user_memories):
+    user, add = user_memories
+    add("Plays the cello", "Plays chess on Sundays", "Plays tennis")
+
+    # What VACUUM or a dump and reload may do to a table without an INTEGER PRIMARY KEY
+    with engine.begin() as connection:
+        connection.exec_driver_sql("UPDATE memories SET rowid = -rowid")
+        connection.exec_driver_sql(
+            "UPDATE memories SET rowid = (SELECT COUNT(*) FROM memories m WHERE m.id <= memories.id)"
+        )
+
+    assert _search(db, user, "chess") == ["Plays chess on Sundays"]
+    assert _search(db, user, "tennis") == ["Plays tennis"]
+
+
+def test_index_keyed_by_the_memories_rowid_is_replaced(db, user_memories):
+    user, add = user_memories
+    add("Collects stamps")
+    with engine.begin() as connection:
+        for statement in SQLITE_SEARCH_DROP:
+            connection.exec_driver_sql(statement)
+        connection.exec_driver_sql(
+            "CREATE VIRTUAL TABLE memories_fts USING fts5("
+            "content, content='memories', content_rowid='rowid', tokenize='trigram')"
+        )
+
+    assert ensure_search_index(engine)
+    assert _search(db, user, "stamps") == ["Collects stamps"]
+
+
+def test_search_without_materialized_ctes(db, user_memories, monkeypatch):
+    user, add = user_memories
+    add("Speaks Portuguese")
+    monkeypatch.setattr(text_search, "_materialize_matches", False)
+
+    assert _search(db, user, "portu") == ["Speaks Portuguese"]
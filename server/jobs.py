@@ -0,0 +1,267 @@
+import asyncio
+import contextlib
+import ipaddress
+import json
+import logging
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Collection, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+import pytz
+
+
+def check_webhook_url(url: str, allowed_hosts: Optional[Collection[str]] = None) -> None:
+    """
+    Raise ValueError unless `url` is a webhook the server may call.
+
+    The URL must be http(s). With `allowed_hosts`, its host must be one of them. Otherwise every address
+    the host resolves to must be public, so that clients can't make the server call localhost, its private
+    network or a cloud metadata endpoint.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise ValueError("The webhook URL must be an absolute http(s) URL.")
+    host = parsed.hostname.lower()
+    if allowed_hosts:
+        if host not in allowed_hosts:
+            raise ValueError(f"Webhooks to {host} are not allowed.")
+        return
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, parsed.port or 443, proto=socket.IPPROTO_TCP)}
+    except socket.gaierror:
+        raise ValueError(f"The webhook host {host} could not be resolved.")
+    for address in addresses:
+        # Drop the zone of scoped IPv6 addresses, e.g. fe80::1%eth0
+        if not ipaddress.ip_address(address.split("%")[0]).is_global:
+            raise ValueError(f"Webhooks to {host} are not allowed: it resolves to the non-public address {address}.")
+
+
+class JobQueue:
+    """
+    Durable queue of add requests processed in the background.
+
+    Jobs are persisted to SQLite before `enqueue` returns and processed by `num_workers` asyncio
+    workers. A failed job is retried up to `max_attempts` times. A job whose worker has not
+    finished it within `lease_seconds` (for example because the process died) is picked up again,
+    so several server processes can share one database. When a job has a `webhook_url`, its final
+    state is POSTed there if `check_webhook_url` still accepts it with `webhook_allowed_hosts`.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        handler: Callable[[Dict[str, Any]], Awaitable[Any]],
+        num_workers: int = 4,
+        max_attempts: int = 3,
+        lease_seconds: float = 600,
+        retention_seconds: float = 7 * 24 * 3600,
+        poll_interval: float = 1.0,
+        webhook_allowed_hosts: Optional[Collection[str]] = None,
+    ):
+        self.db_path = db_path
+        self.handler = handler
+        self.num_workers = num_workers
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.retention_seconds = retention_seconds
+        self.poll_interval = poll_interval
+        self.webhook_allowed_hosts = webhook_allowed_hosts
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._workers = []
+        self._running = set()
+        self._create_table()
+
+    def _create_table(self) -> None:
+        with self._lock:
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id           TEXT PRIMARY KEY,
+                    status       TEXT NOT NULL DEFAULT 'queued',
+                    request      TEXT NOT NULL,
+                    result       TEXT,
+                    error        TEXT,
+                    webhook_url  TEXT,
+                    attempts     INTEGER NOT NULL DEFAULT 0,
+                    claimed_at   REAL,
+                    created_at   DATETIME,
+                    updated_at   DATETIME,
+                    finished_at  REAL
+                )
+                """
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+            self.connection.commit()
+
+    async def start(self) -> None:
+        self._wakeup = asyncio.Event()
+        await asyncio.to_thread(self._purge_finished)
+        self._workers = [asyncio.ensure_future(self._work()) for _ in range(self.num_workers)]
+
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop taking new jobs and wait for running ones. Queued jobs stay on disk for the next start."""
+        for worker in self._workers:
+            worker.cancel()
+        if self._running:
+            _, not_done = await asyncio.wait(set(self._running), timeout=timeout)
+            if not_done:
+                logging.warning(f"{len(not_done)} jobs were still running at shutdown and will be retried")
+                for task in not_done:
+                    task.cancel()
+                await asyncio.wait(not_done)
+        with self._lock:
+            self.connection.close()
+
+    async def enqueue(self, request: Dict[str, Any], webhook_url: Optional[str] = None) -> str:
+        """Persist an add request and return its job id."""
+        job_id = str(uuid.uuid4())
+        await asyncio.to_thread(self._insert, job_id, request, webhook_url)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._select, job_id)
+
+    def _insert(self, job_id: str, request: Dict[str, Any], webhook_url: Optional[str]) -> None:
+        now = datetime.now(pytz.UTC).isoformat()
+        with self._lock:
+            self.connection.execute(
+                "INSERT INTO jobs (id, request, webhook_url, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, json.dumps(request), webhook_url, now, now),
+            )
+            self.connection.commit()
+
+    def _select(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT id, status, result, error, attempts, created_at, updated_at FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row[0],
+            "status": row[1],
+            "result": json.loads(row[2]) if row[2] is not None else None,
+            "error": row[3],
+            "attempts": row[4],
+            "created_at": row[5],
+            "updated_at": row[6],
+        }
+
+    def _claim(self) -> Optional[tuple]:
+        """Mark the oldest runnable job as running in this process and return it."""
+        with self._lock:
+            self.connection.execute(
+                """
+                UPDATE jobs SET status = 'failed', error = 'Job did not finish within its lease', finished_at = ?
+                WHERE status = 'running' AND claimed_at < ? AND attempts >= ?
+                """,
+                (time.time(), time.time() - self.lease_seconds, self.max_attempts),
+            )
+            self.connection.commit()
+            while True:
+                row = self.connection.execute(
+                    """
+                    SELECT id, request, webhook_url, attempts, claimed_at FROM jobs
+                    WHERE status = 'queued' OR (status = 'running' AND claimed_at < ?)
+                    ORDER BY created_at LIMIT 1
+                    """,
+                    (time.time() - self.lease_seconds,),
+                ).fetchone()
+                if row is None:
+                    return None
+                job_id, request, webhook_url, attempts, claimed_at = row
+                # Another process may claim the same job between the SELECT and the UPDATE; only the
+                # process whose UPDATE still sees the old claim wins.
+                claimed = self.connection.execute(
+                    """
+                    UPDATE jobs SET status = 'running', attempts = attempts + 1, claimed_at = ?, updated_at = ?
+                    WHERE id = ? AND attempts = ? AND claimed_at IS ?
+                    """,
+                    (time.time(), datetime.now(pytz.UTC).isoformat(), job_id, attempts, claimed_at),
+                ).rowcount
+                self.connection.commit()
+                if claimed:
+                    return job_id, json.loads(request), webhook_url, attempts + 1
+
+    def _finish(self, job_id: str, attempt: int, result: Any = None, error: Optional[str] = None) -> str:
+        if error is None:
+            status = "succeeded"
+        elif attempt < self.max_attempts:
+            status = "queued"
+        else:
+            status = "failed"
+        with self._lock:
+            self.connection.execute(
+                """
+                UPDATE jobs SET status = ?, result = ?, error = ?, claimed_at = NULL, updated_at = ?, finished_at = ?
+                WHERE id = ?
+                """,
+                (
+                    status,
+                    json.dumps(result) if result is not None else None,
+                    error,
+                    datetime.now(pytz.UTC).isoformat(),
+                    time.time() if status != "queued" else None,
+                    job_id,
+                ),
+            )
+            self.connection.commit()
+        return status
+
+    def _purge_finished(self) -> None:
+        with self._lock:
+            self.connection.execute(
+                "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (time.time() - self.retention_seconds,),
+            )
+            self.connection.commit()
+
+    async def _work(self) -> None:
+        while True:
+            job = await asyncio.to_thread(self._claim)
+            if job is None:
+                self._wakeup.clear()
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                continue
+            # Run the job in its own task so cancelling the worker on shutdown doesn't interrupt it.
+            task = asyncio.ensure_future(self._run(*job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+            await asyncio.shield(task)
+
+    async def _run(self, job_id: str, request: Dict[str, Any], webhook_url: Optional[str], attempt: int) -> None:
+        try:
+            result = await self.handler(request)
+            error = None
+        except Exception as e:
+            logging.exception(f"Error in job {job_id} (attempt {attempt}):")
+            result, error = None, str(e)
+        status = await asyncio.to_thread(self._finish, job_id, attempt, result, error)
+        if webhook_url and status != "queued":
+            await self._notify(webhook_url, {"id": job_id, "status": status, "result": result, "error": error})
+
+    async def _notify(self, webhook_url: str, payload: Dict[str, Any]) -> None:
+        # Checked again because the host may resolve differently than when the job was queued
+        try:
+            await asyncio.to_thread(check_webhook_url, webhook_url, self.webhook_allowed_hosts)
+        except ValueError as e:
+            logging.warning(f"Webhook for job {payload['id']} was not sent: {e}")
+            return
+        try:
+            async with httpx.AsyncClient(timeout=10) as client:
+                response = await client.post(webhook_url, json=payload)
+                response.raise_for_status()
+        except httpx.HTTPError as e:
+            logging.warning(f"Webhook for job {payload['id']} failed: {e}")
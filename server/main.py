@@ -1,13 +1,26 @@
+import asyncio
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, RedirectResponse, Response
+from jobs import JobQueue, check_webhook_url
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
 from pydantic import BaseModel, Field
 
-from mem0 import Memory
+from mem0 import AsyncMemory
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -33,6 +46,31 @@ MEMGRAPH_PASSWORD = os.environ.get("MEMGRAPH_PASSWORD", "mem0graph")
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 HISTORY_DB_PATH = os.environ.get("HISTORY_DB_PATH", "/app/history/history.db")
 
+# Maximum number of concurrent calls into Mem0 per endpoint group. Further requests wait for a slot.
+MAX_CONCURRENT_ADDS = int(os.environ.get("MAX_CONCURRENT_ADDS", "16"))
+MAX_CONCURRENT_SEARCHES = int(os.environ.get("MAX_CONCURRENT_SEARCHES", "64"))
+MAX_CONCURRENT_REQUESTS = int(os.environ.get("MAX_CONCURRENT_REQUESTS", "64"))
+# Seconds a request may spend waiting for a slot and running before the server answers 504.
+REQUEST_TIMEOUT = float(os.environ.get("REQUEST_TIMEOUT", "120"))
+# Seconds to wait for in-flight adds to finish on shutdown.
+SHUTDOWN_TIMEOUT = float(os.environ.get("SHUTDOWN_TIMEOUT", "60"))
+
+# Maximum number of items in one request to the batch endpoints.
+MAX_BATCH_SIZE = int(os.environ.get("MAX_BATCH_SIZE", "100"))
+
+# Durable queue for adds made with `async_mode`.
+JOBS_DB_PATH = os.environ.get("JOBS_DB_PATH", "/app/history/jobs.db")
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "4"))
+JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", "3"))
+# Comma-separated hosts that job webhooks may be sent to. When empty, any host with only public addresses is allowed.
+WEBHOOK_ALLOWED_HOSTS = {
+    host.strip().lower() for host in os.environ.get("WEBHOOK_ALLOWED_HOSTS", "").split(",") if host.strip()
+}
+
+# With several worker processes, each one writes its metrics to this directory and /metrics aggregates them.
+# prometheus_client reads it at import time, so it must be set in the environment rather than in .env.
+PROMETHEUS_MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
 DEFAULT_CONFIG = {
     "version": "v1.1",
     "vector_store": {
@@ -56,15 +94,170 @@ DEFAULT_CONFIG = {
 }
 
 
-MEMORY_INSTANCE = Memory.from_config(DEFAULT_CONFIG)
+class MemoryState:
+    """The active Memory instance and the per-endpoint concurrency limits.
+
+    `/configure` builds the new instance before swapping it in under a lock, so
+    requests never observe a half-configured server. Requests that already
+    hold the previous instance finish on it; it is closed once they have.
+    """
+
+    def __init__(self):
+        self.memory: Optional[AsyncMemory] = None
+        self.configure_lock = asyncio.Lock()
+        self.limits = {
+            "add": asyncio.Semaphore(MAX_CONCURRENT_ADDS),
+            "search": asyncio.Semaphore(MAX_CONCURRENT_SEARCHES),
+            "default": asyncio.Semaphore(MAX_CONCURRENT_REQUESTS),
+        }
+        self.pending_adds = set()
+        self.retiring = set()
+        self._users: Dict[AsyncMemory, int] = {}
+        self._released = asyncio.Condition()
+
+    async def configure(self, config: Dict[str, Any]) -> None:
+        async with self.configure_lock:
+            previous, self.memory = self.memory, await AsyncMemory.from_config(config)
+        if previous is not None:
+            task = asyncio.ensure_future(self._retire(previous))
+            self.retiring.add(task)
+            task.add_done_callback(self.retiring.discard)
+
+    @asynccontextmanager
+    async def use(self):
+        """Hold the active Memory instance for the duration of a call."""
+        memory = self.memory
+        self._users[memory] = self._users.get(memory, 0) + 1
+        try:
+            yield memory
+        finally:
+            self._users[memory] -= 1
+            if not self._users[memory]:
+                del self._users[memory]
+                async with self._released:
+                    self._released.notify_all()
+
+    async def _retire(self, memory: AsyncMemory) -> None:
+        """Close a replaced instance, and its graph write queue, once the calls holding it have finished."""
+        async with self._released:
+            await self._released.wait_for(lambda: memory not in self._users)
+        try:
+            await memory.flush(SHUTDOWN_TIMEOUT)
+            await memory.close()
+        except Exception:
+            logging.exception("Error closing the previous Memory instance:")
+
+    async def drain(self, timeout: float) -> None:
+        """Wait for in-flight adds and queued graph writes to finish."""
+        if self.pending_adds:
+            logging.info(f"Waiting for {len(self.pending_adds)} in-flight adds to finish")
+            _, not_done = await asyncio.wait(set(self.pending_adds), timeout=timeout)
+            if not_done:
+                logging.warning(f"{len(not_done)} adds did not finish before shutdown")
+        if self.retiring:
+            await asyncio.wait(set(self.retiring), timeout=timeout)
+        if self.memory is not None:
+            await self.memory.flush(timeout)
+            await self.memory.close()
+
+
+STATE: Optional[MemoryState] = None
+JOBS: Optional[JobQueue] = None
+
+REQUEST_LATENCY = Histogram(
+    "mem0_request_duration_seconds",
+    "Request latency by route.",
+    ["method", "route", "status"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "mem0_requests_in_progress", "Calls into Mem0 currently running.", ["endpoint"], multiprocess_mode="livesum"
+)
+REQUEST_TIMEOUTS = Counter(
+    "mem0_request_timeouts_total", "Requests answered with 504 after REQUEST_TIMEOUT.", ["endpoint"]
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global STATE, JOBS
+    STATE = MemoryState()
+    await STATE.configure(DEFAULT_CONFIG)
+    JOBS = JobQueue(
+        JOBS_DB_PATH,
+        process_add_job,
+        num_workers=JOB_WORKERS,
+        max_attempts=JOB_MAX_ATTEMPTS,
+        webhook_allowed_hosts=WEBHOOK_ALLOWED_HOSTS,
+    )
+    await JOBS.start()
+    yield
+    await JOBS.stop(SHUTDOWN_TIMEOUT)
+    await STATE.drain(SHUTDOWN_TIMEOUT)
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
+
 
 app = FastAPI(
     title="Mem0 REST APIs",
     description="A REST API for managing and searching memories for your AI Agents and Apps.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 
+@app.middleware("http")
+async def record_metrics(request: Request, call_next):
+    route = request.url.path
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template rather than path so IDs don't create new series.
+        matched = request.scope.get("route")
+        route = getattr(matched, "path", route)
+        REQUEST_LATENCY.labels(request.method, route, str(status)).observe(time.perf_counter() - start)
+
+
+async def run_memory_call(kind: str, name: str, operation: Callable[[AsyncMemory], Awaitable[Any]]) -> Any:
+    """Run `operation` against the active Memory within the `kind` concurrency limit and REQUEST_TIMEOUT.
+
+    Adds are shielded from the timeout so a slow add is never cancelled half-way;
+    the client gets a 504 while the add finishes in the background and is
+    waited for on shutdown.
+    """
+
+    async def limited():
+        async with STATE.limits[kind], STATE.use() as memory:
+            REQUESTS_IN_PROGRESS.labels(name).inc()
+            try:
+                return await operation(memory)
+            finally:
+                REQUESTS_IN_PROGRESS.labels(name).dec()
+
+    task = asyncio.ensure_future(limited())
+    if kind == "add":
+        STATE.pending_adds.add(task)
+        task.add_done_callback(STATE.pending_adds.discard)
+    try:
+        return await asyncio.wait_for(asyncio.shield(task) if kind == "add" else task, REQUEST_TIMEOUT)
+    except asyncio.TimeoutError:
+        REQUEST_TIMEOUTS.labels(name).inc()
+        raise HTTPException(status_code=504, detail=f"Request did not complete within {REQUEST_TIMEOUT} seconds.")
+    except Exception as e:
+        logging.exception(f"Error in {name}:")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def process_add_job(request: Dict[str, Any]) -> Any:
+    """Run a queued add within the add concurrency limit."""
+    async with STATE.limits["add"], STATE.use() as memory:
+        return await memory.add(**request)
+
+
 class Message(BaseModel):
     role: str = Field(..., description="Role of the message (user or assistant).")
     content: str = Field(..., description="Message content.")
@@ -76,6 +269,10 @@ class MemoryCreate(BaseModel):
     agent_id: Optional[str] = None
     run_id: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
+    async_mode: bool = Field(False, description="Queue the add and return a job id instead of waiting for it.")
+    webhook_url: Optional[str] = Field(
+        None, description="URL notified when an `async_mode` add finishes. Must be a public http(s) URL."
+    )
 
 
 class SearchRequest(BaseModel):
@@ -86,31 +283,154 @@ class SearchRequest(BaseModel):
     filters: Optional[Dict[str, Any]] = None
 
 
+class MemoryBatchCreate(BaseModel):
+    items: List[MemoryCreate] = Field(..., description="Memories to create.")
+
+
+class SearchBatchRequest(BaseModel):
+    queries: List[SearchRequest] = Field(..., description="Searches to run.")
+
+
+class MemoryBatchDelete(BaseModel):
+    memory_ids: List[str] = Field(..., description="IDs of the memories to delete.")
+
+
+def check_batch_size(items: List[Any]) -> None:
+    if not items:
+        raise HTTPException(status_code=400, detail="The batch is empty.")
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"A batch can hold at most {MAX_BATCH_SIZE} items.")
+
+
+def batch_response(outcomes: List[Any]) -> Dict[str, Any]:
+    """Build the per-item response of a batch endpoint from results and raised exceptions."""
+    results = []
+    for index, outcome in enumerate(outcomes):
+        if isinstance(outcome, HTTPException):
+            results.append({"index": index, "status": "error", "error": outcome.detail})
+        elif isinstance(outcome, Exception):
+            results.append({"index": index, "status": "error", "error": str(outcome)})
+        else:
+            results.append({"index": index, "status": "ok", "result": outcome})
+    failed = sum(result["status"] == "error" for result in results)
+    return {"results": results, "succeeded": len(results) - failed, "failed": failed}
+
+
 @app.post("/configure", summary="Configure Mem0")
-def set_config(config: Dict[str, Any]):
+async def set_config(config: Dict[str, Any]):
     """Set memory configuration."""
-    global MEMORY_INSTANCE
-    MEMORY_INSTANCE = Memory.from_config(config)
+    await STATE.configure(config)
     return {"message": "Configuration set successfully"}
 
 
 @app.post("/memories", summary="Create memories")
-def add_memory(memory_create: MemoryCreate):
+async def add_memory(memory_create: MemoryCreate):
     """Store new memories."""
     if not any([memory_create.user_id, memory_create.agent_id, memory_create.run_id]):
         raise HTTPException(status_code=400, detail="At least one identifier (user_id, agent_id, run_id) is required.")
 
-    params = {k: v for k, v in memory_create.model_dump().items() if v is not None and k != "messages"}
-    try:
-        response = MEMORY_INSTANCE.add(messages=[m.model_dump() for m in memory_create.messages], **params)
-        return JSONResponse(content=response)
-    except Exception as e:
-        logging.exception("Error in add_memory:")  # This will log the full traceback
-        raise HTTPException(status_code=500, detail=str(e))
+    params = {
+        k: v
+        for k, v in memory_create.model_dump().items()
+        if v is not None and k not in ("messages", "async_mode", "webhook_url")
+    }
+    messages = [m.model_dump() for m in memory_create.messages]
+    if memory_create.async_mode:
+        if memory_create.webhook_url:
+            try:
+                await asyncio.to_thread(check_webhook_url, memory_create.webhook_url, WEBHOOK_ALLOWED_HOSTS)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        job_id = await JOBS.enqueue({"messages": messages, **params}, webhook_url=memory_create.webhook_url)
+        return JSONResponse(status_code=202, content={"job_id": job_id, "status": "queued"})
+
+    response = await run_memory_call("add", "add_memory", lambda memory: memory.add(messages=messages, **params))
+    return JSONResponse(content=response)
+
+
+@app.post("/memories/batch", summary="Create memories in batch")
+async def add_memories_batch(batch: MemoryBatchCreate):
+    """Store several sets of memories. Each item is processed independently and reported on its own."""
+    check_batch_size(batch.items)
+
+    async def add_item(item: MemoryCreate):
+        if not any([item.user_id, item.agent_id, item.run_id]):
+            raise HTTPException(
+                status_code=400, detail="At least one identifier (user_id, agent_id, run_id) is required."
+            )
+        params = {
+            k: v
+            for k, v in item.model_dump().items()
+            if v is not None and k not in ("messages", "async_mode", "webhook_url")
+        }
+        messages = [m.model_dump() for m in item.messages]
+        return await run_memory_call(
+            "add", "add_memories_batch", lambda memory: memory.add(messages=messages, **params)
+        )
+
+    outcomes = await asyncio.gather(*(add_item(item) for item in batch.items), return_exceptions=True)
+    return batch_response(outcomes)
+
+
+@app.post("/search/batch", summary="Search memories in batch")
+async def search_memories_batch(batch: SearchBatchRequest):
+    """Run several searches with one embedding batch and one multi-query vector search."""
+    check_batch_size(batch.queries)
+
+    outcomes: List[Any] = [None] * len(batch.queries)
+    valid = []
+    for index, search_req in enumerate(batch.queries):
+        if not any([search_req.user_id, search_req.agent_id, search_req.run_id]):
+            outcomes[index] = HTTPException(status_code=400, detail="At least one identifier is required.")
+        else:
+            valid.append(index)
+
+    if valid:
+        queries = [{k: v for k, v in batch.queries[i].model_dump().items() if v is not None} for i in valid]
+        try:
+            results = await run_memory_call(
+                "search", "search_memories_batch", lambda memory: memory.search_batch(queries)
+            )
+        except HTTPException as e:
+            results = [e] * len(valid)
+        for index, result in zip(valid, results):
+            outcomes[index] = result
+    return batch_response(outcomes)
+
+
+@app.delete("/memories/batch", summary="Delete memories in batch")
+async def delete_memories_batch(batch: MemoryBatchDelete):
+    """Delete several memories by ID. Each deletion is reported on its own."""
+    check_batch_size(batch.memory_ids)
+    outcomes = await asyncio.gather(
+        *(
+            run_memory_call(
+                "default",
+                "delete_memories_batch",
+                lambda memory, memory_id=memory_id: memory.delete(memory_id=memory_id),
+            )
+            for memory_id in batch.memory_ids
+        ),
+        return_exceptions=True,
+    )
+    outcomes = [
+        outcome if isinstance(outcome, Exception) else {"id": memory_id}
+        for memory_id, outcome in zip(batch.memory_ids, outcomes)
+    ]
+    return batch_response(outcomes)
+
+
+@app.get("/jobs/{job_id}", summary="Get an add job")
+async def get_job(job_id: str):
+    """Retrieve the status and result of an `async_mode` add."""
+    job = await JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
 
 
 @app.get("/memories", summary="Get memories")
-def get_all_memories(
+async def get_all_memories(
     user_id: Optional[str] = None,
     run_id: Optional[str] = None,
     agent_id: Optional[str] = None,
@@ -118,70 +438,48 @@ def get_all_memories(
     """Retrieve stored memories."""
     if not any([user_id, run_id, agent_id]):
         raise HTTPException(status_code=400, detail="At least one identifier is required.")
-    try:
-        params = {
-            k: v for k, v in {"user_id": user_id, "run_id": run_id, "agent_id": agent_id}.items() if v is not None
-        }
-        return MEMORY_INSTANCE.get_all(**params)
-    except Exception as e:
-        logging.exception("Error in get_all_memories:")
-        raise HTTPException(status_code=500, detail=str(e))
+    params = {k: v for k, v in {"user_id": user_id, "run_id": run_id, "agent_id": agent_id}.items() if v is not None}
+    return await run_memory_call("default", "get_all_memories", lambda memory: memory.get_all(**params))
 
 
 @app.get("/memories/{memory_id}", summary="Get a memory")
-def get_memory(memory_id: str):
+async def get_memory(memory_id: str):
     """Retrieve a specific memory by ID."""
-    try:
-        return MEMORY_INSTANCE.get(memory_id)
-    except Exception as e:
-        logging.exception("Error in get_memory:")
-        raise HTTPException(status_code=500, detail=str(e))
+    return await run_memory_call("default", "get_memory", lambda memory: memory.get(memory_id))
 
 
 @app.post("/search", summary="Search memories")
-def search_memories(search_req: SearchRequest):
+async def search_memories(search_req: SearchRequest):
     """Search for memories based on a query."""
-    try:
-        params = {k: v for k, v in search_req.model_dump().items() if v is not None and k != "query"}
-        return MEMORY_INSTANCE.search(query=search_req.query, **params)
-    except Exception as e:
-        logging.exception("Error in search_memories:")
-        raise HTTPException(status_code=500, detail=str(e))
+    params = {k: v for k, v in search_req.model_dump().items() if v is not None and k != "query"}
+    return await run_memory_call(
+        "search", "search_memories", lambda memory: memory.search(query=search_req.query, **params)
+    )
 
 
 @app.put("/memories/{memory_id}", summary="Update a memory")
-def update_memory(memory_id: str, updated_memory: Dict[str, Any]):
+async def update_memory(memory_id: str, updated_memory: Dict[str, Any]):
     """Update an existing memory."""
-    try:
-        return MEMORY_INSTANCE.update(memory_id=memory_id, data=updated_memory)
-    except Exception as e:
-        logging.exception("Error in update_memory:")
-        raise HTTPException(status_code=500, detail=str(e))
+    return await run_memory_call(
+        "default", "update_memory", lambda memory: memory.update(memory_id=memory_id, data=updated_memory)
+    )
 
 
 @app.get("/memories/{memory_id}/history", summary="Get memory history")
-def memory_history(memory_id: str):
+async def memory_history(memory_id: str):
     """Retrieve memory history."""
-    try:
-        return MEMORY_INSTANCE.history(memory_id=memory_id)
-    except Exception as e:
-        logging.exception("Error in memory_history:")
-        raise HTTPException(status_code=500, detail=str(e))
+    return await run_memory_call("default", "memory_history", lambda memory: memory.history(memory_id=memory_id))
 
 
 @app.delete("/memories/{memory_id}", summary="Delete a memory")
-def delete_memory(memory_id: str):
+async def delete_memory(memory_id: str):
     """Delete a specific memory by ID."""
-    try:
-        MEMORY_INSTANCE.delete(memory_id=memory_id)
-        return {"message": "Memory deleted successfully"}
-    except Exception as e:
-        logging.exception("Error in delete_memory:")
-        raise HTTPException(status_code=500, detail=str(e))
+    await run_memory_call("default", "delete_memory", lambda memory: memory.delete(memory_id=memory_id))
+    return {"message": "Memory deleted successfully"}
 
 
 @app.delete("/memories", summary="Delete all memories")
-def delete_all_memories(
+async def delete_all_memories(
     user_id: Optional[str] = None,
     run_id: Optional[str] = None,
     agent_id: Optional[str] = None,
@@ -189,26 +487,26 @@ def delete_all_memories(
     """Delete all memories for a given identifier."""
     if not any([user_id, run_id, agent_id]):
         raise HTTPException(status_code=400, detail="At least one identifier is required.")
-    try:
-        params = {
-            k: v for k, v in {"user_id": user_id, "run_id": run_id, "agent_id": agent_id}.items() if v is not None
-        }
-        MEMORY_INSTANCE.delete_all(**params)
-        return {"message": "All relevant memories deleted"}
-    except Exception as e:
-        logging.exception("Error in delete_all_memories:")
-        raise HTTPException(status_code=500, detail=str(e))
+    params = {k: v for k, v in {"user_id": user_id, "run_id": run_id, "agent_id": agent_id}.items() if v is not None}
+    await run_memory_call("default", "delete_all_memories", lambda memory: memory.delete_all(**params))
+    return {"message": "All relevant memories deleted"}
 
 
 @app.post("/reset", summary="Reset all memories")
-def reset_memory():
+async def reset_memory():
     """Completely reset stored memories."""
-    try:
-        MEMORY_INSTANCE.reset()
-        return {"message": "All memories reset"}
-    except Exception as e:
-        logging.exception("Error in reset_memory:")
-        raise HTTPException(status_code=500, detail=str(e))
+    await run_memory_call("default", "reset_memory", lambda memory: memory.reset())
+    return {"message": "All memories reset"}
+
+
+@app.get("/metrics", summary="Prometheus metrics", include_in_schema=False)
+def metrics():
+    """Expose request metrics in the Prometheus text format."""
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 
 @app.get("/", summary="Redirect to the OpenAPI documentation", include_in_schema=False)
@@ -0,0 +1,208 @@
+import asyncio
+import functools
+import json
+import socket
+import time
+
+import httpx
+import jobs
+import pytest
+from jobs import JobQueue, check_webhook_url
+
+
+class Handler:
+    """Stands in for the add call, failing the first `failures` times it is called."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.requests = []
+
+    async def __call__(self, request):
+        self.requests.append(request)
+        if len(self.requests) <= self.failures:
+            raise RuntimeError(f"add failed ({len(self.requests)})")
+        return {"results": [{"memory": request["messages"][0]["content"]}]}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "jobs.db")
+
+
+@pytest.fixture
+def webhooks(monkeypatch):
+    """Capture webhook calls instead of sending them."""
+    received = []
+
+    def respond(request):
+        received.append((str(request.url), json.loads(request.content)))
+        return httpx.Response(200)
+
+    monkeypatch.setattr(
+        jobs.httpx, "AsyncClient", functools.partial(httpx.AsyncClient, transport=httpx.MockTransport(respond))
+    )
+    return received
+
+
+def _resolves_to(monkeypatch, *addresses):
+    def getaddrinfo(host, port, *args, **kwargs):
+        return [(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", (address, port)) for address in addresses]
+
+    monkeypatch.setattr(jobs.socket, "getaddrinfo", getaddrinfo)
+
+
+def _expire_lease(queue, job_id):
+    with queue._lock:
+        queue.connection.execute(
+            "UPDATE jobs SET claimed_at = ? WHERE id = ?", (time.time() - queue.lease_seconds - 1, job_id)
+        )
+        queue.connection.commit()
+
+
+async def _wait_for(queue, job_id, *statuses):
+    for _ in range(200):
+        job = await queue.get(job_id)
+        if job["status"] in statuses:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Job {job_id} is still {job['status']}")
+
+
+def _request(content="I moved to Berlin"):
+    return {"messages": [{"role": "user", "content": content}], "user_id": "alice"}
+
+
+@pytest.mark.asyncio
+async def test_enqueued_jobs_are_stored_before_they_run(db_path):
+    queue = JobQueue(db_path, Handler())
+    job_id = await queue.enqueue(_request())
+
+    job = await queue.get(job_id)
+    assert (job["status"], job["attempts"], job["result"]) == ("queued", 0, None)
+    assert await queue.get("missing") is None
+
+    # A queue opened on the same database, as after a restart, finds the job
+    reopened = JobQueue(db_path, Handler())
+    assert reopened._claim()[:2] == (job_id, _request())
+
+
+@pytest.mark.asyncio
+async def test_workers_run_jobs_and_store_results(db_path):
+    handler = Handler()
+    queue = JobQueue(db_path, handler, num_workers=2, poll_interval=0.01)
+    await queue.start()
+    try:
+        job_id = await queue.enqueue(_request())
+        job = await _wait_for(queue, job_id, "succeeded")
+    finally:
+        await queue.stop()
+
+    assert job["result"] == {"results": [{"memory": "I moved to Berlin"}]}
+    assert (job["attempts"], job["error"]) == (1, None)
+    assert handler.requests == [_request()]
+
+
+def test_claimed_jobs_are_claimed_once_until_their_lease_expires(db_path):
+    first = JobQueue(db_path, Handler(), lease_seconds=60)
+    second = JobQueue(db_path, Handler(), lease_seconds=60)
+    asyncio.run(first.enqueue(_request()))
+
+    job_id, _, _, attempt = first._claim()
+    assert attempt == 1
+    assert second._claim() is None
+
+    # The first process died without finishing the job
+    _expire_lease(first, job_id)
+    assert second._claim()[0] == job_id
+    assert asyncio.run(second.get(job_id))["attempts"] == 2
+    assert first._claim() is None
+
+
+def test_jobs_whose_lease_expired_too_often_fail(db_path):
+    queue = JobQueue(db_path, Handler(), max_attempts=2, lease_seconds=60)
+    job_id = asyncio.run(queue.enqueue(_request()))
+
+    for _ in range(2):
+        assert queue._claim()[0] == job_id
+        _expire_lease(queue, job_id)
+
+    assert queue._claim() is None
+    job = asyncio.run(queue.get(job_id))
+    assert (job["status"], job["attempts"], job["error"]) == ("failed", 2, "Job did not finish within its lease")
+
+
+@pytest.mark.asyncio
+async def test_failed_jobs_are_retried_up_to_max_attempts(db_path):
+    handler = Handler(failures=5)
+    queue = JobQueue(db_path, handler, max_attempts=3, poll_interval=0.01)
+    await queue.start()
+    try:
+        job_id = await queue.enqueue(_request())
+        job = await _wait_for(queue, job_id, "failed")
+    finally:
+        await queue.stop()
+
+    assert (job["attempts"], job["error"], job["result"]) == (3, "add failed (3)", None)
+    assert len(handler.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_webhook_receives_the_final_state_only(db_path, webhooks):
+    queue = JobQueue(db_path, Handler(failures=1), poll_interval=0.01, webhook_allowed_hosts={"hooks.example.com"})
+    await queue.start()
+    try:
+        job_id = await queue.enqueue(_request(), webhook_url="https://hooks.example.com/mem0")
+        await _wait_for(queue, job_id, "succeeded")
+    finally:
+        await queue.stop()
+
+    assert webhooks == [
+        (
+            "https://hooks.example.com/mem0",
+            {
+                "id": job_id,
+                "status": "succeeded",
+                "result": {"results": [{"memory": "I moved to Berlin"}]},
+                "error": None,
+            },
+        )
+    ]
+
+
+@pytest.mark.asyncio
+async def test_webhook_is_not_sent_to_a_host_that_now_resolves_privately(db_path, webhooks, monkeypatch):
+    _resolves_to(monkeypatch, "169.254.169.254")
+    queue = JobQueue(db_path, Handler(), poll_interval=0.01)
+    await queue.start()
+    try:
+        job_id = await queue.enqueue(_request(), webhook_url="https://hooks.example.com/mem0")
+        await _wait_for(queue, job_id, "succeeded")
+    finally:
+        await queue.stop()
+
+    assert webhooks == []
+
+
+@pytest.mark.parametrize(
+    "url", ["ftp://hooks.example.com/mem0", "hooks.example.com/mem0", "file:///etc/passwd", "https:///mem0"]
+)
+def test_webhook_urls_must_be_http(url):
+    with pytest.raises(ValueError):
+        check_webhook_url(url)
+
+
+@pytest.mark.parametrize("address", ["127.0.0.1", "10.0.0.5", "192.168.1.1", "169.254.169.254", "::1", "fd00::1"])
+def test_webhook_hosts_must_be_public(address, monkeypatch):
+    _resolves_to(monkeypatch, "93.184.215.14", address)
+
+    with pytest.raises(ValueError):
+        check_webhook_url("https://hooks.example.com/mem0")
+
+
+def test_webhook_allow_list(monkeypatch):
+    _resolves_to(monkeypatch, "93.184.215.14")
+    check_webhook_url("https://hooks.example.com/mem0")
+
+    check_webhook_url("http://mem0-hooks:8080/done", allowed_hosts={"mem0-hooks"})
+    with pytest.raises(ValueError):
+        check_webhook_url("https://hooks.example.com/mem0", allowed_hosts={"mem0-hooks"})
@@ -0,0 +1,187 @@
+import asyncio
+from collections import Counter
+
+import main
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from jobs import JobQueue
+from prometheus_client import REGISTRY
+
+
+class FakeMemory:
+    """Stands in for AsyncMemory, recording whether it was flushed and closed."""
+
+    def __init__(self, config):
+        self.config = config
+        self.flushed = False
+        self.closed = False
+
+    @classmethod
+    async def from_config(cls, config):
+        return cls(config)
+
+    async def flush(self, timeout=None):
+        self.flushed = True
+
+    async def close(self):
+        self.closed = True
+
+
+async def _add(request):
+    return {"results": []}
+
+
+@pytest.fixture
+def client():
+    # Without entering the client, the lifespan that connects to the configured stores doesn't run
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def state(monkeypatch):
+    monkeypatch.setattr(main, "AsyncMemory", FakeMemory)
+    state = main.MemoryState()
+    monkeypatch.setattr(main, "STATE", state)
+    return state
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    queue = JobQueue(str(tmp_path / "jobs.db"), _add)
+    monkeypatch.setattr(main, "JOBS", queue)
+    return queue
+
+
+def _async_add(**fields):
+    return {
+        "messages": [{"role": "user", "content": "I moved to Berlin"}],
+        "user_id": "alice",
+        "async_mode": True,
+        **fields,
+    }
+
+
+def test_async_add_is_queued_and_readable(client, queue):
+    response = client.post("/memories", json=_async_add())
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    job = client.get(f"/jobs/{job_id}").json()
+    assert (job["id"], job["status"], job["attempts"]) == (job_id, "queued", 0)
+    assert queue._claim()[1] == {"messages": [{"role": "user", "content": "I moved to Berlin"}], "user_id": "alice"}
+
+
+def test_unknown_jobs_are_not_found(client, queue):
+    assert client.get("/jobs/missing").status_code == 404
+
+
+def test_async_add_refuses_private_webhooks(client, queue, monkeypatch):
+    monkeypatch.setattr(main, "WEBHOOK_ALLOWED_HOSTS", set())
+
+    response = client.post("/memories", json=_async_add(webhook_url="http://127.0.0.1:8000/reset"))
+    assert response.status_code == 400
+    assert queue._claim() is None
+
+    monkeypatch.setattr(main, "WEBHOOK_ALLOWED_HOSTS", {"mem0-hooks"})
+    response = client.post("/memories", json=_async_add(webhook_url="http://mem0-hooks/done"))
+    assert response.status_code == 202
+
+
+@pytest.mark.asyncio
+async def test_replaced_memory_is_closed_once_its_calls_finish(state):
+    await state.configure({"name": "first"})
+    first = state.memory
+
+    async with state.use() as held, state.use():
+        await state.configure({"name": "second"})
+        await asyncio.sleep(0.01)
+        assert held is first
+        assert state.memory.config == {"name": "second"}
+        assert not first.closed
+
+    async with state.use() as memory:
+        assert memory is state.memory
+    await asyncio.wait(set(state.retiring))
+    assert first.flushed and first.closed
+    assert not state.memory.closed
+    assert not state._users
+
+
+@pytest.mark.asyncio
+async def test_each_kind_of_call_has_its_own_limit(state):
+    await state.configure({})
+    state.limits = {kind: asyncio.Semaphore(limit) for kind, limit in [("add", 1), ("search", 2), ("default", 1)]}
+    running, peak = Counter(), Counter()
+    release = asyncio.Event()
+
+    def operation(kind):
+        async def call(memory):
+            running[kind] += 1
+            peak[kind] = max(peak[kind], running[kind])
+            await release.wait()
+            running[kind] -= 1
+            return kind
+
+        return call
+
+    kinds = ["add"] * 3 + ["search"] * 3 + ["default"] * 2
+    calls = [asyncio.ensure_future(main.run_memory_call(kind, f"test_{kind}", operation(kind))) for kind in kinds]
+    await asyncio.sleep(0.01)
+    # Waiting adds don't hold up searches
+    assert running == {"add": 1, "search": 2, "default": 1}
+
+    release.set()
+    assert await asyncio.gather(*calls) == kinds
+    assert peak == {"add": 1, "search": 2, "default": 1}
+    assert REGISTRY.get_sample_value("mem0_requests_in_progress", {"endpoint": "test_add"}) == 0
+
+
+@pytest.mark.asyncio
+async def test_timed_out_adds_answer_504_and_finish_in_the_background(state, monkeypatch):
+    await state.configure({})
+    monkeypatch.setattr(main, "REQUEST_TIMEOUT", 0.05)
+    finished, cancelled = [], []
+
+    async def slow_add(memory):
+        await asyncio.sleep(0.2)
+        finished.append(memory)
+
+    async def slow_search(memory):
+        try:
+            await asyncio.sleep(0.2)
+        except asyncio.CancelledError:
+            cancelled.append(memory)
+            raise
+
+    timeouts_before = REGISTRY.get_sample_value("mem0_request_timeouts_total", {"endpoint": "test_slow_add"}) or 0
+    with pytest.raises(HTTPException) as error:
+        await main.run_memory_call("add", "test_slow_add", slow_add)
+    assert error.value.status_code == 504
+    assert (
+        REGISTRY.get_sample_value("mem0_request_timeouts_total", {"endpoint": "test_slow_add"}) == timeouts_before + 1
+    )
+
+    with pytest.raises(HTTPException):
+        await main.run_memory_call("search", "test_slow_search", slow_search)
+    assert cancelled == [state.memory]
+
+    # The add is still running, and shutdown waits for it before closing the memory
+    memory = state.memory
+    assert finished == [] and len(state.pending_adds) == 1
+    await state.drain(timeout=1)
+    assert finished == [memory]
+    assert memory.flushed and memory.closed
+
+
+def test_metrics_report_latency_by_route_template(client, queue, monkeypatch):
+    monkeypatch.setattr(main, "PROMETHEUS_MULTIPROC_DIR", None)
+    client.get("/jobs/missing")
+    client.get("/jobs/also-missing")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    counts = [line for line in response.text.splitlines() if line.startswith("mem0_request_duration_seconds_count")]
+    assert any('route="/jobs/{job_id}"' in line and 'status="404"' in line for line in counts)
+    assert not any("missing" in line for line in counts)
@@ -88,3 +88,18 @@ def test_embed_uses_environment_api_key(mock_openai_client, monkeypatch):
         input=["Environment key test"], model="text-embedding-3-small", dimensions=1536
     )
     assert result == [1.3, 1.4, 1.5]
+
+
+def test_embed_batch_sends_one_request(mock_openai_client):
+    config = BaseEmbedderConfig(api_key="test_key")
+    embedder = OpenAIEmbedding(config)
+    mock_response = Mock()
+    mock_response.data = [Mock(embedding=[0.4], index=1), Mock(embedding=[0.3], index=0)]
+    mock_openai_client.embeddings.create.return_value = mock_response
+
+    result = embedder.embed_batch(["first\nquery", "second"])
+
+    mock_openai_client.embeddings.create.assert_called_once_with(
+        input=["first query", "second"], model="text-embedding-3-small", dimensions=1536
+    )
+    assert result == [[0.3], [0.4]]
@@ -0,0 +1,140 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mem0.graphs.utils import EntityNameCache, EntityNameIndex, match_entity_names
+
+
+def _config():
+    config = MagicMock()
+    config.graph_store.config.base_label = False
+    config.graph_store.llm = None
+    config.llm.provider = "openai_structured"
+    config.embedder.config = {"embedding_dims": 3}
+    return config
+
+
+def _names_query(names):
+    def query(cypher, params=None):
+        return [{"name": name} for name in names] if "RETURN DISTINCT n.name" in cypher else []
+
+    return query
+
+
+@pytest.fixture
+def neo4j_graph():
+    from mem0.memory.graph_memory import MemoryGraph
+
+    with patch("mem0.memory.graph_memory.Neo4jGraph"), patch("mem0.memory.graph_memory.EmbedderFactory.create"):
+        with patch("mem0.memory.graph_memory.LlmFactory.create"):
+            graph = MemoryGraph(_config())
+            graph.graph.query.reset_mock()
+            yield graph
+
+
+@pytest.fixture
+def memgraph_graph():
+    pytest.importorskip("langchain_memgraph")
+    from mem0.memory.memgraph_memory import MemoryGraph
+
+    indexes = {"vector_index_exists": [], "index_exists": []}
+    with patch("mem0.memory.memgraph_memory.Memgraph"), patch("mem0.memory.memgraph_memory.EmbedderFactory.create"):
+        with patch("mem0.memory.memgraph_memory.LlmFactory.create"):
+            with patch.object(MemoryGraph, "_fetch_existing_indexes", return_value=indexes):
+                graph = MemoryGraph(_config())
+            graph.graph.query.reset_mock()
+            yield graph
+
+
+def test_index_only_offers_names_sharing_a_trigram_of_similar_length():
+    index = EntityNameIndex(["pizza", "pasta", "new_york", "alice"])
+
+    assert index.candidates("pizzas", 0.85) == ["pasta", "pizza"]
+    assert index.candidates("new_yrok", 0.85) == ["new_york"]
+    assert index.candidates("zzzz", 0.85) == []
+
+
+def test_match_entity_names_accepts_an_index():
+    index = EntityNameIndex(["alice", "pizza", "new_york"])
+
+    assert match_entity_names("does alice like pizzas in new york", index) == ["alice", "pizza", "new_york"]
+
+
+def test_cache_loads_each_scope_once_until_invalidated():
+    cache = EntityNameCache()
+    load = MagicMock(return_value=["alice"])
+
+    cache.get({"user_id": "u1"}, load)
+    cache.get({"user_id": "u1"}, load)
+    cache.get({"user_id": "u1", "agent_id": "a1"}, load)
+    assert load.call_count == 2
+
+    # Invalidating a user drops their agent-scoped entries too
+    cache.invalidate("u1")
+    cache.get({"user_id": "u1"}, load)
+    cache.get({"user_id": "u1", "agent_id": "a1"}, load)
+    assert load.call_count == 4
+
+
+def test_cache_expires_entries_and_skips_names_read_before_a_write():
+    cache = EntityNameCache(ttl=0)
+    load = MagicMock(return_value=["alice"])
+    cache.get({"user_id": "u1"}, load)
+    cache.get({"user_id": "u1"}, load)
+    assert load.call_count == 2
+
+    cache = EntityNameCache()
+
+    def load_during_write(filters):
+        cache.invalidate(filters["user_id"])
+        return ["alice"]
+
+    cache.get({"user_id": "u1"}, load_during_write)
+    assert "alice" in cache.get({"user_id": "u1"}, lambda filters: ["alice", "bob"]).names
+    assert "bob" in cache.get({"user_id": "u1"}, lambda filters: []).names
+
+
+@pytest.mark.parametrize("backend", ["neo4j_graph", "memgraph_graph"])
+def test_remote_backends_match_cached_entity_names(backend, request):
+    graph = request.getfixturevalue(backend)
+    graph.graph.query.side_effect = _names_query(["alice", "pizza", "new_york"])
+    filters = {"user_id": "u1"}
+
+    assert graph._retrieve_nodes_from_query("where does alice eat pizzas", filters) == [
+        "alice",
+        "pizza",
+        "where does alice eat pizzas",
+    ]
+    graph._retrieve_nodes_from_query("what about new york", filters)
+    assert graph.graph.query.call_count == 1
+
+    graph.delete_all(filters)
+    graph.graph.query.side_effect = _names_query(["bob"])
+    with patch.object(graph, "_retrieve_nodes_from_data") as extract:
+        assert graph._retrieve_nodes_from_query("where does alice eat pizzas", filters) == [
+            "where does alice eat pizzas"
+        ]
+    extract.assert_not_called()
+    assert graph.graph.query.call_count == 3
+
+
+@pytest.mark.parametrize("backend", ["neo4j_graph", "memgraph_graph"])
+def test_remote_backends_invalidate_entity_names_on_add(backend, request):
+    graph = request.getfixturevalue(backend)
+    graph.graph.query.side_effect = _names_query(["alice"])
+    graph.config.graph_store.extraction_mode = "fused"
+    filters = {"user_id": "u1"}
+    graph._retrieve_nodes_from_query("alice", filters)
+
+    for name, value in (
+        ("_retrieve_nodes_relations_from_data", ({}, [])),
+        ("_search_graph_db", []),
+        ("_get_delete_entities_from_search_output", []),
+        ("_delete_entities", []),
+        ("_add_entities", []),
+    ):
+        setattr(graph, name, MagicMock(return_value=value))
+    graph.add("alice likes bob", filters)
+
+    graph.graph.query.side_effect = _names_query(["alice", "bob"])
+    assert graph._retrieve_nodes_from_query("and bob", filters)[0] == "bob"
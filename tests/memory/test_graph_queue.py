@@ -0,0 +1,217 @@
+import threading
+import time
+
+import pytest
+
+from mem0.memory.graph_queue import GraphWriteQueue
+
+
+class RecordingGraph:
+    def __init__(self, fail_times=0):
+        self.calls = []
+        self.fail_times = fail_times
+        self.release = threading.Event()
+        self.release.set()
+
+    def add(self, data, filters):
+        self.release.wait(timeout=5)
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("graph unavailable")
+        self.calls.append((data, filters))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "graph_queue.db")
+
+
+def test_enqueue_and_flush(db_path):
+    graph = RecordingGraph()
+    queue = GraphWriteQueue(graph, db_path)
+
+    queue.enqueue("Alice likes pizza", {"user_id": "alice"})
+
+    assert queue.flush(timeout=5)
+    assert queue.pending() == 0
+    assert graph.calls == [("Alice likes pizza", {"user_id": "alice"})]
+    queue.close()
+
+
+def test_burst_for_same_scope_is_coalesced_in_order(db_path):
+    graph = RecordingGraph()
+    graph.release.clear()
+    queue = GraphWriteQueue(graph, db_path)
+
+    queue.enqueue("first", {"user_id": "alice"})
+    queue.enqueue("second", {"user_id": "alice"})
+    queue.enqueue("third", {"user_id": "alice"})
+    queue.enqueue("other", {"user_id": "bob"})
+    assert queue.pending() == 4
+
+    graph.release.set()
+    assert queue.flush(timeout=5)
+
+    alice_calls = [data for data, filters in graph.calls if filters["user_id"] == "alice"]
+    assert alice_calls == ["first", "second\nthird"]
+    assert ("other", {"user_id": "bob"}) in graph.calls
+    queue.close()
+
+
+def test_failed_operations_are_retried_then_kept_as_failed(db_path):
+    graph = RecordingGraph(fail_times=1)
+    queue = GraphWriteQueue(graph, db_path, max_attempts=2, retry_delay=0.01)
+
+    queue.enqueue("retry me", {"user_id": "alice"})
+    assert queue.flush(timeout=5)
+    assert graph.calls == [("retry me", {"user_id": "alice"})]
+
+    graph.fail_times = 2
+    queue.enqueue("give up", {"user_id": "alice"})
+    assert queue.flush(timeout=5)
+    assert len(graph.calls) == 1
+    assert (queue.pending(), queue.failed()) == (0, 1)
+
+    assert queue.retry_failed() == 1
+    assert queue.flush(timeout=5)
+    assert graph.calls[-1] == ("give up", {"user_id": "alice"})
+    assert (queue.pending(), queue.failed()) == (0, 0)
+    queue.close()
+
+
+def test_failed_batch_is_retried_after_a_delay_and_holds_back_its_scope(db_path):
+    graph = RecordingGraph(fail_times=1)
+    queue = GraphWriteQueue(graph, db_path, retry_delay=0.5)
+
+    queue.enqueue("first", {"user_id": "alice"})
+    time.sleep(0.1)
+    queue.enqueue("second", {"user_id": "alice"})
+    queue.enqueue("other", {"user_id": "bob"})
+    time.sleep(0.1)
+
+    assert graph.calls == [("other", {"user_id": "bob"})]
+    assert queue.pending() == 2
+
+    # Retried by the queue itself once the delay has passed, without a flush
+    deadline = time.monotonic() + 5
+    while queue.pending() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert graph.calls[1:] == [("first\nsecond", {"user_id": "alice"})]
+    queue.close()
+
+
+def test_discard_drops_pending_and_waits_for_in_flight_operations(db_path):
+    graph = RecordingGraph()
+    graph.release.clear()
+    queue = GraphWriteQueue(graph, db_path)
+
+    queue.enqueue("in flight", {"user_id": "alice"})
+    queue.enqueue("pending", {"user_id": "alice"})
+    queue.enqueue("kept", {"user_id": "bob"})
+
+    dropped = []
+    discarding = threading.Thread(target=lambda: dropped.append(queue.discard("alice")))
+    discarding.start()
+    discarding.join(timeout=0.3)
+    # The in-flight batch could still write to the graph, so discard waits for it
+    assert discarding.is_alive()
+
+    graph.release.set()
+    discarding.join(timeout=5)
+    assert dropped == [1]
+    assert "in flight" in [data for data, _ in graph.calls]
+
+    assert queue.flush(timeout=5)
+    assert sorted(data for data, _ in graph.calls) == ["in flight", "kept"]
+    queue.close()
+
+
+def test_discard_is_scoped_by_run_id(db_path):
+    graph = RecordingGraph()
+    graph.release.clear()
+    queue = GraphWriteQueue(graph, db_path)
+
+    # The first operation of each run starts right away; the second waits behind it
+    for run_id in ("r1", "r2"):
+        queue.enqueue(f"{run_id} first", {"user_id": "alice", "run_id": run_id})
+    for run_id in ("r1", "r2"):
+        queue.enqueue(f"{run_id} second", {"user_id": "alice", "run_id": run_id})
+
+    dropped = []
+    discarding = threading.Thread(target=lambda: dropped.append(queue.discard("alice", run_id="r1")))
+    discarding.start()
+    graph.release.set()
+    discarding.join(timeout=5)
+
+    assert dropped == [1]
+    assert queue.flush(timeout=5)
+    assert sorted(data for data, _ in graph.calls) == ["r1 first", "r2 first", "r2 second"]
+    queue.close()
+
+
+def test_pending_operations_survive_restart(db_path):
+    graph = RecordingGraph()
+
+    # Simulate a process that died after persisting and claiming an operation
+    crashed = GraphWriteQueue(graph, db_path)
+    crashed._closed = True
+    crashed.enqueue("persisted", {"user_id": "alice"})
+    crashed.connection.execute("UPDATE graph_ops SET status = 'running'")
+    crashed.connection.commit()
+    crashed.connection.close()
+    crashed.connection = None
+
+    restarted = GraphWriteQueue(graph, db_path)
+    assert restarted.flush(timeout=5)
+    assert graph.calls == [("persisted", {"user_id": "alice"})]
+    restarted.close()
+
+
+def test_queues_sharing_a_file_only_apply_their_own_graph(db_path):
+    first_graph, second_graph = RecordingGraph(), RecordingGraph()
+    first = GraphWriteQueue(first_graph, db_path, graph_key="first")
+    second = GraphWriteQueue(second_graph, db_path, graph_key="second")
+
+    first.enqueue("for first", {"user_id": "alice"})
+    second.enqueue("for second", {"user_id": "alice"})
+
+    assert first.flush(timeout=5) and second.flush(timeout=5)
+    assert first_graph.calls == [("for first", {"user_id": "alice"})]
+    assert second_graph.calls == [("for second", {"user_id": "alice"})]
+    first.close()
+    second.close()
+
+
+def test_new_queue_leaves_live_claims_alone(db_path):
+    graph = RecordingGraph()
+    graph.release.clear()
+    running = GraphWriteQueue(graph, db_path, graph_key="shared")
+    running.enqueue("in flight", {"user_id": "alice"})
+
+    other_graph = RecordingGraph()
+    other = GraphWriteQueue(other_graph, db_path, graph_key="shared")
+    assert not other.flush(timeout=0.3)
+    assert other_graph.calls == []
+
+    graph.release.set()
+    assert running.flush(timeout=5)
+    assert graph.calls == [("in flight", {"user_id": "alice"})]
+    running.close()
+    other.close()
+
+
+def test_expired_claims_are_requeued(db_path):
+    graph = RecordingGraph()
+
+    crashed = GraphWriteQueue(graph, db_path, graph_key="shared")
+    crashed._closed = True
+    crashed.enqueue("orphaned", {"user_id": "alice"})
+    crashed.connection.execute("UPDATE graph_ops SET status = 'running', owner = 'gone', claimed_at = 0")
+    crashed.connection.commit()
+
+    restarted = GraphWriteQueue(graph, db_path, graph_key="shared", lease_seconds=60)
+    assert restarted.flush(timeout=5)
+    assert graph.calls == [("orphaned", {"user_id": "alice"})]
+    restarted.close()
+    crashed._closed = False
+    crashed.close()
@@ -0,0 +1,77 @@
+from mem0.graphs.rerank import bm25_scores, rerank_relations
+from mem0.memory.utils import tokenize
+
+
+def _relation(source, relationship, destination, similarity=None):
+    relation = {"source": source, "relationship": relationship, "destination": destination}
+    if similarity is not None:
+        relation["similarity"] = similarity
+    return relation
+
+
+def test_tokenize_splits_underscored_names():
+    assert tokenize("Alice works_at ACME-Corp") == ("alice", "works", "at", "acme", "corp")
+
+
+def test_tokenize_keeps_non_ascii_entities():
+    assert tokenize("José lives_in São_Paulo") == ("josé", "lives", "in", "são", "paulo")
+    assert tokenize("Müller works_at 東京大学") == ("müller", "works", "at", "東京大学")
+
+
+def test_rerank_relations_matches_non_ascii_entities():
+    relations = [_relation("josé", "lives_in", "são_paulo"), _relation("josé", "lives_in", "москва")]
+
+    ranked = rerank_relations("does josé live in москва", relations, top_n=2)
+
+    assert ranked[0]["destination"] == "москва"
+
+
+def test_bm25_scores_prefer_matching_documents():
+    documents = [("alice", "likes", "pizza"), ("bob", "likes", "pasta"), ("carol", "owns", "cat")]
+
+    scores = bm25_scores(tokenize("what pizza does alice like"), documents)
+
+    assert scores.argmax() == 0
+    assert scores[2] == 0
+
+
+def test_bm25_scores_handle_empty_inputs():
+    assert len(bm25_scores((), [("alice",)])) == 1
+    assert len(bm25_scores(("alice",), [])) == 0
+
+
+def test_rerank_relations_deduplicates_triples():
+    relations = [
+        _relation("alice", "likes", "pizza", 0.7),
+        _relation("alice", "likes", "pizza", 0.9),
+        _relation("bob", "likes", "pasta", 0.8),
+    ]
+
+    results = rerank_relations("alice pizza", relations)
+
+    assert results == [
+        {"source": "alice", "relationship": "likes", "destination": "pizza"},
+        {"source": "bob", "relationship": "likes", "destination": "pasta"},
+    ]
+
+
+def test_rerank_relations_fuses_lexical_and_similarity_ranks():
+    relations = [
+        _relation("bob", "owns", "cat", 0.95),
+        _relation("carol", "visited", "paris", 0.9),
+        _relation("alice", "likes", "pizza", 0.85),
+    ]
+
+    results = rerank_relations("alice pizza", relations, top_n=2)
+
+    # Carol has the better similarity, but Alice also matches the query terms
+    assert [result["source"] for result in results] == ["bob", "alice"]
+
+
+def test_rerank_relations_without_similarity_uses_bm25():
+    relations = [_relation("bob", "owns", "cat"), _relation("alice", "likes", "pizza")]
+
+    results = rerank_relations("alice", relations, top_n=1)
+
+    assert results == [{"source": "alice", "relationship": "likes", "destination": "pizza"}]
+    assert rerank_relations("alice", []) == []
@@ -0,0 +1,193 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from mem0.graphs.utils import match_entity_names
+from mem0.memory.local_graph_memory import EntityIndex, MemoryGraph
+
+EMBEDDINGS = {
+    "alice": [1.0, 0.0, 0.0],
+    "pizza": [0.0, 1.0, 0.0],
+    "burger": [0.0, 0.0, 1.0],
+}
+
+
+def _config(path):
+    config = MagicMock()
+    config.graph_store.config.path = str(path)
+    config.graph_store.llm = None
+    config.graph_store.custom_prompt = None
+    config.llm.provider = "openai_structured"
+    return config
+
+
+def _create_graph(path):
+    embedding_model = MagicMock()
+    embedding_model.embed.side_effect = lambda text: EMBEDDINGS[text]
+    embedder_patch = patch("mem0.memory.local_graph_memory.EmbedderFactory.create", return_value=embedding_model)
+    llm_patch = patch("mem0.memory.local_graph_memory.LlmFactory.create", return_value=MagicMock())
+    with embedder_patch, llm_patch:
+        return MemoryGraph(_config(path))
+
+
+@pytest.fixture
+def memory_graph(tmp_path):
+    graph = _create_graph(tmp_path)
+    yield graph
+    graph.close()
+
+
+def _add(graph, relations, filters):
+    entity_type_map = {}
+    for item in relations:
+        entity_type_map[item["source"]] = "person"
+        entity_type_map[item["destination"]] = "food"
+    return graph._add_entities([dict(item) for item in relations], filters, entity_type_map)
+
+
+def test_entity_index_search_orders_by_similarity_and_filters_agent():
+    index = EntityIndex()
+    index.add(1, "", "alice", EntityIndex.normalize([1.0, 0.0]))
+    index.add(2, "agent", "bob", EntityIndex.normalize([0.8, 0.6]))
+
+    assert [match[0] for match in index.search([1.0, 0.0], threshold=0.5)] == [1, 2]
+    assert [match[0] for match in index.search([1.0, 0.0], threshold=0.5, agent_id="agent")] == [2]
+    assert index.search([0.0, 1.0], threshold=0.9) == []
+
+
+def test_add_entities_and_get_all(memory_graph):
+    filters = {"user_id": "user1"}
+    result = _add(memory_graph, [{"source": "alice", "relationship": "likes", "destination": "pizza"}], filters)
+
+    assert result == [[{"source": "alice", "relationship": "likes", "target": "pizza"}]]
+    assert memory_graph.get_all(filters) == [{"source": "alice", "relationship": "likes", "target": "pizza"}]
+    assert memory_graph.get_all({"user_id": "user2"}) == []
+
+
+def test_add_entities_merges_existing_nodes(memory_graph):
+    filters = {"user_id": "user1"}
+    _add(memory_graph, [{"source": "alice", "relationship": "likes", "destination": "pizza"}], filters)
+    _add(memory_graph, [{"source": "alice", "relationship": "likes", "destination": "pizza"}], filters)
+    _add(memory_graph, [{"source": "alice", "relationship": "likes", "destination": "burger"}], filters)
+
+    entity_count = memory_graph.connection.execute("SELECT COUNT(*) FROM entities").fetchone()[0]
+    mentions = memory_graph.connection.execute("SELECT mentions FROM relations ORDER BY id").fetchall()
+    assert entity_count == 3
+    assert mentions == [(2,), (1,)]
+
+
+def test_search_graph_db_returns_neighbourhood(memory_graph):
+    filters = {"user_id": "user1"}
+    _add(memory_graph, [{"source": "alice", "relationship": "likes", "destination": "pizza"}], filters)
+
+    results = memory_graph._search_graph_db(["pizza"], filters)
+
+    assert len(results) == 1
+    assert results[0]["source"] == "alice"
+    assert results[0]["destination"] == "pizza"
+    assert results[0]["similarity"] == 1.0
+
+
+def test_delete_entities(memory_graph):
+    filters = {"user_id": "user1"}
+    _add(memory_graph, [{"source": "alice", "relationship": "likes", "destination": "pizza"}], filters)
+
+    deleted = memory_graph._delete_entities(
+        [{"source": "alice", "relationship": "likes", "destination": "pizza"}], filters
+    )
+
+    assert deleted == [[{"source": "alice", "target": "pizza", "relationship": "likes"}]]
+    assert memory_graph.get_all(filters) == []
+
+
+def test_delete_all_scoped_to_agent(memory_graph):
+    _add(memory_graph, [{"source": "alice", "relationship": "likes", "destination": "pizza"}], {"user_id": "user1"})
+    _add(
+        memory_graph,
+        [{"source": "alice", "relationship": "likes", "destination": "burger"}],
+        {"user_id": "user1", "agent_id": "agent1"},
+    )
+
+    memory_graph.delete_all({"user_id": "user1", "agent_id": "agent1"})
+
+    assert memory_graph.get_all({"user_id": "user1"}) == [
+        {"source": "alice", "relationship": "likes", "target": "pizza"}
+    ]
+
+
+def test_persistence_across_instances(memory_graph, tmp_path):
+    filters = {"user_id": "user1"}
+    _add(memory_graph, [{"source": "alice", "relationship": "likes", "destination": "pizza"}], filters)
+    memory_graph.close()
+
+    reopened = _create_graph(tmp_path)
+
+    index = reopened._get_index("user1")
+    assert sorted(index.names) == ["alice", "pizza"]
+    assert np.allclose(index.matrix[index.names.index("pizza")], EMBEDDINGS["pizza"])
+    assert reopened.get_all(filters) == [{"source": "alice", "relationship": "likes", "target": "pizza"}]
+
+    reopened.reset()
+    assert reopened.get_all(filters) == []
+    reopened.close()
+
+
+def test_add_fused_extraction_skips_delete_call_on_empty_neighbourhood(memory_graph):
+    memory_graph.config.graph_store.extraction_mode = "fused"
+    memory_graph.llm.generate_response.return_value = {
+        "tool_calls": [
+            {
+                "name": "extract_entities_and_relations",
+                "arguments": {
+                    "entities": [
+                        {"entity": "Alice", "entity_type": "Person"},
+                        {"entity": "Pizza", "entity_type": "Food"},
+                    ],
+                    "relations": [{"source": "Alice", "relationship": "Likes", "destination": "Pizza"}],
+                },
+            }
+        ]
+    }
+
+    result = memory_graph.add("Alice likes pizza", {"user_id": "user1"})
+
+    assert memory_graph.llm.generate_response.call_count == 1
+    assert result["deleted_entities"] == []
+    assert result["added_entities"] == [[{"source": "alice", "relationship": "likes", "target": "pizza"}]]
+    entity_types = memory_graph.connection.execute("SELECT name, entity_type FROM entities ORDER BY id").fetchall()
+    assert entity_types == [("alice", "person"), ("pizza", "food")]
+
+
+def test_match_entity_names_exact_fuzzy_and_self_reference():
+    names = ["alice", "pizza", "new_york", "user1"]
+
+    assert match_entity_names("Does Alice live in New York?", names) == ["alice", "new_york"]
+    assert match_entity_names("who likes pizzas", names) == ["pizza"]
+    assert match_entity_names("what do I like", names, user_id="user1") == ["user1"]
+    assert match_entity_names("what do I like", [], user_id="user1") == []
+
+
+def test_search_fast_mode_skips_llm(memory_graph):
+    filters = {"user_id": "user1"}
+    _add(memory_graph, [{"source": "alice", "relationship": "likes", "destination": "pizza"}], filters)
+    memory_graph.config.graph_store.search_mode = "fast"
+    memory_graph.embedding_model.embed.side_effect = lambda text: EMBEDDINGS.get(text, [0.5, 0.5, 0.5])
+
+    results = memory_graph.search("what does alice like", filters)
+
+    memory_graph.llm.generate_response.assert_not_called()
+    assert results == [{"source": "alice", "relationship": "likes", "destination": "pizza"}]
+
+
+def test_search_fast_mode_matches_query_embedding_when_no_name_matches(memory_graph):
+    filters = {"user_id": "user1"}
+    _add(memory_graph, [{"source": "alice", "relationship": "likes", "destination": "pizza"}], filters)
+    memory_graph.config.graph_store.search_mode = "fast"
+    embeddings = {**EMBEDDINGS, "which dishes are popular": [0.1, 1.0, 0.0]}
+    memory_graph.embedding_model.embed.side_effect = lambda text: embeddings[text]
+
+    results = memory_graph.search("which dishes are popular", filters)
+
+    memory_graph.llm.generate_response.assert_not_called()
+    assert results == [{"source": "alice", "relationship": "likes", "destination": "pizza"}]
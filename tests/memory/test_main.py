@@ -125,3 +125,82 @@ class TestAsyncAddToVectorStoreErrors:
         assert result == []
         assert "Invalid JSON response" in caplog.text
         assert mock_capture_event.call_count == 1
+
+
+class TestSearchBatch:
+    @pytest.fixture
+    def memory_and_store(self, mocker):
+        _, mock_vector_store = _setup_mocks(mocker)
+        mocker.patch("mem0.memory.main.capture_event")
+        memory = Memory()
+        memory.embedding_model.embed_batch.return_value = [[0.1], [0.2]]
+        hit = MagicMock(id="m1", score=0.9, payload={"data": "likes tea", "user_id": "alice", "topic": "drinks"})
+        low = MagicMock(id="m2", score=0.2, payload={"data": "likes coffee", "user_id": "alice"})
+        mock_vector_store.return_value.search_batch.return_value = [[hit, low], []]
+        return memory, mock_vector_store.return_value
+
+    def test_search_batch_embeds_and_searches_once(self, memory_and_store):
+        memory, store = memory_and_store
+
+        results = memory.search_batch(
+            [
+                {"query": "drinks", "user_id": "alice", "limit": 5, "threshold": 0.5},
+                {"query": "food", "agent_id": "bot", "filters": {"topic": "meals"}},
+            ]
+        )
+
+        memory.embedding_model.embed_batch.assert_called_once_with(["drinks", "food"], "search")
+        store.search_batch.assert_called_once_with(
+            queries=["drinks", "food"],
+            vectors=[[0.1], [0.2]],
+            limit=100,
+            filters=[{"user_id": "alice"}, {"topic": "meals", "agent_id": "bot"}],
+        )
+        assert [m["id"] for m in results[0]["results"]] == ["m1"]
+        assert results[0]["results"][0]["metadata"] == {"topic": "drinks"}
+        assert results[1] == {"results": []}
+
+    def test_search_batch_requires_scope(self, memory_and_store):
+        memory, store = memory_and_store
+
+        with pytest.raises(ValueError):
+            memory.search_batch([{"query": "drinks"}])
+        store.search_batch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_async_search_batch(self, mocker):
+        _, mock_vector_store = _setup_mocks(mocker)
+        mocker.patch("mem0.memory.main.capture_event")
+        memory = AsyncMemory()
+        memory.embedding_model.embed_batch.return_value = [[0.1]]
+        mock_vector_store.return_value.search_batch.return_value = [
+            [MagicMock(id="m1", score=0.9, payload={"data": "likes tea", "user_id": "alice"})]
+        ]
+
+        results = await memory.search_batch([{"query": "drinks", "user_id": "alice"}])
+
+        assert results[0]["results"][0]["memory"] == "likes tea"
+        memory.embedding_model.embed_batch.assert_called_once_with(["drinks"], "search")
+
+
+class TestClose:
+    def test_close_stops_graph_queue_and_history_db(self, mocker):
+        _setup_mocks(mocker)
+        memory = Memory()
+        memory.graph_queue, memory.db = MagicMock(), MagicMock()
+
+        memory.close()
+
+        memory.graph_queue.close.assert_called_once_with()
+        memory.db.close.assert_called_once_with()
+
+    @pytest.mark.asyncio
+    async def test_async_close_stops_graph_queue_and_history_db(self, mocker):
+        _setup_mocks(mocker)
+        memory = AsyncMemory()
+        memory.graph_queue, memory.db = MagicMock(), MagicMock()
+
+        await memory.close()
+
+        memory.graph_queue.close.assert_called_once_with()
+        memory.db.close.assert_called_once_with()
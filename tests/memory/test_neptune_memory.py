@@ -18,6 +18,7 @@ class TestNeptuneMemory(unittest.TestCase):
         self.config.llm.provider = "openai_structured"
         self.config.graph_store.llm = None
         self.config.graph_store.custom_prompt = None
+        self.config.graph_store.rerank_top_n = 5
 
         # Create mock for NeptuneAnalyticsGraph
         self.mock_graph = MagicMock()
@@ -123,27 +124,18 @@ class TestNeptuneMemory(unittest.TestCase):
         ]
         self.memory_graph._search_graph_db = MagicMock(return_value=mock_search_results)
 
-        # Mock BM25Okapi
-        with patch("mem0.graphs.neptune.base.BM25Okapi") as mock_bm25:
-            mock_bm25_instance = MagicMock()
-            mock_bm25.return_value = mock_bm25_instance
+        # Call the search method
+        result = self.memory_graph.search("Find Alice", self.test_filters, limit=5)
 
-            # Mock get_top_n to return reranked results
-            reranked_results = [["alice", "knows", "bob"], ["alice", "works_with", "charlie"]]
-            mock_bm25_instance.get_top_n.return_value = reranked_results
-
-            # Call the search method
-            result = self.memory_graph.search("Find Alice", self.test_filters, limit=5)
-
-            # Verify the method calls
-            self.memory_graph._retrieve_nodes_from_data.assert_called_once_with("Find Alice", self.test_filters)
-            self.memory_graph._search_graph_db.assert_called_once_with(node_list=["alice"], filters=self.test_filters)
+        # Verify the method calls
+        self.memory_graph._retrieve_nodes_from_data.assert_called_once_with("Find Alice", self.test_filters)
+        self.memory_graph._search_graph_db.assert_called_once_with(node_list=["alice"], filters=self.test_filters)
 
-            # Check the result structure
-            self.assertEqual(len(result), 2)
-            self.assertEqual(result[0]["source"], "alice")
-            self.assertEqual(result[0]["relationship"], "knows")
-            self.assertEqual(result[0]["destination"], "bob")
+        # Check the result structure
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result[0]["source"], "alice")
+        self.assertEqual(result[0]["relationship"], "knows")
+        self.assertEqual(result[0]["destination"], "bob")
 
     def test_get_all_method(self):
         """Test the get_all method."""
@@ -330,6 +322,24 @@ class TestNeptuneMemory(unittest.TestCase):
         # Check the result
         self.assertEqual(result, [mock_query_result])
 
+    def test_retrieve_nodes_from_query_matches_cached_entity_names(self):
+        """Test fast-mode name matching, and that entity names are cached until the user's graph changes."""
+        self.mock_graph.query.return_value = [{"name": "alice"}, {"name": "pizza"}, {"name": "new_york"}]
+
+        node_list = self.memory_graph._retrieve_nodes_from_query("where does alice eat pizzas", self.test_filters)
+        self.memory_graph._retrieve_nodes_from_query("what about new york", self.test_filters)
+
+        self.assertEqual(node_list, ["alice", "pizza", "where does alice eat pizzas"])
+        self.assertEqual(self.mock_graph.query.call_count, 1)
+
+        self.memory_graph.delete_all(self.test_filters)
+        self.mock_graph.query.return_value = [{"name": "bob"}]
+        self.memory_graph._retrieve_nodes_from_data = MagicMock()
+
+        self.assertEqual(self.memory_graph._retrieve_nodes_from_query("and alice", self.test_filters), ["and alice"])
+        self.memory_graph._retrieve_nodes_from_data.assert_not_called()
+        self.assertEqual(self.mock_graph.query.call_count, 3)
+
 
 if __name__ == "__main__":
     unittest.main()
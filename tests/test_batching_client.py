@@ -0,0 +1,185 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+
+import httpx
+import pytest
+
+from mem0.client import main as client_main
+from mem0.client.batching import AsyncBatchingMemoryClient, BatchingMemoryClient
+from mem0.client.main import AsyncMemoryClient, MemoryClient
+from mem0.client.resilience import RetryConfig
+from mem0.client.utils import APIError
+
+
+class StandInServer:
+    """In-process stand-in for the Mem0 API that echoes each added message back."""
+
+    def __init__(self):
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        if request.url.path == "/v1/ping/":
+            return httpx.Response(200, json={"user_email": "a@b.c"})
+        body = json.loads(request.content)
+        with self.lock:
+            self.requests.append((request.url.path, body))
+        if request.url.path == "/memories/batch":
+            return httpx.Response(200, json={"results": [self._item(i, item) for i, item in enumerate(body["items"])]})
+        if body["messages"][0]["content"] == "fail":
+            return httpx.Response(400, json={"detail": "bad message"})
+        return httpx.Response(200, json=self._result(body))
+
+    @classmethod
+    def _item(cls, index, payload):
+        if payload["messages"][0]["content"] == "fail":
+            return {"index": index, "status": "error", "error": "bad message"}
+        return {"index": index, "status": "ok", "result": cls._result(payload)}
+
+    @staticmethod
+    def _result(payload):
+        return {"results": [{"memory": payload["messages"][0]["content"], "user_id": payload["user_id"]}]}
+
+
+CLIENT_KWARGS = {"api_key": "key", "retry_config": RetryConfig(max_retries=0, requests_per_second=None)}
+
+
+@pytest.fixture(autouse=True)
+def no_telemetry(monkeypatch):
+    monkeypatch.setattr(client_main, "_validated_keys", {})
+    monkeypatch.setattr(client_main, "capture_client_event", lambda *args, **kwargs: None)
+
+
+def _messages(content):
+    return [{"role": "user", "content": content}]
+
+
+def test_each_caller_gets_its_own_result():
+    server = StandInServer()
+    client = MemoryClient(transport=httpx.MockTransport(server), **CLIENT_KWARGS)
+
+    with BatchingMemoryClient(client, max_delay=0.05) as batching:
+        futures = [batching.add(_messages(f"fact {i}"), user_id=f"user-{i}") for i in range(10)]
+        results = [future.result(timeout=5) for future in futures]
+
+    for i, result in enumerate(results):
+        assert result["results"][0] == {"memory": f"fact {i}", "user_id": f"user-{i}"}
+    assert len(server.requests) == 10
+
+
+def test_batch_endpoint_sends_one_request_per_batch():
+    server = StandInServer()
+    client = MemoryClient(transport=httpx.MockTransport(server), **CLIENT_KWARGS)
+    batching = BatchingMemoryClient(client, max_batch_size=4, max_delay=1, batch_endpoint="/memories/batch")
+
+    futures = [batching.add(_messages(f"fact {i}"), user_id="alice") for i in range(8)]
+    assert batching.flush(timeout=5)
+
+    assert [path for path, _ in server.requests] == ["/memories/batch", "/memories/batch"]
+    assert [future.result()["results"][0]["memory"] for future in futures] == [f"fact {i}" for i in range(8)]
+    batching.close()
+
+
+def test_failures_only_affect_their_caller():
+    server = StandInServer()
+    client = MemoryClient(transport=httpx.MockTransport(server), **CLIENT_KWARGS)
+
+    with BatchingMemoryClient(client) as batching:
+        ok = batching.add(_messages("fine"), user_id="alice")
+        failed = batching.add(_messages("fail"), user_id="alice")
+        assert ok.result(timeout=5)["results"][0]["memory"] == "fine"
+        with pytest.raises(APIError):
+            failed.result(timeout=5)
+
+
+def test_batch_endpoint_reports_failed_items_to_their_caller():
+    server = StandInServer()
+    client = MemoryClient(transport=httpx.MockTransport(server), **CLIENT_KWARGS)
+
+    with BatchingMemoryClient(client, max_batch_size=2, max_delay=1, batch_endpoint="/memories/batch") as batching:
+        ok = batching.add(_messages("fine"), user_id="alice")
+        failed = batching.add(_messages("fail"), user_id="alice")
+        assert ok.result(timeout=5)["results"][0]["memory"] == "fine"
+        with pytest.raises(APIError, match="bad message"):
+            failed.result(timeout=5)
+
+    assert [path for path, _ in server.requests] == ["/memories/batch"]
+
+
+def test_close_flushes_and_rejects_new_adds():
+    server = StandInServer()
+    client = MemoryClient(transport=httpx.MockTransport(server), **CLIENT_KWARGS)
+    batching = BatchingMemoryClient(client, max_delay=10)
+
+    future = batching.add(_messages("buffered"), user_id="alice")
+    batching.close()
+
+    assert future.done()
+    with pytest.raises(RuntimeError):
+        batching.add(_messages("late"), user_id="alice")
+
+
+def test_buffered_adds_are_sent_at_interpreter_exit():
+    script = textwrap.dedent(
+        """
+        import httpx
+        from mem0.client.batching import BatchingMemoryClient
+        from mem0.client.main import MemoryClient
+        from mem0.client.resilience import RetryConfig
+
+        def handler(request):
+            if request.url.path != "/v1/ping/":
+                print("sent", request.url.path, flush=True)
+            return httpx.Response(200, json={"results": []})
+
+        client = MemoryClient(
+            api_key="key",
+            transport=httpx.MockTransport(handler),
+            retry_config=RetryConfig(max_retries=0, requests_per_second=None),
+        )
+        batching = BatchingMemoryClient(client, max_delay=60)
+        batching.add([{"role": "user", "content": "buffered"}], user_id="alice")
+        """
+    )
+    env = dict(os.environ, MEM0_TELEMETRY="False")
+    completed = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=60, env=env)
+
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.splitlines() == ["sent /v1/memories/"]
+
+
+def test_async_batching_client():
+    server = StandInServer()
+
+    async def run():
+        client = AsyncMemoryClient(transport=httpx.MockTransport(server), **CLIENT_KWARGS)
+        async with AsyncBatchingMemoryClient(client, max_batch_size=5, batch_endpoint="/memories/batch") as batching:
+            return await asyncio.gather(*(batching.add(_messages(f"fact {i}"), user_id="bob") for i in range(5)))
+
+    results = asyncio.run(run())
+
+    assert [result["results"][0]["memory"] for result in results] == [f"fact {i}" for i in range(5)]
+    assert [path for path, _ in server.requests] == ["/memories/batch"]
+
+
+def test_async_batch_endpoint_reports_failed_items_to_their_caller():
+    server = StandInServer()
+
+    async def run():
+        client = AsyncMemoryClient(transport=httpx.MockTransport(server), **CLIENT_KWARGS)
+        async with AsyncBatchingMemoryClient(client, max_batch_size=2, batch_endpoint="/memories/batch") as batching:
+            return await asyncio.gather(
+                batching.add(_messages("fine"), user_id="bob"),
+                batching.add(_messages("fail"), user_id="bob"),
+                return_exceptions=True,
+            )
+
+    ok, failed = asyncio.run(run())
+
+    assert ok["results"][0]["memory"] == "fine"
+    assert isinstance(failed, APIError) and "bad message" in str(failed)
@@ -0,0 +1,353 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from mem0.client import main as client_main
+from mem0.client import resilience
+from mem0.client.main import AsyncMemoryClient, MemoryClient
+from mem0.client.resilience import RetryConfig
+from mem0.client.streaming import JsonItemParser
+from mem0.client.transport import TransportConfig, get_shared_transport
+from mem0.client.utils import APIError
+
+
+class RecordingHandler:
+    def __init__(self, ping_status=200):
+        self.paths = []
+        self.received = []
+        self.ping_status = ping_status
+
+    def __call__(self, request):
+        self.paths.append(request.url.path)
+        self.received.append(request)
+        if request.url.path == "/v1/ping/":
+            if self.ping_status != 200:
+                return httpx.Response(self.ping_status, json={"detail": "Invalid API key"})
+            return httpx.Response(200, json={"org_id": "org", "project_id": "proj", "user_email": "a@b.c"})
+        return httpx.Response(200, json={"id": "mem-1", "query": dict(request.url.params)})
+
+
+@pytest.fixture(autouse=True)
+def clear_validation_cache(monkeypatch):
+    monkeypatch.setattr(client_main, "_validated_keys", {})
+    monkeypatch.setattr(resilience, "_rate_limiters", {})
+    monkeypatch.setattr(client_main, "capture_client_event", lambda *args, **kwargs: None)
+
+
+def test_validation_is_deferred_to_first_request():
+    handler = RecordingHandler()
+    client = MemoryClient(api_key="key", transport=httpx.MockTransport(handler))
+
+    assert handler.paths == []
+
+    client.get("mem-1")
+    client.get("mem-1")
+
+    assert handler.paths == ["/v1/ping/", "/v1/memories/mem-1/", "/v1/memories/mem-1/"]
+    assert (client.org_id, client.project_id, client.user_email) == ("org", "proj", "a@b.c")
+
+
+def test_validation_is_cached_across_instances():
+    handler = RecordingHandler()
+    transport = httpx.MockTransport(handler)
+
+    MemoryClient(api_key="key", transport=transport).get("mem-1")
+    second = MemoryClient(api_key="key", transport=transport)
+    second.get("mem-1")
+
+    assert handler.paths.count("/v1/ping/") == 1
+    assert second.user_email == "a@b.c"
+
+    MemoryClient(api_key="other-key", transport=transport).get("mem-1")
+    assert handler.paths.count("/v1/ping/") == 2
+
+
+def test_invalid_key_raises_on_first_request():
+    handler = RecordingHandler(ping_status=401)
+    client = MemoryClient(api_key="bad", transport=httpx.MockTransport(handler))
+
+    with pytest.raises(ValueError, match="Invalid API key"):
+        client.get("mem-1")
+    assert handler.paths == ["/v1/ping/"]
+    assert client_main._validated_keys == {}
+
+
+def test_project_validates_before_use():
+    handler = RecordingHandler()
+    client = MemoryClient(api_key="key", transport=httpx.MockTransport(handler))
+
+    assert client.project.org_id == "org"
+    assert handler.paths == ["/v1/ping/"]
+
+
+def test_mismatched_org_and_project_rejected():
+    with pytest.raises(ValueError, match="both org_id and project_id"):
+        MemoryClient(api_key="key", org_id="org", transport=httpx.MockTransport(RecordingHandler()))
+
+
+def test_shared_transport_is_reused_per_config():
+    config = TransportConfig(max_connections=7, http2=False)
+
+    assert get_shared_transport(config) is get_shared_transport(TransportConfig(max_connections=7, http2=False))
+    assert get_shared_transport(config) is not get_shared_transport(TransportConfig(max_connections=8, http2=False))
+
+    client = MemoryClient(api_key="key", transport_config=config)
+    assert client.client.timeout.connect == config.connect_timeout
+    assert client.client.timeout.read == config.read_timeout
+
+
+def test_rate_limiting_is_opt_in():
+    assert resilience.get_rate_limiter(("host", "user"), RetryConfig()) is None
+    assert resilience.get_rate_limiter(("host", "user"), RetryConfig(requests_per_second=5)).max_rate == 5
+
+
+def test_closing_a_client_leaves_the_shared_transport_open(monkeypatch):
+    config = TransportConfig(max_connections=9, http2=False)
+    shared = get_shared_transport(config)
+    closed = []
+    monkeypatch.setattr(shared, "close", lambda: closed.append(shared))
+
+    MemoryClient(api_key="key", transport_config=config).client.close()
+
+    assert closed == []
+
+
+def test_shared_httpx_client_keeps_one_validation_hook():
+    handler = RecordingHandler()
+    user_hook = lambda request: None  # noqa: E731
+    shared = httpx.Client(transport=httpx.MockTransport(handler), event_hooks={"request": [user_hook]})
+
+    for _ in range(3):
+        client = MemoryClient(api_key="key", client=shared)
+    client.get("mem-1")
+
+    assert shared.event_hooks["request"] == [user_hook, client._validate_before_request]
+    assert handler.paths == ["/v1/ping/", "/v1/memories/mem-1/"]
+
+
+def test_shared_async_httpx_client_keeps_one_validation_hook():
+    shared = httpx.AsyncClient(transport=httpx.MockTransport(RecordingHandler()))
+
+    for _ in range(3):
+        client = AsyncMemoryClient(api_key="key", client=shared)
+
+    assert shared.event_hooks["request"] == [client._validate_before_request]
+
+
+def test_async_client_validates_lazily():
+    handler = RecordingHandler()
+
+    async def run():
+        client = AsyncMemoryClient(api_key="key", transport=httpx.MockTransport(handler))
+        assert handler.paths == []
+        await client.get("mem-1")
+        await client.get("mem-1")
+        return client
+
+    client = asyncio.run(run())
+
+    assert handler.paths == ["/v1/ping/", "/v1/memories/mem-1/", "/v1/memories/mem-1/"]
+    assert client.org_id == "org"
+
+
+def test_first_request_carries_validated_org_and_project():
+    handler = RecordingHandler()
+    client = MemoryClient(api_key="key", transport=httpx.MockTransport(handler))
+
+    client.search("coffee")
+    client.add([{"role": "user", "content": "I like coffee"}], user_id="alice")
+
+    search, add = (json.loads(request.content) for request in handler.received[1:])
+    assert (search["org_id"], search["project_id"]) == ("org", "proj")
+    assert (add["org_id"], add["project_id"]) == ("org", "proj")
+
+
+def test_async_first_request_carries_validated_org_and_project():
+    handler = RecordingHandler()
+
+    async def run():
+        client = AsyncMemoryClient(api_key="key", transport=httpx.MockTransport(handler))
+        await client.search("coffee")
+        await client.get("mem-1")
+
+    asyncio.run(run())
+
+    search, get = handler.received[1:]
+    assert json.loads(search.content)["org_id"] == "org"
+    assert (get.url.params["org_id"], get.url.params["project_id"]) == ("org", "proj")
+
+
+def test_async_project_validates_through_the_async_client(monkeypatch):
+    handler = RecordingHandler()
+
+    def blocking_get(*args, **kwargs):
+        raise AssertionError("validation must not use a blocking request")
+
+    monkeypatch.setattr(httpx, "get", blocking_get)
+
+    async def run():
+        client = AsyncMemoryClient(api_key="key", transport=httpx.MockTransport(handler))
+        await client.project.get()
+        return client
+
+    client = asyncio.run(run())
+
+    assert handler.paths == ["/v1/ping/", "/api/v1/orgs/organizations/org/projects/proj/"]
+    assert client.project.org_id == "org"
+
+
+class FlakyHandler(RecordingHandler):
+    def __init__(self, failures, status=503, headers=None):
+        super().__init__()
+        self.failures = failures
+        self.status = status
+        self.headers = headers or {}
+        self.requests = []
+
+    def __call__(self, request):
+        if request.url.path != "/v1/ping/":
+            self.requests.append(request)
+            if self.failures:
+                self.failures -= 1
+                return httpx.Response(self.status, headers=self.headers, json={"detail": "busy"})
+        return super().__call__(request)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(resilience.time, "sleep", recorded.append)
+    return recorded
+
+
+def test_idempotent_requests_are_retried(sleeps):
+    handler = FlakyHandler(failures=2)
+    client = MemoryClient(api_key="key", transport=httpx.MockTransport(handler))
+
+    assert client.get("mem-1")["id"] == "mem-1"
+    assert len(handler.requests) == 3
+    assert len(sleeps) == 2
+
+
+def test_add_is_retried_with_the_same_idempotency_key(sleeps):
+    handler = FlakyHandler(failures=1, status=502)
+    client = MemoryClient(api_key="key", transport=httpx.MockTransport(handler))
+
+    client.add([{"role": "user", "content": "hi"}], user_id="alice")
+
+    keys = [request.headers["Idempotency-Key"] for request in handler.requests]
+    assert len(keys) == 2 and keys[0] == keys[1]
+
+
+def test_retry_after_is_honoured_and_slows_the_rate_limiter(sleeps):
+    handler = FlakyHandler(failures=1, status=429, headers={"Retry-After": "7"})
+    client = MemoryClient(
+        api_key="key", transport=httpx.MockTransport(handler), retry_config=RetryConfig(requests_per_second=50)
+    )
+
+    client.get("mem-1")
+
+    assert 7 in sleeps
+    limiter = resilience.get_rate_limiter((client.host, client.user_id), client.retry_config)
+    assert limiter.rate < client.retry_config.requests_per_second
+
+
+def test_retries_give_up_after_max_retries(sleeps):
+    handler = FlakyHandler(failures=10)
+    client = MemoryClient(
+        api_key="key", transport=httpx.MockTransport(handler), retry_config=RetryConfig(max_retries=1)
+    )
+
+    with pytest.raises(APIError):
+        client.get("mem-1")
+    assert len(handler.requests) == 2
+
+
+def test_slow_search_is_hedged():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if len(calls) == 1:
+            time.sleep(0.5)
+        return httpx.Response(200, json=[{"id": len(calls)}])
+
+    config = RetryConfig(hedge_search=True, hedge_min_samples=1, requests_per_second=None)
+    transport = resilience.RetryTransport(httpx.MockTransport(handler), config)
+    transport.policy.record_latency(httpx.Request("POST", "https://api.mem0.ai/v1/memories/search/"), 0.01)
+
+    started = time.monotonic()
+    response = transport.handle_request(httpx.Request("POST", "https://api.mem0.ai/v1/memories/search/"))
+
+    assert time.monotonic() - started < 0.4
+    assert response.json() == [{"id": 2}]
+    transport.close()
+
+
+class PagedHandler:
+    """Serves `total` memories in pages, using the paginated v1.1 format."""
+
+    def __init__(self, total):
+        self.total = total
+        self.pages = []
+
+    def __call__(self, request):
+        if request.url.path == "/v1/ping/":
+            return httpx.Response(200, json={})
+        if request.url.path == "/v1/exports/get/":
+            return httpx.Response(200, content=b'{"memories": [' + b'{"id": 1},' * 1000 + b'{"id": 2}]}')
+        if request.url.path.endswith("/history/"):
+            return httpx.Response(200, json=[{"event": "ADD"}, {"event": "UPDATE"}])
+        page, page_size = int(request.url.params["page"]), int(request.url.params["page_size"])
+        self.pages.append(page)
+        ids = range((page - 1) * page_size, min(page * page_size, self.total))
+        return httpx.Response(200, json={"count": self.total, "results": [{"id": i} for i in ids]})
+
+
+def test_iter_all_walks_pages_lazily():
+    handler = PagedHandler(total=25)
+    client = MemoryClient(api_key="key", transport=httpx.MockTransport(handler))
+
+    memories = client.iter_all(user_id="alice", page_size=10)
+    assert next(memories) == {"id": 0}
+    assert handler.pages == [1]
+
+    assert [memory["id"] for memory in memories] == list(range(1, 25))
+    assert handler.pages == [1, 2, 3]
+
+
+def test_iter_history_and_export_download(tmp_path):
+    client = MemoryClient(api_key="key", transport=httpx.MockTransport(PagedHandler(total=0)))
+
+    assert [entry["event"] for entry in client.iter_history("mem-1")] == ["ADD", "UPDATE"]
+
+    path = client.download_memory_export(str(tmp_path / "export.json"), user_id="alice")
+    assert path.endswith("export.json")
+    assert (tmp_path / "export.json").read_bytes().endswith(b'{"id": 2}]}')
+
+
+def test_aiter_all_walks_pages():
+    handler = PagedHandler(total=7)
+
+    async def run():
+        client = AsyncMemoryClient(api_key="key", transport=httpx.MockTransport(handler))
+        return [memory["id"] async for memory in client.aiter_all(user_id="alice", page_size=5)]
+
+    assert asyncio.run(run()) == list(range(7))
+    assert handler.pages == [1, 2]
+
+
+def test_json_item_parser_handles_split_chunks():
+    body = b'{"count": 2, "next": null, "results": [{"id": 1, "memory": "likes tea"}, {"id": 2}]}'
+    parser = JsonItemParser()
+
+    items = []
+    for i in range(0, len(body), 7):
+        items.extend(parser.feed(body[i : i + 7]))
+    items.extend(parser.close())
+
+    assert parser.paginated
+    assert items == [{"id": 1, "memory": "likes tea"}, {"id": 2}]
@@ -0,0 +1,147 @@
+import asyncio
+
+import httpx
+import pytest
+
+from mem0.client import main as client_main
+from mem0.client import resilience
+from mem0.client.cache import InMemoryCacheBackend, ResponseCache, get_scope
+from mem0.client.main import AsyncMemoryClient, MemoryClient
+
+
+class MemoryServer:
+    def __init__(self, etag=None):
+        self.etag = etag
+        self.requests = []
+
+    def __call__(self, request):
+        if request.url.path == "/v1/ping/":
+            return httpx.Response(200, json={"org_id": "org", "project_id": "proj", "user_email": "a@b.c"})
+        self.requests.append((request.method, request.url.path))
+        if self.etag and request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304)
+        headers = {"etag": self.etag} if self.etag else {}
+        if request.url.path.endswith("/search/"):
+            return httpx.Response(200, json=[{"id": "mem-1", "memory": "likes tea"}], headers=headers)
+        return httpx.Response(200, json={"id": "mem-1", "memory": "likes tea"}, headers=headers)
+
+
+@pytest.fixture(autouse=True)
+def isolate_client_state(monkeypatch):
+    monkeypatch.setattr(client_main, "_validated_keys", {})
+    monkeypatch.setattr(resilience, "_rate_limiters", {})
+    monkeypatch.setattr(client_main, "capture_client_event", lambda *args, **kwargs: None)
+
+
+def make_client(server, cache):
+    return MemoryClient(api_key="key", transport=httpx.MockTransport(server), cache=cache)
+
+
+def test_search_is_served_from_cache():
+    server = MemoryServer()
+    client = make_client(server, ResponseCache(ttl=60))
+
+    first = client.search("tea", user_id="alice")
+    first[0]["memory"] = "mutated"
+    second = client.search("tea", user_id="alice")
+
+    assert server.requests == [("POST", "/v1/memories/search/")]
+    assert second[0]["memory"] == "likes tea"
+
+
+def test_add_invalidates_only_the_written_entity():
+    server = MemoryServer()
+    client = make_client(server, ResponseCache(ttl=60))
+
+    client.search("tea", user_id="alice")
+    client.search("tea", user_id="bob")
+    client.add("I like coffee", user_id="alice")
+    client.search("tea", user_id="alice")
+    client.search("tea", user_id="bob")
+
+    searches = [path for method, path in server.requests if path.endswith("/search/")]
+    assert len(searches) == 3
+
+
+def test_write_by_memory_id_invalidates_everything():
+    server = MemoryServer()
+    client = make_client(server, ResponseCache(ttl=60))
+
+    client.get("mem-1")
+    client.search("tea", user_id="bob")
+    client.delete("mem-1")
+    client.get("mem-1")
+    client.search("tea", user_id="bob")
+
+    assert [method for method, _ in server.requests] == ["GET", "POST", "DELETE", "GET", "POST"]
+
+
+def test_add_invalidates_reads_by_memory_id():
+    server = MemoryServer()
+    client = make_client(server, ResponseCache(ttl=60))
+
+    client.get("mem-1")
+    client.search("tea", user_id="bob")
+    # The add may update or delete mem-1, whichever user it belongs to
+    client.add("I no longer like tea", user_id="alice")
+    client.get("mem-1")
+    client.search("tea", user_id="bob")
+
+    assert [method for method, _ in server.requests] == ["GET", "POST", "POST", "GET"]
+
+
+def test_stale_entry_is_revalidated_with_etag():
+    server = MemoryServer(etag='"v1"')
+    client = make_client(server, ResponseCache(ttl=0, revalidate_ttl=60))
+
+    first = client.get("mem-1")
+    second = client.get("mem-1")
+
+    assert first == second == {"id": "mem-1", "memory": "likes tea"}
+    assert len(server.requests) == 2
+
+
+def test_no_cache_by_default():
+    server = MemoryServer()
+    client = MemoryClient(api_key="key", transport=httpx.MockTransport(server))
+
+    client.get("mem-1")
+    client.get("mem-1")
+
+    assert len(server.requests) == 2
+
+
+def test_async_client_uses_cache():
+    server = MemoryServer()
+
+    async def run():
+        async with AsyncMemoryClient(
+            api_key="key", transport=httpx.MockTransport(server), cache=ResponseCache(ttl=60)
+        ) as client:
+            await client.search("tea", user_id="alice")
+            await client.search("tea", user_id="alice")
+            await client.add("I like coffee", user_id="alice")
+            await client.search("tea", user_id="alice")
+
+    asyncio.run(run())
+
+    assert [method for method, _ in server.requests] == ["POST", "POST", "POST"]
+
+
+def test_in_memory_backend_evicts_least_recently_used():
+    backend = InMemoryCacheBackend(max_size=2)
+    backend.set("a", {"value": 1}, ttl=60)
+    backend.set("b", {"value": 2}, ttl=60)
+    backend.get("a")
+    backend.set("c", {"value": 3}, ttl=60)
+
+    assert backend.get("a") == {"value": 1}
+    assert backend.get("b") is None
+    assert backend.get("c") == {"value": 3}
+
+
+def test_get_scope_reads_nested_filters():
+    params = {"filters": {"AND": [{"user_id": "alice"}, {"agent_id": "bot"}]}, "query": "tea"}
+
+    assert get_scope(params) == [("agent_id", "bot"), ("user_id", "alice")]
+    assert get_scope(None) == []
@@ -1,9 +1,11 @@
-from unittest.mock import Mock, patch
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
 from mem0 import Memory, MemoryClient
 from mem0.proxy.main import Chat, Completions, Mem0
+from mem0.proxy.retrieval_cache import RetrievalCache
 
 
 @pytest.fixture
@@ -69,6 +71,7 @@ def test_completions_create(mock_memory_client, mock_litellm):
     mock_litellm.supports_function_calling.return_value = True
 
     response = completions.create(model="gpt-4o-mini", messages=messages, user_id="test_user", temperature=0.7)
+    completions.write_queue.flush(timeout=5)
 
     mock_memory_client.add.assert_called_once()
     mock_memory_client.search.assert_called_once()
@@ -98,3 +101,72 @@ def test_completions_create_with_system_message(mock_memory_client, mock_litellm
     call_args = mock_litellm.completion.call_args[1]
     assert call_args["messages"][0]["role"] == "system"
     assert call_args["messages"][0]["content"] == "You are a helpful assistant."
+
+
+def test_completions_create_reuses_retrieval_for_similar_question(mock_memory_client, mock_litellm):
+    completions = Completions(mock_memory_client)
+    mock_memory_client.search.return_value = [{"memory": "Likes tea"}]
+    mock_litellm.supports_function_calling.return_value = True
+
+    messages = [{"role": "user", "content": "What do I drink?"}]
+    completions.create(model="gpt-4o-mini", messages=messages, user_id="u")
+    messages += [{"role": "assistant", "content": "Tea."}, {"role": "user", "content": "what do I drink"}]
+    completions.create(model="gpt-4o-mini", messages=messages, user_id="u")
+    messages += [{"role": "assistant", "content": "Tea."}, {"role": "user", "content": "Where do I live?"}]
+    completions.create(model="gpt-4o-mini", messages=messages, user_id="u")
+
+    assert mock_memory_client.search.call_count == 2
+    completions.write_queue.close(timeout=5)
+
+
+def test_completions_create_does_not_share_retrieval_across_conversations(mock_memory_client, mock_litellm):
+    completions = Completions(mock_memory_client)
+    mock_memory_client.search.return_value = [{"memory": "Likes tea"}]
+    mock_litellm.supports_function_calling.return_value = True
+
+    completions.create(model="gpt-4o-mini", messages=[{"role": "user", "content": "What do I drink?"}], user_id="u")
+    completions.create(model="gpt-4o-mini", messages=[{"role": "user", "content": "what do I drink"}], user_id="u")
+
+    assert mock_memory_client.search.call_count == 2
+    completions.write_queue.close(timeout=5)
+
+
+def test_completions_acreate(mock_memory_client, mock_litellm):
+    completions = Completions(mock_memory_client)
+    messages = [{"role": "user", "content": "Hello, how are you?"}]
+    mock_memory_client.search.return_value = [{"memory": "Some relevant memory"}]
+    mock_litellm.supports_function_calling.return_value = True
+    mock_litellm.acompletion = AsyncMock(return_value={"choices": [{"message": {"content": "Fine"}}]})
+
+    response = asyncio.run(
+        completions.acreate(model="gpt-4o-mini", messages=messages, user_id="test_user", stream=True)
+    )
+    completions.write_queue.close(timeout=5)
+
+    assert response == {"choices": [{"message": {"content": "Fine"}}]}
+    mock_memory_client.add.assert_called_once()
+    mock_memory_client.search.assert_called_once()
+    call_args = mock_litellm.acompletion.call_args[1]
+    assert call_args["stream"] is True
+    assert "Some relevant memory" in call_args["messages"][-1]["content"]
+    assert messages == [{"role": "user", "content": "Hello, how are you?"}]
+
+
+def test_retrieval_cache_expires_and_evicts():
+    cache = RetrievalCache(ttl=0)
+    cache.set("a", "favourite food", ["pizza"])
+    assert cache.get("a", "favourite food") is None
+
+    cache = RetrievalCache(max_size=1)
+    cache.set("a", "favourite food", ["pizza"])
+    cache.set("b", "favourite food", ["sushi"])
+    assert cache.get("a", "favourite food") is None
+    assert cache.get("b", "favourite food") == ["sushi"]
+
+
+def test_retrieval_cache_distinguishes_non_ascii_queries():
+    cache = RetrievalCache()
+    cache.set("a", "what do I know about 東京", ["tokyo"])
+
+    assert cache.get("a", "what do I know about 大阪") is None
+    assert cache.get("a", "what do I know about 東京") == ["tokyo"]
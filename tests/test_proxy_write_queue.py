@@ -0,0 +1,93 @@
+import threading
+from unittest.mock import Mock
+
+from mem0.proxy.write_queue import MemoryWriteQueue
+
+
+def _turn(*contents):
+    return [{"role": "user", "content": content} for content in contents]
+
+
+def test_writes_are_sent_and_counted():
+    client = Mock()
+    queue = MemoryWriteQueue(client, num_workers=2)
+
+    assert queue.submit(_turn("hi"), user_id="alice")
+    assert queue.submit(_turn("hello"), user_id="bob")
+    assert queue.close(timeout=5)
+
+    assert client.add.call_count == 2
+    stats = queue.stats()
+    assert stats["added"] == 2
+    assert stats["queue_depth"] == 0
+    assert stats["in_flight"] == 0
+
+
+def test_turns_of_a_conversation_are_coalesced():
+    release = threading.Event()
+    client = Mock()
+    client.add.side_effect = lambda **kwargs: release.wait(5)
+    queue = MemoryWriteQueue(client, num_workers=1)
+
+    queue.submit(_turn("blocker"), user_id="bob")
+    queue.submit(_turn("one"), user_id="alice")
+    queue.submit(_turn("one", "two"), user_id="alice")
+    queue.submit(_turn("one", "two", "three"), user_id="alice")
+    release.set()
+    assert queue.flush(timeout=5)
+
+    alice_calls = [call.kwargs for call in client.add.call_args_list if call.kwargs["user_id"] == "alice"]
+    assert [call["messages"] for call in alice_calls] == [_turn("one", "two", "three")]
+    assert queue.stats()["coalesced"] == 2
+    queue.close()
+
+
+def test_different_conversations_of_a_user_are_not_coalesced():
+    release = threading.Event()
+    client = Mock()
+    client.add.side_effect = lambda **kwargs: release.wait(5)
+    queue = MemoryWriteQueue(client, num_workers=1)
+
+    queue.submit(_turn("blocker"), user_id="bob")
+    queue.submit(_turn("plan a trip"), user_id="alice")
+    queue.submit(_turn("fix my bike"), user_id="alice")
+    queue.submit(_turn("plan a trip", "to Rome"), user_id="alice")
+    release.set()
+    assert queue.flush(timeout=5)
+
+    alice_calls = [call.kwargs for call in client.add.call_args_list if call.kwargs["user_id"] == "alice"]
+    assert [call["messages"] for call in alice_calls] == [_turn("plan a trip", "to Rome"), _turn("fix my bike")]
+    assert queue.stats()["coalesced"] == 1
+    queue.close()
+
+
+def test_full_queue_drops_writes():
+    release = threading.Event()
+    client = Mock()
+    client.add.side_effect = lambda **kwargs: release.wait(5)
+    queue = MemoryWriteQueue(client, max_size=1, num_workers=1, put_timeout=0.01)
+
+    assert queue.submit(_turn("in flight"), user_id="a")
+    assert queue.flush(timeout=0.05) is False
+    assert queue.submit(_turn("queued"), user_id="b")
+    assert not queue.submit(_turn("dropped"), user_id="c")
+    release.set()
+    queue.close(timeout=5)
+
+    stats = queue.stats()
+    assert stats["dropped"] == 1
+    assert stats["added"] == 2
+
+
+def test_failed_writes_do_not_stop_the_workers():
+    client = Mock()
+    client.add.side_effect = [RuntimeError("boom"), None]
+    queue = MemoryWriteQueue(client, num_workers=1)
+
+    queue.submit(_turn("first"), user_id="a")
+    queue.flush(timeout=5)
+    queue.submit(_turn("second"), user_id="a")
+    queue.close(timeout=5)
+
+    stats = queue.stats()
+    assert (stats["failed"], stats["added"]) == (1, 1)